@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""Benchmark agent intent detection latency per turn.
+
+Compares, per agent turn:
+  naive     - re.search(pattern, text) for each pattern (previous behaviour)
+  compiled  - precompiled PatternSets with a literal pre-filter (current)
+
+Both runs must classify every turn identically; any mismatch is reported and
+the exit status is non-zero.
+
+Usage:
+    bin/bench_intent_detection.py [PATH ...] [--limit N] [--repeat N]
+
+PATHs may be .jsonl transcripts or directories searched recursively; the
+assistant text messages they contain are the corpus. Without transcripts a
+synthetic corpus of short and very long outputs is used.
+"""
+
+import argparse
+import json
+import logging
+import random
+import re
+import statistics
+import sys
+import time
+from pathlib import Path
+from unittest.mock import patch
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root / "src"))
+
+from claude_headspace.services import intent_detector
+from claude_headspace.services.transcript_reader import _extract_text
+
+_FILLER = [
+    "Reading src/app.py to understand the request flow.",
+    "The handler validates the payload and then writes it to the queue.",
+    "    return {\"status\": \"ok\", \"items\": items}",
+    "Updated the migration to add the missing index on agent_id.",
+    "Running the linter over the changed modules.",
+    "- tests/services/test_worker.py: covers retry and backoff",
+]
+_ENDINGS = [
+    "",
+    "All 42 tests pass.",
+    "Would you like me to also update the docs?",
+    "Here's a summary of what was done:\n- fixed the race\nLet me know if there's anything else.",
+    "Next I'll wire up the route.",
+    "Error: database is locked",
+    "Done. The fix is deployed.",
+]
+
+
+def naive_match_patterns(text, patterns):
+    for pattern in patterns:
+        if re.search(pattern, text):
+            return pattern
+    return None
+
+
+def load_corpus(paths: list[str], limit: int) -> list[str]:
+    texts = []
+    for p in map(Path, paths):
+        for f in sorted(p.rglob("*.jsonl")) if p.is_dir() else [p]:
+            with open(f, encoding="utf-8", errors="replace") as fh:
+                for line in fh:
+                    try:
+                        data = json.loads(line)
+                    except ValueError:
+                        continue
+                    role, text = _extract_text(data)
+                    if role == "assistant" and text:
+                        texts.append(text)
+                        if len(texts) >= limit:
+                            return texts
+    return texts
+
+
+def synthetic_corpus(limit: int) -> list[str]:
+    rng = random.Random(0)
+    texts = []
+    for i in range(limit):
+        lines = 5 if i % 4 else 2000  # Every fourth turn is a very long output
+        body = [rng.choice(_FILLER) for _ in range(lines)]
+        texts.append("\n".join(body + [rng.choice(_ENDINGS)]))
+    return texts
+
+
+def classify_all(texts: list[str]) -> tuple[list, list[float]]:
+    results, latencies = [], []
+    for text in texts:
+        started = time.perf_counter()
+        r = intent_detector.detect_agent_intent(text)
+        latencies.append(time.perf_counter() - started)
+        results.append((r.intent, r.confidence, r.matched_pattern))
+    return results, latencies
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("paths", nargs="*")
+    parser.add_argument("--limit", type=int, default=2000, help="Max agent turns to classify")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per variant (best is kept)")
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)  # detect_agent_intent logs every call
+    texts = load_corpus(args.paths, args.limit) if args.paths else []
+    source = "transcripts"
+    if not texts:
+        texts, source = synthetic_corpus(min(args.limit, 400)), "synthetic"
+    total_kb = sum(len(t) for t in texts) / 1024
+    print(f"{len(texts)} agent turns ({source}), {total_kb:.0f} KB")
+
+    variants = {
+        "naive": patch.object(intent_detector, "_match_patterns", naive_match_patterns),
+        "compiled": patch.object(intent_detector, "_match_patterns", intent_detector._match_patterns),
+    }
+    outputs = {}
+    baseline = None
+    for name, patcher in variants.items():
+        best = None
+        with patcher:
+            for _ in range(args.repeat):
+                results, latencies = classify_all(texts)
+                if best is None or sum(latencies) < sum(best):
+                    best = latencies
+        outputs[name] = results
+        mean = statistics.fmean(best) * 1e6
+        p99 = sorted(best)[int(len(best) * 0.99) - 1 if len(best) > 1 else 0] * 1e6
+        baseline = baseline or mean
+        print(f"  {name:<9} mean {mean:8.1f} us/turn  p99 {p99:9.1f} us  (x{baseline / mean:.1f})")
+
+    mismatches = sum(a != b for a, b in zip(outputs["naive"], outputs["compiled"]))
+    if mismatches:
+        print(f"  {mismatches} turns classified differently", file=sys.stderr)
+        return 1
+    print("  classifications identical")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""Benchmark transcript decoding throughput over real Claude Code transcripts.
+
+Compares, in MB/s of transcript bytes:
+  json      - json.loads + TranscriptEntry for every line (previous behaviour)
+  backend   - the same with the JSON backend in use (orjson if installed)
+  tailer    - TranscriptTailer: peek, skip and lazy decoding
+  index     - TranscriptIndex: the read_transcript_file() path
+
+Usage:
+    bin/bench_transcript_decode.py [PATH ...] [--limit-mb N] [--repeat N]
+
+PATHs may be .jsonl files or directories searched recursively. Defaults to
+the Claude Code projects directory from config.yaml.
+"""
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root / "src"))
+
+from claude_headspace.config import get_claude_projects_path, load_config
+from claude_headspace.services import jsonl_decode
+from claude_headspace.services.transcript_reader import (
+    TranscriptEntry,
+    TranscriptIndex,
+    _extract_text,
+    _parse_jsonl_timestamp,
+)
+from claude_headspace.services.transcript_tailer import TranscriptTailer
+
+
+def find_transcripts(paths: list[str], limit_bytes: int) -> list[Path]:
+    files = []
+    for p in map(Path, paths):
+        files.extend(sorted(p.rglob("*.jsonl")) if p.is_dir() else [p])
+    files.sort(key=lambda f: f.stat().st_size, reverse=True)
+    selected, total = [], 0
+    for f in files:
+        if total >= limit_bytes:
+            break
+        selected.append(f)
+        total += f.stat().st_size
+    return selected
+
+
+def decode_all(loads, data: bytes) -> None:
+    for line in data.splitlines():
+        if not line.strip():
+            continue
+        try:
+            entry = loads(line)
+        except ValueError:
+            continue
+        role, text = _extract_text(entry)
+        TranscriptEntry(
+            type=entry.get("type", ""),
+            role=role,
+            content=text,
+            timestamp=_parse_jsonl_timestamp(entry),
+            raw_data=entry,
+        )
+
+
+def bench_json(files, contents):
+    for data in contents:
+        decode_all(json.loads, data)
+
+
+def bench_backend(files, contents):
+    for data in contents:
+        decode_all(jsonl_decode.loads, data)
+
+
+def bench_tailer(files, contents):
+    tailer = TranscriptTailer(max_retained_entries=1 << 40)
+    for f in files:
+        tailer.read_from(str(f), 0)
+
+
+def bench_index(files, contents):
+    for f in files:
+        index = TranscriptIndex(str(f))
+        # Index the whole file rather than the bootstrap tail
+        index._reset(f.stat().st_ino, 0)
+        with open(f, "rb") as fh:
+            index.refresh(fh)
+
+
+BENCHMARKS = {
+    "json": bench_json,
+    "backend": bench_backend,
+    "tailer": bench_tailer,
+    "index": bench_index,
+}
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("paths", nargs="*")
+    parser.add_argument("--limit-mb", type=float, default=256, help="Max transcript MB to load")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per benchmark (best is kept)")
+    args = parser.parse_args()
+
+    paths = args.paths or [get_claude_projects_path(load_config())]
+    files = find_transcripts(paths, int(args.limit_mb * 1024 * 1024))
+    if not files:
+        print("No transcripts found", file=sys.stderr)
+        return 1
+
+    contents = [f.read_bytes() for f in files]  # Also warms the page cache
+    total_mb = sum(len(c) for c in contents) / (1024 * 1024)
+    print(f"{len(files)} transcripts, {total_mb:.1f} MB, backend={jsonl_decode.BACKEND}")
+
+    baseline = None
+    for name, bench in BENCHMARKS.items():
+        best = min(_timed(bench, files, contents) for _ in range(args.repeat))
+        rate = total_mb / best if best else float("inf")
+        baseline = baseline or rate
+        print(f"  {name:<8} {rate:9.1f} MB/s  ({best * 1000:8.1f} ms, x{rate / baseline:.1f})")
+    return 0
+
+
+def _timed(bench, files, contents) -> float:
+    started = time.perf_counter()
+    bench(files, contents)
+    return time.perf_counter() - started
+
+
+if __name__ == "__main__":
+    sys.exit(main())
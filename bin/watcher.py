@@ -79,6 +79,7 @@ class WatcherProcess:
         self._file_watcher = FileWatcher(
             projects_path=projects_path,
             polling_interval=fw_config["polling_interval"],
+            reconciliation_interval=fw_config["reconciliation_interval"],
             inactivity_timeout=fw_config["inactivity_timeout"],
             debounce_interval=fw_config["debounce_interval"],
         )
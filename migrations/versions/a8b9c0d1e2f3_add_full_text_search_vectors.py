@@ -0,0 +1,64 @@
+"""add full-text search vectors to turns and tasks
+
+Revision ID: a8b9c0d1e2f3
+Revises: 33f6e08da6fd
+Create Date: 2026-10-18 09:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = 'a8b9c0d1e2f3'
+down_revision = '33f6e08da6fd'
+branch_labels = None
+depends_on = None
+
+# Copy of models/search_vector.py at the time of this migration
+MAX_INDEXED_CHARS = 200000
+
+SEARCH_COLUMNS = {
+    'turns': (('text', 'A'), ('summary', 'B')),
+    'tasks': (('instruction', 'A'), ('completion_summary', 'B')),
+}
+
+
+def _vector(columns, row):
+    return " || ".join(
+        f"setweight(to_tsvector('english', "
+        f"left(coalesce({row}.{column}, ''), {MAX_INDEXED_CHARS})), '{weight}')"
+        for column, weight in columns
+    )
+
+
+def upgrade():
+    for table, columns in SEARCH_COLUMNS.items():
+        op.add_column(table, sa.Column('search_vector', postgresql.TSVECTOR(), nullable=True))
+        op.execute(f"""
+            CREATE OR REPLACE FUNCTION {table}_search_vector_update() RETURNS trigger AS $$
+            BEGIN
+                NEW.search_vector := {_vector(columns, 'NEW')};
+                RETURN NEW;
+            END
+            $$ LANGUAGE plpgsql
+        """)
+        op.execute(f"""
+            CREATE TRIGGER {table}_search_vector_update
+            BEFORE INSERT OR UPDATE OF {', '.join(c for c, _ in columns)} ON {table}
+            FOR EACH ROW EXECUTE FUNCTION {table}_search_vector_update()
+        """)
+        # Backfill existing rows directly rather than through the trigger
+        op.execute(f"UPDATE {table} SET search_vector = {_vector(columns, table)}")
+        op.create_index(
+            f'ix_{table}_search_vector', table, ['search_vector'], postgresql_using='gin'
+        )
+
+
+def downgrade():
+    for table in SEARCH_COLUMNS:
+        op.drop_index(f'ix_{table}_search_vector', table_name=table)
+        op.execute(f"DROP TRIGGER IF EXISTS {table}_search_vector_update ON {table}")
+        op.execute(f"DROP FUNCTION IF EXISTS {table}_search_vector_update()")
+        op.drop_column(table, 'search_vector')
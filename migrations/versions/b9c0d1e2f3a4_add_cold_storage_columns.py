@@ -0,0 +1,77 @@
+"""add compressed cold storage columns
+
+Revision ID: b9c0d1e2f3a4
+Revises: a8b9c0d1e2f3
+Create Date: 2026-10-18 12:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b9c0d1e2f3a4'
+down_revision = 'a8b9c0d1e2f3'
+branch_labels = None
+depends_on = None
+
+COLD_COLUMNS = {
+    'turns': ('text',),
+    'tasks': ('full_command', 'full_output'),
+    'inference_calls': ('input_text',),
+}
+
+# Copy of models/search_vector.py at the time of this migration
+MAX_INDEXED_CHARS = 200000
+
+SUMMARY_VECTOR = (
+    f"setweight(to_tsvector('english', left(coalesce(NEW.summary, ''), {MAX_INDEXED_CHARS})), 'B')"
+)
+TURN_VECTOR = (
+    f"setweight(to_tsvector('english', left(coalesce(NEW.text, ''), {MAX_INDEXED_CHARS})), 'A') || "
+    + SUMMARY_VECTOR
+)
+
+
+def _turn_trigger_function(keep_archived):
+    # Archived text keeps its weight-A lexemes; the summary is re-indexed
+    keep = (
+        "IF TG_OP = 'UPDATE' AND (NEW.text_compressed IS NOT NULL) THEN "
+        "NEW.search_vector := coalesce(ts_filter(OLD.search_vector, '{a}'), ''::tsvector) || "
+        f"{SUMMARY_VECTOR}; RETURN NEW; END IF;"
+        if keep_archived else ""
+    )
+    return f"""
+        CREATE OR REPLACE FUNCTION turns_search_vector_update() RETURNS trigger AS $$
+        BEGIN
+            {keep}
+            NEW.search_vector := {TURN_VECTOR};
+            RETURN NEW;
+        END
+        $$ LANGUAGE plpgsql
+    """
+
+
+def upgrade():
+    for table, columns in COLD_COLUMNS.items():
+        for column in columns:
+            op.add_column(table, sa.Column(f'{column}_compressed', sa.LargeBinary(), nullable=True))
+    # Archiving blanks turns.text; keep the lexemes built from the original text
+    op.execute(_turn_trigger_function(keep_archived=True))
+
+
+def downgrade():
+    # Restoring compressed values needs the application codec; refuse to
+    # silently drop archived text.
+    for table, columns in COLD_COLUMNS.items():
+        for column in columns:
+            op.execute(
+                f"DO $$ BEGIN IF EXISTS (SELECT 1 FROM {table} "
+                f"WHERE {column}_compressed IS NOT NULL) THEN "
+                f"RAISE EXCEPTION '{table}.{column} has archived rows; "
+                f"decompress them before downgrading'; END IF; END $$"
+            )
+    op.execute(_turn_trigger_function(keep_archived=False))
+    for table, columns in COLD_COLUMNS.items():
+        for column in columns:
+            op.drop_column(table, f'{column}_compressed')
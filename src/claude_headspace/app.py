@@ -10,7 +10,7 @@ from pathlib import Path
 from flask import Flask, render_template, request, jsonify
 
 from . import __version__
-from .config import load_config, get_value, get_database_url, get_notifications_config
+from .config import load_config, get_value, get_database_url, get_notifications_config, get_claude_projects_path
 from .database import db, init_database
 
 
@@ -125,6 +125,48 @@ def create_app(config_path: str = "config.yaml") -> Flask:
     app.extensions["broadcaster"] = broadcaster
     logger.info("SSE broadcaster initialized")
 
+    # Initialize content-addressed blob store for large card fields
+    from .services.blob_store import BlobStore
+    app.extensions["blob_store"] = BlobStore(config=config)
+
+    # Initialize incrementally maintained priority ranking (recommended next)
+    from .services.priority_ranking import PriorityRanking
+    app.extensions["priority_ranking"] = PriorityRanking()
+
+    # Initialize incrementally maintained Kanban columns and status counters
+    from .services.kanban_index import KanbanIndex
+    app.extensions["kanban_index"] = KanbanIndex()
+
+    # Initialize rendered agent card fragment cache
+    from .services.fragment_cache import FragmentCache
+    app.extensions["fragment_cache"] = FragmentCache(config=config)
+
+    # Configure the intent classification cache shared by hooks and watchers
+    from .services.intent_detector import configure_intent_cache, intent_cache
+    configure_intent_cache(config)
+    app.extensions["intent_cache"] = intent_cache
+
+    # Load the local intent classifier consulted before the LLM fallback
+    from .services.intent_classifier import configure_intent_classifier
+    configure_intent_classifier(config)
+
+    # Configure how far back transcript readers scan for the current turn
+    from .services.transcript_reader import configure_transcript_reader
+    configure_transcript_reader(config)
+
+    # Initialize session id -> JSONL location index for the projects directory
+    from .services.session_index import SessionIndex
+    session_index = SessionIndex(get_claude_projects_path(config), config=config)
+    app.extensions["session_index"] = session_index
+
+    # Start watching on the first request rather than here: test fixtures set
+    # TESTING only after create_app() returns, and every started index holds
+    # an inotify instance until it is stopped.
+    @app.before_request
+    def start_session_index_once():
+        if not app.config.get("TESTING"):
+            session_index.start()
+
     # Initialize git metadata service
     from .services.git_metadata import GitMetadata
     git_metadata = GitMetadata()
@@ -143,10 +185,15 @@ def create_app(config_path: str = "config.yaml") -> Flask:
     else:
         logger.warning("Inference service initialized in degraded mode (no API key)")
 
+    # Batch concurrent summarisation calls into multi-item prompts
+    from .services.inference_batcher import InferenceBatcher
+    inference_batcher = InferenceBatcher(inference_service, config)
+    app.extensions["inference_batcher"] = inference_batcher
+
     # Initialize summarisation service
     from .services.summarisation_service import SummarisationService
     summarisation_service = SummarisationService(
-        inference_service=inference_service,
+        inference_service=inference_batcher,
         config=config,
     )
     app.extensions["summarisation_service"] = summarisation_service
@@ -269,6 +316,23 @@ def create_app(config_path: str = "config.yaml") -> Flask:
         reaper.start()
         app.extensions["agent_reaper"] = reaper
 
+    # Initialize cold storage tiering (only in non-testing environments, requires database)
+    if not app.config.get("TESTING") and db_connected:
+        from .services.cold_storage import ColdStorageService
+        cold_storage = ColdStorageService(app=app, config=config)
+        cold_storage.start()
+        app.extensions["cold_storage"] = cold_storage
+
+    # Initialize summarisation worker pool (only in non-testing environments, requires database)
+    if not app.config.get("TESTING") and db_connected:
+        from .services.summarisation_queue import SummarisationQueue
+        summarisation_queue = SummarisationQueue(
+            app=app, service=summarisation_service, config=config,
+        )
+        summarisation_queue.start()
+        summarisation_service.queue = summarisation_queue
+        app.extensions["summarisation_queue"] = summarisation_queue
+
     # Initialize context poller (only in non-testing environments, requires database)
     if not app.config.get("TESTING") and db_connected:
         from .services.context_poller import ContextPoller
@@ -328,7 +392,7 @@ def create_app(config_path: str = "config.yaml") -> Flask:
     def _get_background_thread_status():
         """Get the alive status of all background threads."""
         status = {}
-        for name in ("agent_reaper", "activity_aggregator", "file_watcher", "commander_availability", "context_poller"):
+        for name in ("agent_reaper", "activity_aggregator", "file_watcher", "commander_availability", "context_poller", "cold_storage"):
             svc = app.extensions.get(name)
             if svc is None:
                 status[name] = "disabled"
@@ -368,10 +432,16 @@ def create_app(config_path: str = "config.yaml") -> Flask:
                 app.extensions["activity_aggregator"].stop()
             if "file_watcher" in app.extensions:
                 app.extensions["file_watcher"].stop()
+            if "session_index" in app.extensions:
+                app.extensions["session_index"].stop()
             if "commander_availability" in app.extensions:
                 app.extensions["commander_availability"].stop()
             if "context_poller" in app.extensions:
                 app.extensions["context_poller"].stop()
+            if "cold_storage" in app.extensions:
+                app.extensions["cold_storage"].stop()
+            if "summarisation_queue" in app.extensions:
+                app.extensions["summarisation_queue"].stop()
             # Stop event writer to close database connections
             event_writer = app.extensions.get("event_writer")
             if event_writer:
@@ -461,6 +531,7 @@ def register_blueprints(app: Flask) -> None:
     from .routes.activity import activity_bp
     from .routes.agents import agents_bp
     from .routes.archive import archive_bp
+    from .routes.blobs import blobs_bp
     from .routes.brain_reboot import brain_reboot_bp
     from .routes.config import config_bp
     from .routes.dashboard import dashboard_bp
@@ -477,6 +548,7 @@ def register_blueprints(app: Flask) -> None:
     from .routes.progress_summary import progress_summary_bp
     from .routes.projects import projects_bp
     from .routes.respond import respond_bp
+    from .routes.search import search_bp
     from .routes.sessions import sessions_bp
     from .routes.sse import sse_bp
     from .routes.summarisation import summarisation_bp
@@ -486,6 +558,7 @@ def register_blueprints(app: Flask) -> None:
     app.register_blueprint(activity_bp)
     app.register_blueprint(agents_bp)
     app.register_blueprint(archive_bp)
+    app.register_blueprint(blobs_bp)
     app.register_blueprint(brain_reboot_bp)
     app.register_blueprint(config_bp)
     app.register_blueprint(dashboard_bp)
@@ -502,6 +575,7 @@ def register_blueprints(app: Flask) -> None:
     app.register_blueprint(progress_summary_bp)
     app.register_blueprint(projects_bp)
     app.register_blueprint(respond_bp)
+    app.register_blueprint(search_bp)
     app.register_blueprint(sessions_bp)
     app.register_blueprint(sse_bp)
     app.register_blueprint(summarisation_bp)
@@ -0,0 +1,541 @@
+"""
+Historical transcript backfill.
+
+Imports Claude Code transcripts that Headspace never saw live: every
+``<projects_path>/<encoded-project>/<session-id>.jsonl`` becomes a Project
+(created on demand), an ended Agent, one Task per user prompt and a Turn per
+text message.
+
+Transcripts are parsed in a process pool and loaded in batches with
+PostgreSQL ``COPY ... FROM STDIN`` (ids are reserved from the table
+sequences up front so agents, tasks and turns can reference each other
+without a round trip per row). After each batch commits, its files are
+recorded in a JSON checkpoint keyed by path, size and mtime, so an
+interrupted import resumes where it stopped and a rerun only picks up new or
+changed transcripts. Sessions already known to the database (by Claude
+session id) are never imported twice.
+"""
+
+import argparse
+import csv
+import io
+import json
+import logging
+import os
+import time
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+
+from ..services.project_decoder import decode_project_path
+from ..services.transcript_tailer import SKIPPED, LazyTranscriptEntry, parse_transcript_line
+
+logger = logging.getLogger(__name__)
+
+EXIT_SUCCESS = 0
+EXIT_ERROR = 1
+
+DEFAULT_BATCH_FILES = 50
+
+# Namespace for session UUIDs derived from transcripts whose file name is
+# not itself a UUID
+_SESSION_NAMESPACE = uuid.UUID("5b0f6c8e-3c1d-4f5e-9a57-6d1c2b8e4f10")
+
+CHECKPOINT_IMPORTED = "imported"
+CHECKPOINT_EXISTING = "existing"
+CHECKPOINT_EMPTY = "empty"
+
+
+@dataclass(frozen=True)
+class TranscriptFile:
+    """A transcript found on disk."""
+
+    path: str
+    folder: str
+    session_id: str
+    size: int
+    mtime: float
+
+
+@dataclass
+class ParsedTurn:
+    actor: str  # TurnActor name
+    intent: str  # TurnIntent name
+    text: str
+    timestamp: datetime
+    timestamp_source: str
+    content_hash: str
+
+
+@dataclass
+class ParsedTask:
+    started_at: datetime
+    completed_at: datetime
+    full_command: str | None
+    full_output: str | None = None
+    turns: list[ParsedTurn] = field(default_factory=list)
+
+
+@dataclass
+class ParsedSession:
+    """Everything the loader needs from one transcript."""
+
+    file: TranscriptFile
+    project_path: str
+    started_at: datetime | None = None
+    ended_at: datetime | None = None
+    tasks: list[ParsedTask] = field(default_factory=list)
+
+    @property
+    def turn_count(self) -> int:
+        return sum(len(task.turns) for task in self.tasks)
+
+
+def discover_transcripts(projects_path: str) -> list[TranscriptFile]:
+    """List top-level session transcripts under the projects directory.
+
+    Only ``<folder>/<session>.jsonl`` is considered; subagent transcripts in
+    nested directories belong to their parent session.
+    """
+    files = []
+    try:
+        folders = sorted(os.scandir(projects_path), key=lambda e: e.name)
+    except OSError:
+        return files
+    for folder in folders:
+        if not folder.is_dir(follow_symlinks=False):
+            continue
+        try:
+            entries = sorted(os.scandir(folder.path), key=lambda e: e.name)
+        except OSError:
+            continue
+        for entry in entries:
+            if not entry.name.endswith(".jsonl") or not entry.is_file():
+                continue
+            stat = entry.stat()
+            files.append(TranscriptFile(
+                path=entry.path,
+                folder=folder.name,
+                session_id=entry.name[: -len(".jsonl")],
+                size=stat.st_size,
+                mtime=stat.st_mtime,
+            ))
+    return files
+
+
+def parse_transcript(file: TranscriptFile) -> ParsedSession:
+    """Parse one transcript into tasks and turns.
+
+    Runs in a worker process. Every user prompt opens a task; assistant text
+    until the next prompt becomes its progress turns, and the last one is
+    the completion. The project path comes from the recorded ``cwd`` when
+    present, since decoded folder names are lossy for paths with dashes.
+    """
+    from ..services.transcript_reconciler import _content_hash
+
+    session = ParsedSession(file=file, project_path=decode_project_path(file.folder))
+    fallback_ts = datetime.fromtimestamp(file.mtime, tz=timezone.utc)
+    cwd = None
+    task = None
+    last_ts = None
+
+    with open(file.path, "rb") as f:
+        for raw in f:
+            raw = raw.strip()
+            if not raw:
+                continue
+            entry = parse_transcript_line(raw)
+            if entry is None or entry is SKIPPED:
+                continue
+            if entry.timestamp:
+                last_ts = entry.timestamp
+                session.started_at = session.started_at or entry.timestamp
+            if isinstance(entry, LazyTranscriptEntry):
+                continue
+            if cwd is None and isinstance(entry.raw_data.get("cwd"), str):
+                cwd = entry.raw_data["cwd"]
+
+            text = (entry.content or "").strip()
+            if not text or entry.raw_data.get("isMeta"):
+                continue
+            ts = entry.timestamp or last_ts or fallback_ts
+            actor = "user" if entry.role == "user" else "agent"
+
+            if actor == "user" or task is None:
+                task = ParsedTask(
+                    started_at=ts,
+                    completed_at=ts,
+                    full_command=text if actor == "user" else None,
+                )
+                session.tasks.append(task)
+            task.turns.append(ParsedTurn(
+                actor="USER" if actor == "user" else "AGENT",
+                intent="COMMAND" if actor == "user" else "PROGRESS",
+                text=text,
+                timestamp=ts,
+                timestamp_source="jsonl" if entry.timestamp else "server",
+                content_hash=_content_hash(actor, text),
+            ))
+            task.completed_at = max(task.completed_at, ts)
+
+    for task in session.tasks:
+        last = task.turns[-1]
+        if last.actor == "AGENT":
+            last.intent = "COMPLETION"
+            task.full_output = last.text
+
+    session.ended_at = last_ts or session.started_at
+    if cwd:
+        session.project_path = cwd
+    return session
+
+
+def _parse_worker(file: TranscriptFile) -> tuple[TranscriptFile, ParsedSession | None, str | None]:
+    """Process-pool entry point: never raises, so one bad file can't stop the pool."""
+    try:
+        return file, parse_transcript(file), None
+    except Exception as e:
+        return file, None, str(e)
+
+
+def session_uuid_for(session_id: str) -> uuid.UUID:
+    """Agent session UUID for a transcript (the file name when it is a UUID)."""
+    try:
+        return uuid.UUID(session_id)
+    except ValueError:
+        return uuid.uuid5(_SESSION_NAMESPACE, session_id)
+
+
+class BackfillCheckpoint:
+    """Per-file import progress, persisted as JSON.
+
+    A file is done while its size and mtime match what was recorded; a
+    transcript that has grown since is considered again.
+    """
+
+    def __init__(self, path: str | Path, resume: bool = True):
+        self.path = Path(path).expanduser()
+        self._files: dict[str, dict] = {}
+        if resume and self.path.exists():
+            try:
+                self._files = json.loads(self.path.read_text()).get("files", {})
+            except (OSError, ValueError) as e:
+                logger.warning(f"Ignoring unreadable backfill checkpoint {self.path}: {e}")
+
+    def __len__(self) -> int:
+        return len(self._files)
+
+    def is_done(self, file: TranscriptFile) -> bool:
+        record = self._files.get(file.path)
+        return (
+            record is not None
+            and record.get("size") == file.size
+            and record.get("mtime") == file.mtime
+        )
+
+    def mark(self, file: TranscriptFile, status: str) -> None:
+        self._files[file.path] = {"size": file.size, "mtime": file.mtime, "status": status}
+
+    def save(self) -> None:
+        """Write atomically so an interrupted save never loses earlier progress."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix(self.path.suffix + ".tmp")
+        tmp.write_text(json.dumps({"version": 1, "files": self._files}))
+        os.replace(tmp, self.path)
+
+
+class _CopyBuffer:
+    """CSV rows for one ``COPY table (columns) FROM STDIN``."""
+
+    def __init__(self, table: str, columns: tuple[str, ...]):
+        self.table = table
+        self.columns = columns
+        self.rows = 0
+        self._buf = io.StringIO()
+        self._writer = csv.writer(self._buf)
+
+    def add(self, *values) -> None:
+        # An unquoted empty field is NULL in COPY's CSV format
+        self._writer.writerow(
+            "" if v is None else v.isoformat() if isinstance(v, datetime) else v
+            for v in values
+        )
+        self.rows += 1
+
+    def copy(self, cursor) -> None:
+        if not self.rows:
+            return
+        self._buf.seek(0)
+        cursor.copy_expert(
+            f"COPY {self.table} ({', '.join(self.columns)}) FROM STDIN WITH (FORMAT csv)",
+            self._buf,
+        )
+
+
+class BackfillLoader:
+    """Bulk-loads parsed sessions over a psycopg2 connection.
+
+    The caller owns the transaction: call load() for a batch, then commit.
+    """
+
+    def __init__(self, conn):
+        self.conn = conn
+        with conn.cursor() as cur:
+            cur.execute("SELECT path, id, slug FROM projects")
+            rows = cur.fetchall()
+            self._projects = {path: project_id for path, project_id, _ in rows}
+            self._slugs = {slug for _, _, slug in rows}
+            cur.execute(
+                "SELECT claude_session_id, session_uuid FROM agents"
+            )
+            self._sessions: set[str] = set()
+            for claude_session_id, session_uuid in cur.fetchall():
+                if claude_session_id:
+                    self._sessions.add(claude_session_id)
+                self._sessions.add(str(session_uuid))
+
+    def is_known(self, session: ParsedSession) -> bool:
+        """True if the session is already in the database."""
+        return (
+            session.file.session_id in self._sessions
+            or str(session_uuid_for(session.file.session_id)) in self._sessions
+        )
+
+    def load(self, sessions: list[ParsedSession]) -> dict:
+        """COPY a batch of new sessions; returns counts of rows written."""
+        from ..models.project import generate_slug
+
+        sessions = [s for s in sessions if s.tasks and not self.is_known(s)]
+        counts = {"projects": 0, "agents": 0, "tasks": 0, "turns": 0}
+        if not sessions:
+            return counts
+
+        now = datetime.now(timezone.utc)
+        with self.conn.cursor() as cur:
+            for session in sessions:
+                if session.project_path in self._projects:
+                    continue
+                name = os.path.basename(session.project_path.rstrip("/")) or session.project_path
+                base_slug = slug = generate_slug(name)
+                counter = 2
+                while slug in self._slugs:
+                    slug = f"{base_slug}-{counter}"
+                    counter += 1
+                cur.execute(
+                    "INSERT INTO projects (name, slug, path, inference_paused, created_at) "
+                    "VALUES (%s, %s, %s, false, %s) RETURNING id",
+                    (name, slug, session.project_path, now),
+                )
+                self._projects[session.project_path] = cur.fetchone()[0]
+                self._slugs.add(slug)
+                counts["projects"] += 1
+
+            agent_ids = self._reserve_ids(cur, "agents", len(sessions))
+            task_ids = self._reserve_ids(cur, "tasks", sum(len(s.tasks) for s in sessions))
+            turn_ids = self._reserve_ids(cur, "turns", sum(s.turn_count for s in sessions))
+
+            agents = _CopyBuffer("agents", (
+                "id", "session_uuid", "claude_session_id", "project_id",
+                "started_at", "last_seen_at", "ended_at", "transcript_path",
+            ))
+            tasks = _CopyBuffer("tasks", (
+                "id", "agent_id", "state", "started_at", "completed_at",
+                "full_command", "full_output",
+            ))
+            turns = _CopyBuffer("turns", (
+                "id", "task_id", "actor", "intent", "text", "timestamp",
+                "timestamp_source", "jsonl_entry_hash",
+            ))
+
+            for session in sessions:
+                agent_id = next(agent_ids)
+                started_at = session.started_at or session.tasks[0].started_at
+                ended_at = session.ended_at or session.tasks[-1].completed_at
+                agents.add(
+                    agent_id, session_uuid_for(session.file.session_id),
+                    session.file.session_id, self._projects[session.project_path],
+                    started_at, ended_at, ended_at, session.file.path,
+                )
+                for task in session.tasks:
+                    task_id = next(task_ids)
+                    tasks.add(
+                        task_id, agent_id, "COMPLETE", task.started_at,
+                        task.completed_at, task.full_command, task.full_output,
+                    )
+                    for turn in task.turns:
+                        turns.add(
+                            next(turn_ids), task_id, turn.actor, turn.intent, turn.text,
+                            turn.timestamp, turn.timestamp_source, turn.content_hash,
+                        )
+                self._sessions.add(session.file.session_id)
+
+            for buffer in (agents, tasks, turns):
+                buffer.copy(cur)
+
+        counts["agents"] = agents.rows
+        counts["tasks"] = tasks.rows
+        counts["turns"] = turns.rows
+        return counts
+
+    @staticmethod
+    def _reserve_ids(cur, table: str, count: int):
+        """Take `count` ids from the table's sequence in one query."""
+        if not count:
+            return iter(())
+        cur.execute(
+            "SELECT nextval(pg_get_serial_sequence(%s, 'id')) FROM generate_series(1, %s)",
+            (table, count),
+        )
+        return iter(row[0] for row in cur.fetchall())
+
+
+@dataclass
+class BackfillReport:
+    files_found: int = 0
+    files_checkpointed: int = 0
+    files_parsed: int = 0
+    files_existing: int = 0
+    files_empty: int = 0
+    files_failed: int = 0
+    bytes_parsed: int = 0
+    projects: int = 0
+    agents: int = 0
+    tasks: int = 0
+    turns: int = 0
+    elapsed: float = 0.0
+
+    def add_counts(self, counts: dict) -> None:
+        for key, value in counts.items():
+            setattr(self, key, getattr(self, key) + value)
+
+    def format(self) -> str:
+        elapsed = self.elapsed or 1e-9
+        mb = self.bytes_parsed / (1024 * 1024)
+        return "\n".join([
+            f"Transcripts: {self.files_found} found, {self.files_checkpointed} already done, "
+            f"{self.files_parsed} parsed ({self.files_existing} already known, "
+            f"{self.files_empty} empty, {self.files_failed} failed)",
+            f"Imported: {self.projects} projects, {self.agents} agents, "
+            f"{self.tasks} tasks, {self.turns} turns",
+            f"Throughput: {mb:.1f} MB in {self.elapsed:.1f}s "
+            f"({mb / elapsed:.1f} MB/s, {self.turns / elapsed:.0f} turns/s)",
+        ])
+
+
+def run_backfill(
+    files: list[TranscriptFile],
+    checkpoint: BackfillCheckpoint,
+    loader: BackfillLoader | None,
+    workers: int | None = None,
+    batch_files: int = DEFAULT_BATCH_FILES,
+) -> BackfillReport:
+    """Parse and load transcripts not yet in the checkpoint.
+
+    With no loader (dry run) transcripts are parsed and counted only and the
+    checkpoint is left untouched.
+    """
+    report = BackfillReport(files_found=len(files))
+    pending = [f for f in files if not checkpoint.is_done(f)]
+    report.files_checkpointed = len(files) - len(pending)
+    # Largest first so one huge transcript doesn't finish last on its own
+    pending.sort(key=lambda f: f.size, reverse=True)
+    started = time.perf_counter()
+
+    batch: list[ParsedSession] = []
+    done: list[tuple[TranscriptFile, str]] = []
+
+    def flush():
+        if loader is not None and (batch or done):
+            try:
+                report.add_counts(loader.load(batch))
+                loader.conn.commit()
+            except Exception:
+                loader.conn.rollback()
+                raise
+            for session in batch:
+                checkpoint.mark(session.file, CHECKPOINT_IMPORTED)
+            for file, status in done:
+                checkpoint.mark(file, status)
+            checkpoint.save()
+        batch.clear()
+        done.clear()
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for file, session, error in pool.map(_parse_worker, pending, chunksize=4):
+            report.files_parsed += 1
+            report.bytes_parsed += file.size
+            if error is not None:
+                report.files_failed += 1
+                logger.warning(f"Failed to parse {file.path}: {error}")
+                continue
+            if not session.tasks:
+                report.files_empty += 1
+                done.append((file, CHECKPOINT_EMPTY))
+            elif loader is not None and loader.is_known(session):
+                report.files_existing += 1
+                done.append((file, CHECKPOINT_EXISTING))
+            else:
+                batch.append(session)
+                if loader is None:
+                    report.agents += 1
+                    report.tasks += len(session.tasks)
+                    report.turns += session.turn_count
+            if len(batch) + len(done) >= batch_files:
+                flush()
+        flush()
+
+    report.elapsed = time.perf_counter() - started
+    return report
+
+
+def cmd_backfill(args: argparse.Namespace) -> int:
+    """
+    Handle the 'backfill' command.
+
+    Args:
+        args: Parsed command line arguments
+
+    Returns:
+        Exit code
+    """
+    from ..config import get_claude_projects_path, get_database_url, load_config
+
+    config = load_config(args.config)
+    projects_path = os.path.expanduser(args.projects_path or get_claude_projects_path(config))
+    files = discover_transcripts(projects_path)
+    if not files:
+        print(f"No transcripts found in {projects_path}")
+        return EXIT_SUCCESS
+
+    checkpoint = BackfillCheckpoint(args.checkpoint, resume=not args.restart)
+
+    conn = None
+    loader = None
+    if not args.dry_run:
+        from sqlalchemy import create_engine
+
+        try:
+            engine = create_engine(get_database_url(config))
+            conn = engine.raw_connection()
+            loader = BackfillLoader(conn)
+        except Exception as e:
+            print(f"Error: cannot connect to the database: {e}")
+            return EXIT_ERROR
+
+    print(f"Backfilling {len(files)} transcripts from {projects_path}")
+    try:
+        report = run_backfill(
+            files, checkpoint, loader,
+            workers=args.workers, batch_files=args.batch_files,
+        )
+    except KeyboardInterrupt:
+        print(f"\nInterrupted; progress saved to {checkpoint.path}")
+        return EXIT_ERROR
+    finally:
+        if conn is not None:
+            conn.close()
+
+    print(report.format())
+    return EXIT_SUCCESS
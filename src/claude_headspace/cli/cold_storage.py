@@ -0,0 +1,51 @@
+"""
+Cold storage command.
+
+Runs one tiering pass of services/cold_storage.py on demand (or a dry run)
+against the configured database and prints its report.
+"""
+
+import argparse
+
+from ..services.cold_storage import ColdStorageService
+
+EXIT_SUCCESS = 0
+EXIT_ERROR = 1
+
+
+def cmd_cold_storage(args: argparse.Namespace) -> int:
+    """
+    Handle the 'cold-storage' command: run one tiering pass and print its report.
+
+    Args:
+        args: Parsed command line arguments
+
+    Returns:
+        Exit code
+    """
+    from sqlalchemy import create_engine
+    from sqlalchemy.orm import Session
+
+    from ..config import get_database_url, load_config
+
+    config = load_config(args.config)
+    if args.after_days is not None:
+        config = {
+            **config,
+            "cold_storage": {**config.get("cold_storage", {}), "after_days": args.after_days},
+        }
+    service = ColdStorageService(app=None, config=config)
+
+    try:
+        engine = create_engine(get_database_url(config))
+        with Session(engine) as session:
+            report = service.run_once(dry_run=args.dry_run, session=session)
+    except KeyboardInterrupt:
+        print("\nInterrupted; batches already committed stay compressed")
+        return EXIT_ERROR
+    except Exception as e:
+        print(f"Error: cold storage pass failed: {e}")
+        return EXIT_ERROR
+
+    print(report.format())
+    return EXIT_SUCCESS
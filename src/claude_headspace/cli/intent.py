@@ -0,0 +1,152 @@
+"""
+Intent corpus commands.
+
+Front ends for services/intent_evaluation.py and
+services/intent_classifier.py: export stored turns as a labelled corpus,
+replay a corpus through the detectors to report accuracy, pattern CPU time
+and backtracking probes, and retrain the local intent classifier.
+"""
+
+import argparse
+import logging
+
+from ..models.turn import TurnActor
+from ..services.intent_classifier import DEFAULT_MIN_CONFIDENCE, train_classifier
+from ..services.intent_evaluation import (
+    PROBE_LARGE,
+    PROBE_SMALL,
+    evaluate,
+    export_corpus,
+    find_pathological,
+    profile_patterns,
+    read_corpus,
+    write_corpus,
+)
+
+EXIT_SUCCESS = 0
+EXIT_ERROR = 1
+
+
+def cmd_intent_export(args: argparse.Namespace) -> int:
+    """
+    Handle the 'intent-export' command: write stored turns as a corpus.
+
+    Args:
+        args: Parsed command line arguments
+
+    Returns:
+        Exit code
+    """
+    from sqlalchemy import create_engine
+    from sqlalchemy.orm import Session
+
+    from ..config import get_database_url, load_config
+
+    config = load_config(args.config)
+    actor = TurnActor(args.actor) if args.actor else None
+    try:
+        engine = create_engine(get_database_url(config))
+        with Session(engine) as session:
+            count = write_corpus(export_corpus(session, actor=actor, limit=args.limit), args.output)
+    except Exception as e:
+        print(f"Error: corpus export failed: {e}")
+        return EXIT_ERROR
+
+    print(f"Wrote {count} labelled turns to {args.output}")
+    return EXIT_SUCCESS
+
+
+def cmd_intent_eval(args: argparse.Namespace) -> int:
+    """
+    Handle the 'intent-eval' command: accuracy, pattern timing, backtracking.
+
+    Args:
+        args: Parsed command line arguments
+
+    Returns:
+        Exit code (non-zero when accuracy is below --min-accuracy or a
+        pathological pattern is found)
+    """
+    logging.getLogger("claude_headspace.services.intent_detector").setLevel(logging.WARNING)
+    try:
+        entries = read_corpus(args.corpus)
+    except OSError as e:
+        print(f"Error: cannot read corpus: {e}")
+        return EXIT_ERROR
+
+    exit_code = EXIT_SUCCESS
+    reports = evaluate(entries)
+    for report in reports.values():
+        print(report.format())
+        if report.total and args.min_accuracy is not None and report.accuracy < args.min_accuracy:
+            print(f"  accuracy below {args.min_accuracy:.1%}")
+            exit_code = EXIT_ERROR
+
+    if args.profile:
+        texts = [e.text for e in entries if e.actor == TurnActor.AGENT.value]
+        print(f"\nPattern CPU time over {len(texts)} agent texts (slowest {args.top}):")
+        for t in profile_patterns(texts)[: args.top]:
+            print(f"  {t.seconds * 1000:9.2f} ms  {t.matches:6d} matches  {t.list_name}: {t.pattern[:70]}")
+
+    if args.backtracking:
+        findings = find_pathological()
+        print(f"\nBacktracking probes ({PROBE_SMALL} -> {PROBE_LARGE} chars):")
+        if not findings:
+            print("  no pathological patterns")
+        for f in findings:
+            print(
+                f"  x{f.growth:5.1f}  {f.large_seconds * 1000:8.1f} ms  "
+                f"{f.list_name}: {f.pattern[:60]}  (input: {f.input_name})"
+            )
+        if findings:
+            exit_code = EXIT_ERROR
+
+    return exit_code
+
+
+def cmd_intent_train(args: argparse.Namespace) -> int:
+    """
+    Handle the 'intent-train' command: retrain the local classifier.
+
+    Args:
+        args: Parsed command line arguments
+
+    Returns:
+        Exit code
+    """
+    from ..config import load_config
+
+    logging.getLogger("claude_headspace.services.intent_detector").setLevel(logging.WARNING)
+    config = load_config(args.config)
+    try:
+        if args.corpus:
+            entries = read_corpus(args.corpus)
+        else:
+            from sqlalchemy import create_engine
+            from sqlalchemy.orm import Session
+
+            from ..config import get_database_url
+
+            engine = create_engine(get_database_url(config))
+            with Session(engine) as session:
+                entries = list(export_corpus(session, actor=TurnActor.AGENT))
+    except Exception as e:
+        print(f"Error: cannot load training turns: {e}")
+        return EXIT_ERROR
+
+    min_confidence = config.get("intent_classifier", {}).get("min_confidence", DEFAULT_MIN_CONFIDENCE)
+    try:
+        classifier, report = train_classifier(
+            entries, holdout=args.holdout, epochs=args.epochs, min_confidence=min_confidence,
+        )
+    except ValueError as e:
+        print(f"Error: {e}")
+        return EXIT_ERROR
+
+    output = args.output or config.get("intent_classifier", {}).get("model_path")
+    classifier.save(output)
+    print(f"Trained intent classifier {classifier.version} on "
+          f"{classifier.metadata['train_examples']} turns -> {output} "
+          f"({classifier.metadata['untrusted_excluded']} unverified labels excluded)")
+    print(report.format())
+    return EXIT_SUCCESS
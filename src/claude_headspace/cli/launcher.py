@@ -635,6 +635,175 @@ def create_parser() -> argparse.ArgumentParser:
         help="Additional arguments to pass to claude (use -- to separate)",
     )
 
+    # 'backfill' command
+    backfill_parser = subparsers.add_parser(
+        "backfill",
+        help="Import existing Claude Code transcripts into the database",
+    )
+    backfill_parser.add_argument(
+        "--config",
+        default="config.yaml",
+        help="Path to config.yaml (default: ./config.yaml)",
+    )
+    backfill_parser.add_argument(
+        "--projects-path",
+        default=None,
+        dest="projects_path",
+        help="Claude Code projects directory (default: claude.projects_path from config)",
+    )
+    backfill_parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Parser processes (default: CPU count)",
+    )
+    backfill_parser.add_argument(
+        "--batch-files",
+        type=int,
+        default=50,
+        dest="batch_files",
+        help="Transcripts loaded per transaction (default: 50)",
+    )
+    backfill_parser.add_argument(
+        "--checkpoint",
+        default="~/.claude-headspace/backfill-checkpoint.json",
+        help="Progress file used to resume an interrupted import",
+    )
+    backfill_parser.add_argument(
+        "--restart",
+        action="store_true",
+        default=False,
+        help="Ignore the existing checkpoint and consider every transcript",
+    )
+    backfill_parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        default=False,
+        dest="dry_run",
+        help="Parse transcripts and report counts without writing anything",
+    )
+
+    # 'cold-storage' command
+    cold_parser = subparsers.add_parser(
+        "cold-storage",
+        help="Compress the text of long-ended agents and report space reclaimed",
+    )
+    cold_parser.add_argument(
+        "--config",
+        default="config.yaml",
+        help="Path to config.yaml (default: ./config.yaml)",
+    )
+    cold_parser.add_argument(
+        "--after-days",
+        type=int,
+        default=None,
+        dest="after_days",
+        help="Compress agents ended more than this many days ago (default: cold_storage.after_days from config)",
+    )
+    cold_parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        default=False,
+        dest="dry_run",
+        help="Report what would be compressed without writing anything",
+    )
+
+    # 'intent-export' command
+    export_parser = subparsers.add_parser(
+        "intent-export",
+        help="Export stored turns with their intents as a labelled JSONL corpus",
+    )
+    export_parser.add_argument(
+        "--config",
+        default="config.yaml",
+        help="Path to config.yaml (default: ./config.yaml)",
+    )
+    export_parser.add_argument(
+        "--output",
+        default="intent-corpus.jsonl",
+        help="Corpus file to write (default: ./intent-corpus.jsonl)",
+    )
+    export_parser.add_argument(
+        "--actor",
+        choices=["user", "agent"],
+        default=None,
+        help="Only export turns by this actor (default: both)",
+    )
+    export_parser.add_argument(
+        "--limit",
+        type=int,
+        default=None,
+        help="Maximum number of turns to export",
+    )
+
+    # 'intent-eval' command
+    eval_parser = subparsers.add_parser(
+        "intent-eval",
+        help="Measure intent detection accuracy and pattern cost over a corpus",
+    )
+    eval_parser.add_argument(
+        "corpus",
+        help="Labelled JSONL corpus (see intent-export)",
+    )
+    eval_parser.add_argument(
+        "--profile",
+        action="store_true",
+        default=False,
+        help="Report per-pattern CPU time over the corpus",
+    )
+    eval_parser.add_argument(
+        "--top",
+        type=int,
+        default=15,
+        help="Number of slowest patterns to list with --profile (default: 15)",
+    )
+    eval_parser.add_argument(
+        "--backtracking",
+        action="store_true",
+        default=False,
+        help="Probe every pattern with adversarial inputs and flag superlinear ones",
+    )
+    eval_parser.add_argument(
+        "--min-accuracy",
+        type=float,
+        default=None,
+        dest="min_accuracy",
+        help="Exit non-zero when a detector's accuracy is below this fraction",
+    )
+
+    # 'intent-train' command
+    train_parser = subparsers.add_parser(
+        "intent-train",
+        help="Retrain the local intent classifier from stored turns",
+    )
+    train_parser.add_argument(
+        "--config",
+        default="config.yaml",
+        help="Path to config.yaml (default: ./config.yaml)",
+    )
+    train_parser.add_argument(
+        "--corpus",
+        default=None,
+        help="Train from a corpus file instead of the database (see intent-export)",
+    )
+    train_parser.add_argument(
+        "--output",
+        default=None,
+        help="Model file to write (default: intent_classifier.model_path from config)",
+    )
+    train_parser.add_argument(
+        "--epochs",
+        type=int,
+        default=8,
+        help="Training passes over the data (default: 8)",
+    )
+    train_parser.add_argument(
+        "--holdout",
+        type=float,
+        default=0.2,
+        help="Fraction of turns held out for the evaluation report (default: 0.2)",
+    )
+
     return parser
 
 
@@ -679,6 +848,26 @@ def main(args: list[str] | None = None) -> int:
 
     if parsed.command == "start":
         return cmd_start(parsed)
+    elif parsed.command == "backfill":
+        from .backfill import cmd_backfill
+
+        return cmd_backfill(parsed)
+    elif parsed.command == "cold-storage":
+        from .cold_storage import cmd_cold_storage
+
+        return cmd_cold_storage(parsed)
+    elif parsed.command == "intent-export":
+        from .intent import cmd_intent_export
+
+        return cmd_intent_export(parsed)
+    elif parsed.command == "intent-eval":
+        from .intent import cmd_intent_eval
+
+        return cmd_intent_eval(parsed)
+    elif parsed.command == "intent-train":
+        from .intent import cmd_intent_train
+
+        return cmd_intent_train(parsed)
     elif parsed.command is None:
         parser.print_help()
         return EXIT_SUCCESS
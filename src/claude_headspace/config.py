@@ -93,6 +93,7 @@ DEFAULTS = {
     "openrouter": {
         "base_url": "https://openrouter.ai/api/v1",
         "timeout": 30,
+        "pool_size": 10,  # Keep-alive HTTP connections to OpenRouter
         "models": {
             "turn": "anthropic/claude-haiku-4.5",
             "task": "anthropic/claude-haiku-4.5",
@@ -102,10 +103,33 @@ DEFAULTS = {
         "rate_limits": {
             "calls_per_minute": 30,
             "tokens_per_minute": 50000,
+            # Seconds a call may queue for capacity before it is dropped
+            "max_wait_seconds": {
+                "interactive": 5,
+                "normal": 30,
+                "background": 60,
+            },
+            "interactive_reserve": 0.2,  # Call capacity background work leaves free
         },
         "cache": {
             "enabled": True,
             "ttl_seconds": 300,
+            "max_entries": 500,
+            "persistent": True,
+            "persistent_ttl_seconds": 86400,
+            "purpose_ttl_seconds": {
+                "summarise_turn": 604800,
+                "summarise_task": 604800,
+                "summarise_instruction": 604800,
+                "summarise_permission": 604800,
+                "priority_scoring": 0,
+                "progress_summary": 0,
+            },
+        },
+        "batching": {
+            "enabled": True,
+            "window_ms": 150,  # How long the first summary waits for others to join
+            "max_items": 8,
         },
         "priority_scoring": {
             "debounce_seconds": 5.0,
@@ -141,6 +165,44 @@ DEFAULTS = {
         "stale_processing_seconds": 600,
         "active_timeout_minutes": 5,
     },
+    "blob_store": {
+        "inline_threshold_bytes": 2048,
+        "max_bytes": 33554432,  # 32MB
+    },
+    "fragment_cache": {
+        "enabled": True,
+        "max_bytes": 8388608,  # 8MB
+    },
+    "intent_cache": {
+        "enabled": True,
+        "max_entries": 2048,
+        "inference_ttl_seconds": 600,  # How long LLM fallback classifications are reused
+    },
+    "intent_classifier": {
+        "enabled": True,
+        "model_path": "~/.claude-headspace/intent-classifier.json",  # Written by `claude-headspace intent-train`
+        "min_confidence": 0.8,  # Below this the LLM fallback is asked instead
+    },
+    "transcript": {
+        "reverse_scan_initial_bytes": 65536,  # 64KB
+        "reverse_scan_max_bytes": 16777216,  # 16MB
+    },
+    "session_index": {
+        "enabled": True,
+        "scan_workers": 8,
+    },
+    "cold_storage": {
+        "enabled": True,
+        "after_days": 30,  # Compress text of agents ended longer ago than this
+        "min_bytes": 1024,  # Leave shorter values uncompressed
+        "batch_size": 500,
+        "interval_hours": 24,
+    },
+    "summarisation_queue": {
+        "enabled": True,
+        "workers": 4,  # Concurrent post-commit summaries (batched together)
+        "max_queued": 256,  # Beyond this, hooks summarise inline
+    },
     "reaper": {
         "enabled": True,
         "interval_seconds": 60,
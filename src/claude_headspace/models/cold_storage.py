@@ -0,0 +1,109 @@
+"""Compressed cold storage for large text columns.
+
+Old transcripts dominate the database: turn text, task output and inference
+prompts are kept raw forever but are rarely read once their agent has ended.
+The tiering job (services/cold_storage.py) moves such values into a sibling
+``<column>_compressed`` bytea column and blanks the raw column (``''`` for
+NOT NULL columns, NULL otherwise).
+
+Reads stay transparent for ORM instances: a load/refresh listener decompresses
+the blob into the raw attribute as committed state, so nothing is marked dirty
+and no UPDATE is issued. Column-level queries must select the compressed
+column too and pass both to cold_value().
+
+Blobs carry a one-byte codec prefix: zstandard when it is installed, zlib
+otherwise. Either codec can be read back as long as its library is present.
+"""
+
+import zlib
+
+from sqlalchemy import event
+from sqlalchemy.orm.attributes import set_committed_value
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - depends on the environment
+    zstandard = None
+
+ZSTD_PREFIX = b"Z"
+ZLIB_PREFIX = b"D"
+
+ZSTD_LEVEL = 9
+ZLIB_LEVEL = 6
+
+CODEC = "zstd" if zstandard is not None else "zlib"
+
+_DECODE_ERRORS = (zlib.error, UnicodeDecodeError) + (
+    (zstandard.ZstdError,) if zstandard is not None else ()
+)
+
+
+class ColdStorageError(ValueError):
+    """A compressed value cannot be decoded."""
+
+
+def compress_text(text: str) -> bytes:
+    """Compress a text value into a prefixed blob."""
+    raw = text.encode("utf-8")
+    if zstandard is not None:
+        return ZSTD_PREFIX + zstandard.ZstdCompressor(level=ZSTD_LEVEL).compress(raw)
+    return ZLIB_PREFIX + zlib.compress(raw, ZLIB_LEVEL)
+
+
+def decompress_text(blob: bytes) -> str:
+    """Decode a blob written by compress_text()."""
+    blob = bytes(blob)
+    prefix, body = blob[:1], blob[1:]
+    try:
+        if prefix == ZLIB_PREFIX:
+            return zlib.decompress(body).decode("utf-8")
+        if prefix == ZSTD_PREFIX:
+            if zstandard is None:
+                raise ColdStorageError("zstd-compressed value but zstandard is not installed")
+            return zstandard.ZstdDecompressor().decompress(body).decode("utf-8")
+    except _DECODE_ERRORS as e:
+        raise ColdStorageError(f"Corrupt compressed value: {e}") from e
+    raise ColdStorageError(f"Unknown compression codec {prefix!r}")
+
+
+def cold_value(value: str | None, blob: bytes | None) -> str | None:
+    """The logical value of a (raw, compressed) column pair."""
+    return decompress_text(blob) if blob is not None else value
+
+
+def install_cold_storage(model, columns: tuple[tuple[str, str | None], ...]) -> None:
+    """Decompress tiered columns of `model` transparently.
+
+    Args:
+        model: Mapped class with a ``<column>_compressed`` attribute per column
+        columns: (column, placeholder) pairs; placeholder is what the raw
+            column holds once its value has been moved to cold storage
+    """
+    def _decompress(target, attrs=None):
+        state = target.__dict__
+        for column, _ in columns:
+            compressed = f"{column}_compressed"
+            if attrs is not None and column not in attrs and compressed not in attrs:
+                continue
+            blob = state.get(compressed)
+            if blob is not None:
+                set_committed_value(target, column, decompress_text(blob))
+
+    @event.listens_for(model, "load")
+    def _on_load(target, context):
+        _decompress(target)
+
+    @event.listens_for(model, "refresh")
+    def _on_refresh(target, context, attrs):
+        _decompress(target, attrs)
+
+    for column, _ in columns:
+        compressed = f"{column}_compressed"
+
+        # Writing the raw value makes it hot again
+        def _on_set(target, value, oldvalue, initiator, compressed=compressed):
+            if target.__dict__.get(compressed) is not None:
+                setattr(target, compressed, None)
+            return value
+
+        event.listen(getattr(model, column), "set", _on_set, retval=True)
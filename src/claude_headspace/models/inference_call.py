@@ -3,10 +3,11 @@
 import enum
 from datetime import datetime, timezone
 
-from sqlalchemy import CheckConstraint, DateTime, Float, ForeignKey, Index, Integer, String, Text
+from sqlalchemy import CheckConstraint, DateTime, Float, ForeignKey, Index, Integer, LargeBinary, String, Text
 from sqlalchemy.orm import Mapped, mapped_column
 
 from ..database import db
+from .cold_storage import install_cold_storage
 
 
 class InferenceLevel(str, enum.Enum):
@@ -45,6 +46,8 @@ class InferenceCall(db.Model):
     output_tokens: Mapped[int | None] = mapped_column(Integer, nullable=True)
     input_hash: Mapped[str | None] = mapped_column(String(64), nullable=True, index=True)
     input_text: Mapped[str | None] = mapped_column(Text, nullable=True)
+    # Cold storage: compressed input_text of old calls, see models/cold_storage.py
+    input_text_compressed: Mapped[bytes | None] = mapped_column(LargeBinary, nullable=True)
     result_text: Mapped[str | None] = mapped_column(Text, nullable=True)
     latency_ms: Mapped[int | None] = mapped_column(Integer, nullable=True)
     cost: Mapped[float | None] = mapped_column(Float, nullable=True)
@@ -74,3 +77,7 @@ class InferenceCall(db.Model):
 # Composite indexes for common query patterns
 Index("ix_inference_calls_level_timestamp", InferenceCall.level, InferenceCall.timestamp)
 Index("ix_inference_calls_model_timestamp", InferenceCall.model, InferenceCall.timestamp)
+
+# Columns the cold storage tiering job compresses: (column, placeholder)
+INFERENCE_CALL_COLD_COLUMNS = (("input_text", None),)
+install_cold_storage(InferenceCall, INFERENCE_CALL_COLD_COLUMNS)
@@ -0,0 +1,86 @@
+"""Trigger-maintained tsvector columns for full-text search.
+
+Each searchable table gets a ``search_vector`` column filled by a BEFORE
+INSERT/UPDATE trigger from a weighted set of text columns, plus a GIN index.
+The DDL is attached to the table so ``metadata.create_all`` (tests, fresh
+databases) installs it too; migrations carry a copy of the same SQL.
+"""
+
+from sqlalchemy import DDL, Index, event
+
+# Search configuration used for both indexing and querying
+SEARCH_CONFIG = "english"
+
+# to_tsvector() fails on documents over ~1MB of lexemes; only the leading part
+# of very long texts (pasted logs, full file dumps) is indexed.
+MAX_INDEXED_CHARS = 200_000
+
+
+def search_vector_expression(weighted_columns: tuple[tuple[str, str], ...], row: str = "NEW") -> str:
+    """SQL building the weighted tsvector for one row."""
+    return " || ".join(
+        f"setweight(to_tsvector('{SEARCH_CONFIG}', "
+        f"left(coalesce({row}.{column}, ''), {MAX_INDEXED_CHARS})), '{weight}')"
+        for column, weight in weighted_columns
+    )
+
+
+def search_trigger_ddl(
+    table: str,
+    weighted_columns: tuple[tuple[str, str], ...],
+    keep_when: str | None = None,
+    kept_columns: tuple[str, ...] | None = None,
+) -> list[str]:
+    """Statements creating the trigger function and trigger for a table.
+
+    `keep_when` is an SQL condition on NEW under which an UPDATE keeps the
+    lexemes of `kept_columns` (default: all) from the existing vector, e.g.
+    the text was moved to cold storage. The other columns are re-indexed, so
+    later edits to them are still searchable. Kept columns must not share a
+    weight with re-indexed ones (lexemes are kept by weight).
+    """
+    columns = ", ".join(column for column, _ in weighted_columns)
+    keep = ""
+    if keep_when:
+        kept = set(kept_columns) if kept_columns is not None else {c for c, _ in weighted_columns}
+        kept_weights = ",".join(sorted({w.lower() for c, w in weighted_columns if c in kept}))
+        reindexed = tuple((c, w) for c, w in weighted_columns if c not in kept)
+        vector = f"coalesce(ts_filter(OLD.search_vector, '{{{kept_weights}}}'), ''::tsvector)"
+        if reindexed:
+            vector += f" || {search_vector_expression(reindexed)}"
+        keep = (
+            f"IF TG_OP = 'UPDATE' AND ({keep_when}) THEN "
+            f"NEW.search_vector := {vector}; RETURN NEW; END IF;"
+        )
+    return [
+        f"""
+        CREATE OR REPLACE FUNCTION {table}_search_vector_update() RETURNS trigger AS $$
+        BEGIN
+            {keep}
+            NEW.search_vector := {search_vector_expression(weighted_columns)};
+            RETURN NEW;
+        END
+        $$ LANGUAGE plpgsql
+        """,
+        f"DROP TRIGGER IF EXISTS {table}_search_vector_update ON {table}",
+        f"""
+        CREATE TRIGGER {table}_search_vector_update
+        BEFORE INSERT OR UPDATE OF {columns} ON {table}
+        FOR EACH ROW EXECUTE FUNCTION {table}_search_vector_update()
+        """,
+    ]
+
+
+def install_search_vector(
+    model,
+    weighted_columns: tuple[tuple[str, str], ...],
+    keep_when: str | None = None,
+    kept_columns: tuple[str, ...] | None = None,
+) -> None:
+    """Add the GIN index and attach the trigger DDL to a model's table."""
+    table = model.__table__
+    Index(f"ix_{table.name}_search_vector", model.search_vector, postgresql_using="gin")
+    for statement in search_trigger_ddl(table.name, weighted_columns, keep_when, kept_columns):
+        event.listen(
+            table, "after_create", DDL(statement).execute_if(dialect="postgresql")
+        )
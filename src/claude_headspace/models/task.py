@@ -3,10 +3,13 @@
 import enum
 from datetime import datetime, timezone
 
-from sqlalchemy import DateTime, Enum, ForeignKey, Index, String, Text
+from sqlalchemy import DateTime, Enum, ForeignKey, Index, LargeBinary, String, Text
+from sqlalchemy.dialects.postgresql import TSVECTOR
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from ..database import db
+from .cold_storage import install_cold_storage
+from .search_vector import install_search_vector
 
 
 class TaskState(enum.Enum):
@@ -53,10 +56,17 @@ class Task(db.Model):
     )
     full_command: Mapped[str | None] = mapped_column(Text, nullable=True)
     full_output: Mapped[str | None] = mapped_column(Text, nullable=True)
+    # Cold storage: compressed full_command/full_output of old tasks, see models/cold_storage.py
+    full_command_compressed: Mapped[bytes | None] = mapped_column(LargeBinary, nullable=True)
+    full_output_compressed: Mapped[bytes | None] = mapped_column(LargeBinary, nullable=True)
     plan_file_path: Mapped[str | None] = mapped_column(String(1024), nullable=True)
     plan_content: Mapped[str | None] = mapped_column(Text, nullable=True)
     plan_approved_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
 
+    # Full-text search over instruction + completion summary, maintained by
+    # a database trigger
+    search_vector = mapped_column(TSVECTOR, nullable=True, deferred=True)
+
     # Relationships
     agent: Mapped["Agent"] = relationship("Agent", back_populates="tasks")
     turns: Mapped[list["Turn"]] = relationship(
@@ -92,3 +102,11 @@ class Task(db.Model):
 
 # Additional indexes
 Index("ix_tasks_agent_id_state", Task.agent_id, Task.state)
+
+# Weighted columns feeding Task.search_vector
+TASK_SEARCH_COLUMNS = (("instruction", "A"), ("completion_summary", "B"))
+install_search_vector(Task, TASK_SEARCH_COLUMNS)
+
+# Columns the cold storage tiering job compresses: (column, placeholder)
+TASK_COLD_COLUMNS = (("full_command", None), ("full_output", None))
+install_cold_storage(Task, TASK_COLD_COLUMNS)
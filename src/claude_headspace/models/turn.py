@@ -3,11 +3,13 @@
 import enum
 from datetime import datetime, timezone
 
-from sqlalchemy import DateTime, Enum, ForeignKey, Index, Integer, String, Text
-from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy import DateTime, Enum, ForeignKey, Index, Integer, LargeBinary, String, Text
+from sqlalchemy.dialects.postgresql import JSONB, TSVECTOR
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from ..database import db
+from .cold_storage import install_cold_storage
+from .search_vector import install_search_vector
 
 
 class TurnActor(enum.Enum):
@@ -48,6 +50,8 @@ class Turn(db.Model):
         Enum(TurnIntent, name="turnintent", create_constraint=True), nullable=False
     )
     text: Mapped[str] = mapped_column(Text, nullable=False)
+    # Cold storage: compressed text of old turns (text is then ''), see models/cold_storage.py
+    text_compressed: Mapped[bytes | None] = mapped_column(LargeBinary, nullable=True)
     # Temporal validation (turn.timestamp >= task.started_at) is enforced at
     # application level — cross-table CHECK constraints are not supported in PostgreSQL.
     timestamp: Mapped[datetime] = mapped_column(
@@ -76,6 +80,9 @@ class Turn(db.Model):
         ForeignKey("turns.id", ondelete="SET NULL"), nullable=True
     )
 
+    # Full-text search over text + summary, maintained by a database trigger
+    search_vector = mapped_column(TSVECTOR, nullable=True, deferred=True)
+
     # Relationships
     task: Mapped["Task"] = relationship("Task", back_populates="turns")
     answered_by: Mapped["Turn | None"] = relationship(
@@ -89,3 +96,16 @@ class Turn(db.Model):
 # Additional indexes
 Index("ix_turns_task_id_timestamp", Turn.task_id, Turn.timestamp)
 Index("ix_turns_task_id_actor", Turn.task_id, Turn.actor)
+
+# Weighted columns feeding Turn.search_vector
+TURN_SEARCH_COLUMNS = (("text", "A"), ("summary", "B"))
+# Archived turns keep the text lexemes computed from their original text;
+# the summary is still re-indexed when it changes
+install_search_vector(
+    Turn, TURN_SEARCH_COLUMNS,
+    keep_when="NEW.text_compressed IS NOT NULL", kept_columns=("text",),
+)
+
+# Columns the cold storage tiering job compresses: (column, placeholder)
+TURN_COLD_COLUMNS = (("text", ""),)
+install_cold_storage(Turn, TURN_COLD_COLUMNS)
@@ -0,0 +1,40 @@
+"""Content-addressed blob API for large card fields."""
+
+import re
+
+from flask import Blueprint, Response, current_app, jsonify, request
+
+blobs_bp = Blueprint("blobs", __name__)
+
+_HASH_RE = re.compile(r"^[0-9a-f]{64}$")
+
+# Content at a given hash can never change, so browsers may cache it forever.
+_IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+
+@blobs_bp.route("/api/blobs/<blob_hash>")
+def get_blob(blob_hash: str):
+    """Serve a blob by its SHA-256 content hash with immutable caching."""
+    if not _HASH_RE.match(blob_hash):
+        return jsonify({"error": "Invalid blob hash"}), 400
+
+    store = current_app.extensions.get("blob_store")
+    if not store:
+        return jsonify({"error": "Blob store unavailable"}), 503
+
+    # The ETag is the content address; any conditional request for it is fresh.
+    etag = f'"{blob_hash}"'
+    if request.headers.get("If-None-Match") == etag:
+        response = Response(status=304)
+        response.headers["ETag"] = etag
+        response.headers["Cache-Control"] = _IMMUTABLE_CACHE_CONTROL
+        return response
+
+    blob = store.get(blob_hash)
+    if blob is None:
+        return jsonify({"error": "Blob not found"}), 404
+
+    response = Response(blob.body, content_type=blob.mimetype)
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = _IMMUTABLE_CACHE_CONTROL
+    return response
@@ -4,6 +4,7 @@ import logging
 from datetime import datetime, timedelta, timezone
 
 from flask import Blueprint, current_app, render_template, request
+from jinja2 import pass_context
 from sqlalchemy.orm import selectinload
 
 from ..database import db
@@ -12,6 +13,7 @@ from ..models.objective import Objective
 from ..services.card_state import (
     TIMED_OUT,
     _get_current_task_elapsed,
+    _get_current_task_timestamps,
     _get_current_task_turn_count,
     format_last_seen,
     format_uptime,
@@ -20,101 +22,98 @@ from ..services.card_state import (
     get_task_completion_summary,
     get_task_instruction,
     get_task_summary,
+    get_active_cutoff,
     get_question_options,
     is_agent_active,
 )
+from ..services.fragment_cache import render_agent_card as _render_agent_card
+from ..services.kanban_index import (
+    KanbanIndex,
+    empty_counts,
+    flags_from_counts,
+    kanban_column,
+    status_bucket,
+)
+from ..services.priority_ranking import (
+    PriorityRanking,
+    entry_from_agent,
+    recommendation_rationale,
+)
 
 logger = logging.getLogger(__name__)
 
 dashboard_bp = Blueprint("dashboard", __name__)
 
 
-def get_recommended_next(all_agents: list, agent_data_map: dict) -> dict | None:
+@dashboard_bp.app_template_global("render_agent_card")
+@pass_context
+def render_agent_card(ctx, agent: dict):
+    """Template global rendering an agent card through the fragment cache."""
+    return _render_agent_card(ctx, agent, cache=current_app.extensions.get("fragment_cache"))
+
+
+def get_recommended_next(
+    all_agents: list, agent_data_map: dict, ranking: PriorityRanking | None = None
+) -> dict | None:
     """
     Get the highest priority agent to recommend.
 
     Priority order:
-    1. Agents with AWAITING_INPUT (oldest waiting first)
-    2. Most recently active agent (by last_seen_at)
+    1. Agents with AWAITING_INPUT or TIMED_OUT (oldest waiting first)
+    2. Highest priority score among active agents, most recently seen first
 
     Args:
         all_agents: List of Agent model instances
         agent_data_map: Dict mapping agent.id to processed agent data dict
+        ranking: Reconciled PriorityRanking to read from; a throwaway ranking
+            is built from all_agents when omitted
 
     Returns:
         Dictionary with recommended agent data and rationale, or None
     """
-    if not all_agents:
+    if ranking is None:
+        if not all_agents:
+            return None
+        ranking = PriorityRanking()
+        ranking.reconcile(entry_from_agent(a) for a in all_agents)
+
+    entry = ranking.recommended(active_since=get_active_cutoff())
+    if entry is None:
         return None
 
-    # Filter to agents needing attention (AWAITING_INPUT or TIMED_OUT)
-    needs_attention = [
-        a for a in all_agents
-        if get_effective_state(a) in (TaskState.AWAITING_INPUT, TIMED_OUT)
-    ]
-
-    if needs_attention:
-        # Sort by last_seen_at ascending (oldest waiting first)
-        needs_attention.sort(key=lambda a: a.last_seen_at)
-        agent = needs_attention[0]
-        effective = get_effective_state(agent)
-
-        # Calculate wait time
-        wait_delta = datetime.now(timezone.utc) - agent.last_seen_at
-        wait_minutes = int(wait_delta.total_seconds() // 60)
-        if effective == TIMED_OUT:
-            if wait_minutes >= 60:
-                wait_hours = wait_minutes // 60
-                rationale = f"Timed out for {wait_hours}h {wait_minutes % 60}m"
-            elif wait_minutes > 0:
-                rationale = f"Timed out for {wait_minutes}m"
-            else:
-                rationale = "Timed out"
-        else:
-            if wait_minutes >= 60:
-                wait_hours = wait_minutes // 60
-                rationale = f"Awaiting input for {wait_hours}h {wait_minutes % 60}m"
-            elif wait_minutes > 0:
-                rationale = f"Awaiting input for {wait_minutes}m"
-            else:
-                rationale = "Awaiting input"
-
-        agent_data = agent_data_map.get(agent.id)
-        if agent_data:
-            return {
-                **agent_data,
-                "rationale": rationale,
-            }
+    agent_data = agent_data_map.get(entry.agent_id)
+    if not agent_data:
+        return None
+    return {
+        **agent_data,
+        "rationale": recommendation_rationale(entry),
+    }
 
-    # No agents awaiting input - recommend by highest priority score
-    active_agents = [a for a in all_agents if is_agent_active(a)]
-    if active_agents:
-        # Sort by priority_score descending, then last_seen_at descending
-        active_agents.sort(
-            key=lambda a: (
-                a.priority_score if a.priority_score is not None else -1,
-                a.last_seen_at,
-            ),
-            reverse=True,
-        )
-        agent = active_agents[0]
-        agent_data = agent_data_map.get(agent.id)
-        if agent_data:
-            score = agent.priority_score
-            reason = agent.priority_reason
-            if score is not None and reason:
-                rationale = f"Priority: {score} — {reason}"
-            else:
-                rationale = "Most recently active"
-            return {
-                **agent_data,
-                "rationale": rationale,
-            }
 
-    return None
+def _priority_key(agent_data: dict) -> tuple:
+    """Sort key for the By Priority view (see sort_agents_by_priority)."""
+    # Primary: priority score descending (negate for ascending sort)
+    score = agent_data.get("priority", 50)
+    if score is None:
+        score = 50
+
+    state = agent_data.get("state")
+    # Secondary: state group (lower = higher priority)
+    if state in (TaskState.AWAITING_INPUT, TIMED_OUT):
+        priority_group = 0
+    elif state in (TaskState.COMMANDED, TaskState.PROCESSING):
+        priority_group = 1
+    else:
+        priority_group = 2
 
+    # Tertiary: last_seen_at descending
+    last_seen = agent_data.get("last_seen_at", datetime.min.replace(tzinfo=timezone.utc))
+    return (-score, priority_group, -last_seen.timestamp())
 
-def sort_agents_by_priority(all_agents_data: list) -> list:
+
+def sort_agents_by_priority(
+    all_agents_data: list, ranking: PriorityRanking | None = None
+) -> list:
     """
     Sort agents by priority for the By Priority view.
 
@@ -125,31 +124,20 @@ def sort_agents_by_priority(all_agents_data: list) -> list:
 
     Args:
         all_agents_data: List of agent data dictionaries
+        ranking: Reconciled PriorityRanking whose order is read in O(n)
+            instead of sorting; agents it doesn't know are sorted after
 
     Returns:
         Sorted list of agent data dictionaries
     """
+    if ranking is None:
+        return sorted(all_agents_data, key=_priority_key)
 
-    def priority_key(agent_data):
-        # Primary: priority score descending (negate for ascending sort)
-        score = agent_data.get("priority", 50)
-        if score is None:
-            score = 50
-
-        state = agent_data.get("state")
-        # Secondary: state group (lower = higher priority)
-        if state in (TaskState.AWAITING_INPUT, TIMED_OUT):
-            priority_group = 0
-        elif state in (TaskState.COMMANDED, TaskState.PROCESSING):
-            priority_group = 1
-        else:
-            priority_group = 2
-
-        # Tertiary: last_seen_at descending
-        last_seen = agent_data.get("last_seen_at", datetime.min.replace(tzinfo=timezone.utc))
-        return (-score, priority_group, -last_seen.timestamp())
-
-    return sorted(all_agents_data, key=priority_key)
+    by_id = {a["id"]: a for a in all_agents_data}
+    ordered = [by_id.pop(e.agent_id) for e in ranking.ranked() if e.agent_id in by_id]
+    if by_id:
+        ordered.extend(sorted(by_id.values(), key=_priority_key))
+    return ordered
 
 
 def calculate_status_counts(agents: list[Agent]) -> dict[str, int]:
@@ -162,28 +150,10 @@ def calculate_status_counts(agents: list[Agent]) -> dict[str, int]:
     Returns:
         Dictionary with timed_out, input_needed, working, and idle counts
     """
-    timed_out = 0
-    input_needed = 0
-    working = 0
-    idle = 0
-
+    counts = empty_counts()
     for agent in agents:
-        state = get_effective_state(agent)
-        if state == TIMED_OUT:
-            timed_out += 1
-        elif state == TaskState.AWAITING_INPUT:
-            input_needed += 1
-        elif state in (TaskState.COMMANDED, TaskState.PROCESSING):
-            working += 1
-        else:  # IDLE or COMPLETE
-            idle += 1
-
-    return {
-        "timed_out": timed_out,
-        "input_needed": input_needed,
-        "working": working,
-        "idle": idle,
-    }
+        counts[status_bucket(get_effective_state(agent))] += 1
+    return counts
 
 
 def get_project_state_flags(agents: list[Agent]) -> dict[str, bool]:
@@ -196,25 +166,7 @@ def get_project_state_flags(agents: list[Agent]) -> dict[str, bool]:
     Returns:
         Dictionary with has_timed_out, has_input_needed, has_working, has_idle flags
     """
-    flags = {
-        "has_timed_out": False,
-        "has_input_needed": False,
-        "has_working": False,
-        "has_idle": False,
-    }
-
-    for agent in agents:
-        state = get_effective_state(agent)
-        if state == TIMED_OUT:
-            flags["has_timed_out"] = True
-        elif state == TaskState.AWAITING_INPUT:
-            flags["has_input_needed"] = True
-        elif state in (TaskState.COMMANDED, TaskState.PROCESSING):
-            flags["has_working"] = True
-        else:
-            flags["has_idle"] = True
-
-    return flags
+    return flags_from_counts(calculate_status_counts(agents))
 
 
 def count_active_agents(agents: list[Agent]) -> int:
@@ -233,6 +185,7 @@ def count_active_agents(agents: list[Agent]) -> int:
 def _prepare_kanban_data(
     projects: list, project_data: list, priority_enabled: bool,
     projects_by_id: dict | None = None,
+    kanban_index: KanbanIndex | None = None,
 ) -> list:
     """Prepare Kanban board data grouped by project and task state.
 
@@ -245,6 +198,8 @@ def _prepare_kanban_data(
         projects: List of Project model instances
         project_data: List of project data dicts (with agents)
         priority_enabled: Whether priority ordering is enabled
+        projects_by_id: Optional pre-built map of project id to Project
+        kanban_index: Reconciled KanbanIndex to read column membership from
 
     Returns:
         List of dicts, each with project info and state columns
@@ -268,21 +223,23 @@ def _prepare_kanban_data(
             # Get live agents for this project
             live_agents = [a for a in project_model.agents if a.ended_at is None]
 
+            agent_data_by_id = {ad["id"]: ad for ad in proj_data["agents"]}
+
             for agent in live_agents:
-                # Find the agent data dict
-                agent_data = None
-                for ad in proj_data["agents"]:
-                    if ad["id"] == agent.id:
-                        agent_data = ad
-                        break
+                agent_data = agent_data_by_id.get(agent.id)
                 if not agent_data:
                     continue
 
-                current_task = agent.get_current_task()
-                effective_state = get_effective_state(agent)
-                state_name = effective_state if isinstance(effective_state, str) else effective_state.name
+                state_name = agent_data.get("state_name")
+                if state_name is None:
+                    effective_state = get_effective_state(agent)
+                    state_name = effective_state if isinstance(effective_state, str) else effective_state.name
+
+                col_name = kanban_index.column_of(agent.id) if kanban_index else None
+                if col_name is None:
+                    col_name = kanban_column(state_name, agent.get_current_task() is not None)
 
-                if current_task is None or state_name in ("IDLE", "COMPLETE"):
+                if col_name == "IDLE":
                     # Agent is idle (or just completed a task — completed tasks
                     # are added as condensed accordion cards by the loop below).
                     # Override display state to IDLE so the card renders correctly.
@@ -303,8 +260,7 @@ def _prepare_kanban_data(
                     })
                 else:
                     # Agent has active task - goes in the state's column
-                    # COMMANDED is a transitory state; display in PROCESSING column
-                    col_name = "PROCESSING" if state_name in ("COMMANDED", "TIMED_OUT") else state_name
+                    # (COMMANDED and TIMED_OUT display in PROCESSING)
                     state_columns[col_name].append({
                         "type": "task",
                         "agent": agent_data,
@@ -345,6 +301,7 @@ def _prepare_kanban_data(
                             "task_id": task.id,
                             "completion_summary": completion_summary or "Completed",
                             "instruction": task.instruction or "Task",
+                            "started_at": task.started_at,
                             "completed_at": task.completed_at,
                             "turn_count": len(task.turns),
                             "elapsed": elapsed,
@@ -486,14 +443,30 @@ def dashboard():
     all_agents = []
     agent_data_map = {}  # Maps agent.id to agent data dict
     all_agents_data = []  # Flat list of all agent data for priority view
+    effective_states = {}  # Maps agent.id to its effective (display) state
+    state_names = {}  # Maps agent.id to the effective state's name
 
     for project in projects:
         # Exclude ended agents from the dashboard
         active_project_agents = [a for a in project.agents if a.ended_at is None]
         all_agents.extend(active_project_agents)
+        for agent in active_project_agents:
+            effective_state = get_effective_state(agent)
+            effective_states[agent.id] = effective_state
+            # string for templates (handles both TaskState enum and TIMED_OUT string)
+            state_names[agent.id] = (
+                effective_state if isinstance(effective_state, str) else effective_state.name
+            )
 
-    # Calculate header status counts
-    status_counts = calculate_status_counts(all_agents)
+    # Header status counts and project state flags come from the shared
+    # Kanban index, kept current between renders by card_refresh broadcasts;
+    # only agents whose state has drifted (e.g. timed out) are re-placed
+    kanban_index = current_app.extensions.get("kanban_index")
+    if kanban_index is not None:
+        kanban_index.refresh(all_agents, state_names)
+        status_counts = kanban_index.status_counts()
+    else:
+        status_counts = calculate_status_counts(all_agents)
 
     # Compute staleness for all projects
     staleness_map = {}
@@ -508,9 +481,8 @@ def dashboard():
         live_agents = [a for a in project.agents if a.ended_at is None]
         agents_data = []
         for agent in live_agents:
-            effective_state = get_effective_state(agent)
-            # state_name: string for templates (handles both TaskState enum and TIMED_OUT string)
-            state_name = effective_state if isinstance(effective_state, str) else effective_state.name
+            effective_state = effective_states[agent.id]
+            state_name = state_names[agent.id]
             truncated_uuid = str(agent.session_uuid)[:8]
             agent_dict = {
                 "id": agent.id,
@@ -535,12 +507,17 @@ def dashboard():
                 "project_slug": project.slug,
                 "project_id": project.id,
                 "last_seen_at": agent.last_seen_at,
+                "started_at": agent.started_at,
                 "context_percent_used": agent.context_percent_used,
                 "context_remaining_tokens": agent.context_remaining_tokens,
                 "tmux_session": agent.tmux_session,
             }
             # Add current task ID and plan state for on-demand drill-down
             _ct = agent.get_current_task()
+            # Raw task timestamps for the client-side relative-time ticker
+            agent_dict["task_started_at"], agent_dict["task_completed_at"] = (
+                _get_current_task_timestamps(agent, _current_task=_ct)
+            )
             agent_dict["current_task_id"] = _ct.id if _ct else (agent.tasks[0].id if agent.tasks else None)
             agent_dict["has_plan"] = bool(_ct and _ct.plan_content)
             # Plan mode label overrides
@@ -581,7 +558,10 @@ def dashboard():
                 "id": project.id,
                 "name": project.name,
                 "slug": project.slug,
-                "state_flags": get_project_state_flags(live_agents),
+                "state_flags": (
+                    kanban_index.project_flags(project.id) if kanban_index is not None
+                    else get_project_state_flags(live_agents)
+                ),
                 "active_count": count_active_agents(live_agents),
                 "agents": agents_data,
                 "waypoint": None,  # Waypoint will be added in Sprint 9
@@ -596,16 +576,30 @@ def dashboard():
     objective = db.session.query(Objective).first()
     priority_enabled = bool(objective and objective.priority_enabled)
 
+    # The shared priority ranking is kept current between renders by
+    # card_refresh broadcasts; only entries whose display state has drifted
+    # (e.g. timed out) are rebuilt, unless it is cold or missing agents.
+    ranking = current_app.extensions.get("priority_ranking")
+    if ranking is not None:
+        ranking.refresh(all_agents, state_names)
+
     # Calculate recommended next agent (only when prioritisation is enabled)
-    recommended_next = get_recommended_next(all_agents, agent_data_map) if priority_enabled else None
+    recommended_next = (
+        get_recommended_next(all_agents, agent_data_map, ranking=ranking)
+        if priority_enabled else None
+    )
 
     # Sort agents for priority view
-    priority_sorted_agents = sort_agents_by_priority(all_agents_data)
+    priority_sorted_agents = sort_agents_by_priority(all_agents_data, ranking=ranking)
 
-    # Sort agents within each project by priority when prioritisation is enabled
+    # Order agents within each project by priority when prioritisation is
+    # enabled (a stable partition of the global order)
     if priority_enabled:
+        by_project = {p["id"]: [] for p in projects_with_agents}
+        for agent_data in priority_sorted_agents:
+            by_project.setdefault(agent_data["project_id"], []).append(agent_data)
         for project in projects_with_agents:
-            project["agents"] = sort_agents_by_priority(project["agents"])
+            project["agents"] = by_project[project["id"]]
 
     # Prepare Kanban data (group by task lifecycle state per project)
     projects_by_id = {p.id: p for p in projects}
@@ -614,6 +608,7 @@ def dashboard():
         kanban_data = _prepare_kanban_data(
             projects, project_data, priority_enabled,
             projects_by_id=projects_by_id,
+            kanban_index=kanban_index,
         )
 
     # Activity metrics are fetched client-side via JS to use the browser's
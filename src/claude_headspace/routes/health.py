@@ -77,6 +77,26 @@ def health_check():
         "background_threads": background_threads,
     }
 
+    fragment_cache = current_app.extensions.get("fragment_cache")
+    if fragment_cache is not None:
+        response["fragment_cache"] = fragment_cache.stats
+
+    intent_cache = current_app.extensions.get("intent_cache")
+    if intent_cache is not None:
+        response["intent_cache"] = intent_cache.stats
+
+    cold_storage = current_app.extensions.get("cold_storage")
+    if cold_storage is not None:
+        response["cold_storage"] = cold_storage.stats
+
+    inference_batcher = current_app.extensions.get("inference_batcher")
+    if inference_batcher is not None:
+        response["inference_batching"] = inference_batcher.stats
+
+    summarisation_queue = current_app.extensions.get("summarisation_queue")
+    if summarisation_queue is not None:
+        response["summarisation_queue"] = summarisation_queue.stats
+
     if db_error:
         response["database_error"] = db_error
 
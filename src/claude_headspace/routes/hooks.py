@@ -136,6 +136,36 @@ def _backfill_tmux_pane(agent, tmux_pane: str | None, tmux_session: str | None =
             logger.debug("No app context for commander_availability")
 
 
+def _indexed_transcript_path(session_id: str | None) -> str | None:
+    """Transcript path for a Claude session from the session index, if known."""
+    if not session_id:
+        return None
+    try:
+        from flask import current_app
+        index = current_app.extensions.get("session_index")
+    except RuntimeError:
+        return None
+    if index is None or not index.ready:
+        return None
+    location = index.lookup(session_id)
+    return location.path if location else None
+
+
+def _backfill_transcript_path(agent, transcript_path: str | None, session_id: str | None) -> None:
+    """Store transcript_path on agent if not yet set (late discovery).
+
+    Uses the path from the hook payload when present, otherwise the session
+    index entry for the Claude session id.
+    """
+    if agent.transcript_path:
+        return
+    transcript_path = transcript_path or _indexed_transcript_path(session_id)
+    if not transcript_path:
+        return
+    agent.transcript_path = transcript_path
+    db.session.flush()
+
+
 @hooks_bp.route("/hook/session-start", methods=["POST"])
 @rate_limited
 def hook_session_start():
@@ -168,7 +198,7 @@ def hook_session_start():
     session_id = data["session_id"]
     working_directory = data.get("working_directory")
     headspace_session_id = data.get("headspace_session_id")
-    transcript_path = data.get("transcript_path")
+    transcript_path = data.get("transcript_path") or _indexed_transcript_path(session_id)
     tmux_pane = data.get("tmux_pane")
     tmux_session = data.get("tmux_session")
 
@@ -263,6 +293,7 @@ def hook_session_end():
     try:
         correlation = correlate_session(session_id, working_directory, headspace_session_id, tmux_pane_id=tmux_pane)
         _backfill_tmux_pane(correlation.agent, tmux_pane, tmux_session)
+        _backfill_transcript_path(correlation.agent, data.get("transcript_path"), session_id)
         result = process_session_end(correlation.agent, session_id)
 
         latency_ms = int((time.time() - start_time) * 1000)
@@ -325,6 +356,7 @@ def hook_user_prompt_submit():
     try:
         correlation = correlate_session(session_id, working_directory, headspace_session_id, tmux_pane_id=tmux_pane)
         _backfill_tmux_pane(correlation.agent, tmux_pane, tmux_session)
+        _backfill_transcript_path(correlation.agent, data.get("transcript_path"), session_id)
         result = process_user_prompt_submit(correlation.agent, session_id, prompt_text=prompt_text)
 
         latency_ms = int((time.time() - start_time) * 1000)
@@ -387,6 +419,7 @@ def hook_stop():
     try:
         correlation = correlate_session(session_id, working_directory, headspace_session_id, tmux_pane_id=tmux_pane)
         _backfill_tmux_pane(correlation.agent, tmux_pane, tmux_session)
+        _backfill_transcript_path(correlation.agent, data.get("transcript_path"), session_id)
         result = process_stop(correlation.agent, session_id)
 
         latency_ms = int((time.time() - start_time) * 1000)
@@ -456,6 +489,7 @@ def hook_notification():
     try:
         correlation = correlate_session(session_id, working_directory, headspace_session_id, tmux_pane_id=tmux_pane)
         _backfill_tmux_pane(correlation.agent, tmux_pane, tmux_session)
+        _backfill_transcript_path(correlation.agent, data.get("transcript_path"), session_id)
         result = process_notification(
             correlation.agent,
             session_id,
@@ -531,11 +565,7 @@ def hook_post_tool_use():
     try:
         correlation = correlate_session(session_id, working_directory, headspace_session_id, tmux_pane_id=tmux_pane)
         _backfill_tmux_pane(correlation.agent, tmux_pane, tmux_session)
-
-        # Backfill transcript_path if provided and not yet set
-        transcript_path = data.get("transcript_path")
-        if transcript_path and not correlation.agent.transcript_path:
-            correlation.agent.transcript_path = transcript_path
+        _backfill_transcript_path(correlation.agent, data.get("transcript_path"), session_id)
 
         result = process_post_tool_use(
             correlation.agent, session_id, tool_name=tool_name,
@@ -608,6 +638,7 @@ def hook_pre_tool_use():
     try:
         correlation = correlate_session(session_id, working_directory, headspace_session_id, tmux_pane_id=tmux_pane)
         _backfill_tmux_pane(correlation.agent, tmux_pane, tmux_session)
+        _backfill_transcript_path(correlation.agent, data.get("transcript_path"), session_id)
         result = process_pre_tool_use(
             correlation.agent, session_id, tool_name=tool_name, tool_input=tool_input
         )
@@ -677,6 +708,7 @@ def hook_permission_request():
     try:
         correlation = correlate_session(session_id, working_directory, headspace_session_id, tmux_pane_id=tmux_pane)
         _backfill_tmux_pane(correlation.agent, tmux_pane, tmux_session)
+        _backfill_transcript_path(correlation.agent, data.get("transcript_path"), session_id)
         result = process_permission_request(
             correlation.agent, session_id, tool_name=tool_name, tool_input=tool_input
         )
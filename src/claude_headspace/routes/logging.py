@@ -4,10 +4,11 @@ import logging
 from datetime import datetime, timedelta, timezone
 
 from flask import Blueprint, current_app, jsonify, render_template, request
-from sqlalchemy import func, or_
+from sqlalchemy import and_, func, or_
 
 from ..database import db
 from ..models.agent import Agent
+from ..models.cold_storage import cold_value
 from ..models.event import Event, EventType
 from ..models.inference_call import InferenceCall
 from ..models.project import Project
@@ -112,17 +113,19 @@ def get_events():
         turn_data = {}
         if turn_ids:
             turns = (
-                db.session.query(Turn.id, Turn.actor, Turn.text, Turn.summary)
+                db.session.query(
+                    Turn.id, Turn.actor, Turn.text, Turn.text_compressed, Turn.summary
+                )
                 .filter(Turn.id.in_(turn_ids))
                 .all()
             )
-            turn_data = {
-                t.id: {
-                    "actor": t.actor.value,
-                    "text": t.summary if t.summary else (t.text[:200] if t.text else None),
-                }
-                for t in turns
-            }
+            turn_data = {}
+            for t in turns:
+                text = t.summary
+                if not text:
+                    text = cold_value(t.text, t.text_compressed)
+                    text = text[:200] if text else None
+                turn_data[t.id] = {"actor": t.actor.value, "text": text}
 
         # Calculate total pages
         pages = (total + per_page - 1) // per_page if total > 0 else 0
@@ -301,7 +304,9 @@ def get_inference_calls():
     Get paginated inference calls with optional filtering.
 
     Query parameters:
-        - search (optional): Case-insensitive text search across input_text, result_text, purpose
+        - search (optional): Case-insensitive text search across input_text, result_text, purpose.
+          Prompts moved to cold storage are not searched; ``archived_unsearched``
+          counts the calls whose prompt was skipped.
         - level (optional): Filter by inference level
         - model (optional): Filter by model name
         - project_id (optional): Filter by project ID
@@ -328,15 +333,6 @@ def get_inference_calls():
 
         query = db.session.query(InferenceCall)
 
-        if search:
-            search_pattern = f"%{search}%"
-            query = query.filter(
-                or_(
-                    InferenceCall.input_text.ilike(search_pattern),
-                    InferenceCall.result_text.ilike(search_pattern),
-                    InferenceCall.purpose.ilike(search_pattern),
-                )
-            )
         if level:
             query = query.filter(InferenceCall.level == level)
         if model:
@@ -348,6 +344,25 @@ def get_inference_calls():
         if cached is not None:
             query = query.filter(InferenceCall.cached == (cached.lower() == "true"))
 
+        archived_unsearched = 0
+        if search:
+            # Compressed prompts would need decompressing row by row; they are
+            # left out of the substring match and reported instead
+            archived_unsearched = query.filter(
+                InferenceCall.input_text_compressed.isnot(None)
+            ).count()
+            search_pattern = f"%{search}%"
+            query = query.filter(
+                or_(
+                    and_(
+                        InferenceCall.input_text_compressed.is_(None),
+                        InferenceCall.input_text.ilike(search_pattern),
+                    ),
+                    InferenceCall.result_text.ilike(search_pattern),
+                    InferenceCall.purpose.ilike(search_pattern),
+                )
+            )
+
         total = query.count()
         offset = (page - 1) * per_page
 
@@ -414,6 +429,7 @@ def get_inference_calls():
                 "pages": pages,
                 "has_next": page < pages,
                 "has_previous": page > 1,
+                "archived_unsearched": archived_unsearched,
             }
         )
 
@@ -1,6 +1,6 @@
 """Priority scoring API routes."""
 
-from flask import Blueprint, current_app, jsonify
+from flask import Blueprint, current_app, jsonify, request
 
 priority_bp = Blueprint("priority", __name__, url_prefix="/api/priority")
 
@@ -37,15 +37,30 @@ def trigger_scoring():
 
 @priority_bp.route("/rankings", methods=["GET"])
 def get_rankings():
-    """Get current priority rankings from database.
+    """Get current priority rankings.
 
-    Returns all agents ordered by priority score descending.
-    No new inference call is made.
+    Served from the in-memory priority ranking once it has been reconciled
+    against the database (first dashboard render or rankings request);
+    otherwise falls back to a DB query and warms the ranking from it.
+    Agents are ordered by score descending, unscored last. No new
+    inference call is made.
+
+    Query parameters:
+        limit: Return only the top N agents
     """
     service = _get_service()
     if not service:
         return jsonify({"error": "Priority scoring service not available"}), 503
 
+    limit = request.args.get("limit", type=int)
+    if limit is not None and limit < 1:
+        return jsonify({"error": "limit must be a positive integer"}), 400
+
+    ranking = current_app.extensions.get("priority_ranking")
+    if ranking is not None and ranking.is_warm:
+        rankings = [_entry_to_ranking(entry) for entry in ranking.ranked_by_score(limit)]
+        return jsonify({"agents": rankings})
+
     from ..database import db
     from ..models.agent import Agent
 
@@ -56,8 +71,15 @@ def get_rankings():
         .all()
     )
 
+    if ranking is not None:
+        from ..services.priority_ranking import entry_from_agent
+
+        ranking.reconcile(entry_from_agent(agent) for agent in agents)
+        rankings = [_entry_to_ranking(entry) for entry in ranking.ranked_by_score(limit)]
+        return jsonify({"agents": rankings})
+
     rankings = []
-    for agent in agents:
+    for agent in agents[:limit]:
         rankings.append({
             "agent_id": agent.id,
             "project_name": agent.project.name if agent.project else "Unknown",
@@ -68,3 +90,15 @@ def get_rankings():
         })
 
     return jsonify({"agents": rankings})
+
+
+def _entry_to_ranking(entry) -> dict:
+    """Format a ranking entry like the DB-backed rankings response."""
+    return {
+        "agent_id": entry.agent_id,
+        "project_name": entry.project_name,
+        "state": entry.model_state,
+        "score": entry.score,
+        "reason": entry.reason,
+        "scored_at": entry.scored_at.isoformat() if entry.scored_at else None,
+    }
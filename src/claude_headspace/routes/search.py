@@ -0,0 +1,86 @@
+"""Full-text search API across agent turns and tasks."""
+
+import logging
+from datetime import datetime, timezone
+
+from flask import Blueprint, jsonify, request
+
+from ..services.search import DEFAULT_LIMIT, KINDS, SearchError, search
+
+logger = logging.getLogger(__name__)
+
+search_bp = Blueprint("search", __name__)
+
+# Longest query accepted; longer input is not a search, it's a paste
+MAX_QUERY_LENGTH = 500
+
+
+def _parse_iso(value: str | None) -> datetime | None:
+    """Parse an ISO 8601 string into a timezone-aware datetime.
+
+    Raises:
+        ValueError: If the value is not a valid timestamp
+    """
+    if not value:
+        return None
+    dt = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return dt
+
+
+@search_bp.route("/api/search", methods=["GET"])
+def api_search():
+    """
+    Search turn text/summaries and task instructions/completion summaries.
+
+    Query parameters:
+        - q (required): Search terms (websearch syntax: "phrase", or, -exclude)
+        - project_id (optional): Filter by project ID
+        - agent_id (optional): Filter by agent ID
+        - since / until (optional): ISO 8601 time range (until is exclusive)
+        - type (optional): "turn" or "task" (default: both)
+        - sort (optional): "relevance" (default) or "recent"
+        - limit (optional, default=20): Results per page (max 100)
+        - cursor (optional): next_cursor from the previous page
+
+    Returns:
+        JSON with results (ranked, with <mark>-highlighted snippets) and
+        next_cursor (null on the last page)
+    """
+    query = (request.args.get("q") or "").strip()
+    if not query:
+        return jsonify({"error": "Missing required parameter: q"}), 400
+    if len(query) > MAX_QUERY_LENGTH:
+        return jsonify({"error": f"Query too long (max {MAX_QUERY_LENGTH} characters)"}), 400
+
+    try:
+        since = _parse_iso(request.args.get("since"))
+        until = _parse_iso(request.args.get("until"))
+    except ValueError:
+        return jsonify({"error": "since/until must be ISO 8601 timestamps"}), 400
+
+    kind = request.args.get("type")
+    try:
+        page = search(
+            query,
+            project_id=request.args.get("project_id", type=int),
+            agent_id=request.args.get("agent_id", type=int),
+            since=since,
+            until=until,
+            kinds=(kind,) if kind else KINDS,
+            sort=request.args.get("sort", "relevance"),
+            limit=request.args.get("limit", DEFAULT_LIMIT, type=int),
+            cursor=request.args.get("cursor"),
+        )
+    except SearchError as e:
+        return jsonify({"error": str(e)}), 400
+    except Exception:
+        logger.exception("Search failed")
+        return jsonify({"error": "Search failed"}), 500
+
+    return jsonify({
+        "query": query,
+        "results": page.results,
+        "next_cursor": page.next_cursor,
+    })
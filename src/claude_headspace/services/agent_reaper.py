@@ -267,7 +267,7 @@ class AgentReaper:
                         summarisation_svc = self._app.extensions.get("summarisation_service")
                         if summarisation_svc:
                             from ..database import db as _db
-                            summarisation_svc.execute_pending(self._pending_summarisations, _db.session)
+                            summarisation_svc.submit_pending(self._pending_summarisations, _db.session)
                     except Exception as e:
                         logger.debug(f"Reaper summarisation failed (non-fatal): {e}")
                     finally:
@@ -0,0 +1,124 @@
+"""Content-addressed in-memory store for large card fields.
+
+Large card fields (plan content, full AskUserQuestion option payloads) are
+replaced in card_refresh events by a SHA-256 content hash. Clients fetch the
+body once from /api/blobs/<hash>, which is served with immutable caching, and
+only re-fetch when the hash in the card changes.
+
+Blobs are re-registered every time a card is built, so an evicted or
+pre-restart hash is simply replaced by the next card_refresh.
+"""
+
+import hashlib
+import json
+import logging
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+# Fields smaller than this stay inline in the card — a hash plus an extra
+# round-trip costs more than it saves for short plans and Yes/No options.
+DEFAULT_INLINE_THRESHOLD_BYTES = 2048
+DEFAULT_MAX_BYTES = 32 * 1024 * 1024
+
+
+@dataclass
+class Blob:
+    """A stored blob body with its content type."""
+
+    body: bytes
+    mimetype: str
+
+
+class BlobStore:
+    """Thread-safe content-addressed blob store with byte-bounded LRU eviction."""
+
+    def __init__(self, config: dict | None = None):
+        blob_config = (config or {}).get("blob_store", {})
+        self.inline_threshold_bytes = blob_config.get(
+            "inline_threshold_bytes", DEFAULT_INLINE_THRESHOLD_BYTES
+        )
+        self.max_bytes = blob_config.get("max_bytes", DEFAULT_MAX_BYTES)
+        self._blobs: OrderedDict[str, Blob] = OrderedDict()
+        self._total_bytes = 0
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    @staticmethod
+    def compute_hash(body: bytes) -> str:
+        """Return the content address (SHA-256 hex digest) for a body."""
+        return hashlib.sha256(body).hexdigest()
+
+    def put(self, body: bytes, mimetype: str) -> str:
+        """Store a body and return its content hash.
+
+        Re-putting an existing body is cheap and refreshes its LRU position.
+        """
+        blob_hash = self.compute_hash(body)
+        with self._lock:
+            if blob_hash in self._blobs:
+                self._blobs.move_to_end(blob_hash)
+                return blob_hash
+
+            self._blobs[blob_hash] = Blob(body=body, mimetype=mimetype)
+            self._total_bytes += len(body)
+
+            # Evict least recently used blobs until within budget, always
+            # keeping the blob just inserted.
+            while self._total_bytes > self.max_bytes and len(self._blobs) > 1:
+                _, evicted = self._blobs.popitem(last=False)
+                self._total_bytes -= len(evicted.body)
+                self._evictions += 1
+        return blob_hash
+
+    @staticmethod
+    def encode(value: Any) -> tuple[bytes, str]:
+        """Encode a card field value as (body, mimetype).
+
+        Strings are stored as UTF-8 text; anything else as canonical JSON
+        (sorted keys) so equal values always produce the same hash.
+        """
+        if isinstance(value, str):
+            return value.encode("utf-8"), "text/plain; charset=utf-8"
+        body = json.dumps(value, sort_keys=True, separators=(",", ":")).encode("utf-8")
+        return body, "application/json"
+
+    def get(self, blob_hash: str) -> Blob | None:
+        """Look up a blob by content hash."""
+        with self._lock:
+            blob = self._blobs.get(blob_hash)
+            if blob is None:
+                self._misses += 1
+                return None
+            self._blobs.move_to_end(blob_hash)
+            self._hits += 1
+            return blob
+
+    def should_externalise(self, size_bytes: int) -> bool:
+        """Whether a field of this encoded size should be replaced by a hash."""
+        return size_bytes >= self.inline_threshold_bytes
+
+    def clear(self) -> None:
+        """Remove all blobs."""
+        with self._lock:
+            self._blobs.clear()
+            self._total_bytes = 0
+
+    @property
+    def stats(self) -> dict:
+        """Return store statistics."""
+        with self._lock:
+            return {
+                "count": len(self._blobs),
+                "total_bytes": self._total_bytes,
+                "max_bytes": self.max_bytes,
+                "inline_threshold_bytes": self.inline_threshold_bytes,
+                "hits": self._hits,
+                "misses": self._misses,
+                "evictions": self._evictions,
+            }
@@ -41,6 +41,34 @@ def _get_dashboard_config() -> dict:
         return {}  # No app context (unit tests without mocking)
 
 
+def _get_extension(name: str):
+    """Get an app extension by name, or None without app context."""
+    try:
+        return current_app.extensions.get(name)
+    except RuntimeError:
+        return None
+
+
+def _attach_large_field(card: dict, key: str, value: str | dict) -> None:
+    """Attach a potentially large field to a card.
+
+    Small values are inlined under ``key``. Values at or above the blob
+    store's inline threshold are stored content-addressed and replaced by
+    ``<key>_hash`` so they are not re-sent on every refresh, replay and
+    reconnect; the client fetches /api/blobs/<hash> only when it changes.
+    """
+    store = _get_extension("blob_store")
+    if store is None:
+        card[key] = value
+        return
+
+    body, mimetype = store.encode(value)
+    if store.should_externalise(len(body)):
+        card[f"{key}_hash"] = store.put(body, mimetype)
+    else:
+        card[key] = value
+
+
 def get_effective_state(agent: Agent) -> TaskState | str:
     """
     Get the effective display state for an agent.
@@ -94,12 +122,16 @@ def is_agent_active(agent: Agent) -> bool:
     """
     if agent.ended_at is not None:
         return False
+    return agent.last_seen_at >= get_active_cutoff()
+
+
+def get_active_cutoff() -> datetime:
+    """Return the last_seen_at cutoff below which an agent is inactive."""
     dashboard_config = _get_dashboard_config()
     timeout_minutes = dashboard_config.get(
         "active_timeout_minutes", _DEFAULT_ACTIVE_TIMEOUT_MINUTES
     )
-    cutoff = datetime.now(timezone.utc) - timedelta(minutes=timeout_minutes)
-    return agent.last_seen_at >= cutoff
+    return datetime.now(timezone.utc) - timedelta(minutes=timeout_minutes)
 
 
 def format_last_seen(last_seen_at: datetime) -> str:
@@ -470,6 +502,32 @@ def _get_current_task_turn_count(agent: Agent, _current_task=None) -> int:
     return 0
 
 
+def _isoformat(value: datetime | None) -> str | None:
+    """Serialise an optional datetime to ISO 8601 for the client-side ticker."""
+    return value.isoformat() if value else None
+
+
+def _get_current_task_timestamps(
+    agent: Agent, _current_task=None
+) -> tuple[datetime | None, datetime | None]:
+    """Get (started_at, completed_at) for the agent's current or most recent task.
+
+    Raw timestamps are sent to the client instead of a pre-formatted elapsed
+    string so the card never goes stale between state changes.
+
+    Args:
+        agent: The agent
+
+    Returns:
+        Tuple of task started_at and completed_at (either may be None)
+    """
+    current_task = _current_task if _current_task is not None else agent.get_current_task()
+    task = current_task or (agent.tasks[0] if agent.tasks else None)
+    if not task or not task.started_at:
+        return None, None
+    return task.started_at, task.completed_at
+
+
 def _get_current_task_elapsed(agent: Agent, _current_task=None) -> str | None:
     """Get elapsed time string for the agent's current or most recent task.
 
@@ -482,15 +540,11 @@ def _get_current_task_elapsed(agent: Agent, _current_task=None) -> str | None:
     Returns:
         Elapsed time string like "2h 15m", "5m", "<1m", or None
     """
-    current_task = _current_task if _current_task is not None else agent.get_current_task()
-    task = current_task or (agent.tasks[0] if agent.tasks else None)
-    if not task or not task.started_at:
+    started_at, completed_at = _get_current_task_timestamps(agent, _current_task)
+    if started_at is None:
         return None
 
-    if task.completed_at:
-        delta = task.completed_at - task.started_at
-    else:
-        delta = datetime.now(timezone.utc) - task.started_at
+    delta = (completed_at or datetime.now(timezone.utc)) - started_at
 
     total_seconds = int(delta.total_seconds())
     if total_seconds < 0:
@@ -595,8 +649,8 @@ def build_card_state(agent: Agent) -> dict:
         "hero_chars": truncated_uuid[:2],
         "hero_trail": truncated_uuid[2:],
         "is_active": is_agent_active(agent),
-        "uptime": format_uptime(agent.started_at),
-        "last_seen": format_last_seen(agent.last_seen_at),
+        "started_at": _isoformat(agent.started_at),
+        "last_seen_at": _isoformat(agent.last_seen_at),
         "state": state_name,
         "state_info": get_state_info(effective_state),
         "task_summary": get_task_summary(agent, _current_task=current_task),
@@ -619,25 +673,31 @@ def build_card_state(agent: Agent) -> dict:
         elif current_task.plan_file_path == "pending":
             card["state_info"] = {**card["state_info"], "label": "Planning..."}
 
-    # Plan content for frontend
+    # Plan content for frontend (large plans are sent as a content hash)
     has_plan = bool(current_task and current_task.plan_content)
     card["has_plan"] = has_plan
     if has_plan:
-        card["plan_content"] = current_task.plan_content
+        _attach_large_field(card, "plan_content", current_task.plan_content)
 
     # Include current task ID for on-demand full-text drill-down
     task_for_id = current_task or (agent.tasks[0] if agent.tasks else None)
     card["current_task_id"] = task_for_id.id if task_for_id else None
 
-    # Include turn count and elapsed time for all states (used by
-    # the agent card footer and condensed completed-task card)
+    # Include turn count and task timestamps for all states (used by
+    # the agent card footer and condensed completed-task card). Relative
+    # strings ("3m ago", "up 2h", "1h 5m") are formatted client-side by
+    # static/js/relative-time.js so the card only changes on real state changes.
     card["turn_count"] = _get_current_task_turn_count(agent, _current_task=current_task)
-    card["elapsed"] = _get_current_task_elapsed(agent, _current_task=current_task)
+    task_started_at, task_completed_at = _get_current_task_timestamps(
+        agent, _current_task=current_task
+    )
+    card["task_started_at"] = _isoformat(task_started_at)
+    card["task_completed_at"] = _isoformat(task_completed_at)
 
     # Include structured question options for AWAITING_INPUT cards
     options = get_question_options(agent, _current_task=current_task)
     if options:
-        card["question_options"] = options
+        _attach_large_field(card, "question_options", options)
 
     # Context usage
     card["context"] = None
@@ -689,3 +749,49 @@ def broadcast_card_refresh(agent: Agent, reason: str) -> None:
         logger.debug(f"Broadcast card_refresh for agent {agent.id}: reason={reason}, instruction={card.get('task_instruction', 'N/A')!r:.60}")
     except Exception as e:
         logger.info(f"card_refresh broadcast failed (non-fatal): {e}")
+
+    _sync_kanban_index(agent)
+    _sync_priority_ranking(agent)
+
+
+def _sync_kanban_index(agent: Agent) -> None:
+    """Apply an agent change to the Kanban index.
+
+    Broadcasts a status_counts SSE event with each affected project's
+    counters and column membership only when that project's board changed
+    (both the old and new project when an agent moves project).
+    """
+    index = _get_extension("kanban_index")
+    if index is None:
+        return
+    try:
+        project_ids = index.sync_agent(agent)
+        if project_ids:
+            from .broadcaster import get_broadcaster
+
+            broadcaster = get_broadcaster()
+            for project_id in project_ids:
+                broadcaster.broadcast("status_counts", index.snapshot(project_id))
+    except Exception as e:
+        logger.info(f"kanban_index update failed (non-fatal): {e}")
+
+
+def _sync_priority_ranking(agent: Agent) -> None:
+    """Apply an agent change to the priority ranking.
+
+    Broadcasts a priority_ranking SSE event only when the recommended agent
+    or the top of the ranking actually moved.
+    """
+    ranking = _get_extension("priority_ranking")
+    if ranking is None:
+        return
+    try:
+        active_since = get_active_cutoff()
+        if ranking.sync_agent(agent, active_since=active_since):
+            from .broadcaster import get_broadcaster
+
+            get_broadcaster().broadcast(
+                "priority_ranking", ranking.snapshot(active_since=active_since)
+            )
+    except Exception as e:
+        logger.info(f"priority_ranking update failed (non-fatal): {e}")
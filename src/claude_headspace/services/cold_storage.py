@@ -0,0 +1,312 @@
+"""Cold storage tiering for the large text of long-ended agents.
+
+Turn.text, Task.full_command, Task.full_output and InferenceCall.input_text
+are rarely read once an agent has ended, but account for most of the
+database. Periodically, values at least ``min_bytes`` long belonging to agents
+that ended more than ``after_days`` ago are compressed into their
+``<column>_compressed`` columns and the raw column is blanked (see
+models/cold_storage.py, which decompresses them again on load).
+
+Each pass produces a TieringReport: rows moved and raw vs compressed bytes per
+column, plus the on-disk size of the affected tables before and after. The
+raw column's old tuple versions are only returned to the table once
+autovacuum (or VACUUM) has processed it, so the on-disk delta can lag behind
+the logical one.
+"""
+
+import logging
+import threading
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+
+from flask import Flask
+from sqlalchemy import bindparam, func, literal_column, select, update
+
+from ..models.agent import Agent
+from ..models.cold_storage import CODEC, compress_text
+from ..models.inference_call import INFERENCE_CALL_COLD_COLUMNS, InferenceCall
+from ..models.task import TASK_COLD_COLUMNS, Task
+from ..models.turn import TURN_COLD_COLUMNS, Turn
+
+logger = logging.getLogger(__name__)
+
+# Defaults (overridden by config.yaml → cold_storage section)
+DEFAULT_AFTER_DAYS = 30
+DEFAULT_MIN_BYTES = 1024
+DEFAULT_BATCH_SIZE = 500
+DEFAULT_INTERVAL_HOURS = 24
+
+_TIERED_MODELS = (
+    (Turn, TURN_COLD_COLUMNS),
+    (Task, TASK_COLD_COLUMNS),
+    (InferenceCall, INFERENCE_CALL_COLD_COLUMNS),
+)
+
+
+@dataclass
+class ColumnReport:
+    """What a tiering pass did to one column."""
+
+    rows: int = 0
+    raw_bytes: int = 0
+    compressed_bytes: int = 0
+
+
+@dataclass
+class TieringReport:
+    """Result of a single tiering pass."""
+
+    cutoff: datetime
+    dry_run: bool = False
+    codec: str = CODEC
+    columns: dict[str, ColumnReport] = field(default_factory=dict)
+    table_bytes_before: dict[str, int] = field(default_factory=dict)
+    table_bytes_after: dict[str, int] = field(default_factory=dict)
+    elapsed_seconds: float = 0.0
+
+    @property
+    def rows(self) -> int:
+        return sum(c.rows for c in self.columns.values())
+
+    @property
+    def raw_bytes(self) -> int:
+        return sum(c.raw_bytes for c in self.columns.values())
+
+    @property
+    def compressed_bytes(self) -> int:
+        return sum(c.compressed_bytes for c in self.columns.values())
+
+    @property
+    def reclaimed_bytes(self) -> int:
+        """Logical bytes saved: raw text minus its compressed form."""
+        return self.raw_bytes - self.compressed_bytes
+
+    def to_dict(self) -> dict:
+        return {
+            "cutoff": self.cutoff.isoformat(),
+            "dry_run": self.dry_run,
+            "codec": self.codec,
+            "rows": self.rows,
+            "raw_bytes": self.raw_bytes,
+            "compressed_bytes": self.compressed_bytes,
+            "reclaimed_bytes": self.reclaimed_bytes,
+            "columns": {
+                name: {
+                    "rows": c.rows,
+                    "raw_bytes": c.raw_bytes,
+                    "compressed_bytes": c.compressed_bytes,
+                }
+                for name, c in self.columns.items()
+            },
+            "table_bytes_before": self.table_bytes_before,
+            "table_bytes_after": self.table_bytes_after,
+            "elapsed_seconds": round(self.elapsed_seconds, 2),
+        }
+
+    def format(self) -> str:
+        """Human-readable summary for logs."""
+        ratio = self.compressed_bytes / self.raw_bytes if self.raw_bytes else 0.0
+        lines = [
+            f"Cold storage {'dry run' if self.dry_run else 'pass'} "
+            f"(cutoff {self.cutoff:%Y-%m-%d}, {self.codec}): {self.rows} values, "
+            f"{_mb(self.raw_bytes)} -> {_mb(self.compressed_bytes)} "
+            f"({ratio:.0%}), reclaimed {_mb(self.reclaimed_bytes)} "
+            f"in {self.elapsed_seconds:.1f}s"
+        ]
+        for name, c in self.columns.items():
+            if c.rows:
+                lines.append(
+                    f"  {name}: {c.rows} values, {_mb(c.raw_bytes)} -> {_mb(c.compressed_bytes)}"
+                )
+        for table, before in self.table_bytes_before.items():
+            after = self.table_bytes_after.get(table)
+            if after is not None:
+                lines.append(f"  {table} on disk: {_mb(before)} -> {_mb(after)}")
+        return "\n".join(lines)
+
+
+def _mb(n: int) -> str:
+    return f"{n / 1_048_576:.1f}MB"
+
+
+class ColdStorageService:
+    """Background service that moves old large text into compressed columns."""
+
+    def __init__(self, app: Flask | None, config: dict | None = None) -> None:
+        self._app = app
+        cold_config = (config or {}).get("cold_storage", {})
+        self.enabled = cold_config.get("enabled", True)
+        self.after_days = cold_config.get("after_days", DEFAULT_AFTER_DAYS)
+        self.min_bytes = cold_config.get("min_bytes", DEFAULT_MIN_BYTES)
+        self.batch_size = cold_config.get("batch_size", DEFAULT_BATCH_SIZE)
+        self.interval_hours = cold_config.get("interval_hours", DEFAULT_INTERVAL_HOURS)
+
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._passes = 0
+        self._total_rows = 0
+        self._total_reclaimed = 0
+        self._last_report: TieringReport | None = None
+
+    def start(self) -> None:
+        """Start the tiering background thread."""
+        if not self.enabled:
+            logger.info("Cold storage tiering disabled by config")
+            return
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(
+            target=self._loop, daemon=True, name="ColdStorage"
+        )
+        self._thread.start()
+        logger.info(
+            f"Cold storage tiering started (after_days={self.after_days}, "
+            f"min_bytes={self.min_bytes}, interval={self.interval_hours}h)"
+        )
+
+    def stop(self) -> None:
+        """Stop the tiering thread; an in-flight batch finishes first."""
+        self._stop_event.set()
+        if self._thread and self._thread.is_alive():
+            self._thread.join(timeout=30)
+        self._thread = None
+
+    def _loop(self) -> None:
+        while not self._stop_event.is_set():
+            try:
+                report = self.run_once()
+                if report.rows:
+                    logger.info(report.format())
+                else:
+                    logger.debug("Cold storage pass: nothing to move")
+            except Exception:
+                logger.exception("Cold storage pass failed")
+            self._stop_event.wait(timeout=self.interval_hours * 3600)
+
+    def run_once(
+        self, dry_run: bool = False, now: datetime | None = None, session=None
+    ) -> TieringReport:
+        """Run one tiering pass over every cold column.
+
+        Args:
+            dry_run: Measure what would move (including compressed size)
+                without writing anything
+            now: Reference time for the age cutoff (default: now)
+            session: SQLAlchemy session (default: db.session in a new app context)
+
+        Returns:
+            TieringReport for the pass
+        """
+        started = time.perf_counter()
+        now = now or datetime.now(timezone.utc)
+        report = TieringReport(cutoff=now - timedelta(days=self.after_days), dry_run=dry_run)
+
+        if session is not None:
+            self._run(session, report)
+        else:
+            with self._app.app_context():
+                from ..database import db
+                self._run(db.session, report)
+
+        report.elapsed_seconds = time.perf_counter() - started
+        with self._lock:
+            self._last_report = report
+            if not dry_run:
+                self._passes += 1
+                self._total_rows += report.rows
+                self._total_reclaimed += report.reclaimed_bytes
+        return report
+
+    def _run(self, session, report: TieringReport) -> None:
+        tables = [model.__tablename__ for model, _ in _TIERED_MODELS]
+        report.table_bytes_before = _table_sizes(session, tables)
+        for model, columns in _TIERED_MODELS:
+            for column, placeholder in columns:
+                if self._stop_event.is_set():
+                    return
+                report.columns[f"{model.__tablename__}.{column}"] = self._tier_column(
+                    session, model, column, placeholder, report.cutoff, report.dry_run
+                )
+        report.table_bytes_after = _table_sizes(session, tables)
+
+    def _tier_column(self, session, model, column: str, placeholder, cutoff, dry_run) -> ColumnReport:
+        """Compress one column in id-ordered batches, committing each batch."""
+        result = ColumnReport()
+        table = model.__table__
+        raw = table.c[column]
+        compressed = table.c[f"{column}_compressed"]
+
+        ended_agents = select(Agent.id).where(Agent.ended_at < cutoff)
+        if model is Turn:
+            owned = table.c.task_id.in_(select(Task.id).where(Task.agent_id.in_(ended_agents)))
+        else:
+            owned = table.c.agent_id.in_(ended_agents)
+
+        candidates = (
+            select(table.c.id, raw)
+            .where(owned, compressed.is_(None), func.octet_length(raw) >= self.min_bytes)
+            .order_by(table.c.id)
+            .limit(self.batch_size)
+        )
+        move = (
+            update(table)
+            .where(table.c.id == bindparam("_id"), compressed.is_(None))
+            .values({column: placeholder, compressed.name: bindparam("_blob")})
+            .execution_options(synchronize_session=False)
+        )
+
+        last_id = 0
+        while not self._stop_event.is_set():
+            rows = session.execute(candidates.where(table.c.id > last_id)).all()
+            if not rows:
+                break
+            last_id = rows[-1][0]
+            params = []
+            for row_id, text in rows:
+                blob = compress_text(text)
+                result.rows += 1
+                result.raw_bytes += len(text.encode("utf-8"))
+                result.compressed_bytes += len(blob)
+                params.append({"_id": row_id, "_blob": blob})
+            if dry_run:
+                continue
+            try:
+                session.connection().execute(move, params)
+                session.commit()
+            except Exception:
+                session.rollback()
+                raise
+        return result
+
+    @property
+    def last_report(self) -> TieringReport | None:
+        with self._lock:
+            return self._last_report
+
+    @property
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "enabled": self.enabled,
+                "after_days": self.after_days,
+                "codec": CODEC,
+                "passes": self._passes,
+                "rows_moved": self._total_rows,
+                "reclaimed_bytes": self._total_reclaimed,
+                "last_report": self._last_report.to_dict() if self._last_report else None,
+            }
+
+
+def _table_sizes(session, tables: list[str]) -> dict[str, int]:
+    """On-disk size of each table including TOAST and indexes (PostgreSQL only)."""
+    if session.get_bind().dialect.name != "postgresql":
+        return {}
+    return {
+        table: session.execute(
+            select(func.pg_total_relation_size(literal_column(f"'{table}'::regclass")))
+        ).scalar() or 0
+        for table in tables
+    }
@@ -120,9 +120,9 @@ CONFIG_SCHEMA = [
             FieldSchema("enabled", "boolean", "Enable file watcher (fallback monitoring)", default=False,
                          help_text="Enable background filesystem polling of .jsonl and transcript files. This is a fallback mechanism that catches events hooks miss. Disabled by default since Claude Code hooks are the primary event path. Enable if you notice missed events or are not using hooks."),
             FieldSchema("polling_interval", "float", "Polling interval in seconds", min_value=0.1, max_value=60, default=2,
-                         help_text="How often to check for file changes. Lower values detect changes faster but use more CPU. Too low (< 0.5s) causes excessive disk I/O. Too high (> 10s) makes the dashboard feel sluggish."),
+                         help_text="How often to run housekeeping such as session inactivity checks. File changes themselves are picked up from filesystem events, so this does not affect detection latency."),
             FieldSchema("reconciliation_interval", "integer", "Reconciliation interval in seconds", min_value=10, max_value=600, default=60,
-                         help_text="How often to run a full reconciliation scan to catch any missed events. This is a safety net for the event-driven watcher. Lower values improve reliability but increase CPU usage."),
+                         help_text="How often to re-list watched project directories (size/mtime only, no file reads) to catch any missed filesystem events. This is a safety net for the event-driven watcher."),
             FieldSchema("inactivity_timeout", "integer", "Inactivity timeout in seconds", min_value=60, max_value=86400, default=5400,
                          help_text="Stop watching a session after this much inactivity (default: 90 minutes). Prevents stale watchers from accumulating. Increase for long-running sessions that may pause."),
             FieldSchema("debounce_interval", "float", "Debounce interval in seconds", min_value=0.1, max_value=10, default=0.5,
@@ -267,6 +267,23 @@ CONFIG_SCHEMA = [
                          help_text="Delete archives older than this many days when using the 'days' retention policy. Does not apply when policy is 'keep_all' or 'keep_last_n'."),
         ],
     ),
+    SectionSchema(
+        name="cold_storage",
+        title="Cold Storage",
+        section_description="Compresses the large text (turns, task output, inference prompts) of agents that ended long ago. Compressed text is still shown everywhere; it is decompressed on read.",
+        fields=[
+            FieldSchema("enabled", "boolean", "Enable cold storage tiering", default=True,
+                         help_text="When enabled, a background job periodically moves the text of long-ended agents into compressed columns. Disable to keep all text uncompressed."),
+            FieldSchema("after_days", "integer", "Compress agents ended more than this many days ago", min_value=1, max_value=3650, default=30,
+                         help_text="Only agents that ended at least this long ago are compressed. Lower values save space sooner; their text costs slightly more to read."),
+            FieldSchema("min_bytes", "integer", "Minimum value size in bytes", min_value=0, max_value=1048576, default=1024,
+                         help_text="Values shorter than this stay uncompressed. Short text gains little from compression."),
+            FieldSchema("batch_size", "integer", "Rows per batch", min_value=10, max_value=10000, default=500,
+                         help_text="How many rows are compressed and committed at a time. Larger batches finish faster but hold locks longer."),
+            FieldSchema("interval_hours", "integer", "Hours between tiering passes", min_value=1, max_value=720, default=24,
+                         help_text="How often the tiering job runs. Each pass reports the space it reclaimed in the server log and on /health."),
+        ],
+    ),
     SectionSchema(
         name="commander",
         title="Commander (Input Bridge)",
@@ -357,6 +374,9 @@ CONFIG_SCHEMA = [
             FieldSchema("timeout", "integer", "Request timeout (seconds)",
                          min_value=1, max_value=300, default=30,
                          help_text="Maximum seconds to wait for an LLM API response. Increase for complex prompts or during high API load. Too low causes frequent timeouts, too high blocks the inference queue."),
+            FieldSchema("pool_size", "integer", "HTTP connection pool size",
+                         min_value=1, max_value=100, default=10,
+                         help_text="Keep-alive connections held open to OpenRouter. Reusing a connection skips TCP and TLS setup on each call. Should be at least the number of inference calls you expect to run concurrently. Takes effect on restart."),
             FieldSchema("models.turn", "string", "Model for turn summaries",
                          default="anthropic/claude-3-haiku",
                          help_text="LLM model used for individual turn summaries and frustration scoring. Use a fast, cheap model (e.g. Haiku) since these are high-frequency calls."),
@@ -375,12 +395,33 @@ CONFIG_SCHEMA = [
             FieldSchema("rate_limits.tokens_per_minute", "integer", "Max tokens per minute",
                          min_value=1, max_value=1000000, default=50000,
                          help_text="Maximum tokens (input + output) per minute. Works alongside the calls-per-minute limit. Increase if large prompts are being throttled."),
+            FieldSchema("rate_limits.interactive_reserve", "float", "Interactive reserve",
+                         min_value=0, max_value=0.9, default=0.2,
+                         help_text="Fraction of the calls-per-minute budget that background work (priority scoring, progress summaries) must leave unused, so permission summaries and intent classification never queue behind it. Per-class wait times are set under rate_limits.max_wait_seconds in config.yaml."),
             FieldSchema("cache.enabled", "boolean", "Enable inference result caching",
                          default=True,
                          help_text="Cache LLM responses using content-based hashing. Avoids redundant API calls for identical prompts. Disable if you need fresh responses every time."),
             FieldSchema("cache.ttl_seconds", "integer", "Cache TTL (seconds)",
                          min_value=1, max_value=3600, default=300,
                          help_text="How long cached inference results remain valid (default: 5 minutes). Shorter TTL means more API calls but fresher results. Longer TTL saves costs but may return stale summaries."),
+            FieldSchema("cache.max_entries", "integer", "In-memory cache size",
+                         min_value=1, max_value=100000, default=500,
+                         help_text="Maximum inference results held in memory. The least recently used entry is evicted first."),
+            FieldSchema("cache.persistent", "boolean", "Persistent inference cache",
+                         default=True,
+                         help_text="On an in-memory miss, reuse a recent successful result for the same prompt from the inference call log. Keeps summaries cached across server restarts."),
+            FieldSchema("cache.persistent_ttl_seconds", "integer", "Persistent cache TTL (seconds)",
+                         min_value=0, max_value=2592000, default=86400,
+                         help_text="How old a logged result may be and still be reused (default: 1 day). Per-purpose overrides are set under cache.purpose_ttl_seconds in config.yaml."),
+            FieldSchema("batching.enabled", "boolean", "Batch summarisation calls",
+                         default=True,
+                         help_text="Combine turn, permission, instruction and completion summaries requested at the same moment into one LLM call. Keeps bursts of activity under the calls-per-minute limit."),
+            FieldSchema("batching.window_ms", "integer", "Batch window (ms)",
+                         min_value=0, max_value=5000, default=150,
+                         help_text="How long the first summary in a burst waits for others to join its batch. Adds up to this much latency per summary."),
+            FieldSchema("batching.max_items", "integer", "Max items per batch",
+                         min_value=1, max_value=50, default=8,
+                         help_text="Largest number of summaries sent in one call. Set to 1 to disable batching."),
             FieldSchema("retry.max_attempts", "integer", "Max retry attempts",
                          min_value=1, max_value=10, default=3,
                          help_text="Number of times to retry a failed LLM API call. Handles transient network errors and rate limit responses. Higher values improve reliability but delay failure detection."),
@@ -1,15 +1,17 @@
 """File watcher service — fallback monitoring for Claude Code session files.
 
 This is a redundancy/robustification mechanism that catches events Claude Code
-hooks miss. It monitors .jsonl and transcript files via filesystem polling
-(Watchdog + periodic reconciliation) and has historically caught events that
-hooks missed due to timing, crashes, or misconfiguration.
+hooks miss. It monitors .jsonl and transcript files via filesystem events
+(Watchdog: inotify/FSEvents, one watch per project directory) with a cheap
+periodic reconciliation scan, and has historically caught events that hooks
+missed due to timing, crashes, or misconfiguration.
 
 The file watcher is DISABLED by default since hooks are the primary event path.
 Enable via ``file_watcher.enabled: true`` in config.yaml or the /config dashboard.
 
 Provides two modes of operation:
-1. Session file monitoring via Watchdog + polling
+1. Session file monitoring via Watchdog events, backed by a batched
+   os.scandir() size/mtime scan of the watched directories (no file reads)
 2. Content pipeline: transcript monitoring, regex question detection,
    and timeout-gated inference for AWAITING_INPUT detection
 """
@@ -22,7 +24,7 @@ from datetime import datetime, timezone
 from typing import Any, Callable, Optional
 from uuid import UUID
 
-from watchdog.events import FileModifiedEvent, FileSystemEventHandler
+from watchdog.events import FileSystemEvent, FileSystemEventHandler
 from watchdog.observers import Observer
 
 from .git_metadata import GitMetadata
@@ -54,23 +56,31 @@ class FileWatcher:
         debounce_interval: float = 0.5,
         awaiting_input_timeout: float = DEFAULT_AWAITING_INPUT_TIMEOUT,
         app: Any = None,
+        reconciliation_interval: float = 60.0,
+        session_index: Any = None,
     ) -> None:
         """
         Initialize the file watcher.
 
         Args:
             projects_path: Path to Claude Code projects directory
-            polling_interval: Polling interval in seconds (fallback mode)
+            polling_interval: Housekeeping interval in seconds (inactivity checks)
             inactivity_timeout: Session inactivity timeout in seconds
             debounce_interval: Debounce interval for rapid file changes
             awaiting_input_timeout: Seconds before inference check on stalled transcript
+            reconciliation_interval: Seconds between fallback directory scans
+                for changes Watchdog did not report
+            session_index: Optional SessionIndex used to resolve jsonl files
+                without listing project folders
         """
         self._projects_path = os.path.expanduser(projects_path)
         self._polling_interval = polling_interval
+        self._reconciliation_interval = reconciliation_interval
         self._inactivity_timeout = inactivity_timeout
         self._debounce_interval = debounce_interval
         self._awaiting_input_timeout = awaiting_input_timeout
         self._app = app
+        self._session_index = session_index
 
         self._registry = SessionRegistry()
         self._git_metadata = GitMetadata()
@@ -79,6 +89,8 @@ class FileWatcher:
         self._observer: Optional[Observer] = None
         self._polling_thread: Optional[threading.Thread] = None
         self._stop_event = threading.Event()
+        # Wakes the polling loop early (new debounced change, interval change)
+        self._wake_event = threading.Event()
         self._running = False
 
         # Event callbacks
@@ -90,11 +102,22 @@ class FileWatcher:
         self._pending_files: dict[str, float] = {}
         self._debounce_lock = threading.Lock()
 
-        # Watchdog watches per session (for cleanup on unregister)
-        self._watches: dict[UUID, object] = {}  # session_uuid -> ObservedWatch
-
-        # Content pipeline: transcript monitoring
-        self._transcript_positions: dict[int, int] = {}  # agent_id -> file byte position
+        # One Watchdog watch per project directory, shared by every session
+        # whose jsonl file lives there. _watched_files maps each watched
+        # jsonl path to its sessions; _file_stats holds the (size, mtime_ns)
+        # last seen for it, compared by the fallback scan.
+        self._watch_lock = threading.Lock()
+        self._dir_watches: dict[str, object] = {}  # directory -> ObservedWatch
+        self._watched_files: dict[str, set[UUID]] = {}
+        self._session_files: dict[UUID, str] = {}
+        self._file_stats: dict[str, tuple[int, int]] = {}
+
+        # Content pipeline: transcript monitoring. Positions are kept as
+        # subscriptions on the shared transcript tailer, keyed by
+        # ("file_watcher", agent_id).
+        from .transcript_tailer import get_transcript_tailer
+
+        self._tailer = get_transcript_tailer()
         self._pending_inference_timers: dict[int, threading.Timer] = {}  # agent_id -> timer
         self._timer_lock = threading.Lock()
 
@@ -129,12 +152,15 @@ class FileWatcher:
         self._stop_event.clear()
         self._running = True
 
-        # Start Watchdog observer
+        # Start Watchdog observer and watch directories registered so far
         self._observer = Observer()
         self._observer.start()
+        with self._watch_lock:
+            for directory in {os.path.dirname(p) for p in self._watched_files}:
+                self._schedule_directory(directory)
         logger.info("Watchdog observer started")
 
-        # Start polling thread for inactivity checks and fallback polling
+        # Start polling thread for inactivity checks and the fallback scan
         self._polling_thread = threading.Thread(
             target=self._polling_loop, daemon=True, name="FileWatcher-Polling"
         )
@@ -148,12 +174,15 @@ class FileWatcher:
 
         self._running = False
         self._stop_event.set()
+        self._wake_event.set()
 
         # Stop Watchdog observer
         if self._observer:
             self._observer.stop()
             self._observer.join(timeout=5)
             self._observer = None
+            with self._watch_lock:
+                self._dir_watches.clear()
             logger.info("Watchdog observer stopped")
 
         # Wait for polling thread
@@ -170,6 +199,10 @@ class FileWatcher:
 
         # Clear parsers
         self._parsers.clear()
+        with self._watch_lock:
+            self._watched_files.clear()
+            self._session_files.clear()
+            self._file_stats.clear()
 
     def register_session(
         self,
@@ -198,7 +231,7 @@ class FileWatcher:
         )
 
         # Locate and set jsonl file path
-        jsonl_path = locate_jsonl_file(working_directory, self._projects_path)
+        jsonl_path = self._locate_jsonl_file(working_directory)
         if jsonl_path:
             self._registry.update_jsonl_path(session_uuid, jsonl_path)
             self._setup_file_watch(session_uuid, jsonl_path)
@@ -216,22 +249,31 @@ class FileWatcher:
         Returns:
             True if session was unregistered
         """
-        # Remove parser
+        # Remove parser and release the directory watch
         self._parsers.pop(session_uuid, None)
-
-        # Unschedule the watchdog handler to prevent handler accumulation
-        watch = self._watches.pop(session_uuid, None)
-        if watch and self._observer:
-            try:
-                self._observer.unschedule(watch)
-            except Exception:
-                pass  # Observer may already be stopped
+        self._unwatch_session_file(session_uuid)
 
         result = self._registry.unregister_session(session_uuid)
         if result:
             logger.info(f"Session unregistered: {session_uuid}")
         return result
 
+    def _locate_jsonl_file(self, working_directory: str) -> str | None:
+        """Most recent jsonl file for a working directory.
+
+        An index lookup once the session index is built; a folder listing
+        before that, without an index, or when the index misses while it is
+        not watching the projects directory.
+        """
+        index = self._session_index
+        if index is not None and index.ready:
+            path = index.latest_for_directory(working_directory)
+            if path is not None or index.watching:
+                return path
+            if index.retry_watch():
+                return index.latest_for_directory(working_directory)
+        return locate_jsonl_file(working_directory, self._projects_path)
+
     def get_registered_sessions(self) -> list[RegisteredSession]:
         """Get all registered sessions."""
         return self._registry.get_registered_sessions()
@@ -251,11 +293,19 @@ class FileWatcher:
             seconds: New polling interval in seconds
         """
         self._polling_interval = seconds
+        self._wake_event.set()
         logger.info(f"Polling interval set to {seconds} seconds")
 
     def _setup_file_watch(self, session_uuid: UUID, jsonl_path: str) -> None:
-        """Set up Watchdog watch for a jsonl file."""
-        if not self._observer or not os.path.exists(jsonl_path):
+        """Start following a session's jsonl file.
+
+        The file's project directory gets a Watchdog watch unless another
+        session already holds one; directories are watched once the observer
+        starts if it is not running yet.
+        """
+        try:
+            stat = os.stat(jsonl_path)
+        except OSError:
             return
 
         # Create parser for this file
@@ -264,34 +314,81 @@ class FileWatcher:
         parser.read_new_lines()
         self._parsers[session_uuid] = parser
 
-        # Set up Watchdog handler for the directory
-        directory = os.path.dirname(jsonl_path)
-        handler = _SessionFileHandler(
-            session_uuid=session_uuid,
-            jsonl_path=jsonl_path,
-            file_watcher=self,
-        )
-        watch = self._observer.schedule(handler, directory, recursive=False)
-        self._watches[session_uuid] = watch
+        self._unwatch_session_file(session_uuid)
+        with self._watch_lock:
+            self._session_files[session_uuid] = jsonl_path
+            self._watched_files.setdefault(jsonl_path, set()).add(session_uuid)
+            self._file_stats[jsonl_path] = (stat.st_size, stat.st_mtime_ns)
+            if self._observer:
+                self._schedule_directory(os.path.dirname(jsonl_path))
+
+    def _schedule_directory(self, directory: str) -> None:
+        """Add the Watchdog watch for a project directory (watch lock held)."""
+        if directory in self._dir_watches or not self._observer:
+            return
+        try:
+            handler = _ProjectDirectoryHandler(directory=directory, file_watcher=self)
+            self._dir_watches[directory] = self._observer.schedule(
+                handler, directory, recursive=False
+            )
+        except Exception as e:
+            # The fallback scan still covers the directory
+            logger.warning(f"Could not watch {directory}: {e}")
+
+    def _unwatch_session_file(self, session_uuid: UUID) -> None:
+        """Stop following a session's file, dropping unused directory watches."""
+        with self._watch_lock:
+            path = self._session_files.pop(session_uuid, None)
+            if path is None:
+                return
+            sessions = self._watched_files.get(path)
+            if sessions is not None:
+                sessions.discard(session_uuid)
+                if not sessions:
+                    del self._watched_files[path]
+                    self._file_stats.pop(path, None)
+
+            directory = os.path.dirname(path)
+            if any(os.path.dirname(p) == directory for p in self._watched_files):
+                return
+            watch = self._dir_watches.pop(directory, None)
+        if watch and self._observer:
+            try:
+                self._observer.unschedule(watch)
+            except Exception:
+                pass  # Observer may already be stopped
 
     def _polling_loop(self) -> None:
-        """Background polling loop for inactivity checks and fallback polling."""
+        """Background loop: debounced changes, inactivity checks, fallback scan.
+
+        File changes arrive as Watchdog events; the loop only wakes for them
+        once their debounce window has passed. Every reconciliation_interval
+        the watched directories are re-listed to catch missed events.
+        """
+        next_housekeeping = 0.0
+        next_scan = time.monotonic() + self._reconciliation_interval
         while not self._stop_event.is_set():
+            self._wake_event.clear()
             try:
-                # Check for inactive sessions
-                self._check_inactive_sessions()
+                now = time.monotonic()
+                if now >= next_housekeeping:
+                    self._check_inactive_sessions()
+                    next_housekeeping = now + self._polling_interval
+                if now >= next_scan:
+                    self._scan_watched_files()
+                    next_scan = now + self._reconciliation_interval
 
                 # Process any debounced file changes
                 self._process_debounced_changes()
 
-                # Fallback polling for sessions without Watchdog events
-                self._poll_all_sessions()
-
             except Exception as e:
                 logger.error(f"Error in polling loop: {e}")
 
-            # Wait for next poll
-            self._stop_event.wait(self._polling_interval)
+            timeout = min(next_housekeeping, next_scan) - time.monotonic()
+            with self._debounce_lock:
+                if self._pending_files:
+                    timeout = min(timeout, self._debounce_interval)
+            self._wake_event.wait(max(timeout, 0.0))
 
     def _check_inactive_sessions(self) -> None:
         """Check for and handle inactive sessions."""
@@ -300,12 +397,36 @@ class FileWatcher:
             self._emit_session_ended(session, reason="timeout")
             self._registry.unregister_session(session.session_uuid)
             self._parsers.pop(session.session_uuid, None)
+            self._unwatch_session_file(session.session_uuid)
             logger.info(f"Session timed out: {session.session_uuid}")
 
-    def _poll_all_sessions(self) -> None:
-        """Poll all registered sessions for new content."""
-        for session in self._registry.get_registered_sessions():
-            self._process_session_file(session.session_uuid)
+    def _scan_watched_files(self) -> None:
+        """Fallback for missed Watchdog events.
+
+        Lists each watched directory once with os.scandir() and compares
+        size/mtime against what was last seen; only files that changed are
+        queued for reading.
+        """
+        with self._watch_lock:
+            by_directory: dict[str, set[str]] = {}
+            for path in self._watched_files:
+                by_directory.setdefault(os.path.dirname(path), set()).add(path)
+
+        for directory, paths in by_directory.items():
+            try:
+                with os.scandir(directory) as it:
+                    for entry in it:
+                        if entry.path not in paths:
+                            continue
+                        stat = entry.stat()
+                        signature = (stat.st_size, stat.st_mtime_ns)
+                        with self._watch_lock:
+                            if self._file_stats.get(entry.path) == signature:
+                                continue
+                            self._file_stats[entry.path] = signature
+                        self._schedule_debounced_change(entry.path)
+            except OSError as e:
+                logger.debug(f"Fallback scan skipped {directory}: {e}")
 
     def _process_session_file(self, session_uuid: UUID) -> None:
         """Process new content in a session's jsonl file."""
@@ -340,14 +461,20 @@ class FileWatcher:
         """Schedule a file change for debounced processing."""
         with self._debounce_lock:
             self._pending_files[path] = time.time()
+        self._wake_event.set()
 
     def _handle_file_change(self, path: str) -> None:
         """Handle a file change event (after debouncing)."""
-        # Find session for this file
-        for session_uuid, parser in self._parsers.items():
-            if parser.file_path == path:
-                self._process_session_file(session_uuid)
-                break
+        with self._watch_lock:
+            sessions = list(self._watched_files.get(path, ()))
+            # Record what was read so the fallback scan doesn't queue it again
+            try:
+                stat = os.stat(path)
+                self._file_stats[path] = (stat.st_size, stat.st_mtime_ns)
+            except OSError:
+                pass
+        for session_uuid in sessions:
+            self._process_session_file(session_uuid)
 
     # --- Content Pipeline Methods ---
 
@@ -368,8 +495,9 @@ class FileWatcher:
 
         # Set initial position to end of file (don't process existing content)
         try:
-            file_size = os.path.getsize(transcript_path)
-            self._transcript_positions[agent_id] = file_size
+            file_size = self._tailer.subscribe(
+                ("file_watcher", agent_id), transcript_path
+            )
             logger.info(
                 f"Transcript registered for agent_id={agent_id}: "
                 f"{transcript_path} (position={file_size})"
@@ -379,7 +507,7 @@ class FileWatcher:
 
     def unregister_transcript(self, agent_id: int) -> None:
         """Unregister a transcript from content pipeline monitoring."""
-        self._transcript_positions.pop(agent_id, None)
+        self._tailer.unsubscribe(("file_watcher", agent_id))
         self.cancel_inference_timer(agent_id)
 
     def check_transcript_for_questions(
@@ -400,13 +528,7 @@ class FileWatcher:
         Returns:
             True if a question was detected (regex), False otherwise
         """
-        from .transcript_reader import read_new_entries_from_position
-
-        position = self._transcript_positions.get(agent_id, 0)
-        entries, new_position = read_new_entries_from_position(
-            transcript_path, position
-        )
-        self._transcript_positions[agent_id] = new_position
+        entries = self._tailer.poll(("file_watcher", agent_id), transcript_path)
 
         if not entries:
             return False
@@ -595,25 +717,37 @@ class FileWatcher:
                 logger.error(f"Error in session_ended callback: {e}")
 
 
-class _SessionFileHandler(FileSystemEventHandler):
-    """Watchdog event handler for session jsonl files."""
+class _ProjectDirectoryHandler(FileSystemEventHandler):
+    """Watchdog event handler for one project directory.
 
-    def __init__(
-        self, session_uuid: UUID, jsonl_path: str, file_watcher: FileWatcher
-    ) -> None:
+    Shared by all sessions whose jsonl files live in the directory; events
+    for files nobody is following are ignored.
+    """
+
+    def __init__(self, directory: str, file_watcher: FileWatcher) -> None:
         super().__init__()
-        self._session_uuid = session_uuid
-        self._jsonl_path = jsonl_path
+        self._directory = directory
         self._file_watcher = file_watcher
 
-    def on_modified(self, event: FileModifiedEvent) -> None:
+    def on_modified(self, event: FileSystemEvent) -> None:
         """Handle file modification event."""
-        if event.is_directory:
-            return
+        if not event.is_directory:
+            self._schedule(event.src_path)
+
+    def on_created(self, event: FileSystemEvent) -> None:
+        """Handle a file being recreated (e.g. rewritten via rename)."""
+        if not event.is_directory:
+            self._schedule(event.src_path)
+
+    def on_moved(self, event: FileSystemEvent) -> None:
+        """Handle a file being atomically replaced."""
+        if not event.is_directory:
+            self._schedule(event.dest_path)
 
-        if event.src_path == self._jsonl_path:
+    def _schedule(self, path: str) -> None:
+        if path in self._file_watcher._watched_files:
             # Schedule debounced processing
-            self._file_watcher._schedule_debounced_change(event.src_path)
+            self._file_watcher._schedule_debounced_change(path)
 
 
 def init_file_watcher(app: Any, config: dict) -> FileWatcher:
@@ -635,12 +769,14 @@ def init_file_watcher(app: Any, config: dict) -> FileWatcher:
     watcher = FileWatcher(
         projects_path=projects_path,
         polling_interval=fw_config["polling_interval"],
+        reconciliation_interval=fw_config["reconciliation_interval"],
         inactivity_timeout=fw_config["inactivity_timeout"],
         debounce_interval=fw_config["debounce_interval"],
         awaiting_input_timeout=fw_config.get(
             "awaiting_input_timeout", DEFAULT_AWAITING_INPUT_TIMEOUT
         ),
         app=app,
+        session_index=app.extensions.get("session_index"),
     )
 
     app.extensions["file_watcher"] = watcher
@@ -0,0 +1,195 @@
+"""Rendered-fragment cache for agent card partials.
+
+A full dashboard render includes _agent_card.html once per live agent (and
+again per view). Most cards are unchanged between renders, so the rendered
+HTML is cached under (agent_id, card version, template hash):
+
+- card version: digest of the agent's card data dict plus the render inputs
+  the partial reads from the page context (context thresholds), so any data
+  change produces a new key and no explicit invalidation is needed. The
+  minute-granular display strings (last seen, uptime, elapsed) are left out
+  whenever their raw timestamp is present: the partial then renders only the
+  timestamp and the client-side ticker formats it, so the key doesn't roll
+  over every minute;
+- template hash: digest of the partial's source, so an edited template
+  (auto-reload in debug) never serves stale markup.
+
+Entries are evicted least-recently-used once the cache exceeds its byte
+budget. Hit rate and the render time saved by hits are reported via stats.
+"""
+
+import hashlib
+import logging
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+
+from markupsafe import Markup
+
+logger = logging.getLogger(__name__)
+
+AGENT_CARD_TEMPLATE = "partials/_agent_card.html"
+
+DEFAULT_MAX_BYTES = 8 * 1024 * 1024
+
+# Page-context variables the agent card partial reads besides `agent`
+_CARD_CONTEXT_KEYS = ("context_thresholds",)
+
+# Display strings the partial only renders when their raw timestamp is missing
+_TICKER_FIELDS = {
+    "last_seen": "last_seen_at",
+    "uptime": "started_at",
+    "elapsed": "task_started_at",
+}
+
+
+@dataclass
+class _Fragment:
+    html: str
+    render_seconds: float
+
+
+def _digest(value) -> str:
+    return hashlib.blake2b(repr(value).encode("utf-8"), digest_size=16).hexdigest()
+
+
+def card_version(agent: dict, extra: dict | None = None) -> str:
+    """Digest of everything that affects a card's rendered HTML."""
+    items = [
+        (key, value) for key, value in agent.items()
+        if not (key in _TICKER_FIELDS and agent.get(_TICKER_FIELDS[key]))
+    ]
+    return _digest((sorted(items), sorted((extra or {}).items())))
+
+
+class FragmentCache:
+    """Thread-safe, byte-bounded LRU cache of rendered template fragments."""
+
+    def __init__(self, config: dict | None = None):
+        cache_config = (config or {}).get("fragment_cache", {})
+        self.enabled = cache_config.get("enabled", True)
+        self.max_bytes = cache_config.get("max_bytes", DEFAULT_MAX_BYTES)
+        self._fragments: OrderedDict[tuple, _Fragment] = OrderedDict()
+        # Only the latest key per agent is worth keeping; older versions are
+        # dropped on insert instead of waiting for LRU eviction.
+        self._latest_key: dict = {}
+        self._total_bytes = 0
+        self._template_hashes: dict[str, tuple[str, object]] = {}
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._render_seconds = 0.0
+        self._saved_seconds = 0.0
+
+    def template_hash(self, env, name: str) -> str:
+        """Digest of a template's source, recomputed when it changes on disk."""
+        cached = self._template_hashes.get(name)
+        if cached is not None:
+            digest, uptodate = cached
+            if uptodate is None or not env.auto_reload or uptodate():
+                return digest
+        source, _, uptodate = env.loader.get_source(env, name)
+        digest = hashlib.blake2b(source.encode("utf-8"), digest_size=16).hexdigest()
+        self._template_hashes[name] = (digest, uptodate)
+        return digest
+
+    def get(self, key: tuple) -> str | None:
+        with self._lock:
+            fragment = self._fragments.get(key)
+            if fragment is None:
+                self._misses += 1
+                return None
+            self._fragments.move_to_end(key)
+            self._hits += 1
+            self._saved_seconds += fragment.render_seconds
+            return fragment.html
+
+    def put(self, key: tuple, html: str, render_seconds: float) -> None:
+        owner = key[0]
+        size = len(html)
+        with self._lock:
+            self._render_seconds += render_seconds
+            if size > self.max_bytes:
+                return
+            stale = self._latest_key.get(owner)
+            if stale is not None and stale != key:
+                self._drop(stale)
+            if key in self._fragments:
+                self._drop(key)
+            self._fragments[key] = _Fragment(html=html, render_seconds=render_seconds)
+            self._latest_key[owner] = key
+            self._total_bytes += size
+            while self._total_bytes > self.max_bytes and self._fragments:
+                oldest = next(iter(self._fragments))
+                self._drop(oldest)
+                self._evictions += 1
+
+    def _drop(self, key: tuple) -> None:
+        """Remove an entry (lock held)."""
+        fragment = self._fragments.pop(key, None)
+        if fragment is None:
+            return
+        self._total_bytes -= len(fragment.html)
+        if self._latest_key.get(key[0]) == key:
+            del self._latest_key[key[0]]
+
+    def render(self, env, template_name: str, owner, version: str, context: dict) -> Markup:
+        """Return a fragment's HTML, rendering and caching it on a miss."""
+        template = env.get_template(template_name)
+        if not self.enabled:
+            return Markup(template.render(context))
+
+        key = (owner, version, self.template_hash(env, template_name))
+        html = self.get(key)
+        if html is None:
+            started = time.perf_counter()
+            html = template.render(context)
+            self.put(key, html, time.perf_counter() - started)
+        return Markup(html)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._fragments.clear()
+            self._latest_key.clear()
+            self._total_bytes = 0
+
+    @property
+    def stats(self) -> dict:
+        """Return cache statistics, including render time saved by hits."""
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "enabled": self.enabled,
+                "entries": len(self._fragments),
+                "total_bytes": self._total_bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_rate": round(self._hits / lookups, 4) if lookups else 0.0,
+                "evictions": self._evictions,
+                "render_ms": round(self._render_seconds * 1000, 2),
+                "render_ms_saved": round(self._saved_seconds * 1000, 2),
+            }
+
+
+def render_agent_card(ctx, agent: dict, cache: FragmentCache | None = None) -> Markup:
+    """Render the agent card partial for `agent` within a template context.
+
+    Equivalent to ``{% include "partials/_agent_card.html" %}`` with `agent`
+    in scope, served from `cache` when one is given.
+    """
+    context = dict(ctx.get_all())
+    context["agent"] = agent
+    if cache is None:
+        return Markup(ctx.environment.get_template(AGENT_CARD_TEMPLATE).render(context))
+
+    extra = {key: context.get(key) for key in _CARD_CONTEXT_KEYS}
+    return cache.render(
+        ctx.environment,
+        AGENT_CARD_TEMPLATE,
+        owner=agent.get("id"),
+        version=card_version(agent, extra),
+        context=context,
+    )
@@ -60,7 +60,7 @@ def _execute_pending_summarisations(pending: list) -> None:
         from flask import current_app
         service = current_app.extensions.get("summarisation_service")
         if service:
-            service.execute_pending(pending, db.session)
+            service.submit_pending(pending, db.session)
     except Exception as e:
         logger.warning(f"Post-commit summarisation failed (non-fatal): {e}")
 
@@ -117,7 +117,7 @@ def _execute_pending_summarisations(pending: list) -> None:
         from flask import current_app
         service = current_app.extensions.get("summarisation_service")
         if service:
-            service.execute_pending(pending, db.session)
+            service.submit_pending(pending, db.session)
     except Exception as e:
         logger.warning(f"Post-commit summarisation failed (non-fatal): {e}")
 
@@ -635,11 +635,12 @@ def process_session_end(
         # Phase 2: Reconcile JSONL transcript to backfill missed turns
         try:
             from .transcript_reconciler import reconcile_agent_session, broadcast_reconciliation
-            recon_result = reconcile_agent_session(agent)
-            if recon_result["created"]:
+            recon_result = reconcile_agent_session(agent, batch=True)
+            if recon_result["created"] or recon_result["updated"]:
                 logger.info(
                     f"session_end reconciliation: agent_id={agent.id}, "
-                    f"created={len(recon_result['created'])} turns from JSONL"
+                    f"created={len(recon_result['created'])} turns from JSONL, "
+                    f"corrected={len(recon_result['updated'])} timestamps"
                 )
         except Exception as e:
             recon_result = None
@@ -650,9 +651,9 @@ def process_session_end(
         _execute_pending_summarisations(pending)
 
         # Phase 3: Broadcast reconciliation results after commit
-        if recon_result and recon_result.get("created"):
+        if recon_result and (recon_result.get("created") or recon_result.get("updated")):
             try:
-                broadcast_reconciliation(agent, recon_result)
+                broadcast_reconciliation(agent, recon_result, aggregate=True)
             except Exception as e:
                 logger.warning(f"Session-end reconciliation broadcast failed: {e}")
 
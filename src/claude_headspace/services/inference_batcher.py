@@ -0,0 +1,291 @@
+"""Batches concurrent summarisation calls into one multi-item prompt.
+
+Every turn, permission and instruction summary is its own LLM call and its
+own slot against ``rate_limits.calls_per_minute``, so a burst of hooks can
+exhaust the limit and drop summaries. ``InferenceBatcher`` wraps
+``InferenceService`` with the same ``infer()`` signature. Calls for a
+batchable purpose that arrive within a short window of each other are sent
+together as one ``summarise_batch`` prompt that asks for a JSON object
+keyed by item id. Each caller gets back an ordinary ``InferenceResult``
+holding only its own answer, so the summarisation parsers run unchanged.
+An item missing from the batch response falls back to its own call.
+
+The batch request itself is neither cached nor logged. Each answered item
+is cached and logged as its own inference_calls row, with its own purpose,
+ids and a share of the batch's tokens. The request waits for rate-limit
+capacity at the highest priority class among its items, so an interactive
+permission summary does not queue behind background work.
+"""
+
+import json
+import logging
+import re
+import threading
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+
+from .inference_rate_limiter import PRIORITY_CLASSES
+from .inference_service import InferenceService
+from .openrouter_client import InferenceResult, OpenRouterClient
+from .prompt_registry import build_prompt
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PURPOSES = (
+    "summarise_turn",
+    "summarise_permission",
+    "summarise_instruction",
+    "summarise_task",
+)
+
+# Future result for a batch nobody else joined: make the call as usual
+_SOLO = object()
+
+_FENCE_RE = re.compile(r"^```(?:json)?\s*\n?(.*?)\n?\s*```", re.DOTALL)
+
+
+@dataclass
+class _Item:
+    purpose: str
+    input_text: str
+    kwargs: dict
+    future: Future = field(default_factory=Future)
+
+
+@dataclass
+class _Batch:
+    level: str
+    items: list[_Item] = field(default_factory=list)
+    full: threading.Event = field(default_factory=threading.Event)
+
+
+def _ids(kwargs: dict) -> dict:
+    """The project/agent/task/turn ids among infer() keyword arguments."""
+    return {k: kwargs[k] for k in ("project_id", "agent_id", "task_id", "turn_id") if k in kwargs}
+
+
+def parse_batch_response(text: str, count: int) -> dict[int, str]:
+    """Extract ``{item number: answer}`` from a batch response.
+
+    Tolerates markdown fences and surrounding prose. Answers that are
+    themselves JSON (e.g. the frustration prompt) are re-serialised so the
+    per-item parser sees the same text it would for a single call.
+    """
+    stripped = text.strip()
+    fence = _FENCE_RE.match(stripped)
+    if fence:
+        stripped = fence.group(1).strip()
+    try:
+        data = json.loads(stripped)
+    except ValueError:
+        start, end = stripped.find("{"), stripped.rfind("}")
+        if start < 0 or end <= start:
+            return {}
+        try:
+            data = json.loads(stripped[start:end + 1])
+        except ValueError:
+            return {}
+    if not isinstance(data, dict):
+        return {}
+
+    answers = {}
+    for key, value in data.items():
+        try:
+            number = int(str(key).strip())
+        except ValueError:
+            continue
+        if not 1 <= number <= count or value is None:
+            continue
+        answer = value if isinstance(value, str) else json.dumps(value)
+        if answer.strip():
+            answers[number] = answer
+    return answers
+
+
+class InferenceBatcher:
+    """Drop-in ``infer()`` front end that batches summarisation calls.
+
+    The first caller for a level opens a batch and waits up to
+    ``window_ms`` (or until ``max_items`` have joined) before sending it.
+    Later callers join the open batch and block on their own future.
+    """
+
+    def __init__(self, inference_service: InferenceService, config: dict):
+        batch_config = config.get("openrouter", {}).get("batching", {})
+        self.enabled = batch_config.get("enabled", True)
+        self.window_seconds = batch_config.get("window_ms", 150) / 1000
+        self.max_items = max(1, batch_config.get("max_items", 8))
+        self.purposes = frozenset(batch_config.get("purposes", DEFAULT_PURPOSES))
+        self._inference = inference_service
+        self._open: dict[str, _Batch] = {}
+        self._lock = threading.Lock()
+        self._batches = 0
+        self._batched_items = 0
+        self._fallbacks = 0
+
+    @property
+    def is_available(self) -> bool:
+        return self._inference.is_available
+
+    def infer(self, level: str, purpose: str, input_text: str, **kwargs) -> InferenceResult:
+        """Make an inference call, batched with concurrent calls when possible."""
+        if (
+            not self.enabled
+            or not self._inference.is_available
+            or self.max_items < 2
+            or purpose not in self.purposes
+            or kwargs.get("on_token") is not None
+        ):
+            return self._inference.infer(level=level, purpose=purpose, input_text=input_text, **kwargs)
+
+        # Cache hits bypass the batch window; misses skip infer()'s own lookup
+        cached = self._inference.cached_result(level, purpose, input_text, **_ids(kwargs))
+        if cached is not None:
+            return cached
+
+        item = _Item(purpose, input_text, kwargs)
+        with self._lock:
+            batch = self._open.get(level)
+            leader = batch is None
+            if leader:
+                batch = self._open[level] = _Batch(level)
+            batch.items.append(item)
+            if len(batch.items) >= self.max_items:
+                del self._open[level]
+                batch.full.set()
+
+        if leader:
+            batch.full.wait(self.window_seconds)
+            with self._lock:
+                if self._open.get(level) is batch:
+                    del self._open[level]
+            try:
+                self._flush(batch)
+            except BaseException as e:
+                for waiting in batch.items:
+                    if not waiting.future.done():
+                        waiting.future.set_exception(e)
+
+        result = item.future.result()
+        if result is _SOLO or result is None:
+            if result is None:
+                with self._lock:
+                    self._fallbacks += 1
+            return self._inference.infer(
+                level=level, purpose=purpose, input_text=input_text, cache_checked=True, **kwargs
+            )
+        return result
+
+    def _flush(self, batch: _Batch) -> None:
+        """Send a closed batch and resolve every item's future.
+
+        A future resolved with None tells its caller to fall back to an
+        individual call. If this raises, the caller fails every waiting item
+        with the same error.
+        """
+        items = batch.items
+        if len(items) == 1:
+            items[0].future.set_result(_SOLO)
+            return
+
+        prompt = build_prompt(
+            "summarise_batch",
+            count=len(items),
+            items="\n\n".join(
+                f'<item id="{n}">\n{item.input_text}\n</item>' for n, item in enumerate(items, 1)
+            ),
+        )
+        model = self._inference.get_model_for_level(batch.level)
+        try:
+            result = self._inference.infer(
+                level=batch.level,
+                purpose="summarise_batch",
+                input_text=prompt,
+                project_id=items[0].kwargs.get("project_id"),
+                priority=self._priority(items),
+                record=False,
+            )
+        except Exception as e:
+            for item in items:
+                self._log_item(batch.level, model, item, None, error_message=str(e))
+            raise
+
+        answers = parse_batch_response(result.text, len(items))
+        if not answers:
+            logger.warning(f"Unparseable batch response for {len(items)} items, falling back per item")
+
+        # Items that fall back make their own call, so the batch's tokens are
+        # shared among the answered ones
+        share_in = (result.input_tokens or 0) // max(1, len(answers))
+        share_out = (result.output_tokens or 0) // max(1, len(answers))
+        for n, item in enumerate(items, 1):
+            answer = answers.get(n)
+            if answer is None:
+                item.future.set_result(None)
+                continue
+            item_result = InferenceResult(
+                text=answer,
+                input_tokens=share_in,
+                output_tokens=share_out,
+                model=result.model,
+                latency_ms=result.latency_ms,
+                cached=result.cached,
+            )
+            self._inference.cache.put(
+                input_hash=OpenRouterClient.compute_input_hash(item.input_text),
+                result_text=answer,
+                input_tokens=share_in,
+                output_tokens=share_out,
+                model=result.model,
+            )
+            self._log_item(batch.level, model, item, item_result)
+            item.future.set_result(item_result)
+
+        with self._lock:
+            self._batches += 1
+            self._batched_items += len(answers)
+        logger.debug(f"Batched {len(items)} {batch.level} inference calls, {len(answers)} answered")
+
+    def _priority(self, items: list[_Item]) -> str:
+        """Highest rate-limit priority class among a batch's purposes."""
+        limiter = self._inference.rate_limiter
+        return min(
+            (limiter.priority_for(item.purpose) for item in items),
+            key=lambda p: PRIORITY_CLASSES.index(p) if p in PRIORITY_CLASSES else len(PRIORITY_CLASSES),
+        )
+
+    def _log_item(
+        self,
+        level: str,
+        model: str,
+        item: _Item,
+        result: InferenceResult | None,
+        error_message: str | None = None,
+    ) -> None:
+        """Log one batched item as its own inference call."""
+        self._inference.log_call(
+            level=level,
+            purpose=item.purpose,
+            model=model,
+            input_hash=OpenRouterClient.compute_input_hash(item.input_text),
+            result=result,
+            error_message=error_message,
+            input_text=item.input_text,
+            project_id=item.kwargs.get("project_id"),
+            agent_id=item.kwargs.get("agent_id"),
+            task_id=item.kwargs.get("task_id"),
+            turn_id=item.kwargs.get("turn_id"),
+        )
+
+    @property
+    def stats(self) -> dict:
+        """Return batching statistics."""
+        with self._lock:
+            return {
+                "enabled": self.enabled,
+                "window_ms": int(self.window_seconds * 1000),
+                "max_items": self.max_items,
+                "batches": self._batches,
+                "batched_items": self._batched_items,
+                "fallbacks": self._fallbacks,
+            }
@@ -1,9 +1,17 @@
-"""In-memory cache for inference results."""
+"""Two-tier cache for inference results.
+
+Tier 1 is an in-memory LRU keyed by content hash. Tier 2 is the
+``inference_calls`` audit table: every successful call already stores its
+``input_hash`` and ``result_text``, so a tier-1 miss can be answered from a
+recent row instead of re-paying for a summary generated before a restart.
+"""
 
 import logging
 import threading
 import time
+from collections import OrderedDict
 from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
 
 logger = logging.getLogger(__name__)
 
@@ -25,22 +33,38 @@ class CacheEntry:
 
 
 class InferenceCache:
-    """Thread-safe in-memory cache keyed by content hash with LRU eviction."""
+    """Thread-safe in-memory LRU keyed by content hash, backed by the call log.
+
+    Args:
+        config: Application configuration dictionary
+        max_size: Tier-1 capacity, overridden by ``openrouter.cache.max_entries``
+        session_factory: Callable returning a database session. Without it
+            only the in-memory tier is used.
+    """
 
-    def __init__(self, config: dict, max_size: int = 500):
+    def __init__(self, config: dict, max_size: int = 500, session_factory=None):
         cache_config = config.get("openrouter", {}).get("cache", {})
         self.enabled = cache_config.get("enabled", True)
         self.ttl_seconds = cache_config.get("ttl_seconds", 300)
-        self.max_size = max_size
-        self._cache: dict[str, CacheEntry] = {}
+        self.max_size = cache_config.get("max_entries", max_size)
+        self.persistent = cache_config.get("persistent", False) and session_factory is not None
+        self.persistent_ttl_seconds = cache_config.get("persistent_ttl_seconds", 86400)
+        self.purpose_ttl_seconds = cache_config.get("purpose_ttl_seconds") or {}
+        self._session_factory = session_factory
+        self._cache: OrderedDict[str, CacheEntry] = OrderedDict()
         self._lock = threading.Lock()
         self._hits = 0
         self._misses = 0
+        self._persistent_hits = 0
         self._insert_count = 0
 
-    def get(self, input_hash: str) -> CacheEntry | None:
+    def get(self, input_hash: str, purpose: str | None = None, model: str | None = None) -> CacheEntry | None:
         """Look up a cached result by input hash.
 
+        Falls back to the persistent tier on an in-memory miss when
+        ``purpose`` and ``model`` are given; a persistent hit is promoted
+        into memory.
+
         Returns:
             CacheEntry if found and not expired, None otherwise
         """
@@ -50,20 +74,30 @@ class InferenceCache:
 
         with self._lock:
             entry = self._cache.get(input_hash)
-            if entry is None:
-                self._misses += 1
-                return None
-
-            if entry.is_expired:
+            if entry is not None:
+                if not entry.is_expired:
+                    self._cache.move_to_end(input_hash)
+                    self._hits += 1
+                    return entry
                 del self._cache[input_hash]
-                self._misses += 1
-                return None
 
+        entry = self._get_persistent(input_hash, purpose, model)
+        if entry is None:
+            self._misses += 1
+            return None
+
+        with self._lock:
+            self._store(input_hash, entry)
             self._hits += 1
-            return entry
+            self._persistent_hits += 1
+        return entry
 
     def put(self, input_hash: str, result_text: str, input_tokens: int, output_tokens: int, model: str) -> None:
-        """Store a result in the cache."""
+        """Store a result in the in-memory tier.
+
+        The persistent tier needs no write: the service logs every call
+        to ``inference_calls`` already.
+        """
         if not self.enabled:
             return
 
@@ -77,22 +111,84 @@ class InferenceCache:
         )
 
         with self._lock:
-            self._cache[input_hash] = entry
+            self._store(input_hash, entry)
             self._insert_count += 1
 
-            # LRU eviction: remove oldest entries until within capacity
-            while len(self._cache) > self.max_size:
-                oldest_key = min(self._cache, key=lambda k: self._cache[k].cached_at)
-                del self._cache[oldest_key]
-
             # Periodic expired entry eviction (every 100 inserts)
             if self._insert_count % 100 == 0:
                 expired_keys = [k for k, v in self._cache.items() if v.is_expired]
                 for key in expired_keys:
                     del self._cache[key]
 
+    def _store(self, input_hash: str, entry: CacheEntry) -> None:
+        """Insert as most recently used and evict the LRU entries. Caller holds the lock."""
+        self._cache[input_hash] = entry
+        self._cache.move_to_end(input_hash)
+        while len(self._cache) > self.max_size:
+            self._cache.popitem(last=False)
+
+    def ttl_for(self, purpose: str | None) -> int:
+        """Persistent-tier TTL in seconds for a purpose (0 disables it)."""
+        return self.purpose_ttl_seconds.get(purpose, self.persistent_ttl_seconds)
+
+    def _get_persistent(self, input_hash: str, purpose: str | None, model: str | None) -> CacheEntry | None:
+        """Find the newest uncached, successful call with this hash within the purpose TTL."""
+        if not self.persistent or purpose is None or model is None:
+            return None
+        ttl = self.ttl_for(purpose)
+        if ttl <= 0:
+            return None
+
+        from ..models.inference_call import InferenceCall
+
+        cutoff = datetime.now(timezone.utc) - timedelta(seconds=ttl)
+        session = None
+        try:
+            session = self._session_factory()
+            # cached=False anchors the TTL on the original generation, not on
+            # the rows logged for later cache hits.
+            row = (
+                session.query(
+                    InferenceCall.result_text,
+                    InferenceCall.input_tokens,
+                    InferenceCall.output_tokens,
+                    InferenceCall.timestamp,
+                )
+                .filter(
+                    InferenceCall.input_hash == input_hash,
+                    InferenceCall.purpose == purpose,
+                    InferenceCall.model == model,
+                    InferenceCall.cached.is_(False),
+                    InferenceCall.error_message.is_(None),
+                    InferenceCall.result_text.isnot(None),
+                    InferenceCall.timestamp >= cutoff,
+                )
+                .order_by(InferenceCall.timestamp.desc())
+                .first()
+            )
+        except Exception as e:
+            logger.warning(f"Persistent inference cache lookup failed: {e}")
+            return None
+        finally:
+            if session:
+                session.close()
+
+        if row is None:
+            return None
+
+        # Keep it in memory no longer than it remains valid in the database
+        age = (datetime.now(timezone.utc) - row.timestamp).total_seconds()
+        return CacheEntry(
+            result_text=row.result_text,
+            input_tokens=row.input_tokens,
+            output_tokens=row.output_tokens,
+            model=model,
+            cached_at=time.monotonic(),
+            ttl_seconds=max(0, min(self.ttl_seconds, int(ttl - age))),
+        )
+
     def clear(self) -> None:
-        """Clear all cached entries."""
+        """Clear all in-memory entries."""
         with self._lock:
             self._cache.clear()
 
@@ -116,4 +212,6 @@ class InferenceCache:
                 "hits": self._hits,
                 "misses": self._misses,
                 "hit_rate": self._hits / max(self._hits + self._misses, 1),
+                "persistent": self.persistent,
+                "persistent_hits": self._persistent_hits,
             }
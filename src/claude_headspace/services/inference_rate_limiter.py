@@ -1,12 +1,34 @@
-"""Thread-safe rate limiter for inference calls."""
-
+"""Thread-safe rate limiter for inference calls.
+
+Calls/min and tokens/min are each a token bucket, so every check and record
+is O(1). Callers that would exceed a limit can wait in ``acquire()`` until
+their deadline instead of failing straight away. Waiters are served by
+priority class first (interactive > normal > background) and then
+round-robin across projects within a class. Background work also has to
+leave a reserve of call capacity untouched, so it can never starve
+interactive inference.
+"""
+
+import itertools
 import logging
+import math
 import threading
 import time
 from dataclasses import dataclass, field
 
 logger = logging.getLogger(__name__)
 
+PRIORITY_CLASSES = ("interactive", "normal", "background")
+
+# Purposes not listed here are "normal"
+DEFAULT_PURPOSE_PRIORITY = {
+    "summarise_permission": "interactive",
+    "completion_classification": "interactive",
+    "question_classification": "interactive",
+    "priority_scoring": "background",
+    "progress_summary": "background",
+}
+
 
 @dataclass
 class RateLimitResult:
@@ -15,21 +37,104 @@ class RateLimitResult:
     allowed: bool
     retry_after_seconds: float = 0.0
     reason: str = ""
+    waited_seconds: float = 0.0
+
+
+@dataclass
+class _Bucket:
+    """Token bucket refilled continuously at ``capacity`` per minute."""
+
+    capacity: float
+    level: float
+    updated: float = field(default_factory=time.monotonic)
+
+    @property
+    def rate(self) -> float:
+        return self.capacity / 60.0
+
+    def refill(self, now: float) -> None:
+        self.level = min(self.capacity, self.level + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def seconds_until(self, amount: float) -> float:
+        return max(0.0, (amount - self.level) / self.rate) if self.rate else math.inf
+
+
+@dataclass
+class _Waiter:
+    rank: int
+    project_id: int | None
+    seq: int
+    estimated_tokens: int
 
 
 class InferenceRateLimiter:
-    """Sliding-window rate limiter for calls/min and tokens/min."""
+    """Token-bucket rate limiter for calls/min and tokens/min."""
 
     def __init__(self, config: dict):
         rate_config = config.get("openrouter", {}).get("rate_limits", {})
         self.calls_per_minute = rate_config.get("calls_per_minute", 30)
         self.tokens_per_minute = rate_config.get("tokens_per_minute", 50000)
-        self._call_timestamps: list[float] = []
-        self._token_records: list[tuple[float, int]] = []  # (timestamp, token_count)
-        self._lock = threading.Lock()
+        # Seconds each class may wait for capacity; 0 rejects immediately
+        self.max_wait_seconds = {
+            cls: 0.0 for cls in PRIORITY_CLASSES
+        } | rate_config.get("max_wait_seconds", {})
+        self.purpose_priority = DEFAULT_PURPOSE_PRIORITY | rate_config.get("purpose_priority", {})
+        # Fraction of call capacity background work may not use
+        self.interactive_reserve = rate_config.get("interactive_reserve", 0.2)
+
+        self._calls = _Bucket(self.calls_per_minute, self.calls_per_minute)
+        self._tokens = _Bucket(self.tokens_per_minute, self.tokens_per_minute)
+        self._cond = threading.Condition()
+        self._waiting: list[_Waiter] = []
+        self._seq = itertools.count()
+        self._grants = itertools.count()
+        self._last_grant: dict[int | None, int] = {}
+        self._granted = dict.fromkeys(PRIORITY_CLASSES, 0)
+        self._timed_out = dict.fromkeys(PRIORITY_CLASSES, 0)
+
+    def priority_for(self, purpose: str) -> str:
+        """Priority class for an inference purpose."""
+        return self.purpose_priority.get(purpose, "normal")
+
+    def _refill(self) -> float:
+        now = time.monotonic()
+        self._calls.refill(now)
+        self._tokens.refill(now)
+        return now
+
+    def _blocked(self, priority: str, estimated_tokens: int) -> tuple[float, str] | None:
+        """Seconds until capacity allows a call, with the reason, or None if it fits now.
+
+        Caller holds the lock and has refilled.
+        """
+        needed = 1.0
+        if priority == "background":
+            needed += self.interactive_reserve * self.calls_per_minute
+        if self._calls.level < needed:
+            return (
+                self._calls.seconds_until(needed),
+                f"Calls per minute limit reached ({self.calls_per_minute}/min)",
+            )
+        estimated = min(estimated_tokens, self.tokens_per_minute)
+        if self._tokens.level < estimated or self._tokens.level < 0:
+            return (
+                self._tokens.seconds_until(max(estimated, 0)),
+                f"Tokens per minute limit reached ({self.tokens_per_minute}/min)",
+            )
+        return None
+
+    def _head(self) -> _Waiter | None:
+        """Next waiter to serve: best class, then the project served longest ago."""
+        if not self._waiting:
+            return None
+        return min(
+            self._waiting,
+            key=lambda w: (w.rank, self._last_grant.get(w.project_id, -1), w.seq),
+        )
 
     def check(self, estimated_tokens: int = 0) -> RateLimitResult:
-        """Check if a request is within rate limits.
+        """Check if a request is within rate limits, without waiting or reserving.
 
         Args:
             estimated_tokens: Estimated total tokens for this request
@@ -37,65 +142,104 @@ class InferenceRateLimiter:
         Returns:
             RateLimitResult indicating if the request is allowed
         """
-        now = time.monotonic()
-        window_start = now - 60.0
-
-        with self._lock:
-            # Prune old entries
-            self._call_timestamps = [t for t in self._call_timestamps if t > window_start]
-            self._token_records = [(t, c) for t, c in self._token_records if t > window_start]
-
-            # Check calls per minute
-            if len(self._call_timestamps) >= self.calls_per_minute:
-                oldest = self._call_timestamps[0]
-                retry_after = 60.0 - (now - oldest)
+        with self._cond:
+            self._refill()
+            blocked = self._blocked("normal", estimated_tokens)
+            if blocked:
+                retry_after, reason = blocked
                 return RateLimitResult(
-                    allowed=False,
-                    retry_after_seconds=max(retry_after, 0.1),
-                    reason=f"Calls per minute limit reached ({self.calls_per_minute}/min)",
+                    allowed=False, retry_after_seconds=max(retry_after, 0.1), reason=reason,
                 )
+            return RateLimitResult(allowed=True)
 
-            # Check tokens per minute
-            total_tokens = sum(c for _, c in self._token_records) + estimated_tokens
-            if total_tokens > self.tokens_per_minute:
-                oldest = self._token_records[0][0] if self._token_records else now
-                retry_after = 60.0 - (now - oldest)
-                return RateLimitResult(
-                    allowed=False,
-                    retry_after_seconds=max(retry_after, 0.1),
-                    reason=f"Tokens per minute limit reached ({self.tokens_per_minute}/min)",
-                )
+    def acquire(
+        self,
+        priority: str = "normal",
+        project_id: int | None = None,
+        estimated_tokens: int = 0,
+        timeout: float | None = None,
+    ) -> RateLimitResult:
+        """Wait for capacity and reserve one call.
 
-            return RateLimitResult(allowed=True)
+        The caller must follow a granted acquire with
+        ``record(tokens, reserved=True)``.
 
-    def record(self, tokens: int) -> None:
+        Args:
+            priority: One of PRIORITY_CLASSES
+            project_id: Project the call is for (fair sharing key)
+            estimated_tokens: Estimated total tokens for this request
+            timeout: Seconds to wait; defaults to the class's max_wait_seconds
+
+        Returns:
+            RateLimitResult; allowed=False when the deadline passed first
+        """
+        if priority not in PRIORITY_CLASSES:
+            priority = "normal"
+        if timeout is None:
+            timeout = self.max_wait_seconds.get(priority, 0.0)
+        started = time.monotonic()
+        deadline = started + timeout
+        waiter = _Waiter(PRIORITY_CLASSES.index(priority), project_id, next(self._seq), estimated_tokens)
+
+        with self._cond:
+            self._waiting.append(waiter)
+            try:
+                while True:
+                    now = self._refill()
+                    blocked = self._blocked(priority, estimated_tokens)
+                    if self._head() is waiter and blocked is None:
+                        self._calls.level -= 1
+                        self._last_grant[project_id] = next(self._grants)
+                        self._granted[priority] += 1
+                        return RateLimitResult(allowed=True, waited_seconds=now - started)
+
+                    remaining = deadline - now
+                    if remaining <= 0:
+                        self._timed_out[priority] += 1
+                        retry_after, reason = blocked or (0.1, "Waiting behind higher-priority inference")
+                        return RateLimitResult(
+                            allowed=False,
+                            retry_after_seconds=max(retry_after, 0.1),
+                            reason=reason,
+                            waited_seconds=now - started,
+                        )
+                    # Wake when capacity should be back, or when another waiter leaves
+                    self._cond.wait(min(remaining, blocked[0]) if blocked else remaining)
+            finally:
+                self._waiting.remove(waiter)
+                self._cond.notify_all()
+
+    def record(self, tokens: int, reserved: bool = False) -> None:
         """Record a completed call for rate tracking.
 
         Args:
             tokens: Total tokens consumed (input + output)
+            reserved: True when the call slot was already taken by acquire()
         """
-        now = time.monotonic()
-        with self._lock:
-            self._call_timestamps.append(now)
-            self._token_records.append((now, tokens))
+        with self._cond:
+            self._refill()
+            if not reserved:
+                self._calls.level -= 1
+            self._tokens.level -= tokens
 
     @property
     def current_usage(self) -> dict:
         """Get current rate limit usage."""
-        now = time.monotonic()
-        window_start = now - 60.0
-
-        with self._lock:
-            active_calls = [t for t in self._call_timestamps if t > window_start]
-            active_tokens = sum(c for t, c in self._token_records if t > window_start)
-
+        with self._cond:
+            self._refill()
+            waiting = dict.fromkeys(PRIORITY_CLASSES, 0)
+            for w in self._waiting:
+                waiting[PRIORITY_CLASSES[w.rank]] += 1
             return {
                 "calls_per_minute": {
-                    "current": len(active_calls),
+                    "current": max(0, math.ceil(self.calls_per_minute - self._calls.level - 1e-9)),
                     "limit": self.calls_per_minute,
                 },
                 "tokens_per_minute": {
-                    "current": active_tokens,
+                    "current": max(0, math.ceil(self.tokens_per_minute - self._tokens.level - 1e-9)),
                     "limit": self.tokens_per_minute,
                 },
+                "waiting": waiting,
+                "granted": dict(self._granted),
+                "timed_out": dict(self._timed_out),
             }
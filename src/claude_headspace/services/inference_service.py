@@ -1,12 +1,15 @@
 """Inference service orchestrating model selection, caching, rate limiting, and logging."""
 
 import logging
+import threading
 import time
+from collections.abc import Callable
+from concurrent.futures import Future
 from datetime import datetime, timezone
 
 from ..models.inference_call import InferenceCall, InferenceLevel
 from .inference_cache import InferenceCache
-from .inference_rate_limiter import InferenceRateLimiter, RateLimitResult
+from .inference_rate_limiter import InferenceRateLimiter
 from .openrouter_client import InferenceResult, OpenRouterClient, OpenRouterClientError
 
 logger = logging.getLogger(__name__)
@@ -42,9 +45,14 @@ class InferenceService:
             self._log_session_factory = db_session_factory
 
         self.client = OpenRouterClient(config)
-        self.cache = InferenceCache(config)
+        self.cache = InferenceCache(config, session_factory=self._log_session_factory)
         self.rate_limiter = InferenceRateLimiter(config)
 
+        # Single-flight: identical concurrent requests share one API call
+        self._in_flight: dict[tuple[str, str], Future] = {}
+        self._in_flight_lock = threading.Lock()
+        self._coalesced = 0
+
         or_config = config.get("openrouter", {})
         self.models = or_config.get("models", {})
         self.pricing = or_config.get("pricing", {})
@@ -66,7 +74,8 @@ class InferenceService:
         self._log_session_factory = sessionmaker(bind=self._independent_engine)
 
     def stop(self) -> None:
-        """Dispose of the independent database engine, releasing connections."""
+        """Close pooled HTTP connections and dispose of the independent database engine."""
+        self.client.close()
         if self._independent_engine:
             self._independent_engine.dispose()
             logger.info("Inference service: independent engine disposed")
@@ -90,7 +99,7 @@ class InferenceService:
         output_rate = model_pricing.get("output_per_million", 0)
         return (input_tokens * input_rate / 1_000_000) + (output_tokens * output_rate / 1_000_000)
 
-    def _log_call(
+    def log_call(
         self,
         level: str,
         purpose: str,
@@ -198,6 +207,49 @@ class InferenceService:
         except Exception as e:
             logger.debug(f"Failed to broadcast inference call (non-fatal): {e}")
 
+    def cached_result(
+        self,
+        level: str,
+        purpose: str,
+        input_text: str,
+        project_id: int | None = None,
+        agent_id: int | None = None,
+        task_id: int | None = None,
+        turn_id: int | None = None,
+    ) -> InferenceResult | None:
+        """Answer a call from the cache (logged as cached), or None on a miss.
+
+        One lookup across both cache tiers, counted once in the cache stats.
+        """
+        model = self.get_model_for_level(level)
+        input_hash = OpenRouterClient.compute_input_hash(input_text)
+        cached_entry = self.cache.get(input_hash, purpose=purpose, model=model)
+        if not cached_entry:
+            return None
+        result = InferenceResult(
+            text=cached_entry.result_text,
+            input_tokens=cached_entry.input_tokens,
+            output_tokens=cached_entry.output_tokens,
+            model=cached_entry.model,
+            latency_ms=0,
+            cached=True,
+        )
+        self.log_call(
+            level=level,
+            purpose=purpose,
+            model=model,
+            input_hash=input_hash,
+            result=result,
+            cached=True,
+            input_text=input_text,
+            project_id=project_id,
+            agent_id=agent_id,
+            task_id=task_id,
+            turn_id=turn_id,
+        )
+        logger.debug(f"Cache hit for inference call (level={level}, purpose={purpose})")
+        return result
+
     def infer(
         self,
         level: str,
@@ -207,6 +259,10 @@ class InferenceService:
         agent_id: int | None = None,
         task_id: int | None = None,
         turn_id: int | None = None,
+        on_token: Callable[[str], None] | None = None,
+        priority: str | None = None,
+        record: bool = True,
+        cache_checked: bool = False,
     ) -> InferenceResult:
         """Make an inference call.
 
@@ -218,6 +274,14 @@ class InferenceService:
             agent_id: Optional agent FK
             task_id: Optional task FK
             turn_id: Optional turn FK
+            on_token: Optional callback streaming the response text as it
+                arrives. Cached and coalesced results are delivered in a
+                single call.
+            priority: Rate limiter class; defaults to the purpose's class
+            record: False to neither cache the result nor log the call,
+                for callers that record their own rows (multi-item batches)
+            cache_checked: True when the caller already missed in
+                cached_result() for this input, to skip a second lookup
 
         Returns:
             InferenceResult with the response
@@ -238,48 +302,122 @@ class InferenceService:
         )
 
         # Check cache
-        cached_entry = self.cache.get(input_hash)
-        if cached_entry:
+        if record and not cache_checked:
+            result = self.cached_result(
+                level, purpose, input_text,
+                project_id=project_id, agent_id=agent_id, task_id=task_id, turn_id=turn_id,
+            )
+            if result:
+                if on_token:
+                    on_token(result.text)
+                return result
+
+        # Coalesce with an identical request already waiting on the API
+        key = (model, input_hash)
+        with self._in_flight_lock:
+            future = self._in_flight.get(key)
+            leader = future is None
+            if leader:
+                future = Future()
+                self._in_flight[key] = future
+            else:
+                self._coalesced += 1
+
+        if not leader:
+            logger.debug(f"Coalesced inference call (level={level}, purpose={purpose})")
+            shared = future.result()
             result = InferenceResult(
-                text=cached_entry.result_text,
-                input_tokens=cached_entry.input_tokens,
-                output_tokens=cached_entry.output_tokens,
-                model=cached_entry.model,
+                text=shared.text,
+                input_tokens=shared.input_tokens,
+                output_tokens=shared.output_tokens,
+                model=shared.model,
                 latency_ms=0,
                 cached=True,
             )
-            self._log_call(
+            if record:
+                self.log_call(
+                    level=level,
+                    purpose=purpose,
+                    model=model,
+                    input_hash=input_hash,
+                    result=result,
+                    cached=True,
+                    input_text=input_text,
+                    project_id=project_id,
+                    agent_id=agent_id,
+                    task_id=task_id,
+                    turn_id=turn_id,
+                )
+            if on_token:
+                on_token(result.text)
+            return result
+
+        try:
+            result = self._call_model(
                 level=level,
                 purpose=purpose,
                 model=model,
                 input_hash=input_hash,
-                result=result,
-                cached=True,
                 input_text=input_text,
                 project_id=project_id,
                 agent_id=agent_id,
                 task_id=task_id,
                 turn_id=turn_id,
+                on_token=on_token,
+                priority=priority,
+                record=record,
             )
-            logger.debug(f"Cache hit for inference call (level={level}, purpose={purpose})")
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(result)
             return result
+        finally:
+            with self._in_flight_lock:
+                self._in_flight.pop(key, None)
 
-        # Check rate limits
-        rate_check = self.rate_limiter.check()
-        if not rate_check.allowed:
-            self._log_call(
-                level=level,
-                purpose=purpose,
-                model=model,
-                input_hash=input_hash,
-                result=None,
-                error_message=rate_check.reason,
-                input_text=input_text,
-                project_id=project_id,
-                agent_id=agent_id,
-                task_id=task_id,
-                turn_id=turn_id,
+    def _call_model(
+        self,
+        level: str,
+        purpose: str,
+        model: str,
+        input_hash: str,
+        input_text: str,
+        project_id: int | None,
+        agent_id: int | None,
+        task_id: int | None,
+        turn_id: int | None,
+        on_token: Callable[[str], None] | None = None,
+        priority: str | None = None,
+        record: bool = True,
+    ) -> InferenceResult:
+        """Rate-check, call the API, then cache and log the result (if recording)."""
+        # Wait for rate-limit capacity, ahead of lower-priority purposes
+        rate_check = self.rate_limiter.acquire(
+            priority=priority or self.rate_limiter.priority_for(purpose),
+            project_id=project_id,
+        )
+        if rate_check.waited_seconds >= 1:
+            logger.info(
+                f"Inference waited {rate_check.waited_seconds:.1f}s for rate limit "
+                f"(purpose={purpose}, allowed={rate_check.allowed})"
             )
+        if not rate_check.allowed:
+            if record:
+                self.log_call(
+                    level=level,
+                    purpose=purpose,
+                    model=model,
+                    input_hash=input_hash,
+                    result=None,
+                    error_message=rate_check.reason,
+                    input_text=input_text,
+                    project_id=project_id,
+                    agent_id=agent_id,
+                    task_id=task_id,
+                    turn_id=turn_id,
+                )
             raise InferenceServiceError(
                 rate_check.reason,
                 rate_limited=True,
@@ -290,17 +428,23 @@ class InferenceService:
         messages = [{"role": "user", "content": input_text}]
 
         try:
-            result = self.client.chat_completion(model=model, messages=messages)
+            if on_token:
+                result = self.client.chat_completion(model=model, messages=messages, on_token=on_token)
+            else:
+                result = self.client.chat_completion(model=model, messages=messages)
 
             logger.debug(
                 f"Inference response: level={level}, purpose={purpose}, model={model}, "
                 f"input_tokens={result.input_tokens}, output_tokens={result.output_tokens}, "
-                f"latency_ms={result.latency_ms}"
+                f"latency_ms={result.latency_ms}, ttft_ms={result.ttft_ms}"
             )
 
             # Record rate limit usage
             total_tokens = (result.input_tokens or 0) + (result.output_tokens or 0)
-            self.rate_limiter.record(total_tokens)
+            self.rate_limiter.record(total_tokens, reserved=True)
+
+            if not record:
+                return result
 
             # Cache the result
             self.cache.put(
@@ -312,7 +456,7 @@ class InferenceService:
             )
 
             # Log success
-            self._log_call(
+            self.log_call(
                 level=level,
                 purpose=purpose,
                 model=model,
@@ -333,19 +477,20 @@ class InferenceService:
                 f"error={e}"
             )
             # Log failure
-            self._log_call(
-                level=level,
-                purpose=purpose,
-                model=model,
-                input_hash=input_hash,
-                result=None,
-                error_message=str(e),
-                input_text=input_text,
-                project_id=project_id,
-                agent_id=agent_id,
-                task_id=task_id,
-                turn_id=turn_id,
-            )
+            if record:
+                self.log_call(
+                    level=level,
+                    purpose=purpose,
+                    model=model,
+                    input_hash=input_hash,
+                    result=None,
+                    error_message=str(e),
+                    input_text=input_text,
+                    project_id=project_id,
+                    agent_id=agent_id,
+                    task_id=task_id,
+                    turn_id=turn_id,
+                )
             raise
 
     def get_status(self) -> dict:
@@ -360,8 +505,19 @@ class InferenceService:
             "models": self.models,
             "rate_limits": self.rate_limiter.current_usage,
             "cache": self.cache.stats,
+            "coalescing": self.coalescing_stats,
+            "client": self.client.stats,
         }
 
+    @property
+    def coalescing_stats(self) -> dict:
+        """Return single-flight statistics."""
+        with self._in_flight_lock:
+            return {
+                "in_flight": len(self._in_flight),
+                "coalesced": self._coalesced,
+            }
+
     def get_usage(self, db_session=None) -> dict:
         """Get usage statistics from the database.
 
@@ -0,0 +1,397 @@
+"""Local intent classifier consulted before the LLM fallback.
+
+When no intent pattern matches, detect_agent_intent() used to go straight to
+the inference service, adding network latency and rate-limit pressure to the
+stop path. This module provides a small CPU-only model in between: a
+multinomial logistic regression over hashed word unigrams and bigrams of the
+output's tail, trained from stored Turns whose label a pattern or a logged
+LLM call explains (see intent_evaluation's corpus).
+Its prediction is used when the top class probability reaches
+``min_confidence``; otherwise the LLM is asked as before.
+
+The model is a JSON file carrying its format version, a model version (UTC
+training time plus a digest of the weights), its feature hashing size and
+training metadata. Files with another format version are rejected.
+
+Commands (cli/intent.py):
+    claude-headspace intent-train [--corpus FILE] --output MODEL
+"""
+
+import hashlib
+import json
+import logging
+import math
+import os
+import random
+import re
+import zlib
+from collections import Counter
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+
+from ..models.turn import TurnActor, TurnIntent
+from . import intent_detector
+from .intent_detector import IntentResult, _extract_tail, _strip_code_blocks
+
+logger = logging.getLogger(__name__)
+
+MODEL_FORMAT_VERSION = 1
+
+DEFAULT_BUCKETS = 1 << 18
+DEFAULT_MIN_CONFIDENCE = 0.8
+DEFAULT_EPOCHS = 8
+DEFAULT_LEARNING_RATE = 0.5
+DEFAULT_L2 = 1e-6
+
+# A model needs at least this many intents, each with this many training
+# examples: one trained on a single label answers it with confidence 1.0 and
+# would replace every LLM fallback.
+MIN_LABELS = 2
+MIN_CLASS_EXAMPLES = 20
+
+# Intents an agent turn can end up with
+AGENT_INTENTS = (
+    TurnIntent.QUESTION,
+    TurnIntent.COMPLETION,
+    TurnIntent.END_OF_TASK,
+    TurnIntent.PROGRESS,
+)
+
+_TOKEN_RE = re.compile(r"[a-z0-9']+|[?!:]")
+
+
+def features(cleaned: str, buckets: int = DEFAULT_BUCKETS) -> dict[int, float]:
+    """Hashed, L2-normalised features of the tail of code-stripped text.
+
+    Word unigrams and bigrams of the last 15 non-empty lines, plus the words
+    of the last line and whether the text ends with a question mark.
+    """
+    tail = _extract_tail(cleaned)
+    tokens = _TOKEN_RE.findall(tail.lower())
+    last_line = tail.rsplit("\n", 1)[-1]
+    names = [f"w:{t}" for t in tokens]
+    names += [f"b:{a} {b}" for a, b in zip(tokens, tokens[1:])]
+    names += [f"e:{t}" for t in _TOKEN_RE.findall(last_line.lower())]
+    if tail.rstrip().endswith("?"):
+        names.append("end:?")
+    counts: dict[int, float] = {}
+    for name in names:
+        bucket = zlib.crc32(name.encode("utf-8")) % buckets
+        counts[bucket] = counts.get(bucket, 0.0) + 1.0
+    norm = math.sqrt(sum(v * v for v in counts.values())) or 1.0
+    return {b: v / norm for b, v in counts.items()}
+
+
+def _softmax(scores: list[float]) -> list[float]:
+    top = max(scores)
+    exps = [math.exp(s - top) for s in scores]
+    total = sum(exps)
+    return [e / total for e in exps]
+
+
+@dataclass
+class IntentClassifier:
+    """Multinomial logistic regression over hashed text features."""
+
+    labels: list[str]
+    buckets: int = DEFAULT_BUCKETS
+    bias: list[float] = field(default_factory=list)
+    # bucket -> one weight per label; buckets never seen in training are absent
+    weights: dict[int, list[float]] = field(default_factory=dict)
+    version: str = ""
+    metadata: dict = field(default_factory=dict)
+
+    def __post_init__(self):
+        if not self.bias:
+            self.bias = [0.0] * len(self.labels)
+
+    def probabilities(self, cleaned: str) -> list[float]:
+        return self._probabilities(features(cleaned, self.buckets))
+
+    def _probabilities(self, feats: dict[int, float]) -> list[float]:
+        scores = list(self.bias)
+        for bucket, value in feats.items():
+            row = self.weights.get(bucket)
+            if row is not None:
+                for k, w in enumerate(row):
+                    scores[k] += w * value
+        return _softmax(scores)
+
+    def classify(self, cleaned: str) -> IntentResult:
+        """Most likely intent for code-stripped agent text."""
+        probs = self.probabilities(cleaned)
+        best = max(range(len(probs)), key=probs.__getitem__)
+        return IntentResult(
+            intent=TurnIntent(self.labels[best]),
+            confidence=round(probs[best], 4),
+            matched_pattern=f"classifier:{self.version}",
+        )
+
+    def fit(
+        self,
+        examples: list[tuple[str, str]],
+        epochs: int = DEFAULT_EPOCHS,
+        learning_rate: float = DEFAULT_LEARNING_RATE,
+        l2: float = DEFAULT_L2,
+        seed: int = 0,
+    ) -> None:
+        """Train with SGD on (cleaned text, label) pairs."""
+        index = {label: k for k, label in enumerate(self.labels)}
+        data = [(features(text, self.buckets), index[label]) for text, label in examples]
+        rng = random.Random(seed)
+        n = len(self.labels)
+        for epoch in range(epochs):
+            rng.shuffle(data)
+            rate = learning_rate / (1 + epoch)
+            for feats, target in data:
+                probs = self._probabilities(feats)
+                grads = [p - (k == target) for k, p in enumerate(probs)]
+                for k in range(n):
+                    self.bias[k] -= rate * grads[k]
+                for bucket, value in feats.items():
+                    row = self.weights.get(bucket)
+                    if row is None:
+                        row = self.weights[bucket] = [0.0] * n
+                    for k in range(n):
+                        row[k] -= rate * (grads[k] * value + l2 * row[k])
+        self.version = self._make_version()
+
+    def _make_version(self) -> str:
+        digest = hashlib.blake2b(
+            json.dumps([self.bias, sorted(self.weights.items())]).encode("utf-8"),
+            digest_size=4,
+        ).hexdigest()
+        return f"{datetime.now(timezone.utc):%Y%m%d%H%M%S}-{digest}"
+
+    def check_usable(self) -> None:
+        """Raise ValueError for a degenerate model.
+
+        Checks the label count, and per-class example counts when the
+        training metadata records them.
+        """
+        if len(self.labels) < MIN_LABELS:
+            raise ValueError(
+                f"Intent model has {len(self.labels)} label(s) {self.labels}, needs at least {MIN_LABELS}"
+            )
+        counts = self.metadata.get("class_examples", {})
+        short = {label: n for label, n in counts.items() if n < MIN_CLASS_EXAMPLES}
+        if short:
+            raise ValueError(f"Intent model classes with under {MIN_CLASS_EXAMPLES} examples: {short}")
+
+    def save(self, path: str | Path) -> None:
+        """Write the model as JSON.
+
+        Raises:
+            ValueError: If the model is degenerate (see check_usable)
+        """
+        self.check_usable()
+        data = {
+            "format_version": MODEL_FORMAT_VERSION,
+            "version": self.version,
+            "labels": self.labels,
+            "buckets": self.buckets,
+            "bias": [round(b, 6) for b in self.bias],
+            "weights": {
+                str(bucket): [round(w, 6) for w in row]
+                for bucket, row in self.weights.items()
+                if any(abs(w) >= 1e-6 for w in row)
+            },
+            "metadata": self.metadata,
+        }
+        path = Path(path).expanduser()
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(path.suffix + ".tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(data, f, separators=(",", ":"))
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path: str | Path) -> "IntentClassifier":
+        """Load a model file.
+
+        Raises:
+            ValueError: If the file is not a model of the supported format,
+                or the model is degenerate (see check_usable)
+        """
+        with open(Path(path).expanduser(), encoding="utf-8") as f:
+            data = json.load(f)
+        if data.get("format_version") != MODEL_FORMAT_VERSION:
+            raise ValueError(
+                f"Unsupported intent model format {data.get('format_version')!r} "
+                f"(expected {MODEL_FORMAT_VERSION})"
+            )
+        labels = data["labels"]
+        if any(label not in {i.value for i in TurnIntent} for label in labels):
+            raise ValueError(f"Unknown intent labels in model: {labels}")
+        classifier = cls(
+            labels=labels,
+            buckets=data["buckets"],
+            bias=data["bias"],
+            weights={int(b): row for b, row in data["weights"].items()},
+            version=data.get("version", ""),
+            metadata=data.get("metadata", {}),
+        )
+        classifier.check_usable()
+        return classifier
+
+
+def configure_intent_classifier(config: dict | None = None) -> IntentClassifier | None:
+    """Load the model named by the ``intent_classifier`` config section.
+
+    Installs it in intent_detector; a missing or invalid model leaves the
+    LLM fallback as the only fallback.
+    """
+    classifier_config = (config or {}).get("intent_classifier", {})
+    classifier = None
+    if classifier_config.get("enabled", True):
+        path = Path(classifier_config.get("model_path", "")).expanduser()
+        if path.is_file():
+            try:
+                classifier = IntentClassifier.load(path)
+                logger.info(f"Intent classifier {classifier.version} loaded from {path}")
+            except (OSError, ValueError, KeyError) as e:
+                logger.warning(f"Intent classifier not loaded from {path}: {e}")
+        else:
+            logger.debug(f"No intent classifier model at {path}")
+    intent_detector.set_local_classifier(
+        classifier, classifier_config.get("min_confidence", DEFAULT_MIN_CONFIDENCE)
+    )
+    return classifier
+
+
+def split_holdout(entries: list, fraction: float) -> tuple[list, list]:
+    """Deterministic train/holdout split keyed by turn id (or text)."""
+    train, holdout = [], []
+    for entry in entries:
+        key = str(entry.turn_id if entry.turn_id is not None else entry.text)
+        bucket = zlib.crc32(key.encode("utf-8")) % 1000
+        (holdout if bucket < fraction * 1000 else train).append(entry)
+    return train, holdout
+
+
+@dataclass
+class ComparisonReport:
+    """Classifier vs the regex-plus-LLM pipeline on held-out turns."""
+
+    min_confidence: float
+    total: int = 0
+    regex_matched: int = 0
+    regex_correct: int = 0
+    # Turns no pattern matched: today each one costs an LLM call
+    misses: int = 0
+    miss_confident: int = 0
+    miss_confident_correct: int = 0
+    classifier_correct: int = 0
+
+    def to_dict(self) -> dict:
+        return {k: getattr(self, k) for k in self.__dataclass_fields__}
+
+    def format(self) -> str:
+        def pct(a, b):
+            return f"{a / b:.1%}" if b else "n/a"
+
+        # Stored labels of regex misses are the LLM fallback's answers, so
+        # escalated turns count as correct for both pipelines
+        escalated = self.misses - self.miss_confident
+        regex_llm = self.regex_correct + self.misses
+        with_classifier = self.regex_correct + self.miss_confident_correct + escalated
+        return "\n".join([
+            f"Holdout: {self.total} agent turns, min_confidence={self.min_confidence}",
+            f"  regex matched        {self.regex_matched:6d}  accuracy {pct(self.regex_correct, self.regex_matched)}",
+            f"  regex misses (LLM)   {self.misses:6d}",
+            f"  classifier confident {self.miss_confident:6d}  "
+            f"({pct(self.miss_confident, self.misses)} of LLM calls avoided), "
+            f"agrees with stored label {pct(self.miss_confident_correct, self.miss_confident)}",
+            f"  pipeline accuracy    regex+LLM {pct(regex_llm, self.total)}, "
+            f"regex+classifier+LLM {pct(with_classifier, self.total)}",
+            f"  classifier alone     accuracy {pct(self.classifier_correct, self.total)}",
+        ])
+
+
+def compare(classifier: IntentClassifier, entries: list, min_confidence: float) -> ComparisonReport:
+    """Evaluate the classifier where the pipeline would call the LLM.
+
+    Stored labels of turns no pattern matches came from the LLM fallback, so
+    agreement on those turns measures how well the classifier stands in for
+    it; the rest measures the classifier on its own.
+    """
+    report = ComparisonReport(min_confidence=min_confidence)
+    for entry in entries:
+        cleaned = _strip_code_blocks(entry.text.strip())
+        if not cleaned.strip():
+            continue
+        report.total += 1
+        predicted = classifier.classify(cleaned)
+        report.classifier_correct += predicted.intent.value == entry.intent
+        regex = intent_detector._detect_by_patterns(cleaned)
+        if regex is not None:
+            report.regex_matched += 1
+            report.regex_correct += regex.intent.value == entry.intent
+            continue
+        report.misses += 1
+        if predicted.confidence >= min_confidence:
+            report.miss_confident += 1
+            report.miss_confident_correct += predicted.intent.value == entry.intent
+    return report
+
+
+def has_trusted_label(entry) -> bool:
+    """Whether an agent entry's label came from a pattern or the LLM fallback.
+
+    Turns neither classified are stored as the detector's default PROGRESS;
+    training on them would teach the classifier to answer PROGRESS exactly
+    where the LLM should have been asked. Corpora exported before entries
+    carried a label source only lose their unmatched PROGRESS labels.
+    """
+    if entry.label_source is not None:
+        return entry.label_source in ("pattern", "inference")
+    if entry.intent != TurnIntent.PROGRESS.value:
+        return True
+    return intent_detector._detect_by_patterns(_strip_code_blocks(entry.text.strip())) is not None
+
+
+def train_classifier(
+    entries: list,
+    holdout: float = 0.2,
+    epochs: int = DEFAULT_EPOCHS,
+    min_confidence: float = DEFAULT_MIN_CONFIDENCE,
+    min_class_examples: int = MIN_CLASS_EXAMPLES,
+) -> tuple[IntentClassifier, ComparisonReport]:
+    """Train on trusted agent entries of a corpus and compare on the holdout.
+
+    Intents with fewer than ``min_class_examples`` training examples are
+    left out (the pipeline escalates their turns to the LLM as before).
+
+    Raises:
+        ValueError: If fewer than MIN_LABELS intents have enough examples
+    """
+    candidates = [
+        e for e in entries
+        if e.actor == TurnActor.AGENT.value and e.intent in {i.value for i in AGENT_INTENTS}
+    ]
+    agent = [e for e in candidates if has_trusted_label(e)]
+    train, test = split_holdout(agent, holdout)
+    counts = Counter(e.intent for e in train)
+    labels = sorted(label for label, n in counts.items() if n >= min_class_examples)
+    if len(labels) < MIN_LABELS:
+        raise ValueError(
+            f"need at least {MIN_LABELS} intents with {min_class_examples}+ trusted "
+            f"training examples, got {dict(counts) or 'none'}"
+        )
+    examples = [(_strip_code_blocks(e.text.strip()), e.intent) for e in train if e.intent in labels]
+    classifier = IntentClassifier(labels=labels)
+    classifier.fit(examples, epochs=epochs)
+    report = compare(classifier, test, min_confidence)
+    classifier.metadata = {
+        "trained_at": datetime.now(timezone.utc).isoformat(),
+        "train_examples": len(examples),
+        "holdout_examples": len(test),
+        "untrusted_excluded": len(candidates) - len(agent),
+        "class_examples": {label: counts[label] for label in labels},
+        "epochs": epochs,
+        "detector_version": intent_detector.DETECTOR_VERSION,
+        "holdout": report.to_dict(),
+    }
+    return classifier, report
+
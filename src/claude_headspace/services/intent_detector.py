@@ -1,16 +1,33 @@
 """Intent detector service for classifying turn intent."""
 
+import hashlib
 import logging
 import re
-from dataclasses import dataclass
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, replace
+from functools import lru_cache
 from typing import Any, Optional
 
+try:  # Python 3.11+
+    from re import _constants as _sre, _parser as _sre_parse
+except ImportError:  # pragma: no cover - Python 3.10
+    import sre_constants as _sre
+    import sre_parse as _sre_parse
+
 from ..models.task import TaskState
 from ..models.turn import TurnActor, TurnIntent
 from .prompt_registry import build_prompt
 
 logger = logging.getLogger(__name__)
 
+_REPEATS = tuple(
+    getattr(_sre, name)
+    for name in ("MAX_REPEAT", "MIN_REPEAT", "POSSESSIVE_REPEAT")
+    if hasattr(_sre, name)
+)
+
 
 def _strip_code_blocks(text: str) -> str:
     """Remove fenced code blocks (``` delimited) to prevent false positives."""
@@ -193,6 +210,238 @@ class IntentResult:
     matched_pattern: Optional[str] = None
 
 
+# Bump whenever patterns or the detection pipeline change, so cached results
+# computed by an older detector are never served.
+DETECTOR_VERSION = 1
+
+DEFAULT_CACHE_ENTRIES = 2048
+DEFAULT_INFERENCE_TTL_SECONDS = 600
+
+_NOT_CACHED = object()
+
+
+class IntentCache:
+    """Bounded LRU of agent intent results keyed by cleaned-text hash.
+
+    The same agent text is classified several times (stop hook, deferred
+    stop retries, the file watcher's question check), so results are shared
+    across callers:
+
+    - pattern results (including "no pattern matched") are deterministic
+      for a given cleaned text and detector version and never expire;
+    - LLM fallback results are kept for ``inference_ttl_seconds``, and only
+      consulted by callers that pass an inference service.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = DEFAULT_CACHE_ENTRIES,
+        inference_ttl_seconds: float = DEFAULT_INFERENCE_TTL_SECONDS,
+        enabled: bool = True,
+    ):
+        self.enabled = enabled
+        self.max_entries = max_entries
+        self.inference_ttl_seconds = inference_ttl_seconds
+        self._patterns: OrderedDict[tuple, Optional[IntentResult]] = OrderedDict()
+        self._inferred: OrderedDict[tuple, tuple[IntentResult, float]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._inference_hits = 0
+
+    def configure(self, config: dict) -> None:
+        """Apply the ``intent_cache`` config section and drop cached results."""
+        cache_config = config.get("intent_cache", {})
+        with self._lock:
+            self.enabled = cache_config.get("enabled", True)
+            self.max_entries = cache_config.get("max_entries", DEFAULT_CACHE_ENTRIES)
+            self.inference_ttl_seconds = cache_config.get(
+                "inference_ttl_seconds", DEFAULT_INFERENCE_TTL_SECONDS
+            )
+            self._patterns.clear()
+            self._inferred.clear()
+
+    @staticmethod
+    def key(cleaned: str) -> tuple:
+        digest = hashlib.blake2b(cleaned.encode("utf-8"), digest_size=16).hexdigest()
+        return (DETECTOR_VERSION, digest)
+
+    def get(self, key: tuple):
+        """Cached pattern result (None if no pattern matched), or _NOT_CACHED."""
+        if not self.enabled:
+            return _NOT_CACHED
+        with self._lock:
+            if key not in self._patterns:
+                self._misses += 1
+                return _NOT_CACHED
+            self._patterns.move_to_end(key)
+            self._hits += 1
+            result = self._patterns[key]
+        return replace(result) if result is not None else None
+
+    def put(self, key: tuple, result: Optional[IntentResult]) -> None:
+        if not self.enabled:
+            return
+        with self._lock:
+            self._patterns[key] = replace(result) if result is not None else None
+            self._patterns.move_to_end(key)
+            while len(self._patterns) > self.max_entries:
+                self._patterns.popitem(last=False)
+
+    def get_inferred(self, key: tuple) -> Optional[IntentResult]:
+        if not self.enabled:
+            return None
+        with self._lock:
+            entry = self._inferred.get(key)
+            if entry is None:
+                return None
+            result, expires_at = entry
+            if time.monotonic() >= expires_at:
+                del self._inferred[key]
+                return None
+            self._inferred.move_to_end(key)
+            self._inference_hits += 1
+        return replace(result)
+
+    def put_inferred(self, key: tuple, result: IntentResult) -> None:
+        if not self.enabled:
+            return
+        with self._lock:
+            self._inferred[key] = (replace(result), time.monotonic() + self.inference_ttl_seconds)
+            self._inferred.move_to_end(key)
+            while len(self._inferred) > self.max_entries:
+                self._inferred.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._patterns.clear()
+            self._inferred.clear()
+
+    @property
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "enabled": self.enabled,
+                "detector_version": DETECTOR_VERSION,
+                "max_entries": self.max_entries,
+                "size": len(self._patterns),
+                "inferred_size": len(self._inferred),
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_rate": self._hits / max(self._hits + self._misses, 1),
+                "inference_hits": self._inference_hits,
+            }
+
+
+# Shared by every caller of detect_agent_intent()
+intent_cache = IntentCache()
+
+
+def configure_intent_cache(config: dict | None = None) -> None:
+    """Apply the ``intent_cache`` config section to the shared cache."""
+    intent_cache.configure(config or {})
+
+
+# Local classifier consulted before the LLM fallback (see intent_classifier.py)
+_local_classifier: Any = None
+_local_min_confidence = 0.8
+
+
+def set_local_classifier(classifier: Any, min_confidence: float = 0.8) -> None:
+    """Install (or with None, remove) the local fallback classifier."""
+    global _local_classifier, _local_min_confidence
+    _local_classifier = classifier
+    _local_min_confidence = min_confidence
+
+
+# Non-ASCII characters that IGNORECASE matching treats as an ASCII letter
+# but str.lower() does not fold to one (İ even lowers to two characters).
+_CASEFOLD_FIXES = str.maketrans({
+    "\u0130": "i", "\u0131": "i", "\u017f": "s", "\u212a": "k",
+})
+
+
+def _fold(text: str) -> str:
+    """Lowercase text so it contains every literal any pattern can match."""
+    if not text.isascii():
+        text = text.translate(_CASEFOLD_FIXES)
+    return text.lower()
+
+
+def _required_literals(parsed) -> Optional[frozenset[str]]:
+    """Lowercase ASCII strings at least one of which every match contains.
+
+    Walks a parsed pattern and keeps the candidate set whose shortest string
+    is longest. Returns None when no such set can be derived (the pattern
+    must then always be tried).
+    """
+    best: Optional[frozenset[str]] = None
+    run: list[str] = []
+
+    def consider(candidates: Optional[frozenset[str]]) -> None:
+        nonlocal best
+        if candidates and (
+            best is None or min(map(len, candidates)) > min(map(len, best))
+        ):
+            best = candidates
+
+    def close_run() -> None:
+        if run:
+            consider(frozenset({"".join(run)}))
+            run.clear()
+
+    for op, av in parsed:
+        if op is _sre.LITERAL and av < 128:
+            run.append(chr(av).lower())
+            continue
+        close_run()
+        if op is _sre.SUBPATTERN:
+            consider(_required_literals(av[-1]))
+        elif op is _sre.BRANCH:
+            alternatives = [_required_literals(branch) for branch in av[1]]
+            if all(alternatives):
+                consider(frozenset().union(*alternatives))
+        elif op in _REPEATS and av[0] >= 1:
+            consider(_required_literals(av[2]))
+    close_run()
+    return best
+
+
+class PatternSet:
+    """An ordered list of regex patterns matched with a literal pre-filter.
+
+    ``search()`` returns the first pattern *in list order* that matches
+    anywhere in the text, exactly like trying each pattern with
+    ``re.search`` in turn. Each pattern is compiled once, together with
+    the literals one of which any match must contain; the text is lowercased
+    once per call and a pattern's regex only runs when one of its literals
+    is present. On long agent output most patterns are ruled out by a few
+    substring checks instead of a backtracking scan.
+    """
+
+    def __init__(self, patterns: list[str] | tuple[str, ...]):
+        self.patterns = tuple(patterns)
+        self._compiled = tuple(re.compile(p) for p in self.patterns)
+        self._literals = tuple(
+            _required_literals(_sre_parse.parse(p)) for p in self.patterns
+        )
+
+    def search(self, text: str) -> Optional[str]:
+        """The first pattern that matches text, or None."""
+        folded = _fold(text)
+        for pattern, compiled, literals in zip(self.patterns, self._compiled, self._literals):
+            if literals is not None and not any(lit in folded for lit in literals):
+                continue
+            if compiled.search(text):
+                return pattern
+        return None
+
+
+@lru_cache(maxsize=64)
+def _pattern_set(patterns: tuple[str, ...]) -> PatternSet:
+    return PatternSet(patterns)
+
+
 def _match_patterns(text: str, patterns: list[str]) -> Optional[str]:
     """
     Check if text matches any pattern in the list.
@@ -202,12 +451,9 @@ def _match_patterns(text: str, patterns: list[str]) -> Optional[str]:
         patterns: List of regex patterns
 
     Returns:
-        The matched pattern string, or None if no match
+        The first matching pattern string in list order, or None if no match
     """
-    for pattern in patterns:
-        if re.search(pattern, text):
-            return pattern
-    return None
+    return _pattern_set(tuple(patterns)).search(text)
 
 
 def _detect_end_of_task(tail: str, has_continuation: bool) -> Optional[IntentResult]:
@@ -361,49 +607,13 @@ def _infer_completion_classification(
         return None
 
 
-def detect_agent_intent(
-    text: Optional[str],
-    inference_service: Any = None,
-    project_id: int | None = None,
-    agent_id: int | None = None,
-) -> IntentResult:
+def _detect_by_patterns(cleaned: str) -> Optional[IntentResult]:
     """
-    Detect the intent of an agent turn using regex pattern matching.
-
-    Pipeline:
-    1. Return PROGRESS(0.5) for empty/None text
-    2. Strip code blocks from text
-    3. Extract tail (last 15 non-empty lines)
-    4. Check continuation guard
-    5. Tail: END_OF_TASK detection (before QUESTION to catch soft-close offers)
-    6. Tail: QUESTION -> BLOCKED -> COMPLETION (confidence=1.0)
-    6.5. Tail: COMPLETION OPENER detection (e.g. "Done. All files...")
-    7. Full text: END_OF_TASK detection (lower confidence)
-    8. Full text: QUESTION -> BLOCKED -> COMPLETION (confidence=0.8)
-    9. Optional inference fallback for ambiguous cases
-    10. Default: PROGRESS (confidence=0.5)
-
-    Args:
-        text: The text content of the agent's turn. May be None or empty.
-        inference_service: Optional inference service for LLM fallback.
+    Run the regex phases (0 to 3) of detect_agent_intent on cleaned text.
 
     Returns:
-        IntentResult with detected intent and confidence
+        IntentResult from the first phase that matches, or None
     """
-    text_preview = repr(text[:120]) if text else "None"
-    logger.info(f"AGENT_INTENT called: text={text_preview}")
-
-    # Handle missing/empty text - default to progress
-    if not text or not text.strip():
-        logger.info("AGENT_INTENT result: PROGRESS (empty text)")
-        return IntentResult(
-            intent=TurnIntent.PROGRESS,
-            confidence=0.5,
-            matched_pattern=None,
-        )
-
-    # Preprocessing: strip code blocks, then extract tail
-    cleaned = _strip_code_blocks(text.strip())
     tail = _extract_tail(cleaned)
 
     # Check continuation guard on the LAST 5 lines only.
@@ -506,11 +716,87 @@ def detect_agent_intent(
                 matched_pattern=matched,
             )
 
+    return None
+
+
+def detect_agent_intent(
+    text: Optional[str],
+    inference_service: Any = None,
+    project_id: int | None = None,
+    agent_id: int | None = None,
+) -> IntentResult:
+    """
+    Detect the intent of an agent turn using regex pattern matching.
+
+    Pipeline:
+    1. Return PROGRESS(0.5) for empty/None text
+    2. Strip code blocks from text
+    3. Extract tail (last 15 non-empty lines)
+    4. Check continuation guard
+    5. Tail: END_OF_TASK detection (before QUESTION to catch soft-close offers)
+    6. Tail: QUESTION -> BLOCKED -> COMPLETION (confidence=1.0)
+    6.5. Tail: COMPLETION OPENER detection (e.g. "Done. All files...")
+    7. Full text: END_OF_TASK detection (lower confidence)
+    8. Full text: QUESTION -> BLOCKED -> COMPLETION (confidence=0.8)
+    8.5. Local classifier, when installed and confident enough
+    9. Optional inference fallback for ambiguous cases
+    10. Default: PROGRESS (confidence=0.5)
+
+    Steps 3-8 are cached in ``intent_cache`` per cleaned text, and step 9
+    for ``inference_ttl_seconds``, so re-classifying the same output is
+    a hash lookup.
+
+    Args:
+        text: The text content of the agent's turn. May be None or empty.
+        inference_service: Optional inference service for LLM fallback.
+
+    Returns:
+        IntentResult with detected intent and confidence
+    """
+    text_preview = repr(text[:120]) if text else "None"
+    logger.info(f"AGENT_INTENT called: text={text_preview}")
+
+    # Handle missing/empty text - default to progress
+    if not text or not text.strip():
+        logger.info("AGENT_INTENT result: PROGRESS (empty text)")
+        return IntentResult(
+            intent=TurnIntent.PROGRESS,
+            confidence=0.5,
+            matched_pattern=None,
+        )
+
+    # Preprocessing: strip code blocks; results are cached per cleaned text
+    cleaned = _strip_code_blocks(text.strip())
+    cache_key = intent_cache.key(cleaned)
+    result = intent_cache.get(cache_key)
+    if result is _NOT_CACHED:
+        result = _detect_by_patterns(cleaned)
+        intent_cache.put(cache_key, result)
+    else:
+        logger.debug("AGENT_INTENT pattern result served from cache")
+    if result is not None:
+        return result
+
+    # Phase 3.5: Local classifier; escalate to the LLM only when it is unsure
+    if _local_classifier is not None:
+        local = _local_classifier.classify(cleaned)
+        if local.confidence >= _local_min_confidence:
+            logger.debug(
+                f"Local classifier classified as {local.intent.value} "
+                f"(confidence={local.confidence})"
+            )
+            return local
+
     # Phase 4: Optional inference fallback for ambiguous cases
     if inference_service and getattr(inference_service, "is_available", False):
-        inferred = _infer_completion_classification(
-            tail, inference_service, project_id=project_id, agent_id=agent_id
-        )
+        inferred = intent_cache.get_inferred(cache_key)
+        if inferred is None:
+            inferred = _infer_completion_classification(
+                _extract_tail(cleaned), inference_service,
+                project_id=project_id, agent_id=agent_id,
+            )
+            if inferred:
+                intent_cache.put_inferred(cache_key, inferred)
         if inferred:
             logger.debug(
                 f"Inference fallback classified as {inferred.intent.value}"
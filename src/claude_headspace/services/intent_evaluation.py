@@ -0,0 +1,433 @@
+"""Labelled intent corpus and evaluation harness for intent_detector.
+
+A corpus is a JSONL file of stored Turns with the intent they ended up with:
+one ``{"turn_id", "actor", "intent", "state", "label_source", "text"}``
+object per line. ``state`` is the task state the turn was classified in,
+reconstructed from the preceding turn of the same task (user turns only need
+it). ``label_source`` says where an agent turn's label came from: "pattern",
+"inference" (a logged completion_classification call) or "unverified" (the
+detector's default PROGRESS, or a label neither explains).
+
+The harness replays a corpus through detect_agent_intent() (without the LLM
+fallback) and detect_user_intent() and reports accuracy, a confusion matrix
+and per-pattern hit rates. It can also time every pattern over the corpus
+and probe each one with adversarial inputs at two sizes: a pattern whose
+search time grows much faster than the input (catastrophic backtracking,
+e.g. ``[\\s\\S]*\\?\\s*$`` restarted at every "would you like") is flagged.
+
+Commands (cli/intent.py):
+    claude-headspace intent-export --output corpus.jsonl
+    claude-headspace intent-eval corpus.jsonl [--profile] [--backtracking]
+"""
+
+import json
+import logging
+import re
+import time
+from collections import Counter, defaultdict
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Callable, Iterable, Iterator
+
+from ..models.task import TaskState
+from ..models.turn import TurnActor, TurnIntent
+from . import intent_detector
+from .intent_classifier import has_trusted_label
+from .intent_detector import (
+    _extract_tail,
+    _required_literals,
+    _sre_parse,
+    _strip_code_blocks,
+    detect_agent_intent,
+    detect_user_intent,
+)
+from .openrouter_client import OpenRouterClient
+from .prompt_registry import build_prompt
+
+logger = logging.getLogger(__name__)
+
+# Every pattern list the detector consults, by name
+PATTERN_LISTS = {
+    name: getattr(intent_detector, name)
+    for name in (
+        "QUESTION_PATTERNS",
+        "BLOCKED_PATTERNS",
+        "COMPLETION_PATTERNS",
+        "COMPLETION_OPENER_PATTERNS",
+        "END_OF_TASK_SUMMARY_PATTERNS",
+        "END_OF_TASK_SOFT_CLOSE_PATTERNS",
+        "END_OF_TASK_HANDOFF_PATTERNS",
+        "CONTINUATION_PATTERNS",
+    )
+}
+
+# Adversarial probe sizes (characters) and the growth factor flagged as
+# pathological: linear scanning grows ~4x between the two sizes, quadratic
+# backtracking ~16x.
+PROBE_SMALL = 5_000
+PROBE_LARGE = 20_000
+GROWTH_THRESHOLD = 8.0
+# Ignore probes that stay fast in absolute terms, whatever their growth
+MIN_FLAGGED_SECONDS = 0.005
+
+
+@dataclass
+class CorpusEntry:
+    """One labelled turn."""
+
+    turn_id: int | None
+    actor: str
+    intent: str
+    text: str
+    state: str | None = None
+    label_source: str | None = None  # agent turns; None in older corpora
+
+
+def state_before(previous: tuple[TurnActor, TurnIntent] | None) -> TaskState:
+    """Task state a turn was classified in, from the previous turn of its task."""
+    if previous is None:
+        return TaskState.IDLE
+    prev_actor, prev_intent = previous
+    if prev_actor == TurnActor.AGENT and prev_intent == TurnIntent.QUESTION:
+        return TaskState.AWAITING_INPUT
+    if prev_intent in (TurnIntent.COMPLETION, TurnIntent.END_OF_TASK):
+        return TaskState.COMPLETE
+    return TaskState.PROCESSING
+
+
+def export_corpus(session, actor: TurnActor | None = None, limit: int | None = None) -> Iterator[CorpusEntry]:
+    """Yield stored turns as corpus entries, task by task in turn order.
+
+    Turns are loaded as ORM objects so text in cold storage is decompressed.
+    """
+    from ..models.turn import Turn
+
+    inferred = _logged_classification_hashes(session) if actor in (None, TurnActor.AGENT) else set()
+    query = session.query(Turn).order_by(Turn.task_id, Turn.timestamp, Turn.id)
+    previous: tuple[TurnActor, TurnIntent] | None = None
+    task_id = None
+    emitted = 0
+    for turn in query.yield_per(500):
+        if turn.task_id != task_id:
+            task_id, previous = turn.task_id, None
+        state = state_before(previous)
+        previous = (turn.actor, turn.intent)
+        if actor is not None and turn.actor != actor:
+            continue
+        if not turn.text:
+            continue
+        yield CorpusEntry(
+            turn_id=turn.id,
+            actor=turn.actor.value,
+            intent=turn.intent.value,
+            text=turn.text,
+            state=state.value,
+            label_source=label_source(turn.text, inferred) if turn.actor == TurnActor.AGENT else None,
+        )
+        emitted += 1
+        if limit is not None and emitted >= limit:
+            return
+
+
+def _logged_classification_hashes(session) -> set[str]:
+    """Input hashes of completion_classification calls that returned a result."""
+    from ..models.inference_call import InferenceCall
+
+    rows = session.query(InferenceCall.input_hash).filter(
+        InferenceCall.purpose == "completion_classification",
+        InferenceCall.error_message.is_(None),
+        InferenceCall.input_hash.isnot(None),
+    ).distinct()
+    return {input_hash for (input_hash,) in rows}
+
+
+def label_source(text: str, inferred: set[str]) -> str:
+    """Where an agent turn's stored label came from.
+
+    A turn no pattern matches got its label from the LLM fallback only if a
+    completion_classification call for its tail was logged; otherwise it is
+    the detector's default PROGRESS (inference unavailable, rate-limited or
+    timed out).
+    """
+    cleaned = _strip_code_blocks(text.strip())
+    if intent_detector._detect_by_patterns(cleaned) is not None:
+        return "pattern"
+    prompt = build_prompt("completion_classification", tail=_extract_tail(cleaned))
+    if OpenRouterClient.compute_input_hash(prompt) in inferred:
+        return "inference"
+    return "unverified"
+
+
+def write_corpus(entries: Iterable[CorpusEntry], path: str | Path) -> int:
+    """Write entries as JSONL; returns the number written."""
+    count = 0
+    with open(path, "w", encoding="utf-8") as f:
+        for entry in entries:
+            f.write(json.dumps(asdict(entry), ensure_ascii=False) + "\n")
+            count += 1
+    return count
+
+
+def read_corpus(path: str | Path) -> list[CorpusEntry]:
+    """Read a JSONL corpus; blank and malformed lines are skipped."""
+    entries = []
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            if not line.strip():
+                continue
+            try:
+                data = json.loads(line)
+                entries.append(CorpusEntry(
+                    turn_id=data.get("turn_id"),
+                    actor=data["actor"],
+                    intent=data["intent"],
+                    text=data["text"],
+                    state=data.get("state"),
+                    label_source=data.get("label_source"),
+                ))
+            except (ValueError, KeyError, TypeError):
+                logger.warning(f"Skipping malformed corpus line: {line[:80]!r}")
+    return entries
+
+
+@dataclass
+class PatternHits:
+    """How often a pattern decided a classification, and how often rightly."""
+
+    hits: int = 0
+    correct: int = 0
+
+    @property
+    def precision(self) -> float:
+        return self.correct / self.hits if self.hits else 0.0
+
+
+@dataclass
+class EvaluationReport:
+    """Accuracy of one detector over a corpus."""
+
+    detector: str
+    total: int = 0
+    correct: int = 0
+    # confusion[expected][predicted] = count
+    confusion: dict[str, Counter] = field(default_factory=lambda: defaultdict(Counter))
+    pattern_hits: dict[str, PatternHits] = field(default_factory=lambda: defaultdict(PatternHits))
+    # label_source -> [total, correct]; "pattern" labels agree with the
+    # pattern phases by construction
+    by_source: dict[str, list[int]] = field(default_factory=lambda: defaultdict(lambda: [0, 0]))
+    # Entries whose stored label is the detector's own unverified output
+    excluded: int = 0
+    elapsed_seconds: float = 0.0
+
+    @property
+    def accuracy(self) -> float:
+        return self.correct / self.total if self.total else 0.0
+
+    def add(self, expected: str, predicted: str, pattern: str | None, source: str | None = None) -> None:
+        self.total += 1
+        self.correct += expected == predicted
+        if source is not None:
+            counts = self.by_source[source]
+            counts[0] += 1
+            counts[1] += expected == predicted
+        self.confusion[expected][predicted] += 1
+        if pattern:
+            stats = self.pattern_hits[pattern]
+            stats.hits += 1
+            stats.correct += expected == predicted
+
+    def to_dict(self) -> dict:
+        return {
+            "detector": self.detector,
+            "total": self.total,
+            "correct": self.correct,
+            "accuracy": round(self.accuracy, 4),
+            "confusion": {k: dict(v) for k, v in self.confusion.items()},
+            "pattern_hits": {
+                p: {"hits": s.hits, "correct": s.correct} for p, s in self.pattern_hits.items()
+            },
+            "by_source": {k: {"total": t, "correct": c} for k, (t, c) in self.by_source.items()},
+            "excluded": self.excluded,
+            "elapsed_seconds": round(self.elapsed_seconds, 3),
+        }
+
+    def format(self) -> str:
+        """Human-readable report: accuracy, confusion matrix, pattern hits."""
+        if not self.total:
+            return f"{self.detector}: no entries" + (
+                f" ({self.excluded} unverified labels not scored)" if self.excluded else ""
+            )
+        mean_ms = self.elapsed_seconds / self.total * 1000
+        lines = [
+            f"{self.detector}: {self.correct}/{self.total} correct "
+            f"({self.accuracy:.1%}), {mean_ms:.2f} ms/turn"
+        ]
+        if self.excluded:
+            lines.append(f"  {self.excluded} unverified labels not scored")
+        if self.by_source:
+            lines.append("  by label source: " + ", ".join(
+                f"{source} {c}/{t} ({c / t:.1%}{', by construction' if source == 'pattern' else ''})"
+                for source, (t, c) in sorted(self.by_source.items())
+            ))
+        labels = sorted(set(self.confusion) | {p for row in self.confusion.values() for p in row})
+        header = "expected \\ predicted"
+        width = max(len(header), *(len(label) for label in labels)) + 2
+        lines.append("  " + header.ljust(width) + "".join(l[:11].rjust(12) for l in labels))
+        for expected in labels:
+            row = self.confusion.get(expected, {})
+            lines.append(
+                "  " + expected.ljust(width) + "".join(str(row.get(p, 0)).rjust(12) for p in labels)
+            )
+        if self.pattern_hits:
+            lines.append("  pattern hits (hits, precision):")
+            ranked = sorted(self.pattern_hits.items(), key=lambda kv: -kv[1].hits)
+            for pattern, stats in ranked:
+                lines.append(f"    {stats.hits:6d}  {stats.precision:6.1%}  {pattern[:90]}")
+        return "\n".join(lines)
+
+
+def evaluate(entries: Iterable[CorpusEntry]) -> dict[str, EvaluationReport]:
+    """Replay a corpus through both detectors.
+
+    Agent turns go through detect_agent_intent() without an inference
+    service, so the report measures the regex pipeline alone. Only agent
+    labels a pattern or a logged LLM call explains are scored (see
+    intent_classifier.has_trusted_label); the detector's own default
+    PROGRESS labels would count as ground truth otherwise.
+    """
+    reports = {
+        "agent": EvaluationReport("detect_agent_intent"),
+        "user": EvaluationReport("detect_user_intent"),
+    }
+    for entry in entries:
+        started = time.perf_counter()
+        if entry.actor == TurnActor.USER.value:
+            state = TaskState(entry.state) if entry.state else TaskState.PROCESSING
+            result = detect_user_intent(entry.text, state)
+            report = reports["user"]
+        else:
+            if not has_trusted_label(entry):
+                reports["agent"].excluded += 1
+                continue
+            result = detect_agent_intent(entry.text)
+            report = reports["agent"]
+        report.elapsed_seconds += time.perf_counter() - started
+        report.add(entry.intent, result.intent.value, result.matched_pattern, entry.label_source)
+    return reports
+
+
+@dataclass
+class PatternTiming:
+    """Total search time of one pattern over a set of texts."""
+
+    list_name: str
+    pattern: str
+    seconds: float
+    matches: int
+
+
+def profile_patterns(texts: list[str], repeat: int = 1) -> list[PatternTiming]:
+    """Time every detector pattern over texts, slowest first.
+
+    Each pattern is searched in every text on its own (no pre-filter), so
+    the numbers are the raw regex cost a pattern adds.
+    """
+    timings = []
+    for list_name, patterns in PATTERN_LISTS.items():
+        for pattern in patterns:
+            compiled = re.compile(pattern)
+            best = None
+            matches = 0
+            for _ in range(max(1, repeat)):
+                started = time.perf_counter()
+                matches = sum(1 for text in texts if compiled.search(text))
+                elapsed = time.perf_counter() - started
+                best = elapsed if best is None else min(best, elapsed)
+            timings.append(PatternTiming(list_name, pattern, best, matches))
+    timings.sort(key=lambda t: -t.seconds)
+    return timings
+
+
+def adversarial_inputs(pattern: str) -> dict[str, Callable[[int], str]]:
+    """Input builders (size -> text) likely to make a pattern backtrack.
+
+    Besides generic inputs (long lines, whitespace runs, question marks not
+    at a line end), every literal the pattern requires is repeated without
+    ever completing a match, which is what triggers restarts of unbounded
+    ``[\\s\\S]*`` or ``\\w*\\s*`` runs.
+    """
+    def repeat(unit: str) -> Callable[[int], str]:
+        return lambda size: (unit * (size // len(unit) + 1))[:size]
+
+    builders = {
+        "letters": repeat("a"),
+        "words": repeat("lorem ipsum "),
+        "spaces": repeat(" \t"),
+        "newlines": repeat("x\n"),
+        "digits": repeat("1 "),
+        "question-marks": repeat("? x"),
+    }
+    try:
+        literals = _required_literals(_sre_parse.parse(pattern)) or ()
+    except re.error:
+        literals = ()
+    for literal in sorted(literals):
+        builders[f"repeat {literal!r}"] = repeat(literal + " 1 x ")
+    return builders
+
+
+@dataclass
+class BacktrackFinding:
+    """A pattern whose search time grows superlinearly on some input."""
+
+    list_name: str
+    pattern: str
+    input_name: str
+    small_seconds: float
+    large_seconds: float
+
+    @property
+    def growth(self) -> float:
+        return self.large_seconds / self.small_seconds if self.small_seconds else float("inf")
+
+
+def _best_time(compiled: re.Pattern, text: str, runs: int = 3) -> float:
+    best = None
+    for _ in range(runs):
+        started = time.perf_counter()
+        compiled.search(text)
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def find_pathological(
+    small: int = PROBE_SMALL,
+    large: int = PROBE_LARGE,
+    threshold: float = GROWTH_THRESHOLD,
+    min_seconds: float = MIN_FLAGGED_SECONDS,
+    pattern_lists: dict[str, list[str]] | None = None,
+) -> list[BacktrackFinding]:
+    """Probe every pattern with adversarial inputs at two sizes.
+
+    A pattern is flagged when its search time on the larger input is more
+    than ``threshold`` times that on the smaller one and above
+    ``min_seconds``. Returns the worst input per flagged pattern, worst first.
+    """
+    findings = []
+    for list_name, patterns in (pattern_lists or PATTERN_LISTS).items():
+        for pattern in patterns:
+            compiled = re.compile(pattern)
+            worst = None
+            for input_name, build in adversarial_inputs(pattern).items():
+                small_s = _best_time(compiled, build(small))
+                large_s = _best_time(compiled, build(large))
+                finding = BacktrackFinding(list_name, pattern, input_name, small_s, large_s)
+                if large_s < min_seconds or finding.growth <= threshold:
+                    continue
+                if worst is None or finding.large_seconds > worst.large_seconds:
+                    worst = finding
+            if worst is not None:
+                findings.append(worst)
+    findings.sort(key=lambda f: -f.large_seconds)
+    return findings
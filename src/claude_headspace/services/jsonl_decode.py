@@ -0,0 +1,109 @@
+"""Selective decoding of Claude Code transcript lines.
+
+Most transcript bytes are tool traffic: tool_use inputs in assistant entries,
+tool_result payloads in user entries, and progress/system records. Readers
+only want text blocks and turn boundaries, so fully decoding every line just
+to look at its "type" wastes most of the parse time.
+
+This module inspects the raw bytes of a line before decoding it:
+
+- peek_type() reads the top-level "type" without decoding the line, so
+  records the caller does not want are skipped outright;
+- may_have_text() / is_user_content_list() cheaply prove that a line has
+  no text blocks, so large tool_use / tool_result lines can be classified
+  without decoding them.
+
+Both checks are conservative: when the bytes do not match the compact layout
+Claude Code writes, they fall back to "decode it". loads() uses orjson when it
+is installed and the standard library otherwise.
+"""
+
+import json
+import re
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - depends on the environment
+    orjson = None
+
+JSONDecodeError = json.JSONDecodeError
+
+if orjson is not None:
+    BACKEND = "orjson"
+
+    def loads(raw: bytes | str):
+        """Decode one JSON document (orjson.JSONDecodeError subclasses JSONDecodeError)."""
+        return orjson.loads(raw)
+
+else:  # pragma: no cover - depends on the environment
+    BACKEND = "json"
+
+    def loads(raw: bytes | str):
+        """Decode one JSON document."""
+        return json.loads(raw)
+
+
+# Lines at least this long are worth classifying from their bytes instead of
+# decoding them; shorter lines decode faster than they can be scanned twice.
+LAZY_DECODE_BYTES = 4096
+
+_TYPE_RE = re.compile(rb'"type"\s*:\s*"([A-Za-z_-]+)"')
+# A quoted "text" can only appear unescaped as a JSON key or value
+_TEXT_RE = re.compile(rb'"text"')
+# Claude Code writes user messages as {"role":"user","content":...}
+_USER_CONTENT_LIST_RE = re.compile(
+    rb'"message"\s*:\s*\{\s*"role"\s*:\s*"user"\s*,\s*"content"\s*:\s*\[\s*\{'
+)
+
+
+# Record types that never carry message text
+NON_MESSAGE_TYPES = frozenset({
+    "progress", "system", "summary", "file-history-snapshot", "queue-operation",
+})
+
+# How far into a line to look for leading metadata, and how far from its end
+# to look for trailing metadata
+_HEAD_PEEK_BYTES = 2048
+_TAIL_PEEK_BYTES = 1024
+
+
+def peek_type(raw, start: int = 0, end: int | None = None) -> str | None:
+    """Top-level "type" of a JSONL record, without decoding it.
+
+    Looks for a "type" key at nesting depth 1 in the metadata before the
+    first nested object, then in the metadata after the last one (assistant
+    records put "message" before "type"). Returns None when it cannot be
+    determined cheaply; the caller should then decode the line.
+
+    Args:
+        raw: The line, or any buffer (e.g. an mmap) containing it
+        start: Offset of the line in `raw`
+        end: End offset of the line in `raw` (default: end of `raw`)
+    """
+    end = len(raw) if end is None else end
+    match = _TYPE_RE.search(raw, start, min(end, start + _HEAD_PEEK_BYTES))
+    if match is not None:
+        prefix = raw[start:match.start()]
+        if prefix.count(b"{") == 1 and b"}" not in prefix and b"[" not in prefix:
+            return match.group(1).decode("ascii")
+
+    last = None
+    for last in _TYPE_RE.finditer(raw, max(start, end - _TAIL_PEEK_BYTES), end):
+        pass
+    if last is not None:
+        suffix = raw[last.end():end]
+        if suffix.count(b"}") == 1 and b"{" not in suffix and b"]" not in suffix:
+            return last.group(1).decode("ascii")
+    return None
+
+
+def may_have_text(raw, start: int = 0, end: int | None = None) -> bool:
+    """False only if the line certainly has no {"type": "text"} block."""
+    end = len(raw) if end is None else end
+    return _TEXT_RE.search(raw, start, end) is not None
+
+
+def is_user_content_list(raw, start: int = 0, end: int | None = None) -> bool:
+    """True if the line is a user message whose content is a non-empty list."""
+    end = len(raw) if end is None else end
+    return _USER_CONTENT_LIST_RE.search(raw, start, min(end, start + _HEAD_PEEK_BYTES)) is not None
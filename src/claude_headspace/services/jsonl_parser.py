@@ -1,11 +1,13 @@
 """JSONL parser for Claude Code session files."""
 
-import json
 import logging
+import os
 from dataclasses import dataclass
 from datetime import datetime, timezone
 from typing import Optional
 
+from . import jsonl_decode
+
 logger = logging.getLogger(__name__)
 
 
@@ -24,7 +26,9 @@ class JSONLParser:
     """
     Incremental parser for Claude Code jsonl files.
 
-    Tracks file position to only process new lines since last read.
+    Tracks file position to only process new lines since last read. Lines
+    are read and decoded by the shared TranscriptTailer, so the watcher's
+    parser and the other transcript consumers parse each line only once.
     """
 
     def __init__(self, file_path: str) -> None:
@@ -58,27 +62,23 @@ class JSONLParser:
         Returns:
             List of parsed turns (only user and assistant messages)
         """
-        turns = []
-
-        try:
-            with open(self._file_path, "r", encoding="utf-8") as f:
-                # Seek to last known position
-                f.seek(self._position)
+        from .transcript_tailer import LazyTranscriptEntry, get_transcript_tailer
 
-                for line in f:
-                    parsed = self._parse_line(line)
-                    if parsed:
-                        turns.append(parsed)
+        if not os.path.exists(self._file_path):
+            logger.warning(f"JSONL file not found: {self._file_path}")
+            return []
 
-                # Update position to end of file
-                self._position = f.tell()
+        entries, self._position = get_transcript_tailer().read_from(
+            self._file_path, self._position
+        )
 
-        except FileNotFoundError:
-            logger.warning(f"JSONL file not found: {self._file_path}")
-        except PermissionError:
-            logger.warning(f"Permission denied reading: {self._file_path}")
-        except Exception as e:
-            logger.error(f"Error reading JSONL file: {e}")
+        turns = []
+        for entry in entries:
+            if isinstance(entry, LazyTranscriptEntry):
+                continue  # No text blocks: nothing to turn into a ParsedTurn
+            parsed = self._parse_data(entry.raw_data)
+            if parsed:
+                turns.append(parsed)
 
         return turns
 
@@ -97,11 +97,23 @@ class JSONLParser:
             return None
 
         try:
-            data = json.loads(line)
-        except json.JSONDecodeError as e:
+            data = jsonl_decode.loads(line)
+        except jsonl_decode.JSONDecodeError as e:
             logger.warning(f"Malformed JSON line: {e}")
             return None
 
+        return self._parse_data(data)
+
+    def _parse_data(self, data: dict) -> Optional[ParsedTurn]:
+        """
+        Build a ParsedTurn from a decoded jsonl record.
+
+        Args:
+            data: Parsed JSON data
+
+        Returns:
+            ParsedTurn if the record is a user/assistant message, None otherwise
+        """
         # Only process user and assistant messages
         msg_type = data.get("type")
         if msg_type not in ("user", "assistant"):
@@ -0,0 +1,275 @@
+"""Incrementally maintained Kanban column membership and status counters.
+
+The dashboard header counts, each project's state-dot flags and the Kanban
+column each agent sits in used to be recomputed by walking every agent of
+every project on each render. KanbanIndex keeps them per project and is
+updated from card_refresh broadcasts, so a state change in one project only
+touches that project's columns and counters. Header totals are maintained
+alongside and read in O(1).
+"""
+
+import logging
+import threading
+from dataclasses import dataclass, field
+
+from ..models import TaskState
+
+logger = logging.getLogger(__name__)
+
+# Display state for stale PROCESSING agents (mirrors card_state.TIMED_OUT)
+_TIMED_OUT = "TIMED_OUT"
+
+STATUS_BUCKETS = ("timed_out", "input_needed", "working", "idle")
+KANBAN_COLUMNS = ("IDLE", "PROCESSING", "AWAITING_INPUT", "COMPLETE")
+
+_FLAG_NAMES = {
+    "timed_out": "has_timed_out",
+    "input_needed": "has_input_needed",
+    "working": "has_working",
+    "idle": "has_idle",
+}
+
+
+def status_bucket(state: TaskState | str) -> str:
+    """Map an effective agent state to its header status counter."""
+    if state == _TIMED_OUT:
+        return "timed_out"
+    if state == TaskState.AWAITING_INPUT:
+        return "input_needed"
+    if state in (TaskState.COMMANDED, TaskState.PROCESSING):
+        return "working"
+    return "idle"  # IDLE or COMPLETE
+
+
+def _bucket_for_name(state_name: str | None) -> str | None:
+    if state_name is None:
+        return None
+    if state_name == _TIMED_OUT:
+        return "timed_out"
+    return status_bucket(TaskState[state_name])
+
+
+def kanban_column(state_name: str, has_current_task: bool) -> str:
+    """Map an effective state name to the Kanban column its card goes in.
+
+    Idle and just-completed agents sit in IDLE (their completed tasks are
+    rendered separately in COMPLETE). COMMANDED is transitory and TIMED_OUT
+    is a stale PROCESSING, so both display in PROCESSING.
+    """
+    if not has_current_task or state_name in ("IDLE", "COMPLETE"):
+        return "IDLE"
+    if state_name in ("COMMANDED", _TIMED_OUT):
+        return "PROCESSING"
+    return state_name
+
+
+def empty_counts() -> dict[str, int]:
+    return {bucket: 0 for bucket in STATUS_BUCKETS}
+
+
+def flags_from_counts(counts: dict[str, int]) -> dict[str, bool]:
+    """Derive project state-dot flags from its status counters."""
+    return {flag: counts.get(bucket, 0) > 0 for bucket, flag in _FLAG_NAMES.items()}
+
+
+@dataclass
+class _Placement:
+    project_id: int
+    bucket: str
+    column: str
+
+
+@dataclass
+class _ProjectBoard:
+    counts: dict[str, int] = field(default_factory=empty_counts)
+    # Insertion-ordered sets of agent ids per column
+    columns: dict[str, dict[int, None]] = field(
+        default_factory=lambda: {col: {} for col in KANBAN_COLUMNS}
+    )
+
+
+class KanbanIndex:
+    """Thread-safe per-project Kanban columns and status counters."""
+
+    def __init__(self):
+        self._placements: dict[int, _Placement] = {}
+        self._boards: dict[int, _ProjectBoard] = {}
+        self._totals = empty_counts()
+        self._lock = threading.Lock()
+        self._warm = False
+        self._updates = 0
+
+    @staticmethod
+    def placement_for(agent) -> tuple[str, str]:
+        """Compute (status bucket, Kanban column) for an Agent model."""
+        from .card_state import get_effective_state
+
+        effective = get_effective_state(agent)
+        state_name = effective if isinstance(effective, str) else effective.name
+        has_task = agent.get_current_task() is not None
+        return status_bucket(effective), kanban_column(state_name, has_task)
+
+    # --- mutation (lock held) -------------------------------------------
+
+    def _remove(self, agent_id: int) -> int | None:
+        placement = self._placements.pop(agent_id, None)
+        if placement is None:
+            return None
+        board = self._boards[placement.project_id]
+        board.counts[placement.bucket] -= 1
+        self._totals[placement.bucket] -= 1
+        board.columns[placement.column].pop(agent_id, None)
+        if not any(board.counts.values()):
+            del self._boards[placement.project_id]
+        self._updates += 1
+        return placement.project_id
+
+    def _place(self, agent_id: int, project_id: int, bucket: str, column: str) -> bool:
+        new = _Placement(project_id=project_id, bucket=bucket, column=column)
+        if self._placements.get(agent_id) == new:
+            return False
+        self._remove(agent_id)
+        board = self._boards.setdefault(project_id, _ProjectBoard())
+        board.counts[bucket] += 1
+        self._totals[bucket] += 1
+        board.columns[column][agent_id] = None
+        self._placements[agent_id] = new
+        self._updates += 1
+        return True
+
+    # --- public API -----------------------------------------------------
+
+    def sync_agent(self, agent) -> tuple[int, ...]:
+        """Apply an agent's current state.
+
+        Ended agents are removed. Only the boards of the agent's previous
+        and current project are touched.
+
+        Returns:
+            Ids of the projects whose board changed (two when the agent
+            moved project), or an empty tuple
+        """
+        placement = None if agent.ended_at is not None else self.placement_for(agent)
+        with self._lock:
+            previous = self._placements.get(agent.id)
+            if placement is None:
+                removed = self._remove(agent.id)
+                return (removed,) if removed is not None else ()
+            bucket, column = placement
+            if not self._place(agent.id, agent.project_id, bucket, column):
+                return ()
+            if previous is not None and previous.project_id != agent.project_id:
+                return (previous.project_id, agent.project_id)
+            return (agent.project_id,)
+
+    def refresh(self, agents, states: dict[int, str]) -> int:
+        """Bring the index in line with the live agents of a dashboard render.
+
+        A cold index, or one whose membership differs from ``agents``, is
+        fully reconciled. Otherwise only agents whose status bucket no
+        longer matches their effective state (e.g. PROCESSING that has
+        since timed out) are re-placed.
+
+        Args:
+            agents: Live Agent model instances
+            states: Effective state name per agent id, as computed by the render
+
+        Returns:
+            Number of agents re-placed
+        """
+        agents = list(agents)
+        with self._lock:
+            cold = not self._warm or len(self._placements) != len(agents)
+            drifted = []
+            for agent in agents:
+                placement = self._placements.get(agent.id)
+                if placement is None:
+                    cold = True
+                    break
+                if placement.bucket != _bucket_for_name(states.get(agent.id)):
+                    drifted.append(agent)
+        if cold:
+            self.reconcile(agents)
+            return len(agents)
+        for agent in drifted:
+            self.sync_agent(agent)
+        return len(drifted)
+
+    def reconcile(self, agents) -> None:
+        """Make the index match exactly the given live agents."""
+        placements = [(agent, self.placement_for(agent)) for agent in agents]
+        with self._lock:
+            live_ids = {agent.id for agent, _ in placements}
+            for agent_id in [a for a in self._placements if a not in live_ids]:
+                self._remove(agent_id)
+            for agent, (bucket, column) in placements:
+                self._place(agent.id, agent.project_id, bucket, column)
+            self._warm = True
+
+    def clear(self) -> None:
+        with self._lock:
+            self._placements.clear()
+            self._boards.clear()
+            self._totals = empty_counts()
+            self._warm = False
+
+    def status_counts(self) -> dict[str, int]:
+        """Header status counters across all projects."""
+        with self._lock:
+            return dict(self._totals)
+
+    def project_counts(self, project_id: int) -> dict[str, int]:
+        with self._lock:
+            board = self._boards.get(project_id)
+            return dict(board.counts) if board else empty_counts()
+
+    def project_flags(self, project_id: int) -> dict[str, bool]:
+        """State-dot flags for a project."""
+        return flags_from_counts(self.project_counts(project_id))
+
+    def column_of(self, agent_id: int) -> str | None:
+        with self._lock:
+            placement = self._placements.get(agent_id)
+            return placement.column if placement else None
+
+    def project_columns(self, project_id: int) -> dict[str, list[int]]:
+        """Agent ids per Kanban column for a project."""
+        with self._lock:
+            board = self._boards.get(project_id)
+            if board is None:
+                return {col: [] for col in KANBAN_COLUMNS}
+            return {col: list(ids) for col, ids in board.columns.items()}
+
+    def snapshot(self, project_id: int) -> dict:
+        """Payload for status_counts SSE events."""
+        with self._lock:
+            board = self._boards.get(project_id)
+            counts = dict(board.counts) if board else empty_counts()
+            columns = (
+                {col: list(ids) for col, ids in board.columns.items()}
+                if board else {col: [] for col in KANBAN_COLUMNS}
+            )
+            totals = dict(self._totals)
+        return {
+            "project_id": project_id,
+            "project_counts": counts,
+            "project_flags": flags_from_counts(counts),
+            "project_columns": columns,
+            "status_counts": totals,
+        }
+
+    @property
+    def is_warm(self) -> bool:
+        with self._lock:
+            return self._warm
+
+    @property
+    def stats(self) -> dict:
+        """Return index statistics."""
+        with self._lock:
+            return {
+                "agents": len(self._placements),
+                "projects": len(self._boards),
+                "warm": self._warm,
+                "updates": self._updates,
+            }
@@ -1,12 +1,17 @@
 """OpenRouter API client for LLM inference."""
 
 import hashlib
+import json
 import logging
 import os
+import threading
 import time
+from collections import deque
+from collections.abc import Callable
 from dataclasses import dataclass
 
 import requests
+from requests.adapters import HTTPAdapter
 
 logger = logging.getLogger(__name__)
 
@@ -22,6 +27,7 @@ class InferenceResult:
     latency_ms: int
     cached: bool = False
     error: str | None = None
+    ttft_ms: int | None = None  # Time to first token (streamed calls only)
 
 
 class OpenRouterClientError(Exception):
@@ -34,7 +40,11 @@ class OpenRouterClientError(Exception):
 
 
 class OpenRouterClient:
-    """HTTP client for OpenRouter API."""
+    """HTTP client for OpenRouter API.
+
+    Requests share a pooled, keep-alive session so consecutive calls reuse
+    an open TLS connection instead of paying the handshake each time.
+    """
 
     def __init__(self, config: dict):
         or_config = config.get("openrouter", {})
@@ -50,6 +60,24 @@ class OpenRouterClient:
         self.base_delay = retry_config.get("base_delay_seconds", 1.0)
         self.max_delay = retry_config.get("max_delay_seconds", 30.0)
 
+        # Connection pool: retries are handled here, not by urllib3
+        self.pool_size = or_config.get("pool_size", 10)
+        self._session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=1, pool_maxsize=self.pool_size, max_retries=0,
+        )
+        self._session.mount("https://", adapter)
+        self._session.mount("http://", adapter)
+        self._adapter = adapter
+
+        self._stats_lock = threading.Lock()
+        self._streamed = 0
+        self._ttft_ms: deque[int] = deque(maxlen=100)
+
+    def close(self) -> None:
+        """Close pooled connections."""
+        self._session.close()
+
     @property
     def is_configured(self) -> bool:
         """Check if the client has a valid API key."""
@@ -63,12 +91,21 @@ class OpenRouterClient:
             "X-Title": "Claude Headspace",
         }
 
-    def chat_completion(self, model: str, messages: list[dict], **kwargs) -> InferenceResult:
+    def chat_completion(
+        self,
+        model: str,
+        messages: list[dict],
+        on_token: Callable[[str], None] | None = None,
+        **kwargs,
+    ) -> InferenceResult:
         """Send a chat completion request with retries.
 
         Args:
             model: The model identifier (e.g., "anthropic/claude-3-haiku")
             messages: List of message dicts with "role" and "content"
+            on_token: If given, the completion is streamed and called with
+                each text delta as it arrives. A stream that fails after its
+                first token is not retried.
             **kwargs: Additional parameters passed to the API
 
         Returns:
@@ -86,17 +123,24 @@ class OpenRouterClient:
             "messages": messages,
             **kwargs,
         }
+        if on_token is not None:
+            payload["stream"] = True
 
         last_error = None
         for attempt in range(self.max_attempts):
             try:
                 start_time = time.monotonic()
-                response = requests.post(
+                response = self._session.post(
                     url,
                     json=payload,
                     headers=self._get_headers(),
                     timeout=self.timeout,
+                    stream=on_token is not None,
                 )
+
+                if response.status_code == 200 and on_token is not None:
+                    return self._read_stream(response, model, start_time, on_token)
+
                 latency_ms = int((time.monotonic() - start_time) * 1000)
 
                 if response.status_code == 200:
@@ -135,8 +179,10 @@ class OpenRouterClient:
                 last_error = OpenRouterClientError(
                     "Connection failed", retryable=True
                 )
-            except OpenRouterClientError:
-                raise
+            except OpenRouterClientError as e:
+                if not e.retryable:
+                    raise
+                last_error = e
             except Exception as e:
                 last_error = OpenRouterClientError(
                     f"Unexpected error: {e}", retryable=False
@@ -154,6 +200,84 @@ class OpenRouterClient:
 
         raise last_error
 
+    def _read_stream(
+        self,
+        response: requests.Response,
+        model: str,
+        start_time: float,
+        on_token: Callable[[str], None],
+    ) -> InferenceResult:
+        """Consume a server-sent event stream, forwarding text deltas."""
+        parts: list[str] = []
+        usage: dict = {}
+        ttft_ms = None
+        try:
+            for line in response.iter_lines(decode_unicode=True):
+                # Blank keep-alives and ": OPENROUTER PROCESSING" comments
+                if not line or not line.startswith("data:"):
+                    continue
+                data = line[5:].strip()
+                if data == "[DONE]":
+                    break
+                chunk = json.loads(data)
+                if "error" in chunk:
+                    raise OpenRouterClientError(
+                        f"Stream error: {chunk['error']}", retryable=not parts,
+                    )
+                model = chunk.get("model", model)
+                usage = chunk.get("usage") or usage
+                delta = (chunk.get("choices") or [{}])[0].get("delta", {}).get("content")
+                if delta:
+                    if ttft_ms is None:
+                        ttft_ms = int((time.monotonic() - start_time) * 1000)
+                    parts.append(delta)
+                    on_token(delta)
+        except requests.exceptions.RequestException as e:
+            raise OpenRouterClientError(f"Stream interrupted: {e}", retryable=not parts) from e
+        except ValueError as e:
+            raise OpenRouterClientError(f"Malformed stream chunk: {e}", retryable=False) from e
+        finally:
+            response.close()
+
+        with self._stats_lock:
+            self._streamed += 1
+            if ttft_ms is not None:
+                self._ttft_ms.append(ttft_ms)
+
+        return InferenceResult(
+            text="".join(parts),
+            input_tokens=usage.get("prompt_tokens", 0),
+            output_tokens=usage.get("completion_tokens", 0),
+            model=model,
+            latency_ms=int((time.monotonic() - start_time) * 1000),
+            ttft_ms=ttft_ms,
+        )
+
+    @property
+    def stats(self) -> dict:
+        """Return connection reuse and time-to-first-token statistics."""
+        requests_sent = connections_opened = 0
+        pools = self._adapter.poolmanager.pools
+        for key in pools.keys():
+            pool = pools.get(key)
+            if pool is not None:
+                requests_sent += pool.num_requests
+                connections_opened += pool.num_connections
+        with self._stats_lock:
+            ttft = sorted(self._ttft_ms)
+            streamed = self._streamed
+        return {
+            "pool_size": self.pool_size,
+            "requests": requests_sent,
+            "connections_opened": connections_opened,
+            "connection_reuse_rate": (
+                1 - connections_opened / requests_sent if requests_sent else 0
+            ),
+            "streamed": streamed,
+            "ttft_ms_avg": int(sum(ttft) / len(ttft)) if ttft else None,
+            "ttft_ms_p95": ttft[int(len(ttft) * 0.95)] if ttft else None,
+        }
+
     def check_connectivity(self) -> bool:
         """Check if OpenRouter API is reachable.
 
@@ -164,7 +288,7 @@ class OpenRouterClient:
             return False
 
         try:
-            response = requests.get(
+            response = self._session.get(
                 f"{self.base_url}/models",
                 headers=self._get_headers(),
                 timeout=5,
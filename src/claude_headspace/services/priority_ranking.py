@@ -0,0 +1,367 @@
+"""Incrementally maintained priority ranking of live agents.
+
+The dashboard's By Priority order, the per-project priority order and the
+Recommended Next agent used to be recomputed by sorting every agent on every
+render. PriorityRanking keeps the same orderings as sorted key lists that are
+updated in O(log n) whenever an agent's card is refreshed (state change,
+priority scoring, session end), so reads are O(1) for the recommended agent
+and O(k) for the top-k agents.
+
+Time-dependent state (stale PROCESSING shown as TIMED_OUT, the active-agent
+window) is re-derived whenever an agent is synced. Dashboard renders only
+rebuild the entries whose display state has drifted; the whole ranking is
+reconciled against the database when it is cold or its membership is off.
+
+The By Priority view groups agents by state and ranks unscored agents as 50.
+``/api/priority/rankings`` keeps its score-descending, unscored-last order
+and reads it from a separate sorted list.
+"""
+
+import logging
+import threading
+from bisect import bisect_left, insort
+from dataclasses import dataclass
+from datetime import datetime, timezone
+
+from ..models import TaskState
+
+logger = logging.getLogger(__name__)
+
+# Number of top-ranked agents included in priority_ranking SSE events
+DEFAULT_TOP_N = 5
+
+_ATTENTION_STATES = (TaskState.AWAITING_INPUT.name, "TIMED_OUT")
+_WORKING_STATES = (TaskState.COMMANDED.name, TaskState.PROCESSING.name)
+
+
+@dataclass(frozen=True)
+class RankingEntry:
+    """Ranking-relevant snapshot of a single agent."""
+
+    agent_id: int
+    project_id: int | None
+    project_name: str
+    project_slug: str | None
+    session_uuid: str
+    state: str
+    model_state: str
+    score: int | None
+    reason: str | None
+    scored_at: datetime | None
+    last_seen_at: datetime
+
+    @property
+    def needs_attention(self) -> bool:
+        return self.state in _ATTENTION_STATES
+
+    def to_dict(self) -> dict:
+        """Serialise for JSON responses and SSE events."""
+        return {
+            "agent_id": self.agent_id,
+            "project_id": self.project_id,
+            "project_name": self.project_name,
+            "project_slug": self.project_slug,
+            "session_uuid": self.session_uuid,
+            "state": self.state,
+            "model_state": self.model_state,
+            "score": self.score,
+            "reason": self.reason,
+            "scored_at": self.scored_at.isoformat() if self.scored_at else None,
+            "last_seen_at": self.last_seen_at.isoformat() if self.last_seen_at else None,
+        }
+
+
+def entry_from_agent(agent) -> RankingEntry:
+    """Build a RankingEntry from an Agent model instance."""
+    from .card_state import get_effective_state
+
+    effective = get_effective_state(agent)
+    state = effective if isinstance(effective, str) else effective.name
+    model_state = agent.state.value if hasattr(agent.state, "value") else str(agent.state)
+    project = getattr(agent, "project", None)
+    return RankingEntry(
+        agent_id=agent.id,
+        project_id=getattr(agent, "project_id", None),
+        project_name=project.name if project else "Unknown",
+        project_slug=project.slug if project else None,
+        session_uuid=str(agent.session_uuid)[:8],
+        state=state,
+        model_state=model_state,
+        score=agent.priority_score,
+        reason=agent.priority_reason,
+        scored_at=agent.priority_updated_at,
+        last_seen_at=agent.last_seen_at,
+    )
+
+
+def recommendation_rationale(entry: RankingEntry, now: datetime | None = None) -> str:
+    """Explain why an agent is the recommended next agent."""
+    if entry.needs_attention:
+        now = now or datetime.now(timezone.utc)
+        wait_minutes = int((now - entry.last_seen_at).total_seconds() // 60)
+        label = "Timed out" if entry.state == "TIMED_OUT" else "Awaiting input"
+        if wait_minutes >= 60:
+            return f"{label} for {wait_minutes // 60}h {wait_minutes % 60}m"
+        if wait_minutes > 0:
+            return f"{label} for {wait_minutes}m"
+        return label
+
+    if entry.score is not None and entry.reason:
+        return f"Priority: {entry.score} — {entry.reason}"
+    return "Most recently active"
+
+
+def _timestamp(value: datetime | None) -> float:
+    return value.timestamp() if value else float("-inf")
+
+
+def _order_key(entry: RankingEntry) -> tuple:
+    """By Priority view order: score desc, state group, last seen desc."""
+    score = entry.score if entry.score is not None else 50
+    if entry.needs_attention:
+        group = 0
+    elif entry.state in _WORKING_STATES:
+        group = 1
+    else:
+        group = 2
+    return (-score, group, -_timestamp(entry.last_seen_at), entry.agent_id)
+
+
+def _attention_key(entry: RankingEntry) -> tuple:
+    """Agents needing attention: longest waiting first."""
+    return (_timestamp(entry.last_seen_at), entry.agent_id)
+
+
+def _score_key(entry: RankingEntry) -> tuple:
+    """Recommendation fallback: score desc (unscored last), last seen desc."""
+    score = entry.score if entry.score is not None else -1
+    return (-score, -_timestamp(entry.last_seen_at), entry.agent_id)
+
+
+class PriorityRanking:
+    """Thread-safe, incrementally maintained agent priority ranking."""
+
+    def __init__(self, top_n: int = DEFAULT_TOP_N):
+        self.top_n = top_n
+        self._entries: dict[int, RankingEntry] = {}
+        self._order: list[tuple] = []
+        self._attention: list[tuple] = []
+        self._by_score: list[tuple] = []
+        self._lock = threading.Lock()
+        self._warm = False
+        self._updates = 0
+        self._head_changes = 0
+
+    # --- mutation -------------------------------------------------------
+
+    def _discard(self, entry: RankingEntry) -> None:
+        """Remove an entry's keys from the sorted lists (lock held)."""
+        for keys, key in (
+            (self._order, _order_key(entry)),
+            (self._by_score, _score_key(entry)),
+        ):
+            idx = bisect_left(keys, key)
+            if idx < len(keys) and keys[idx] == key:
+                del keys[idx]
+        if entry.needs_attention:
+            key = _attention_key(entry)
+            idx = bisect_left(self._attention, key)
+            if idx < len(self._attention) and self._attention[idx] == key:
+                del self._attention[idx]
+
+    def _insert(self, entry: RankingEntry) -> None:
+        """Insert an entry's keys into the sorted lists (lock held)."""
+        insort(self._order, _order_key(entry))
+        insort(self._by_score, _score_key(entry))
+        if entry.needs_attention:
+            insort(self._attention, _attention_key(entry))
+
+    def _put(self, entry: RankingEntry) -> None:
+        existing = self._entries.get(entry.agent_id)
+        if existing == entry:
+            return
+        if existing is not None:
+            self._discard(existing)
+        self._entries[entry.agent_id] = entry
+        self._insert(entry)
+        self._updates += 1
+
+    def _pop(self, agent_id: int) -> None:
+        existing = self._entries.pop(agent_id, None)
+        if existing is not None:
+            self._discard(existing)
+            self._updates += 1
+
+    def update(self, entry: RankingEntry) -> None:
+        """Insert or re-position an agent. Unchanged entries are a no-op."""
+        with self._lock:
+            self._put(entry)
+
+    def remove(self, agent_id: int) -> None:
+        """Drop an agent from the ranking (e.g. when it ends)."""
+        with self._lock:
+            self._pop(agent_id)
+
+    def reconcile(self, entries) -> None:
+        """Make the ranking match exactly the given set of live agents."""
+        entries = list(entries)
+        with self._lock:
+            live_ids = {e.agent_id for e in entries}
+            for agent_id in [a for a in self._entries if a not in live_ids]:
+                self._pop(agent_id)
+            for entry in entries:
+                self._put(entry)
+            self._warm = True
+
+    def refresh(self, agents, states: dict[int, str]) -> int:
+        """Bring the ranking in line with the live agents of a dashboard render.
+
+        A cold ranking, or one whose membership differs from ``agents``, is
+        fully reconciled. Otherwise only agents whose display state differs
+        from their entry (e.g. PROCESSING that has since timed out) have their
+        entry rebuilt.
+
+        Args:
+            agents: Live Agent model instances
+            states: Effective state name per agent id, as computed by the render
+
+        Returns:
+            Number of entries rebuilt
+        """
+        agents = list(agents)
+        with self._lock:
+            cold = not self._warm or len(self._entries) != len(agents)
+            drifted = []
+            for agent in agents:
+                entry = self._entries.get(agent.id)
+                if entry is None:
+                    cold = True
+                    break
+                if entry.state != states.get(agent.id):
+                    drifted.append(agent)
+        if cold:
+            self.reconcile(entry_from_agent(agent) for agent in agents)
+            return len(agents)
+        if drifted:
+            entries = [entry_from_agent(agent) for agent in drifted]
+            with self._lock:
+                for entry in entries:
+                    self._put(entry)
+        return len(drifted)
+
+    def sync_agent(self, agent, active_since: datetime | None = None) -> bool:
+        """Apply an agent's current state and report whether the head moved.
+
+        The head is the recommended agent plus the top-N order; callers use
+        the return value to decide whether a priority_ranking event is worth
+        broadcasting.
+
+        Args:
+            agent: Agent model instance
+            active_since: Cutoff for the recommendation's active-agent window
+
+        Returns:
+            True if the recommended agent or the top-N order changed
+        """
+        entry = None if agent.ended_at is not None else entry_from_agent(agent)
+        with self._lock:
+            before = self._head_signature(active_since)
+            if entry is None:
+                self._pop(agent.id)
+            else:
+                self._put(entry)
+            changed = self._head_signature(active_since) != before
+            if changed:
+                self._head_changes += 1
+            return changed
+
+    def clear(self) -> None:
+        """Remove all entries and mark the ranking cold."""
+        with self._lock:
+            self._entries.clear()
+            self._order.clear()
+            self._attention.clear()
+            self._by_score.clear()
+            self._warm = False
+
+    # --- reads ----------------------------------------------------------
+
+    def _recommended(self, active_since: datetime | None) -> RankingEntry | None:
+        if self._attention:
+            return self._entries[self._attention[0][-1]]
+        for key in self._by_score:
+            entry = self._entries[key[-1]]
+            if active_since is None or entry.last_seen_at >= active_since:
+                return entry
+        return None
+
+    def _head_signature(self, active_since: datetime | None) -> tuple:
+        recommended = self._recommended(active_since)
+        rec_key = (
+            (recommended.agent_id, recommended.state, recommended.score, recommended.reason)
+            if recommended else None
+        )
+        top = tuple(
+            (key[-1], self._entries[key[-1]].score)
+            for key in self._order[: self.top_n]
+        )
+        return (rec_key, top)
+
+    def ranked(self, limit: int | None = None) -> list[RankingEntry]:
+        """Agents in By Priority order, optionally only the first `limit`."""
+        with self._lock:
+            keys = self._order if limit is None else self._order[:limit]
+            return [self._entries[key[-1]] for key in keys]
+
+    def ranked_by_score(self, limit: int | None = None) -> list[RankingEntry]:
+        """Agents by score descending (unscored last), then most recently seen."""
+        with self._lock:
+            keys = self._by_score if limit is None else self._by_score[:limit]
+            return [self._entries[key[-1]] for key in keys]
+
+    def recommended(self, active_since: datetime | None = None) -> RankingEntry | None:
+        """The recommended next agent.
+
+        Oldest-waiting AWAITING_INPUT/TIMED_OUT agent first; otherwise the
+        highest-scored agent seen since `active_since`.
+        """
+        with self._lock:
+            return self._recommended(active_since)
+
+    def snapshot(self, active_since: datetime | None = None) -> dict:
+        """Payload for priority_ranking SSE events."""
+        with self._lock:
+            recommended = self._recommended(active_since)
+            top = [self._entries[key[-1]] for key in self._order[: self.top_n]]
+        payload = None
+        if recommended:
+            payload = {
+                **recommended.to_dict(),
+                "rationale": recommendation_rationale(recommended),
+            }
+        return {
+            "recommended": payload,
+            "top": [entry.to_dict() for entry in top],
+        }
+
+    @property
+    def is_warm(self) -> bool:
+        """Whether the ranking has been reconciled against the database."""
+        with self._lock:
+            return self._warm
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+    @property
+    def stats(self) -> dict:
+        """Return ranking statistics."""
+        with self._lock:
+            return {
+                "agents": len(self._entries),
+                "needs_attention": len(self._attention),
+                "warm": self._warm,
+                "updates": self._updates,
+                "head_changes": self._head_changes,
+            }
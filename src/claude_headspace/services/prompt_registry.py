@@ -157,6 +157,16 @@ _PROMPT_TEMPLATES: dict[str, str] = {
         'Return ONLY valid JSON: {{"summary": "...", "frustration_score": N}}'
     ),
 
+    # --- Summarisation: several independent prompts in one call ---
+    "summarise_batch": (
+        "Below are {count} independent requests, each inside <item id=\"...\"> tags. "
+        "Answer each one on its own, exactly as its own instructions ask, "
+        "without reference to the other items.\n\n"
+        "{items}\n\n"
+        "Return ONLY a JSON object mapping every item id to its answer as a string, "
+        'e.g. {{"1": "...", "2": "..."}}. No preamble or commentary.'
+    ),
+
     # --- Project metadata: description generation ---
     "project_description": (
         "Below is the CLAUDE.md file from a software project.\n\n"
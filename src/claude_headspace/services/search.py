@@ -0,0 +1,307 @@
+"""Full-text search across turns and tasks.
+
+Searches Turn.text / Turn.summary and Task.instruction /
+Task.completion_summary through their trigger-maintained ``search_vector``
+columns (GIN indexed, see models/search_vector.py). Queries use
+websearch_to_tsquery syntax: bare words are ANDed, "quoted phrases",
+``or`` and ``-excluded`` terms are supported.
+
+Results are ranked with ts_rank_cd (or ordered by recency) and paginated
+with an opaque keyset cursor rather than OFFSET, so deep pages cost the same
+as the first. Highlighted snippets are computed only for the rows on the
+returned page; turns whose text is in cold storage are decompressed here and
+highlighted in one extra query.
+"""
+
+import base64
+import json
+from dataclasses import dataclass
+from datetime import datetime
+from decimal import Decimal
+from html import escape
+
+from sqlalchemy import Numeric, Text, cast, func, literal, select, tuple_, union_all
+
+from ..database import db
+from ..models.agent import Agent
+from ..models.cold_storage import ColdStorageError, decompress_text
+from ..models.project import Project
+from ..models.search_vector import SEARCH_CONFIG
+from ..models.task import Task
+from ..models.turn import Turn
+
+KINDS = ("turn", "task")
+SORTS = ("relevance", "recent")
+
+DEFAULT_LIMIT = 20
+MAX_LIMIT = 100
+
+# Only the start of very long documents is scanned for snippets
+_SNIPPET_SOURCE_CHARS = 50_000
+
+# Highlight markers: control characters never present in HTML-escaped text,
+# replaced with <mark> after escaping the snippet
+_START_SEL = "\x02"
+_STOP_SEL = "\x03"
+_HEADLINE_OPTIONS = (
+    f"StartSel={_START_SEL}, StopSel={_STOP_SEL}, "
+    "MaxWords=35, MinWords=12, MaxFragments=2, FragmentDelimiter=\" … \""
+)
+
+
+class SearchError(ValueError):
+    """Invalid search parameters (bad cursor, kind or sort)."""
+
+
+@dataclass
+class SearchPage:
+    results: list[dict]
+    next_cursor: str | None
+
+
+def encode_cursor(sort: str, row) -> str:
+    """Opaque cursor for the position after `row` (a hit row)."""
+    key = {"ts": row.ts.isoformat(), "id": row.id, "kind": row.kind}
+    if sort == "relevance":
+        key["rank"] = str(row.rank)
+    raw = json.dumps(key, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(sort: str, cursor: str) -> tuple:
+    """Keyset values from a cursor, in ORDER BY column order."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        key = json.loads(base64.urlsafe_b64decode(padded))
+        values = (datetime.fromisoformat(key["ts"]), int(key["id"]), str(key["kind"]))
+        if sort == "relevance":
+            return (Decimal(key["rank"]),) + values
+        return values
+    except (ValueError, KeyError, TypeError, ArithmeticError) as e:
+        raise SearchError("Invalid cursor") from e
+
+
+def render_snippet(headline: str | None) -> str | None:
+    """HTML-escape a ts_headline result and turn its markers into <mark>."""
+    if not headline:
+        return None
+    return (
+        escape(headline)
+        .replace(_START_SEL, "<mark>")
+        .replace(_STOP_SEL, "</mark>")
+    )
+
+
+def _rank(vector, tsquery):
+    # Rounded numeric so cursor values compare exactly across pages
+    return func.round(cast(func.ts_rank_cd(vector, tsquery), Numeric), 6)
+
+
+def _headline(column, tsquery):
+    return func.ts_headline(
+        SEARCH_CONFIG,
+        func.left(column, _SNIPPET_SOURCE_CHARS),
+        tsquery,
+        _HEADLINE_OPTIONS,
+    )
+
+
+def build_hits_query(
+    tsquery,
+    project_id: int | None = None,
+    agent_id: int | None = None,
+    since: datetime | None = None,
+    until: datetime | None = None,
+    kinds: tuple[str, ...] = KINDS,
+):
+    """UNION ALL of matching turns and tasks: (kind, id, ts, rank)."""
+    parts = []
+    if "turn" in kinds:
+        q = select(
+            literal("turn").label("kind"),
+            Turn.id.label("id"),
+            Turn.timestamp.label("ts"),
+            _rank(Turn.search_vector, tsquery).label("rank"),
+        ).where(Turn.search_vector.op("@@")(tsquery))
+        if project_id is not None or agent_id is not None:
+            q = q.join(Task, Task.id == Turn.task_id)
+            if agent_id is not None:
+                q = q.where(Task.agent_id == agent_id)
+            if project_id is not None:
+                q = q.join(Agent, Agent.id == Task.agent_id).where(Agent.project_id == project_id)
+        if since is not None:
+            q = q.where(Turn.timestamp >= since)
+        if until is not None:
+            q = q.where(Turn.timestamp < until)
+        parts.append(q)
+
+    if "task" in kinds:
+        q = select(
+            literal("task").label("kind"),
+            Task.id.label("id"),
+            Task.started_at.label("ts"),
+            _rank(Task.search_vector, tsquery).label("rank"),
+        ).where(Task.search_vector.op("@@")(tsquery))
+        if agent_id is not None:
+            q = q.where(Task.agent_id == agent_id)
+        if project_id is not None:
+            q = q.join(Agent, Agent.id == Task.agent_id).where(Agent.project_id == project_id)
+        if since is not None:
+            q = q.where(Task.started_at >= since)
+        if until is not None:
+            q = q.where(Task.started_at < until)
+        parts.append(q)
+
+    return union_all(*parts).subquery("hits") if len(parts) > 1 else parts[0].subquery("hits")
+
+
+def search(
+    query: str,
+    project_id: int | None = None,
+    agent_id: int | None = None,
+    since: datetime | None = None,
+    until: datetime | None = None,
+    kinds: tuple[str, ...] = KINDS,
+    sort: str = "relevance",
+    limit: int = DEFAULT_LIMIT,
+    cursor: str | None = None,
+    session=None,
+) -> SearchPage:
+    """Search turns and tasks.
+
+    Args:
+        query: websearch_to_tsquery-style query string
+        project_id: Only results from this project's agents
+        agent_id: Only results from this agent
+        since: Only results at or after this time
+        until: Only results before this time
+        kinds: Which record kinds to search ("turn", "task")
+        sort: "relevance" (rank, then newest) or "recent"
+        limit: Page size (capped at MAX_LIMIT)
+        cursor: next_cursor from the previous page
+        session: SQLAlchemy session (default: db.session)
+
+    Returns:
+        SearchPage with result dicts and the cursor for the next page
+
+    Raises:
+        SearchError: On invalid kinds, sort or cursor
+    """
+    session = session or db.session
+    if sort not in SORTS:
+        raise SearchError(f"sort must be one of {', '.join(SORTS)}")
+    if not kinds or any(k not in KINDS for k in kinds):
+        raise SearchError(f"type must be one of {', '.join(KINDS)}")
+    limit = max(1, min(limit, MAX_LIMIT))
+
+    tsquery = func.websearch_to_tsquery(SEARCH_CONFIG, query)
+    hits = build_hits_query(tsquery, project_id, agent_id, since, until, kinds)
+
+    if sort == "relevance":
+        order = (hits.c.rank, hits.c.ts, hits.c.id, hits.c.kind)
+    else:
+        order = (hits.c.ts, hits.c.id, hits.c.kind)
+    stmt = select(hits).order_by(*(c.desc() for c in order)).limit(limit + 1)
+    if cursor:
+        stmt = stmt.where(tuple_(*order) < tuple_(*decode_cursor(sort, cursor)))
+
+    rows = session.execute(stmt).all()
+    next_cursor = encode_cursor(sort, rows[limit - 1]) if len(rows) > limit else None
+    rows = rows[:limit]
+
+    details = _load_details(session, tsquery, rows)
+    results = []
+    for row in rows:
+        detail = details.get((row.kind, row.id))
+        if detail is None:
+            continue  # Deleted between the two queries
+        results.append({
+            "kind": row.kind,
+            "id": row.id,
+            "rank": float(row.rank),
+            "timestamp": row.ts.isoformat() if row.ts else None,
+            **detail,
+        })
+    return SearchPage(results=results, next_cursor=next_cursor)
+
+
+def _load_details(session, tsquery, rows) -> dict[tuple[str, int], dict]:
+    """Snippets and context for the rows on one page (two queries at most)."""
+    details: dict[tuple[str, int], dict] = {}
+    turn_ids = [r.id for r in rows if r.kind == "turn"]
+    task_ids = [r.id for r in rows if r.kind == "task"]
+
+    if turn_ids:
+        stmt = (
+            select(
+                Turn.id, Turn.actor, Turn.intent, Turn.task_id,
+                Task.agent_id, Agent.project_id, Project.name.label("project_name"),
+                Turn.text_compressed,
+                _headline(Turn.text, tsquery).label("snippet"),
+                _headline(Turn.summary, tsquery).label("summary_snippet"),
+            )
+            .join(Task, Task.id == Turn.task_id)
+            .join(Agent, Agent.id == Task.agent_id)
+            .join(Project, Project.id == Agent.project_id)
+            .where(Turn.id.in_(turn_ids))
+        )
+        turn_rows = session.execute(stmt).all()
+        cold = _cold_headlines(session, tsquery, {
+            r.id: r.text_compressed for r in turn_rows if r.text_compressed is not None
+        })
+        for r in turn_rows:
+            details[("turn", r.id)] = {
+                "task_id": r.task_id,
+                "agent_id": r.agent_id,
+                "project_id": r.project_id,
+                "project_name": r.project_name,
+                "actor": r.actor.value,
+                "intent": r.intent.value,
+                "snippet": render_snippet(cold.get(r.id, r.snippet)),
+                "summary_snippet": render_snippet(r.summary_snippet),
+            }
+
+    if task_ids:
+        stmt = (
+            select(
+                Task.id, Task.state, Task.agent_id,
+                Agent.project_id, Project.name.label("project_name"),
+                _headline(Task.instruction, tsquery).label("snippet"),
+                _headline(Task.completion_summary, tsquery).label("summary_snippet"),
+            )
+            .join(Agent, Agent.id == Task.agent_id)
+            .join(Project, Project.id == Agent.project_id)
+            .where(Task.id.in_(task_ids))
+        )
+        for r in session.execute(stmt):
+            details[("task", r.id)] = {
+                "task_id": r.id,
+                "agent_id": r.agent_id,
+                "project_id": r.project_id,
+                "project_name": r.project_name,
+                "state": r.state.value,
+                "snippet": render_snippet(r.snippet),
+                "summary_snippet": render_snippet(r.summary_snippet),
+            }
+    return details
+
+
+def _cold_headlines(session, tsquery, blobs: dict[int, bytes]) -> dict[int, str | None]:
+    """Headlines over the decompressed text of archived turns (one query).
+
+    At most a page of rows is decompressed, and only the part scanned for
+    snippets is sent back to the database.
+    """
+    texts = {}
+    for turn_id, blob in blobs.items():
+        try:
+            texts[turn_id] = decompress_text(blob)[:_SNIPPET_SOURCE_CHARS]
+        except ColdStorageError:
+            continue
+    if not texts:
+        return {}
+    ids = list(texts)
+    stmt = select(*(
+        _headline(literal(texts[turn_id], Text), tsquery).label(f"t{turn_id}") for turn_id in ids
+    ))
+    return dict(zip(ids, session.execute(stmt).one()))
@@ -0,0 +1,313 @@
+"""Session-to-JSONL location index for the Claude Code projects directory.
+
+Claude Code writes each session to ``<projects>/<encoded-cwd>/<session-id>.jsonl``.
+Finding a session's file used to mean listing (and stat-ing) a project folder
+every time a session was registered or its transcript path re-resolved. This
+index maps session id -> (path, size, mtime) instead:
+
+- it is built once with a parallel scan, one os.scandir() per project folder;
+- it is kept current from Watchdog events on the projects directory (a
+  created/modified/moved/deleted .jsonl updates only that entry);
+- lookups by session id, and "most recent session file for this working
+  directory", are dictionary reads with no filesystem access.
+
+Until the initial build finishes, ``ready`` is False and callers should fall
+back to their previous resolution path. A miss is only authoritative while
+``watching`` is True: if the projects directory did not exist at startup (or
+the watch failed), callers fall back and ask the index to retry the watch.
+"""
+
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import NamedTuple
+
+from watchdog.events import FileSystemEvent, FileSystemEventHandler
+from watchdog.observers import Observer
+
+from .project_decoder import encode_project_path
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SCAN_WORKERS = 8
+
+
+class SessionLocation(NamedTuple):
+    """Where a session's transcript lives, as of the last scan or event."""
+
+    session_id: str
+    path: str
+    folder: str
+    size: int
+    mtime: float
+
+
+class SessionIndex:
+    """Thread-safe index of session transcripts under the projects directory."""
+
+    def __init__(self, projects_path: str = "~/.claude/projects", config: dict | None = None):
+        index_config = (config or {}).get("session_index", {})
+        self.enabled = index_config.get("enabled", True)
+        self.scan_workers = index_config.get("scan_workers", DEFAULT_SCAN_WORKERS)
+        self._projects_path = os.path.abspath(os.path.expanduser(projects_path))
+
+        self._lock = threading.Lock()
+        self._sessions: dict[str, SessionLocation] = {}
+        self._folders: dict[str, set[str]] = {}  # folder -> session ids
+        self._ready = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._observer: Observer | None = None
+        self._watch_lock = threading.Lock()
+        self._stopped = False
+
+        self._builds = 0
+        self._build_seconds = 0.0
+        self._lookups = 0
+        self._misses = 0
+        self._events = 0
+
+    @property
+    def ready(self) -> bool:
+        """True once the initial scan has completed."""
+        return self._ready.is_set()
+
+    @property
+    def watching(self) -> bool:
+        """True while directory events keep the index current."""
+        observer = self._observer
+        return observer is not None and observer.is_alive()
+
+    @property
+    def projects_path(self) -> str:
+        return self._projects_path
+
+    # --- Lifecycle ---
+
+    def start(self) -> None:
+        """Watch the projects directory and build the index in the background.
+
+        The watch is installed before scanning so files created during the
+        scan are not missed.
+        """
+        if not self.enabled or self._thread is not None:
+            return
+        with self._watch_lock:
+            self._install_watch()
+        self._thread = threading.Thread(
+            target=self.build, daemon=True, name="SessionIndex-Build"
+        )
+        self._thread.start()
+
+    def retry_watch(self) -> bool:
+        """Install the watch start() could not, then rebuild; True if watching.
+
+        Called by lookups that fell back to the filesystem, so a projects
+        directory created after startup makes the index authoritative again.
+        """
+        with self._watch_lock:
+            if self._thread is None or self._stopped or self.watching:
+                return self.watching
+            if not self._install_watch():
+                return False
+        self.build()
+        return True
+
+    def _install_watch(self) -> bool:
+        """Start the Watchdog observer on the projects directory (lock held)."""
+        if not os.path.isdir(self._projects_path):
+            return False
+        try:
+            observer = Observer()
+            observer.schedule(_ProjectsEventHandler(self), self._projects_path, recursive=True)
+            observer.start()
+        except Exception as e:
+            logger.warning(f"Session index: cannot watch {self._projects_path}: {e}")
+            return False
+        self._observer = observer
+        return True
+
+    def stop(self) -> None:
+        """Stop following directory events."""
+        self._stopped = True
+        if self._observer:
+            self._observer.stop()
+            self._observer.join(timeout=5)
+            self._observer = None
+
+    def build(self) -> int:
+        """(Re)build the index with a parallel scan; returns the session count."""
+        started = time.perf_counter()
+        scan_started_at = time.time()
+        try:
+            with os.scandir(self._projects_path) as it:
+                folders = [e.name for e in it if e.is_dir(follow_symlinks=False)]
+        except OSError as e:
+            logger.debug(f"Session index: cannot list {self._projects_path}: {e}")
+            folders = []
+
+        with ThreadPoolExecutor(max_workers=max(1, self.scan_workers)) as pool:
+            scanned = list(pool.map(self._scan_folder, folders))
+
+        sessions: dict[str, SessionLocation] = {}
+        by_folder: dict[str, set[str]] = {}
+        for locations in scanned:
+            for location in locations:
+                sessions[location.session_id] = location
+                by_folder.setdefault(location.folder, set()).add(location.session_id)
+
+        with self._lock:
+            # Keep entries from events that arrived while the scan ran
+            for session_id, location in self._sessions.items():
+                if location.mtime < scan_started_at:
+                    continue
+                current = sessions.get(session_id)
+                if current is None or location.mtime >= current.mtime:
+                    sessions[session_id] = location
+                    by_folder.setdefault(location.folder, set()).add(session_id)
+            self._sessions = sessions
+            self._folders = by_folder
+            self._builds += 1
+            self._build_seconds = time.perf_counter() - started
+        self._ready.set()
+        logger.info(
+            f"Session index built: {len(sessions)} sessions in {len(folders)} "
+            f"folders ({self._build_seconds * 1000:.0f}ms)"
+        )
+        return len(sessions)
+
+    def _scan_folder(self, folder: str) -> list[SessionLocation]:
+        locations = []
+        try:
+            with os.scandir(os.path.join(self._projects_path, folder)) as it:
+                for entry in it:
+                    if not entry.name.endswith(".jsonl"):
+                        continue
+                    try:
+                        if not entry.is_file():
+                            continue
+                        stat = entry.stat()
+                    except OSError:
+                        continue
+                    locations.append(SessionLocation(
+                        session_id=entry.name[: -len(".jsonl")],
+                        path=entry.path,
+                        folder=folder,
+                        size=stat.st_size,
+                        mtime=stat.st_mtime,
+                    ))
+        except OSError:
+            pass
+        return locations
+
+    # --- Lookups ---
+
+    def lookup(self, session_id: str) -> SessionLocation | None:
+        """Location of a session's transcript, or None if unknown."""
+        with self._lock:
+            self._lookups += 1
+            location = self._sessions.get(session_id)
+            if location is None:
+                self._misses += 1
+            return location
+
+    def latest_for_directory(self, working_directory: str) -> str | None:
+        """Most recently modified transcript for a working directory.
+
+        Index-backed equivalent of project_decoder.locate_jsonl_file().
+        """
+        folder = encode_project_path(working_directory)
+        with self._lock:
+            self._lookups += 1
+            candidates = [self._sessions[s] for s in self._folders.get(folder, ())]
+            if not candidates:
+                self._misses += 1
+                return None
+            return max(candidates, key=lambda loc: loc.mtime).path
+
+    # --- Updates ---
+
+    def update_path(self, path: str) -> None:
+        """Refresh the entry for one transcript path after a filesystem event."""
+        parsed = self._parse_path(path)
+        if parsed is None:
+            return
+        folder, session_id = parsed
+        try:
+            stat = os.stat(path)
+        except OSError:
+            self.remove_path(path)
+            return
+        location = SessionLocation(session_id, path, folder, stat.st_size, stat.st_mtime)
+        with self._lock:
+            self._events += 1
+            previous = self._sessions.get(session_id)
+            if previous is not None and previous.folder != folder:
+                self._folders.get(previous.folder, set()).discard(session_id)
+            self._sessions[session_id] = location
+            self._folders.setdefault(folder, set()).add(session_id)
+
+    def remove_path(self, path: str) -> None:
+        """Drop a transcript that was deleted or moved away."""
+        parsed = self._parse_path(path)
+        if parsed is None:
+            return
+        folder, session_id = parsed
+        with self._lock:
+            self._events += 1
+            location = self._sessions.get(session_id)
+            if location is not None and location.path == path:
+                del self._sessions[session_id]
+                self._folders.get(folder, set()).discard(session_id)
+
+    def _parse_path(self, path: str) -> tuple[str, str] | None:
+        """(folder, session_id) for a top-level session transcript path."""
+        if not path.endswith(".jsonl"):
+            return None
+        relative = os.path.relpath(path, self._projects_path)
+        parts = relative.split(os.sep)
+        if len(parts) != 2 or parts[0] in (os.pardir, os.curdir):
+            return None  # Outside the tree, or a nested subagent transcript
+        return parts[0], parts[1][: -len(".jsonl")]
+
+    @property
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "enabled": self.enabled,
+                "ready": self.ready,
+                "sessions": len(self._sessions),
+                "folders": len(self._folders),
+                "watching": self.watching,
+                "builds": self._builds,
+                "build_ms": round(self._build_seconds * 1000, 1),
+                "lookups": self._lookups,
+                "misses": self._misses,
+                "events": self._events,
+            }
+
+
+class _ProjectsEventHandler(FileSystemEventHandler):
+    """Keeps a SessionIndex current from Watchdog events."""
+
+    def __init__(self, index: SessionIndex) -> None:
+        super().__init__()
+        self._index = index
+
+    def on_created(self, event: FileSystemEvent) -> None:
+        if not event.is_directory:
+            self._index.update_path(event.src_path)
+
+    def on_modified(self, event: FileSystemEvent) -> None:
+        if not event.is_directory:
+            self._index.update_path(event.src_path)
+
+    def on_deleted(self, event: FileSystemEvent) -> None:
+        if not event.is_directory:
+            self._index.remove_path(event.src_path)
+
+    def on_moved(self, event: FileSystemEvent) -> None:
+        if not event.is_directory:
+            self._index.remove_path(event.src_path)
+            self._index.update_path(event.dest_path)
@@ -0,0 +1,241 @@
+"""Prioritised background queue for post-commit summarisation.
+
+Hook handlers used to run every pending summary inline, so each hook
+response waited on one or more LLM round-trips. The queue hands those
+requests to a small worker pool instead. Workers re-load the turn or task
+by id in their own app context, run them through
+``SummarisationService.execute_pending`` (which already broadcasts the SSE
+update for each summary it completes), and serve the most urgent summaries
+first:
+
+    permission_summary < instruction < turn < task_completion
+
+A queued request is dropped rather than run when a newer submission makes
+it redundant: an identical request for the same entity, or a permission
+summary for a task that has since received a newer turn.
+"""
+
+import itertools
+import logging
+import queue
+import threading
+from collections import Counter
+from dataclasses import dataclass, field
+
+from flask import Flask
+
+logger = logging.getLogger(__name__)
+
+PRIORITIES = {
+    "permission_summary": 0,
+    "instruction": 1,
+    "turn": 2,
+    "task_completion": 3,
+}
+
+DEFAULT_WORKERS = 4
+DEFAULT_MAX_QUEUED = 256
+
+
+@dataclass
+class QueuedRequest:
+    """A summarisation request detached from the submitting session."""
+
+    type: str
+    turn_id: int | None = None
+    task_id: int | None = None
+    command_text: str | None = None
+
+
+@dataclass(order=True)
+class _Job:
+    priority: int
+    seq: int
+    key: tuple = field(compare=False)
+    requests: list[QueuedRequest] = field(compare=False)
+    task_id: int | None = field(default=None, compare=False)
+    turn_id: int | None = field(default=None, compare=False)
+    cancelled: bool = field(default=False, compare=False)
+
+
+def _detach(req) -> QueuedRequest:
+    turn_id = req.turn.id if req.turn is not None else None
+    task_id = req.task.id if req.task is not None else None
+    if task_id is None and req.turn is not None:
+        task_id = req.turn.task_id
+    return QueuedRequest(req.type, turn_id, task_id, req.command_text)
+
+
+def _is_command_turn(req) -> bool:
+    if req.type != "turn" or req.turn is None:
+        return False
+    intent = req.turn.intent
+    return (intent.value if hasattr(intent, "value") else str(intent)) == "command"
+
+
+class SummarisationQueue:
+    """Bounded worker pool executing summarisation requests by priority."""
+
+    def __init__(self, app: Flask, service, config: dict | None = None) -> None:
+        self._app = app
+        self._service = service
+        queue_config = (config or {}).get("summarisation_queue", {})
+        self.enabled = queue_config.get("enabled", True)
+        self.workers = queue_config.get("workers", DEFAULT_WORKERS)
+        self.max_queued = queue_config.get("max_queued", DEFAULT_MAX_QUEUED)
+
+        self._queue: queue.PriorityQueue[_Job] = queue.PriorityQueue()
+        self._queued: dict[tuple, _Job] = {}
+        self._seq = itertools.count()
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._threads: list[threading.Thread] = []
+        self._counts: Counter = Counter()
+
+    @property
+    def running(self) -> bool:
+        return any(t.is_alive() for t in self._threads)
+
+    def start(self) -> None:
+        """Start the worker threads."""
+        if not self.enabled:
+            logger.info("Summarisation queue disabled by config")
+            return
+        if self.running:
+            return
+        self._stop_event.clear()
+        self._threads = [
+            threading.Thread(target=self._loop, daemon=True, name=f"Summarisation-{i}")
+            for i in range(self.workers)
+        ]
+        for thread in self._threads:
+            thread.start()
+        logger.info(f"Summarisation queue started (workers={self.workers}, max_queued={self.max_queued})")
+
+    def stop(self) -> None:
+        """Stop the workers; requests still queued are dropped."""
+        self._stop_event.set()
+        for thread in self._threads:
+            thread.join(timeout=10)
+        self._threads = []
+
+    def submit(self, requests) -> list:
+        """Queue SummarisationRequests from a committed transaction.
+
+        A COMMAND turn and the instruction requests submitted with it stay
+        in one job so ``execute_pending`` can reuse the turn summary as the
+        instruction.
+
+        Returns:
+            The requests that could not be queued (the queue is stopped or
+            full); the caller should execute them synchronously.
+        """
+        if not requests or not self.running:
+            return list(requests or [])
+
+        instructions = [r for r in requests if r.type == "instruction" and r.task is not None]
+        grouped = [r for r in requests if _is_command_turn(r)] if instructions else []
+        taken = {id(r) for r in grouped + instructions}
+        groups = [grouped + instructions] if instructions else []
+        groups += [[r] for r in requests if id(r) not in taken]
+
+        overflow = []
+        with self._lock:
+            for group in groups:
+                lead = group[-1]
+                if lead.type not in PRIORITIES:
+                    overflow.extend(group)
+                    continue
+                detached = [_detach(r) for r in group]
+                head = detached[-1]
+                key = (head.type, head.turn_id if head.type in ("turn", "permission_summary") else head.task_id)
+                if key in self._queued:
+                    self._counts["deduplicated"] += 1
+                    continue
+                if len(self._queued) >= self.max_queued:
+                    self._counts["overflow"] += 1
+                    overflow.extend(group)
+                    continue
+
+                turn_ids = [d.turn_id for d in detached if d.turn_id is not None]
+                job = _Job(
+                    priority=PRIORITIES[head.type],
+                    seq=next(self._seq),
+                    key=key,
+                    requests=detached,
+                    task_id=head.task_id,
+                    turn_id=max(turn_ids) if turn_ids else None,
+                )
+                self._supersede(job)
+                self._queued[key] = job
+                self._queue.put(job)
+                self._counts["submitted"] += 1
+        return overflow
+
+    def _supersede(self, job: _Job) -> None:
+        """Cancel queued permission summaries made stale by a newer turn. Caller holds the lock."""
+        if job.task_id is None or job.turn_id is None:
+            return
+        for key, queued in list(self._queued.items()):
+            if (
+                queued.key[0] == "permission_summary"
+                and queued.task_id == job.task_id
+                and queued.turn_id is not None
+                and queued.turn_id < job.turn_id
+            ):
+                queued.cancelled = True
+                del self._queued[key]
+                self._counts["cancelled"] += 1
+
+    def _loop(self) -> None:
+        while not self._stop_event.is_set():
+            try:
+                job = self._queue.get(timeout=0.5)
+            except queue.Empty:
+                continue
+            with self._lock:
+                if self._queued.get(job.key) is job:
+                    del self._queued[job.key]
+            if job.cancelled:
+                continue
+            try:
+                self._run(job)
+                outcome = "completed"
+            except Exception as e:
+                outcome = "failed"
+                logger.warning(f"Queued summarisation failed for {job.key} (non-fatal): {e}")
+            with self._lock:
+                self._counts[outcome] += 1
+
+    def _run(self, job: _Job) -> None:
+        from ..database import db
+        from ..models.task import Task
+        from ..models.turn import Turn
+        from .task_lifecycle import SummarisationRequest
+
+        with self._app.app_context():
+            requests = []
+            for ref in job.requests:
+                turn = db.session.get(Turn, ref.turn_id) if ref.turn_id is not None else None
+                task = db.session.get(Task, ref.task_id) if ref.task_id is not None else None
+                if turn is None and task is None:
+                    continue
+                requests.append(SummarisationRequest(
+                    type=ref.type, turn=turn, task=task, command_text=ref.command_text,
+                ))
+            if requests:
+                self._service.execute_pending(requests, db.session)
+
+    @property
+    def stats(self) -> dict:
+        with self._lock:
+            pending = Counter(key[0] for key in self._queued)
+            return {
+                "enabled": self.enabled,
+                "running": self.running,
+                "workers": self.workers,
+                "queued": len(self._queued),
+                "queued_by_type": dict(pending),
+                **{name: self._counts[name] for name in
+                   ("submitted", "completed", "failed", "cancelled", "deduplicated", "overflow")},
+            }
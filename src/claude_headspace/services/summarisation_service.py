@@ -51,6 +51,8 @@ class SummarisationService:
         self._inference = inference_service
         headspace_config = (config or {}).get("headspace", {})
         self._headspace_enabled = headspace_config.get("enabled", True)
+        # Background worker pool (SummarisationQueue), attached by create_app
+        self.queue = None
 
     @staticmethod
     def _clean_response(text: str) -> str:
@@ -467,6 +469,21 @@ class SummarisationService:
             logger.error(f"Instruction summarisation failed for task {task.id}: {e}")
             return None
 
+    def submit_pending(self, requests, db_session) -> None:
+        """Hand post-commit summarisation requests to the background queue.
+
+        Falls back to executing synchronously in the calling thread when no
+        queue is running or it is full.
+
+        Args:
+            requests: List of SummarisationRequest objects
+            db_session: Database session for any synchronous fallback
+        """
+        if self.queue is not None:
+            requests = self.queue.submit(requests)
+        if requests:
+            self.execute_pending(requests, db_session)
+
     def execute_pending(self, requests, db_session) -> None:
         """Execute pending summarisation requests synchronously with SSE broadcasting.
 
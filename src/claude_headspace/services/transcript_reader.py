@@ -6,11 +6,16 @@ JSONL format (one JSON object per line):
   {"type": "progress", ...}
 """
 
-import json
 import logging
+import mmap
 import os
+import threading
+from collections import OrderedDict
 from dataclasses import dataclass
 from datetime import datetime, timezone
+from typing import Iterator
+
+from . import jsonl_decode
 
 logger = logging.getLogger(__name__)
 
@@ -86,14 +91,308 @@ def _extract_text(data: dict) -> tuple[str | None, str | None]:
     return role, "\n".join(parts) if parts else None
 
 
+def _user_has_content(data: dict) -> bool:
+    """Whether a user entry marks a turn boundary.
+
+    Only user entries with NO content at all are skipped (truly empty turn
+    boundary markers). User entries with string content (prompts),
+    tool_result blocks, or any other content are real turn boundaries.
+    """
+    msg = data.get("message", {})
+    content = msg.get("content") if isinstance(msg, dict) else None
+    return bool(
+        (isinstance(content, str) and content.strip())
+        or (isinstance(content, list) and len(content) > 0)
+    )
+
+
+def _extract_user_text(data: dict) -> str | None:
+    """Extract the text a user typed from a user entry, if any."""
+    msg = data.get("message", {})
+    if not isinstance(msg, dict):
+        return None
+
+    content = msg.get("content")
+    if isinstance(content, str) and content.strip():
+        return content.strip()
+
+    if isinstance(content, list):
+        parts = []
+        for block in content:
+            if isinstance(block, dict) and block.get("type") == "text":
+                t = block.get("text", "")
+                if t.strip():
+                    parts.append(t.strip())
+        if parts:
+            return "\n".join(parts)
+    return None
+
+
+# The index of a transcript first seen mid-session starts at the current
+# turn's boundary, found by scanning backwards from the end of the file. The
+# scan window starts at the initial size and doubles up to the ceiling.
+_REVERSE_SCAN_INITIAL_BYTES = 64 * 1024
+_REVERSE_SCAN_MAX_BYTES = 16 * 1024 * 1024
+# Trailing bytes of the indexed region re-checked on every refresh, to detect
+# a file that was rewritten in place rather than appended to.
+_SIGNATURE_BYTES = 64
+_MAX_INDEXES = 256
+
+
+def configure_transcript_reader(config: dict | None = None) -> None:
+    """Apply the ``transcript`` config section to the reverse boundary scan."""
+    global _REVERSE_SCAN_INITIAL_BYTES, _REVERSE_SCAN_MAX_BYTES
+    transcript_config = (config or {}).get("transcript", {})
+    _REVERSE_SCAN_INITIAL_BYTES = transcript_config.get(
+        "reverse_scan_initial_bytes", _REVERSE_SCAN_INITIAL_BYTES
+    )
+    _REVERSE_SCAN_MAX_BYTES = transcript_config.get(
+        "reverse_scan_max_bytes", _REVERSE_SCAN_MAX_BYTES
+    )
+
+
+def iter_lines_reverse(
+    buf,
+    end: int | None = None,
+    initial_window: int | None = None,
+    max_window: int | None = None,
+) -> Iterator[tuple[int, int]]:
+    """Yield (start, end) byte ranges of lines in `buf`, last line first.
+
+    Only lines lying entirely within the window at the end of the buffer are
+    yielded. The window starts at `initial_window` bytes and doubles each
+    time a line crosses its start, up to `max_window`; iteration stops when
+    a line would cross the ceiling. Newlines are located with buf.rfind, so
+    with an mmap no more of the file is read than the lines consumed.
+    """
+    end = len(buf) if end is None else end
+    window = initial_window or _REVERSE_SCAN_INITIAL_BYTES
+    max_window = max(window, max_window or _REVERSE_SCAN_MAX_BYTES)
+    floor = max(0, end - window)
+    hi = end
+    while hi > 0:
+        nl = buf.rfind(b"\n", floor, hi)
+        if nl < 0 and floor > 0:
+            if window >= max_window:
+                return
+            window = min(window * 2, max_window)
+            floor = max(0, end - window)
+            continue
+        lo = nl + 1
+        if lo < hi:
+            yield lo, hi
+        hi = nl
+
+
+@dataclass
+class _LineRef:
+    """Byte range of one JSONL line."""
+
+    offset: int
+    length: int
+
+
+def _find_turn_start(f, size: int) -> tuple[int, _LineRef | None]:
+    """Scan a transcript backwards for the current turn.
+
+    Returns (start, last_user_text) where start is the offset of the last
+    turn boundary (or of the oldest line within the scan ceiling if none was
+    found) and last_user_text the last user entry with text, if found.
+    """
+    if size == 0:
+        return 0, None
+
+    boundary: int | None = None
+    oldest = size
+    with mmap.mmap(f.fileno(), size, access=mmap.ACCESS_READ) as mm:
+        for lo, hi in iter_lines_reverse(mm, size):
+            oldest = lo
+            entry_type = jsonl_decode.peek_type(mm, lo, hi)
+            if entry_type in jsonl_decode.NON_MESSAGE_TYPES or entry_type == "assistant":
+                continue
+            if (
+                entry_type == "user"
+                and hi - lo >= jsonl_decode.LAZY_DECODE_BYTES
+                and not jsonl_decode.may_have_text(mm, lo, hi)
+                and jsonl_decode.is_user_content_list(mm, lo, hi)
+            ):
+                # Large tool_result: a boundary without user text
+                if boundary is None:
+                    boundary = lo
+                continue
+            try:
+                data = jsonl_decode.loads(mm[lo:hi])
+            except (jsonl_decode.JSONDecodeError, UnicodeDecodeError):
+                continue  # Malformed, or the writer's unfinished last line
+            if not isinstance(data, dict) or data.get("type") != "user":
+                continue
+            if _user_has_content(data) and boundary is None:
+                boundary = lo
+            if _extract_user_text(data):
+                return boundary, _LineRef(offset=lo, length=hi - lo)
+
+    return (boundary if boundary is not None else oldest), None
+
+
+class TranscriptIndex:
+    """Incrementally extended byte-offset index of one transcript file.
+
+    Tracks turn boundaries (user entries with content), the assistant entries
+    with text in the current turn, and the last user entry with text. Each
+    refresh parses only lines appended since the previous one; queries then
+    seek to and parse just the lines they need.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.lock = threading.Lock()
+        self._reset(None, 0)
+
+    def _reset(self, inode: int | None, start: int) -> None:
+        self._inode = inode
+        self.start = start
+        self.position = start
+        self._signature = b""
+        self.boundaries: list[int] = []
+        self.current_turn: list[_LineRef] = []
+        self.last_user_text: _LineRef | None = None
+        self.lines_indexed = 0
+
+    def _is_stale(self, f, st: os.stat_result) -> bool:
+        if self._inode != st.st_ino or st.st_size < self.position:
+            return True
+        if self._signature:
+            f.seek(self.position - len(self._signature))
+            if f.read(len(self._signature)) != self._signature:
+                return True
+        return False
+
+    def refresh(self, f) -> None:
+        """Index lines appended since the last refresh (caller holds lock).
+
+        Args:
+            f: The transcript opened in binary mode
+        """
+        st = os.fstat(f.fileno())
+        if self._inode is None or self._is_stale(f, st):
+            start, last_user_text = _find_turn_start(f, st.st_size)
+            self._reset(st.st_ino, start)
+            self.last_user_text = last_user_text
+
+        if st.st_size <= self.position:
+            return
+
+        f.seek(self.position)
+        data = f.read(st.st_size - self.position)
+        pos = 0
+        while pos < len(data):
+            nl = data.find(b"\n", pos)
+            if nl < 0:
+                # Trailing line without a newline: index it only once it is
+                # complete JSON, otherwise wait for the writer to finish it.
+                if self._index_line(data[pos:], self.position + pos, partial=True):
+                    pos = len(data)
+                break
+            self._index_line(data[pos:nl], self.position + pos)
+            pos = nl + 1
+
+        if pos:
+            self.position += pos
+            f.seek(max(self.start, self.position - _SIGNATURE_BYTES))
+            self._signature = f.read(self.position - max(self.start, self.position - _SIGNATURE_BYTES))
+
+    def _index_line(self, raw: bytes, offset: int, partial: bool = False) -> bool:
+        if not raw.strip():
+            return not partial
+        ref = _LineRef(offset=offset, length=len(raw))
+        if not partial and self._index_from_bytes(raw, ref):
+            return True
+        try:
+            data = jsonl_decode.loads(raw)
+        except (jsonl_decode.JSONDecodeError, UnicodeDecodeError):
+            if partial:
+                return False
+            logger.warning("Malformed JSON line in transcript, skipping")
+            return True
+        if not isinstance(data, dict):
+            return True
+
+        self.lines_indexed += 1
+        entry_type = data.get("type")
+        if entry_type == "user":
+            if _user_has_content(data):
+                self.boundaries.append(offset)
+                self.current_turn = []
+            if _extract_user_text(data):
+                self.last_user_text = ref
+        elif entry_type == "assistant":
+            _role, text = _extract_text(data)
+            if text:
+                self.current_turn.append(ref)
+        return True
+
+    def _index_from_bytes(self, raw: bytes, ref: _LineRef) -> bool:
+        """Index a complete line without decoding it, if its bytes allow.
+
+        Non-message records are ignored, and large lines shown to carry no
+        text blocks (tool_use inputs, tool_result payloads) only contribute
+        their turn boundary. Returns False if the line must be decoded.
+        """
+        entry_type = jsonl_decode.peek_type(raw)
+        if entry_type in jsonl_decode.NON_MESSAGE_TYPES:
+            self.lines_indexed += 1
+            return True
+        if len(raw) < jsonl_decode.LAZY_DECODE_BYTES or jsonl_decode.may_have_text(raw):
+            return False
+        if entry_type == "assistant":
+            self.lines_indexed += 1
+            return True
+        if entry_type == "user" and jsonl_decode.is_user_content_list(raw):
+            self.lines_indexed += 1
+            self.boundaries.append(ref.offset)
+            self.current_turn = []
+            return True
+        return False
+
+    @staticmethod
+    def load(f, ref: _LineRef) -> dict:
+        """Seek to and decode a single indexed line."""
+        f.seek(ref.offset)
+        return jsonl_decode.loads(f.read(ref.length))
+
+
+_indexes: OrderedDict[str, TranscriptIndex] = OrderedDict()
+_indexes_lock = threading.Lock()
+
+
+def get_transcript_index(transcript_path: str) -> TranscriptIndex:
+    """Get (or create) the shared index for a transcript path."""
+    with _indexes_lock:
+        index = _indexes.get(transcript_path)
+        if index is None:
+            index = TranscriptIndex(transcript_path)
+            _indexes[transcript_path] = index
+            if len(_indexes) > _MAX_INDEXES:
+                _indexes.popitem(last=False)
+        else:
+            _indexes.move_to_end(transcript_path)
+        return index
+
+
+def clear_transcript_indexes() -> None:
+    """Drop all transcript indexes (e.g. between tests)."""
+    with _indexes_lock:
+        _indexes.clear()
+
+
 def read_transcript_file(transcript_path: str) -> TranscriptReadResult:
     """Read all agent response text from the current turn in a transcript .jsonl file.
 
-    Walks backwards from the end of the file collecting all assistant messages
-    until a user message is encountered (marking the turn boundary).  The
-    collected texts are returned in chronological order so that completion
-    signals from earlier assistant messages in multi-tool-call turns are not
-    lost.
+    Collects all assistant messages after the last user message with content
+    (the turn boundary), using the transcript's index so only lines appended
+    since the previous call are parsed. The collected texts are returned in
+    chronological order so that completion signals from earlier assistant
+    messages in multi-tool-call turns are not lost.
     """
     if not transcript_path:
         return TranscriptReadResult(success=False, error="No transcript path")
@@ -102,68 +401,27 @@ def read_transcript_file(transcript_path: str) -> TranscriptReadResult:
         return TranscriptReadResult(success=False, error=f"File not found: {transcript_path}")
 
     try:
-        # Reverse-read strategy: only read the last 64KB instead of the whole file
-        _TAIL_SIZE = 64 * 1024
-        file_size = os.path.getsize(transcript_path)
-        with open(transcript_path, "r") as f:
-            start_pos = max(0, file_size - _TAIL_SIZE)
-            if start_pos > 0:
-                f.seek(start_pos)
-                f.readline()  # Skip partial line at seek boundary
-            lines = f.readlines()
-
-        # Walk backwards, collecting assistant texts until we hit a user message
+        index = get_transcript_index(transcript_path)
         parts: list[str] = []
         result_timestamp: datetime | None = None
-        logger.debug(f"TRANSCRIPT_READ: walking backwards through {len(lines)} lines from {transcript_path}")
-        lines_scanned = 0
-        for line in reversed(lines):
-            line = line.strip()
-            if not line:
-                continue
-            try:
-                data = json.loads(line)
-            except json.JSONDecodeError:
-                logger.warning("Malformed JSON line in transcript, skipping")
-                continue
-
-            entry_type = data.get("type")
-            lines_scanned += 1
-
-            # User message with content marks the start of the current turn — stop collecting.
-            # Only skip user entries with NO content at all (truly empty turn boundary
-            # markers). User entries with string content (prompts), tool_result blocks,
-            # or any other content are real turn boundaries.
-            if entry_type == "user":
-                msg = data.get("message", {})
-                content = msg.get("content") if isinstance(msg, dict) else None
-                has_content = bool(
-                    (isinstance(content, str) and content.strip())
-                    or (isinstance(content, list) and len(content) > 0)
-                )
-                if has_content:
-                    logger.debug(f"TRANSCRIPT_READ: hit user entry with content after scanning {lines_scanned} lines, collected {len(parts)} parts")
-                    break
-                logger.debug(f"TRANSCRIPT_READ: skipping empty user entry at scan line {lines_scanned}")
-                continue
-
-            if entry_type != "assistant":
-                continue
-
-            _role, text = _extract_text(data)
-            if text:
-                parts.append(text)
-                # Capture timestamp from the most recent (first found) assistant entry
-                if result_timestamp is None:
-                    result_timestamp = _parse_jsonl_timestamp(data)
-                logger.debug(f"TRANSCRIPT_READ: collected assistant text ({len(text)} chars): {repr(text[:100])}")
+        with open(transcript_path, "rb") as f, index.lock:
+            index.refresh(f)
+            logger.debug(
+                f"TRANSCRIPT_READ: {len(index.current_turn)} assistant entries in current turn "
+                f"of {transcript_path} (boundaries={len(index.boundaries)})"
+            )
+            for ref in index.current_turn:
+                data = index.load(f, ref)
+                _role, text = _extract_text(data)
+                if text:
+                    parts.append(text)
+                    # Timestamp of the most recent assistant entry wins
+                    result_timestamp = _parse_jsonl_timestamp(data) or result_timestamp
 
         if not parts:
-            logger.debug(f"TRANSCRIPT_READ: no assistant text found after scanning {lines_scanned} lines")
+            logger.debug("TRANSCRIPT_READ: no assistant text in current turn")
             return TranscriptReadResult(success=True, text="")
 
-        # Reverse to restore chronological order
-        parts.reverse()
         combined = "\n\n".join(parts)
 
         if len(combined) > MAX_CONTENT_LENGTH:
@@ -179,9 +437,9 @@ def read_transcript_file(transcript_path: str) -> TranscriptReadResult:
 def read_last_user_message(transcript_path: str) -> TranscriptReadResult:
     """Read the most recent user message text from a transcript .jsonl file.
 
-    Walks backwards from the end of the file looking for the first ``user``
-    entry with text content.  Returns the text of that entry.  Used as a
-    fallback to recover user command text when hooks arrive out of order.
+    Returns the text of the last ``user`` entry with text content, located
+    via the transcript's index.  Used as a fallback to recover user command
+    text when hooks arrive out of order.
     """
     if not transcript_path:
         return TranscriptReadResult(success=False, error="No transcript path")
@@ -190,54 +448,16 @@ def read_last_user_message(transcript_path: str) -> TranscriptReadResult:
         return TranscriptReadResult(success=False, error=f"File not found: {transcript_path}")
 
     try:
-        _TAIL_SIZE = 64 * 1024
-        file_size = os.path.getsize(transcript_path)
-        with open(transcript_path, "r") as f:
-            start_pos = max(0, file_size - _TAIL_SIZE)
-            if start_pos > 0:
-                f.seek(start_pos)
-                f.readline()  # Skip partial line at seek boundary
-            lines = f.readlines()
-
-        for line in reversed(lines):
-            line = line.strip()
-            if not line:
-                continue
-            try:
-                data = json.loads(line)
-            except json.JSONDecodeError:
-                continue
-
-            if data.get("type") != "user":
-                continue
-
-            msg = data.get("message", {})
-            if not isinstance(msg, dict):
-                continue
+        index = get_transcript_index(transcript_path)
+        with open(transcript_path, "rb") as f, index.lock:
+            index.refresh(f)
+            if index.last_user_text is None:
+                return TranscriptReadResult(success=True, text="")
+            text = _extract_user_text(index.load(f, index.last_user_text)) or ""
 
-            content = msg.get("content")
-            # Extract text from string content
-            if isinstance(content, str) and content.strip():
-                text = content.strip()
-                if len(text) > MAX_CONTENT_LENGTH:
-                    text = text[:MAX_CONTENT_LENGTH] + "... [truncated]"
-                return TranscriptReadResult(success=True, text=text)
-
-            # Extract text from content blocks
-            if isinstance(content, list):
-                parts = []
-                for block in content:
-                    if isinstance(block, dict) and block.get("type") == "text":
-                        t = block.get("text", "")
-                        if t.strip():
-                            parts.append(t.strip())
-                if parts:
-                    text = "\n".join(parts)
-                    if len(text) > MAX_CONTENT_LENGTH:
-                        text = text[:MAX_CONTENT_LENGTH] + "... [truncated]"
-                    return TranscriptReadResult(success=True, text=text)
-
-        return TranscriptReadResult(success=True, text="")
+        if len(text) > MAX_CONTENT_LENGTH:
+            text = text[:MAX_CONTENT_LENGTH] + "... [truncated]"
+        return TranscriptReadResult(success=True, text=text)
 
     except Exception as e:
         logger.warning(f"Error reading last user message from {transcript_path}: {e}")
@@ -250,43 +470,12 @@ def read_new_entries_from_position(
 ) -> tuple[list[TranscriptEntry], int]:
     """Read new entries from a transcript file starting at a byte position.
 
-    Used by the file watcher for incremental reading.
+    Used by the file watcher, hook progress capture and the reconciler for
+    incremental reading. Served by the shared TranscriptTailer, so each line
+    is parsed once however many callers follow the same transcript. Every
+    record is returned, including progress/system/summary records. The
+    returned position is the end of the last complete line.
     """
-    if not transcript_path or not os.path.exists(transcript_path):
-        return [], position
+    from .transcript_tailer import get_transcript_tailer
 
-    try:
-        with open(transcript_path, "r") as f:
-            f.seek(position)
-            new_content = f.read()
-            new_position = f.tell()
-
-        if not new_content.strip():
-            return [], new_position
-
-        entries = []
-        for line in new_content.strip().split("\n"):
-            line = line.strip()
-            if not line:
-                continue
-            try:
-                data = json.loads(line)
-            except json.JSONDecodeError:
-                logger.warning("Malformed JSON line in transcript, skipping")
-                continue
-
-            role, text = _extract_text(data)
-            ts = _parse_jsonl_timestamp(data)
-            entries.append(TranscriptEntry(
-                type=data.get("type", ""),
-                role=role,
-                content=text,
-                timestamp=ts,
-                raw_data=data,
-            ))
-
-        return entries, new_position
-
-    except Exception as e:
-        logger.warning(f"Error reading transcript incrementally: {e}")
-        return [], position
+    return get_transcript_tailer().read_from(transcript_path, position, messages_only=False)
@@ -4,12 +4,23 @@ Implements Phase 2 of the three-phase event pipeline:
 - Phase 1: Hook creates Turn with timestamp=now() (approximate)
 - Phase 2: THIS — reconciles against JSONL entries, corrects timestamps
 - Phase 3: Broadcasts SSE updates for corrections
+
+Batch mode (``batch=True``) is meant for catching up after a server restart
+or hook outage, when hundreds of entries can be missing: new turns are
+inserted with a single flush, timestamp corrections are applied with one
+UPDATE statement, and broadcast_reconciliation(aggregate=True) sends one
+``turns_reconciled`` event per agent instead of one event per turn. Session
+end runs reconcile_agent_session() in batch mode, which both backfills
+missing turns and moves server-stamped hook turns onto their JSONL
+timestamps.
 """
 
 import hashlib
 import logging
 from datetime import datetime, timedelta, timezone
 
+from sqlalchemy import case, update
+
 from ..database import db
 from ..models.turn import Turn, TurnActor, TurnIntent
 
@@ -19,13 +30,15 @@ logger = logging.getLogger(__name__)
 MATCH_WINDOW_SECONDS = 30
 
 
-def reconcile_transcript_entries(agent, task, entries):
+def reconcile_transcript_entries(agent, task, entries, batch=False):
     """Reconcile JSONL transcript entries against existing Turns.
 
     Args:
         agent: Agent record
         task: Current Task record
         entries: List of TranscriptEntry objects with timestamps
+        batch: Insert new turns with one flush and apply corrections with
+            one UPDATE instead of per-turn writes
 
     Returns:
         dict with keys:
@@ -53,6 +66,8 @@ def reconcile_transcript_entries(agent, task, entries):
         if key not in turn_index:
             turn_index[key] = turn
 
+    corrections = []  # (turn, new_timestamp or None, content_key)
+    new_turns = []
     for entry in entries:
         if not entry.content or not entry.content.strip():
             continue
@@ -66,28 +81,33 @@ def reconcile_transcript_entries(agent, task, entries):
             # Phase 2: Update timestamp to JSONL value
             old_ts = matched_turn.timestamp
             if old_ts != entry.timestamp:
-                matched_turn.timestamp = entry.timestamp
-                matched_turn.timestamp_source = "jsonl"
-                matched_turn.jsonl_entry_hash = content_key
+                if batch:
+                    corrections.append((matched_turn, entry.timestamp, content_key))
+                else:
+                    matched_turn.timestamp = entry.timestamp
+                    matched_turn.timestamp_source = "jsonl"
+                    matched_turn.jsonl_entry_hash = content_key
                 result["updated"].append((matched_turn.id, old_ts, entry.timestamp))
         elif matched_turn and not entry.timestamp:
             # Matched but no JSONL timestamp — just record the hash for dedup
             if not matched_turn.jsonl_entry_hash:
-                matched_turn.jsonl_entry_hash = content_key
+                if batch:
+                    corrections.append((matched_turn, None, content_key))
+                else:
+                    matched_turn.jsonl_entry_hash = content_key
         elif not matched_turn:
             # New entry not seen via hooks — create Turn
-            turn = Turn(
-                task_id=task.id,
-                actor=TurnActor.USER if actor == "user" else TurnActor.AGENT,
-                intent=_infer_intent(actor, entry),
-                text=entry.content.strip(),
-                timestamp=entry.timestamp or datetime.now(timezone.utc),
-                timestamp_source="jsonl" if entry.timestamp else "server",
-                jsonl_entry_hash=content_key,
-            )
-            db.session.add(turn)
-            db.session.flush()
-            result["created"].append(turn.id)
+            turn = _new_turn(task.id, actor, entry, content_key)
+            if batch:
+                new_turns.append(turn)
+            else:
+                db.session.add(turn)
+                db.session.flush()
+                result["created"].append(turn.id)
+
+    if batch:
+        result["created"] = _bulk_insert_turns(new_turns)
+        _apply_corrections(corrections)
 
     if result["updated"] or result["created"]:
         db.session.commit()
@@ -95,12 +115,67 @@ def reconcile_transcript_entries(agent, task, entries):
     return result
 
 
-def broadcast_reconciliation(agent, reconciliation_result):
+def _new_turn(task_id, actor, entry, content_key):
+    """Build a Turn for a transcript entry not captured by hooks."""
+    return Turn(
+        task_id=task_id,
+        actor=TurnActor.USER if actor == "user" else TurnActor.AGENT,
+        intent=_infer_intent(actor, entry),
+        text=entry.content.strip(),
+        timestamp=entry.timestamp or datetime.now(timezone.utc),
+        timestamp_source="jsonl" if entry.timestamp else "server",
+        jsonl_entry_hash=content_key,
+    )
+
+
+def _bulk_insert_turns(turns):
+    """Insert new turns with a single flush; returns their ids in order."""
+    if not turns:
+        return []
+    db.session.add_all(turns)
+    db.session.flush()
+    return [turn.id for turn in turns]
+
+
+def _apply_corrections(corrections):
+    """Apply timestamp/hash corrections to matched turns in one UPDATE.
+
+    Args:
+        corrections: (turn, new_timestamp, content_key) tuples; a None
+            timestamp only records the entry hash
+    """
+    if not corrections:
+        return
+    timestamps = {turn.id: ts for turn, ts, _ in corrections if ts is not None}
+    hashes = {turn.id: key for turn, _, key in corrections}
+    values = {"jsonl_entry_hash": case(hashes, value=Turn.id)}
+    if timestamps:
+        values["timestamp"] = case(timestamps, value=Turn.id, else_=Turn.timestamp)
+        values["timestamp_source"] = case(
+            {turn_id: "jsonl" for turn_id in timestamps},
+            value=Turn.id,
+            else_=Turn.timestamp_source,
+        )
+    db.session.execute(
+        update(Turn)
+        .where(Turn.id.in_(list(hashes)))
+        .values(**values)
+        .execution_options(synchronize_session=False)
+    )
+    # Reload the corrected columns on next access
+    for turn, _, _ in corrections:
+        db.session.expire(turn, ["timestamp", "timestamp_source", "jsonl_entry_hash"])
+
+
+def broadcast_reconciliation(agent, reconciliation_result, aggregate=False):
     """Broadcast SSE updates after transcript reconciliation (Phase 3).
 
     Sends:
     - turn_updated events for timestamp corrections (existing turns)
     - turn_created events for newly discovered turns
+
+    With aggregate=True, sends a single turns_reconciled event carrying both
+    lists instead.
     """
     from .broadcaster import get_broadcaster
 
@@ -113,6 +188,10 @@ def broadcast_reconciliation(agent, reconciliation_result):
         logger.warning(f"Reconciliation broadcast failed (no broadcaster): {e}")
         return
 
+    if aggregate:
+        _broadcast_turns_reconciled(broadcaster, agent, reconciliation_result)
+        return
+
     # Broadcast timestamp corrections for existing turns
     for turn_id, old_ts, new_ts in reconciliation_result["updated"]:
         try:
@@ -145,6 +224,41 @@ def broadcast_reconciliation(agent, reconciliation_result):
             logger.warning(f"Reconciliation turn_created broadcast failed: {e}")
 
 
+def _broadcast_turns_reconciled(broadcaster, agent, reconciliation_result):
+    """Send one turns_reconciled event for all corrections and new turns."""
+    try:
+        created_ids = reconciliation_result["created"]
+        created_turns = (
+            Turn.query.filter(Turn.id.in_(created_ids)).order_by(Turn.timestamp.asc()).all()
+            if created_ids else []
+        )
+        broadcaster.broadcast("turns_reconciled", {
+            "agent_id": agent.id,
+            "project_id": agent.project_id,
+            "updated": [
+                {
+                    "turn_id": turn_id,
+                    "timestamp": new_ts.isoformat(),
+                    "update_type": "timestamp_correction",
+                }
+                for turn_id, _old_ts, new_ts in reconciliation_result["updated"]
+            ],
+            "created": [
+                {
+                    "text": turn.text,
+                    "actor": turn.actor.value,
+                    "intent": turn.intent.value,
+                    "task_id": turn.task_id,
+                    "turn_id": turn.id,
+                    "timestamp": turn.timestamp.isoformat(),
+                }
+                for turn in created_turns
+            ],
+        })
+    except Exception as e:
+        logger.warning(f"Reconciliation turns_reconciled broadcast failed: {e}")
+
+
 def _content_hash(actor, text):
     """Generate a content-based hash for dedup matching.
 
@@ -156,18 +270,23 @@ def _content_hash(actor, text):
     return hashlib.sha256(normalized.encode()).hexdigest()[:16]
 
 
-def reconcile_agent_session(agent):
+def reconcile_agent_session(agent, batch=False):
     """Full-session reconciliation — run at session end.
 
     Reads ALL JSONL entries for the agent's transcript and creates
-    Turn records for any entries not already captured by hooks.
+    Turn records for any entries not already captured by hooks. Hook-created
+    turns still carrying their approximate server timestamp are corrected to
+    the matching entry's JSONL timestamp when the two are within
+    MATCH_WINDOW_SECONDS of each other.
 
     Args:
         agent: Agent record with transcript_path
+        batch: Insert the new turns with a single flush and apply the
+            timestamp corrections with one UPDATE
 
     Returns:
         dict with keys:
-            updated: list (always empty for full-session mode)
+            updated: list of (turn_id, old_timestamp, new_timestamp) tuples
             created: list of turn_id for newly created turns
     """
     from .transcript_reader import read_new_entries_from_position
@@ -183,15 +302,22 @@ def reconcile_agent_session(agent):
 
     # Get ALL turns for this agent's tasks (no time window)
     task_ids = [t.id for t in Task.query.filter_by(agent_id=agent.id).all()]
-    existing_turns = Turn.query.filter(Turn.task_id.in_(task_ids)).all() if task_ids else []
+    existing_turns = (
+        Turn.query.filter(Turn.task_id.in_(task_ids)).order_by(Turn.timestamp.asc()).all()
+        if task_ids else []
+    )
 
-    # Build hash index from existing turns
+    # Build hash index from existing turns, plus the server-stamped ones
+    # (oldest first per hash) that can still take a JSONL timestamp
     existing_hashes = set()
+    server_stamped = {}
     for turn in existing_turns:
         h = _content_hash(turn.actor.value, turn.text)
         existing_hashes.add(h)
         if turn.jsonl_entry_hash:
             existing_hashes.add(turn.jsonl_entry_hash)
+        if turn.timestamp_source in (None, "server"):
+            server_stamped.setdefault(h, []).append(turn)
 
     # Find the most recent task for creating new turns
     latest_task = Task.query.filter_by(agent_id=agent.id).order_by(Task.id.desc()).first()
@@ -199,26 +325,40 @@ def reconcile_agent_session(agent):
         return {"updated": [], "created": []}
 
     result = {"updated": [], "created": []}
+    new_turns = []
+    corrections = []
+    window = timedelta(seconds=MATCH_WINDOW_SECONDS)
     for entry in entries:
         if not entry.content or not entry.content.strip():
             continue
         actor = "user" if entry.role == "user" else "agent"
         content_key = _content_hash(actor, entry.content.strip())
         if content_key in existing_hashes:
+            candidates = server_stamped.get(content_key)
+            if candidates and entry.timestamp:
+                turn = candidates.pop(0)
+                old_ts = turn.timestamp
+                if old_ts != entry.timestamp and abs(old_ts - entry.timestamp) <= window:
+                    if batch:
+                        corrections.append((turn, entry.timestamp, content_key))
+                    else:
+                        turn.timestamp = entry.timestamp
+                        turn.timestamp_source = "jsonl"
+                        turn.jsonl_entry_hash = content_key
+                    result["updated"].append((turn.id, old_ts, entry.timestamp))
             continue
         existing_hashes.add(content_key)
-        turn = Turn(
-            task_id=latest_task.id,
-            actor=TurnActor.USER if actor == "user" else TurnActor.AGENT,
-            intent=_infer_intent(actor, entry),
-            text=entry.content.strip(),
-            timestamp=entry.timestamp or datetime.now(timezone.utc),
-            timestamp_source="jsonl" if entry.timestamp else "server",
-            jsonl_entry_hash=content_key,
-        )
-        db.session.add(turn)
-        db.session.flush()
-        result["created"].append(turn.id)
+        turn = _new_turn(latest_task.id, actor, entry, content_key)
+        if batch:
+            new_turns.append(turn)
+        else:
+            db.session.add(turn)
+            db.session.flush()
+            result["created"].append(turn.id)
+
+    if batch:
+        result["created"] = _bulk_insert_turns(new_turns)
+        _apply_corrections(corrections)
 
     return result
 
@@ -0,0 +1,431 @@
+"""Shared tailing of Claude Code transcript files.
+
+Several components follow the same transcript .jsonl files: the file
+watcher (session turns and question detection), the hook path (progress
+capture, stop-time de-duplication), deferred stops and the transcript
+reconciler. Each used to open the file, re-read the bytes after its own
+position and json.loads every line again.
+
+TranscriptTailer reads each transcript once and parses each complete line
+once into a shared, offset-ordered stream of TranscriptEntry objects.
+Consumers keep their own cursor, either as a plain byte position passed to
+read_from() or as a named subscription advanced by poll(). The most recently parsed
+entries are retained per file (bounded by entry count), so consumers at
+different positions are served from the same parsed entries.
+
+Progress/system/summary records are retained undecoded. Tailer reads leave
+them out by default; position-based readers that expect every record
+(read_new_entries_from_position) ask for them with ``messages_only=False``.
+"""
+
+import logging
+import os
+import threading
+from bisect import bisect_left
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Hashable
+
+from . import jsonl_decode
+from .transcript_reader import TranscriptEntry, _extract_text, _parse_jsonl_timestamp
+
+logger = logging.getLogger(__name__)
+
+# Entries retained per transcript before the oldest are dropped. Parsed
+# entries cost several times their line size as Python objects, so the budget
+# is a count rather than bytes.
+DEFAULT_MAX_RETAINED_ENTRIES = 512
+DEFAULT_MAX_FILES = 64
+_SIGNATURE_BYTES = 64
+
+
+class _RawTranscriptEntry(TranscriptEntry):
+    """An entry kept as raw bytes; its JSON is decoded on first access."""
+
+    def __init__(self, entry_type: str, raw: bytes):
+        self.type = entry_type
+        self._raw = raw
+        self._data: dict | None = None
+
+    @property
+    def raw_data(self) -> dict:
+        if self._data is None:
+            self._data = jsonl_decode.loads(self._raw)
+        return self._data
+
+    @property
+    def timestamp(self) -> datetime | None:
+        return _parse_jsonl_timestamp(self.raw_data)
+
+
+class LazyTranscriptEntry(_RawTranscriptEntry):
+    """A user/assistant entry shown from its raw bytes to carry no text.
+
+    Large tool_use and tool_result lines are classified without decoding
+    them (see jsonl_decode); the JSON is only decoded if a consumer asks for
+    raw_data or timestamp.
+    """
+
+    def __init__(self, entry_type: str, raw: bytes):
+        super().__init__(entry_type, raw)
+        self.role = entry_type
+        self.content = None
+
+
+class NonMessageEntry(_RawTranscriptEntry):
+    """A progress/system/summary record, decoded only if a reader asks."""
+
+    @property
+    def role(self) -> str | None:
+        return _extract_text(self.raw_data)[0]
+
+    @property
+    def content(self) -> str | None:
+        return _extract_text(self.raw_data)[1]
+
+    def is_valid(self) -> bool:
+        """Whether the record decodes to a JSON object (decodes it)."""
+        try:
+            return isinstance(self.raw_data, dict)
+        except (jsonl_decode.JSONDecodeError, UnicodeDecodeError):
+            return False
+
+
+# Returned by parse_transcript_line for records no consumer reads
+SKIPPED = object()
+
+
+def parse_transcript_line(raw: bytes, complete: bool = True):
+    """Parse one raw JSONL line.
+
+    Complete lines are classified from their bytes first: non-message records
+    are SKIPPED and large lines without text blocks become lazy entries.
+
+    Returns:
+        A TranscriptEntry, SKIPPED, or None if the line is not valid JSON
+    """
+    if complete:
+        entry_type = jsonl_decode.peek_type(raw)
+        if entry_type in jsonl_decode.NON_MESSAGE_TYPES:
+            return SKIPPED
+        if (
+            entry_type in ("user", "assistant")
+            and len(raw) >= jsonl_decode.LAZY_DECODE_BYTES
+            and not jsonl_decode.may_have_text(raw)
+            and (entry_type == "assistant" or jsonl_decode.is_user_content_list(raw))
+        ):
+            return LazyTranscriptEntry(entry_type, raw)
+
+    try:
+        data = jsonl_decode.loads(raw)
+    except (jsonl_decode.JSONDecodeError, UnicodeDecodeError):
+        return None
+    if not isinstance(data, dict):
+        return None
+    role, text = _extract_text(data)
+    return TranscriptEntry(
+        type=data.get("type", ""),
+        role=role,
+        content=text,
+        timestamp=_parse_jsonl_timestamp(data),
+        raw_data=data,
+    )
+
+
+def _parse_lines(data: bytes, base: int, allow_partial: bool) -> tuple[list[int], list[TranscriptEntry], int, int]:
+    """Split raw bytes into lines and parse them.
+
+    Returns (offsets, entries, consumed, skipped) where consumed is the
+    number of bytes covered by complete lines and skipped the number of
+    non-message lines kept undecoded as NonMessageEntry. A trailing line without a newline is
+    only consumed when allow_partial is set and it is already valid JSON.
+    """
+    offsets: list[int] = []
+    entries: list[TranscriptEntry] = []
+    skipped = 0
+    pos = 0
+    while pos < len(data):
+        nl = data.find(b"\n", pos)
+        end = nl if nl >= 0 else len(data)
+        raw = data[pos:end].strip()
+        if raw:
+            entry = parse_transcript_line(raw, complete=nl >= 0)
+            if entry is None:
+                if nl < 0:
+                    break  # Incomplete trailing line: wait for the writer
+                logger.warning("Malformed JSON line in transcript, skipping")
+            elif nl < 0 and not allow_partial:
+                break
+            elif entry is SKIPPED:
+                offsets.append(base + pos)
+                entries.append(NonMessageEntry(jsonl_decode.peek_type(raw), raw))
+                skipped += 1
+            else:
+                offsets.append(base + pos)
+                entries.append(entry)
+        pos = end + 1 if nl >= 0 else len(data)
+    return offsets, entries, min(pos, len(data)), skipped
+
+
+@dataclass
+class _Tail:
+    """Parsed state of one transcript file."""
+
+    path: str
+    base: int = 0  # Offset of the first retained line
+    position: int = 0  # End of the last parsed line
+    inode: int | None = None
+    signature: bytes = b""
+    offsets: list[int] = field(default_factory=list)
+    entries: list[TranscriptEntry] = field(default_factory=list)
+    # Entries parsed for a consumer behind the retained window that did not
+    # fit the retention budget; handed out once by read_from()
+    gap: tuple[list[int], list[TranscriptEntry]] | None = None
+    lock: threading.Lock = field(default_factory=threading.Lock)
+
+
+@dataclass
+class _Subscription:
+    path: str
+    cursor: int
+
+
+class TranscriptTailer:
+    """Thread-safe shared reader of transcript files with per-consumer cursors."""
+
+    def __init__(
+        self,
+        max_retained_entries: int = DEFAULT_MAX_RETAINED_ENTRIES,
+        max_files: int = DEFAULT_MAX_FILES,
+    ):
+        self.max_retained_entries = max_retained_entries
+        self.max_files = max_files
+        self._tails: OrderedDict[str, _Tail] = OrderedDict()
+        self._subscriptions: dict[Hashable, _Subscription] = {}
+        self._lock = threading.Lock()
+        self._bytes_read = 0
+        self._lines_parsed = 0
+        self._lines_skipped = 0
+        self._lines_deferred = 0
+        self._entries_served = 0
+
+    # --- per-file state -------------------------------------------------
+
+    def _get_tail(self, path: str) -> _Tail:
+        with self._lock:
+            tail = self._tails.get(path)
+            if tail is None:
+                tail = _Tail(path=path)
+                self._tails[path] = tail
+                if len(self._tails) > self.max_files:
+                    self._tails.popitem(last=False)
+            else:
+                self._tails.move_to_end(path)
+            return tail
+
+    @staticmethod
+    def _line_start_at_or_after(f, position: int) -> int:
+        """Snap a byte position forward to the start of a line."""
+        if position <= 0:
+            return 0
+        f.seek(position - 1)
+        if f.read(1) == b"\n":
+            return position
+        while True:
+            chunk = f.read(64 * 1024)
+            if not chunk:
+                return f.tell()
+            nl = chunk.find(b"\n")
+            if nl >= 0:
+                return f.tell() - len(chunk) + nl + 1
+
+    def _is_stale(self, f, tail: _Tail, size: int, inode: int) -> bool:
+        if tail.inode != inode or size < tail.position:
+            return True
+        if tail.signature:
+            f.seek(tail.position - len(tail.signature))
+            if f.read(len(tail.signature)) != tail.signature:
+                return True
+        return False
+
+    def _update_signature(self, f, tail: _Tail) -> None:
+        start = max(tail.base, tail.position - _SIGNATURE_BYTES)
+        f.seek(start)
+        tail.signature = f.read(tail.position - start)
+
+    def _read_range(self, f, start: int, end: int, allow_partial: bool):
+        f.seek(start)
+        data = f.read(end - start)
+        offsets, entries, consumed, skipped = _parse_lines(data, start, allow_partial)
+        deferred = sum(1 for e in entries if isinstance(e, LazyTranscriptEntry))
+        with self._lock:
+            self._bytes_read += len(data)
+            self._lines_parsed += len(entries) - deferred - skipped
+            self._lines_deferred += deferred
+            self._lines_skipped += skipped
+        return offsets, entries, start + consumed
+
+    def _trim(self, tail: _Tail) -> None:
+        """Drop the oldest retained entries once over the entry budget."""
+        excess = len(tail.entries) - self.max_retained_entries
+        if excess <= 0:
+            return
+        del tail.offsets[:excess]
+        del tail.entries[:excess]
+        tail.base = tail.offsets[0] if tail.offsets else tail.position
+
+    def _refresh(self, f, tail: _Tail, position: int) -> None:
+        """Bring a tail up to date with the file (tail lock held)."""
+        st = os.fstat(f.fileno())
+        if tail.inode is None or self._is_stale(f, tail, st.st_size, st.st_ino):
+            start = self._line_start_at_or_after(f, min(position, st.st_size))
+            tail.inode = st.st_ino
+            tail.base = tail.position = start
+            tail.offsets.clear()
+            tail.entries.clear()
+            tail.signature = b""
+
+        if position < tail.base:
+            # A consumer behind the retained window: parse the gap once and
+            # keep it if it fits the retention budget.
+            start = self._line_start_at_or_after(f, position)
+            if start < tail.base:
+                offsets, entries, _ = self._read_range(f, start, tail.base, allow_partial=False)
+                if len(entries) + len(tail.entries) <= self.max_retained_entries:
+                    tail.offsets[:0] = offsets
+                    tail.entries[:0] = entries
+                    tail.base = start
+                else:
+                    tail.gap = (offsets, entries)
+
+        if st.st_size > tail.position:
+            offsets, entries, end = self._read_range(f, tail.position, st.st_size, allow_partial=True)
+            tail.offsets.extend(offsets)
+            tail.entries.extend(entries)
+            if end > tail.position:
+                tail.position = end
+                self._update_signature(f, tail)
+
+    # --- public API -----------------------------------------------------
+
+    def read_from(
+        self, path: str, position: int = 0, messages_only: bool = True,
+    ) -> tuple[list[TranscriptEntry], int]:
+        """Entries of complete lines at or after `position`.
+
+        Args:
+            path: Transcript file path
+            position: The consumer's byte cursor
+            messages_only: Leave out progress/system/summary records
+
+        Returns:
+            (entries, new_position) where new_position is the end of the last
+            complete line, to be passed back on the next call
+        """
+        if not path or not os.path.exists(path):
+            return [], position
+
+        tail = self._get_tail(path)
+        try:
+            with open(path, "rb") as f, tail.lock:
+                self._refresh(f, tail, position)
+                gap, tail.gap = tail.gap, None
+                if position > tail.position:
+                    return [], position
+                idx = bisect_left(tail.offsets, position)
+                entries = tail.entries[idx:]
+                if gap is not None:
+                    gap_offsets, gap_entries = gap
+                    entries = gap_entries[bisect_left(gap_offsets, position):] + entries
+                new_position = tail.position
+                self._trim(tail)
+        except OSError as e:
+            logger.warning(f"Error reading transcript incrementally: {e}")
+            return [], position
+
+        if messages_only:
+            entries = [e for e in entries if not isinstance(e, NonMessageEntry)]
+        else:
+            entries = [e for e in entries if not isinstance(e, NonMessageEntry) or e.is_valid()]
+        with self._lock:
+            self._entries_served += len(entries)
+        return entries, new_position
+
+    def subscribe(self, key: Hashable, path: str, position: int | None = None) -> int:
+        """Register a named cursor on a transcript.
+
+        Args:
+            key: Subscriber key, e.g. ("question_detection", agent_id)
+            path: Transcript file path
+            position: Starting byte position (default: current end of file)
+
+        Returns:
+            The starting cursor
+        """
+        if position is None:
+            position = os.path.getsize(path)
+        with self._lock:
+            self._subscriptions[key] = _Subscription(path=path, cursor=position)
+        return position
+
+    def poll(self, key: Hashable, path: str | None = None) -> list[TranscriptEntry]:
+        """Entries since a subscription's cursor, advancing the cursor.
+
+        If the key has no subscription and `path` is given, it is subscribed
+        from the start of the file.
+        """
+        with self._lock:
+            sub = self._subscriptions.get(key)
+            if sub is None or (path and sub.path != path):
+                if not path:
+                    return []
+                sub = _Subscription(path=path, cursor=0)
+                self._subscriptions[key] = sub
+        entries, new_position = self.read_from(sub.path, sub.cursor)
+        with self._lock:
+            if self._subscriptions.get(key) is sub:
+                sub.cursor = new_position
+        return entries
+
+    def cursor(self, key: Hashable) -> int | None:
+        with self._lock:
+            sub = self._subscriptions.get(key)
+            return sub.cursor if sub else None
+
+    def unsubscribe(self, key: Hashable) -> None:
+        with self._lock:
+            self._subscriptions.pop(key, None)
+
+    def forget(self, path: str) -> None:
+        """Drop retained entries for a transcript."""
+        with self._lock:
+            self._tails.pop(path, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._tails.clear()
+            self._subscriptions.clear()
+
+    @property
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "files": len(self._tails),
+                "subscriptions": len(self._subscriptions),
+                "retained_entries": sum(len(t.entries) for t in self._tails.values()),
+                "bytes_read": self._bytes_read,
+                "lines_parsed": self._lines_parsed,
+                "lines_deferred": self._lines_deferred,
+                "lines_skipped": self._lines_skipped,
+                "json_backend": jsonl_decode.BACKEND,
+                "entries_served": self._entries_served,
+            }
+
+
+_tailer = TranscriptTailer()
+
+
+def get_transcript_tailer() -> TranscriptTailer:
+    """Get the process-wide transcript tailer."""
+    return _tailer
@@ -825,6 +825,9 @@
             client.on('turn_created', function() {
                 ActivityPage._debouncedRefresh();
             });
+            client.on('turns_reconciled', function() {
+                ActivityPage._debouncedRefresh();
+            });
             client.on('activity_update', function() {
                 ActivityPage._debouncedRefresh();
             });
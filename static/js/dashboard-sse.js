@@ -47,6 +47,9 @@
     // Track fallback timeout IDs per agent for cleanup (M15)
     const _fallbackTimeouts = new Map();
 
+    // Latest card_refresh per agent waiting on a blob fetch
+    const _pendingBlobRefresh = new Map();
+
     /**
      * Check for SSE event ID gaps indicating dropped events.
      * If the gap exceeds a threshold, trigger a safe reload to re-sync state.
@@ -285,6 +288,9 @@
         client.on('turn_detected', handleTurnCreated);
         client.on('turn_created', handleTurnCreated);
 
+        // Handle batched transcript reconciliation (one event per agent)
+        client.on('turns_reconciled', handleTurnsReconciled);
+
         // Handle agent activity
         // Canonical: agent_activity | Alias: agent_updated
         client.on('agent_updated', handleAgentActivity);
@@ -304,6 +310,12 @@
         // Handle priority score updates
         client.on('priority_update', handlePriorityUpdate);
 
+        // Handle authoritative per-project counters (sent only when a board changes)
+        client.on('status_counts', handleStatusCounts);
+
+        // Handle recommended-next changes (sent only when the ranking head moves)
+        client.on('priority_ranking', handlePriorityRanking);
+
         // Handle full card refresh (authoritative state from server)
         client.on('card_refresh', handleCardRefresh);
 
@@ -316,6 +328,7 @@
         // Handle activity bar updates on turn events
         client.on('turn_detected', handleActivityBarUpdate);
         client.on('turn_created', handleActivityBarUpdate);
+        client.on('turns_reconciled', handleActivityBarUpdate);
 
         // Track event IDs for gap detection (M6 client-side).
         // Uses a wildcard handler so every event type is checked.
@@ -401,12 +414,6 @@
         if (projectId) {
             updateProjectStateDots(projectId);
         }
-
-        // Trigger recommended next update (full page would need data from server)
-        // For now, just highlight if state changed to AWAITING_INPUT or TIMED_OUT
-        if (newState === 'AWAITING_INPUT' || newState === 'TIMED_OUT') {
-            highlightRecommendedUpdate();
-        }
     }
 
     /**
@@ -467,6 +474,18 @@
         }
     }
 
+    /**
+     * Handle turns_reconciled events: the latest recovered turn drives the
+     * card's task summary, as a single turn_created would.
+     */
+    function handleTurnsReconciled(data, eventType) {
+        const created = (data && data.created) || [];
+        if (!data.agent_id || !created.length) return;
+
+        const latest = Object.assign({ agent_id: data.agent_id }, created[created.length - 1]);
+        handleTurnCreated(latest, eventType);
+    }
+
     /**
      * Handle agent activity events
      */
@@ -493,20 +512,14 @@
             }
         }
 
-        // Update uptime if provided
-        if (data.uptime) {
-            const uptimeEl = card.querySelector('.uptime');
-            if (uptimeEl) {
-                uptimeEl.textContent = data.uptime;
-            }
+        // Update uptime if provided (raw timestamp, formatted client-side)
+        if (data.started_at) {
+            window.CHTime.bind(card.querySelector('.uptime'), 'uptime', data.started_at);
         }
 
         // Update last seen if provided
-        if (data.last_seen) {
-            const lastSeenEl = card.querySelector('.last-seen');
-            if (lastSeenEl) {
-                lastSeenEl.textContent = data.last_seen;
-            }
+        if (data.last_seen_at) {
+            window.CHTime.bind(card.querySelector('.last-seen'), 'last-seen', data.last_seen_at);
         }
     }
 
@@ -704,7 +717,9 @@
         var heroChars = esc(data.hero_chars || '');
         var heroTrail = esc(data.hero_trail || '');
         var turnCount = data.turn_count != null ? parseInt(data.turn_count, 10) : 0;
-        var elapsed = esc(data.elapsed || '');
+        var elapsed = esc(data.task_started_at
+            ? window.CHTime.formatElapsed(data.task_started_at, data.task_completed_at)
+            : '');
         var turnLabel = turnCount === 1 ? 'turn' : 'turns';
         var elapsedStr = elapsed ? ' \u00b7 ' + elapsed : '';
 
@@ -738,6 +753,11 @@
                 '</div>' +
             '</div>';
 
+        if (data.task_started_at) {
+            window.CHTime.bind(details.querySelector('.card-line:last-child .text-muted'), 'elapsed',
+                data.task_started_at, { end: data.task_completed_at, prefix: turnCount + ' ' + turnLabel });
+        }
+
         return details;
     }
 
@@ -809,6 +829,23 @@
 
         console.log('card_refresh:', agentId, 'state:', state, 'reason:', reason);
 
+        // Large question options arrive as a content hash — resolve before
+        // applying. Only the latest pending refresh per agent is applied.
+        if (data.question_options_hash && !data.question_options) {
+            _pendingBlobRefresh.set(agentId, data);
+            window.CHUtils.fetchBlob(data.question_options_hash)
+                .then(function(options) { data.question_options = options; })
+                .catch(function(err) { console.warn('Question options blob fetch failed:', err); })
+                .then(function() {
+                    if (_pendingBlobRefresh.get(agentId) !== data) return;
+                    _pendingBlobRefresh.delete(agentId);
+                    delete data.question_options_hash;
+                    handleCardRefresh(data, eventType);
+                });
+            return;
+        }
+        _pendingBlobRefresh.delete(agentId);
+
         // Clear any pending fallback timeout for this agent (M15)
         var pendingTimeout = _fallbackTimeouts.get(agentId);
         if (pendingTimeout) {
@@ -980,13 +1017,14 @@
                 statusBadge.style.display = data.is_bridge_connected ? 'none' : '';
             }
         }
+        // Relative times are formatted client-side from raw timestamps
         var lastSeenEl = card.querySelector('.last-seen');
-        if (lastSeenEl && data.last_seen) {
-            lastSeenEl.textContent = data.last_seen;
+        if (lastSeenEl && data.last_seen_at) {
+            window.CHTime.bind(lastSeenEl, 'last-seen', data.last_seen_at);
         }
         var uptimeEl = card.querySelector('.uptime');
-        if (uptimeEl && data.uptime) {
-            uptimeEl.textContent = data.uptime;
+        if (uptimeEl && data.started_at) {
+            window.CHTime.bind(uptimeEl, 'uptime', data.started_at);
         }
 
         // Line 02: state bar + state label
@@ -1032,7 +1070,7 @@
                 planIndicator.style.display = '';
                 planIndicator.onclick = function() {
                     if (window.FullTextModal) {
-                        window.FullTextModal.show(data.current_task_id, 'plan');
+                        window.FullTextModal.show(data.current_task_id, 'plan', data.plan_content_hash);
                     }
                 };
             }
@@ -1119,8 +1157,9 @@
         var turnCount = data.turn_count != null ? parseInt(data.turn_count, 10) : 0;
         if (turnCount > 0) {
             var turnLabel = turnCount === 1 ? 'turn' : 'turns';
+            var statsOpts = { prefix: turnCount + ' ' + turnLabel, end: data.task_completed_at };
             if (statsEl) {
-                statsEl.textContent = turnCount + ' ' + turnLabel + (data.elapsed ? ' \u00b7 ' + data.elapsed : '');
+                window.CHTime.bind(statsEl, 'elapsed', data.task_started_at, statsOpts);
                 statsEl.style.display = '';
             } else {
                 // Create stats element inside the left group (beside priority score)
@@ -1128,7 +1167,7 @@
                 if (leftGroup) {
                     var newStats = document.createElement('span');
                     newStats.className = 'task-stats text-muted text-xs';
-                    newStats.textContent = turnCount + ' ' + turnLabel + (data.elapsed ? ' \u00b7 ' + data.elapsed : '');
+                    window.CHTime.bind(newStats, 'elapsed', data.task_started_at, statsOpts);
                     leftGroup.appendChild(newStats);
                 }
             }
@@ -1194,11 +1233,6 @@
             updateProjectStateDots(projectId);
         }
 
-        // Highlight if needs attention
-        if (state === 'AWAITING_INPUT' || state === 'TIMED_OUT') {
-            highlightRecommendedUpdate();
-        }
-
         // Dispatch custom event for respond widget re-initialization
         document.dispatchEvent(new CustomEvent('sse:card_refresh', { detail: data }));
     }
@@ -1246,6 +1280,37 @@
         if (idleBadge) idleBadge.textContent = '[' + idle + ']';
     }
 
+    /**
+     * Handle status_counts events: the server's Kanban index sends the
+     * changed project's counters plus header totals, which replace the
+     * client-side recount (cards for other projects may not be on the page).
+     */
+    function handleStatusCounts(data, eventType) {
+        var totals = data.status_counts;
+        if (totals) {
+            var inputBadge = document.querySelector('#status-input-needed .status-count');
+            var workingBadge = document.querySelector('#status-working .status-count');
+            var idleBadge = document.querySelector('#status-idle .status-count');
+            if (inputBadge) inputBadge.textContent = '[' + (totals.input_needed || 0) + ']';
+            if (workingBadge) workingBadge.textContent = '[' + (totals.working || 0) + ']';
+            if (idleBadge) idleBadge.textContent = '[' + (totals.idle || 0) + ']';
+        }
+
+        var flags = data.project_flags;
+        if (!flags || data.project_id == null) return;
+        var projectEl = document.querySelector('[data-project-id="' + data.project_id + '"]');
+        if (!projectEl) return;
+        var dots = projectEl.querySelectorAll('.state-dot');
+        // Kanban headers omit the timed-out dot (amber, blue, green only)
+        var order = dots.length >= 4
+            ? ['has_timed_out', 'has_input_needed', 'has_working', 'has_idle']
+            : ['has_input_needed', 'has_working', 'has_idle'];
+        if (dots.length < order.length) return;
+        order.forEach(function(flag, i) {
+            dots[i].classList.toggle('opacity-25', !flags[flag]);
+        });
+    }
+
     /**
      * Update a project's state indicator dots
      */
@@ -1274,6 +1339,57 @@
         dots[3].classList.toggle('opacity-25', !hasIdle);
     }
 
+    /**
+     * Handle priority ranking events. The server only sends these when the
+     * recommended agent or the top of the ranking changes, so the panel is
+     * re-pointed and highlighted without a page reload.
+     */
+    function handlePriorityRanking(data, eventType) {
+        var rec = data.recommended;
+        var panel = document.getElementById('recommended-next-panel');
+        if (!panel || !rec) return;
+
+        var panelDiv = panel.querySelector('[data-agent-id]');
+        if (!panelDiv) return;
+
+        var agentId = rec.agent_id;
+        var changed = panelDiv.getAttribute('data-agent-id') !== String(agentId);
+        panelDiv.setAttribute('data-agent-id', agentId);
+        panelDiv.setAttribute('onclick',
+            'window.FocusAPI && window.FocusAPI.focusAgent(' + parseInt(agentId, 10) + ')');
+        panelDiv.setAttribute('aria-label', 'Focus on recommended agent ' + (rec.session_uuid || ''));
+
+        var scoreEl = panelDiv.querySelector('[title="Priority score"]');
+        if (scoreEl) {
+            scoreEl.textContent = '[' + (rec.score != null ? rec.score : 50) + ']';
+        }
+
+        var uuid = rec.session_uuid || '';
+        var hero = panelDiv.querySelector('.agent-hero');
+        if (hero) hero.textContent = uuid.substring(0, 2);
+        var heroTrail = panelDiv.querySelector('.agent-hero-trail');
+        if (heroTrail) heroTrail.textContent = uuid.substring(2);
+
+        var projectLink = panelDiv.querySelector('a[href^="/projects/"]');
+        if (projectLink) {
+            projectLink.textContent = rec.project_name || '';
+            if (rec.project_slug) {
+                projectLink.setAttribute('href', '/projects/' + encodeURIComponent(rec.project_slug));
+            }
+        }
+
+        var rationaleEl = panelDiv.querySelector('p.italic');
+        if (rationaleEl) {
+            rationaleEl.textContent = '"' + (rec.rationale || '') + '"';
+        }
+
+        updateRecommendedPanel(agentId, rec.state);
+
+        if (changed || rec.state === 'AWAITING_INPUT' || rec.state === 'TIMED_OUT') {
+            highlightRecommendedUpdate();
+        }
+    }
+
     /**
      * Highlight the recommended next panel to indicate an update
      */
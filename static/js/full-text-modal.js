@@ -41,7 +41,15 @@
         return modal;
     }
 
-    function show(taskId, type) {
+    /**
+     * Show full text for a task.
+     *
+     * @param {number} taskId - Task ID
+     * @param {string} type - 'command' | 'output' | 'plan'
+     * @param {string} [blobHash] - Content hash of the plan (from card_refresh);
+     *     fetched from /api/blobs/<hash> instead of the full-text endpoint
+     */
+    function show(taskId, type, blobHash) {
         var m = createModal();
         var titleEl = m.querySelector('.full-text-modal-title');
         var textEl = m.querySelector('.full-text-modal-text');
@@ -51,6 +59,17 @@
         textEl.textContent = 'Loading...';
         m.style.display = 'flex';
 
+        if (type === 'plan' && blobHash && window.CHUtils) {
+            window.CHUtils.fetchBlob(blobHash)
+                .then(function(text) {
+                    textEl.textContent = text || 'No content available';
+                })
+                .catch(function() {
+                    textEl.textContent = 'Failed to load content.';
+                });
+            return;
+        }
+
         // Use cache if available
         if (cache[taskId]) {
             var text = type === 'command' ? cache[taskId].full_command
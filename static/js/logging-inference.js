@@ -50,6 +50,7 @@
       this.prevPageBtn = document.getElementById("prev-page-btn");
       this.nextPageBtn = document.getElementById("next-page-btn");
       this.pageIndicator = document.getElementById("page-indicator");
+      this.archivedSearchNote = document.getElementById("archived-search-note");
       this.clearLogsBtn = document.getElementById("clear-logs-btn");
       this.clearLogsConfirm = document.getElementById("clear-logs-confirm");
       this.clearLogsYes = document.getElementById("clear-logs-yes");
@@ -416,6 +417,7 @@
      */
     _renderCalls: function (data) {
       this._hideStates();
+      this._updateArchivedNote(data.archived_unsearched || 0);
 
       if (!data.calls || data.calls.length === 0) {
         if (
@@ -808,6 +810,21 @@
       row.after(detailRow);
     },
 
+    /**
+     * Note how many archived (compressed) prompts the text search skipped
+     */
+    _updateArchivedNote: function (count) {
+      if (!this.archivedSearchNote) return;
+      if (!count) {
+        this.archivedSearchNote.classList.add("hidden");
+        return;
+      }
+      this.archivedSearchNote.textContent =
+        count + (count === 1 ? " archived call's prompt was" : " archived calls' prompts were") +
+        " not searched (their results and purposes were).";
+      this.archivedSearchNote.classList.remove("hidden");
+    },
+
     /**
      * Update pagination controls
      */
@@ -864,6 +881,7 @@
      * Show loading state
      */
     _showLoading: function () {
+      if (this.archivedSearchNote) this.archivedSearchNote.classList.add("hidden");
       if (this.loadingState) this.loadingState.classList.remove("hidden");
       if (this.emptyState) this.emptyState.classList.add("hidden");
       if (this.noResultsState) this.noResultsState.classList.add("hidden");
@@ -898,6 +916,7 @@
      * Show error state
      */
     _showError: function () {
+      if (this.archivedSearchNote) this.archivedSearchNote.classList.add("hidden");
       if (this.loadingState) this.loadingState.classList.add("hidden");
       if (this.emptyState) this.emptyState.classList.add("hidden");
       if (this.noResultsState) this.noResultsState.classList.add("hidden");
@@ -0,0 +1,211 @@
+/**
+ * Client-side relative time formatting for Claude Headspace.
+ *
+ * Cards carry raw ISO timestamps instead of server-rendered strings like
+ * "3m ago", so they never go stale between state changes. A single shared
+ * ticker re-formats every tagged element on the page.
+ *
+ * Markup contract (server templates and SSE handlers):
+ *   data-rel-time="last-seen" data-ts="<iso>"            -> "5m ago"
+ *   data-rel-time="uptime"    data-ts="<iso>"            -> "up 2h"
+ *   data-rel-time="elapsed"   data-ts="<iso start>"
+ *                             [data-ts-end="<iso end>"]
+ *                             [data-rel-prefix="3 turns"] -> "3 turns · 1h 5m"
+ *
+ * Loaded in base.html after utils.js. Access via window.CHTime.
+ */
+(function() {
+    'use strict';
+
+    // Formats have minute granularity; a 15s tick keeps them within a
+    // quarter-minute of the server formatters without measurable cost.
+    var TICK_INTERVAL_MS = 15000;
+
+    var _timer = null;
+
+    /**
+     * Whole seconds between an ISO timestamp and an end point (clamped at 0).
+     *
+     * @param {string} iso - Start timestamp
+     * @param {string|number} [end] - ISO end timestamp or epoch ms (default: now)
+     * @returns {number|null} Seconds, or null if the timestamp is unparseable
+     */
+    function _secondsSince(iso, end) {
+        if (!iso) return null;
+        var start = new Date(iso).getTime();
+        if (isNaN(start)) return null;
+        var stop = end == null ? Date.now() :
+            (typeof end === 'number' ? end : new Date(end).getTime());
+        if (isNaN(stop)) stop = Date.now();
+        return Math.max(0, Math.floor((stop - start) / 1000));
+    }
+
+    /**
+     * Format time since last seen (matches Python format_last_seen).
+     *
+     * @param {string} iso - last_seen_at timestamp
+     * @param {number} [now] - Epoch ms override (for testing)
+     * @returns {string} e.g. "1h 5m ago", "2m ago", "<1m ago", or ''
+     */
+    function formatLastSeen(iso, now) {
+        var secs = _secondsSince(iso, now);
+        if (secs == null) return '';
+        var hours = Math.floor(secs / 3600);
+        var minutes = Math.floor((secs % 3600) / 60);
+        if (hours > 0) return hours + 'h ' + minutes + 'm ago';
+        if (minutes > 0) return minutes + 'm ago';
+        return '<1m ago';
+    }
+
+    /**
+     * Format agent uptime (matches Python format_uptime).
+     *
+     * @param {string} iso - started_at timestamp
+     * @param {number} [now] - Epoch ms override (for testing)
+     * @returns {string} e.g. "up 13h", "up 45m", "up <1m", or ''
+     */
+    function formatUptime(iso, now) {
+        var secs = _secondsSince(iso, now);
+        if (secs == null) return '';
+        var hours = Math.floor(secs / 3600);
+        var minutes = Math.floor((secs % 3600) / 60);
+        if (hours > 0) return 'up ' + hours + 'h';
+        if (minutes > 0) return 'up ' + minutes + 'm';
+        return 'up <1m';
+    }
+
+    /**
+     * Format task elapsed time (matches Python _get_current_task_elapsed).
+     * Completed tasks pass their completed_at so the value stays fixed.
+     *
+     * @param {string} startIso - task started_at
+     * @param {string} [endIso] - task completed_at (omit for running tasks)
+     * @returns {string} e.g. "2h 15m", "5m", "<1m", or ''
+     */
+    function formatElapsed(startIso, endIso) {
+        var secs = _secondsSince(startIso, endIso || null);
+        if (secs == null) return '';
+        var hours = Math.floor(secs / 3600);
+        var minutes = Math.floor((secs % 3600) / 60);
+        if (hours > 0) return hours + 'h ' + minutes + 'm';
+        if (minutes > 0) return minutes + 'm';
+        return '<1m';
+    }
+
+    /**
+     * Render a single tagged element from its data attributes.
+     *
+     * @param {Element} el - Element carrying data-rel-time / data-ts
+     */
+    function render(el) {
+        var kind = el.getAttribute('data-rel-time');
+        var ts = el.getAttribute('data-ts');
+        if (!kind || !ts) return;
+
+        var text;
+        if (kind === 'last-seen') {
+            text = formatLastSeen(ts);
+        } else if (kind === 'uptime') {
+            text = formatUptime(ts);
+        } else if (kind === 'elapsed') {
+            var elapsed = formatElapsed(ts, el.getAttribute('data-ts-end'));
+            var prefix = el.getAttribute('data-rel-prefix');
+            if (prefix) {
+                text = elapsed ? prefix + ' \u00b7 ' + elapsed : prefix;
+            } else {
+                text = elapsed;
+            }
+        } else {
+            return;
+        }
+        if (el.textContent !== text) el.textContent = text;
+    }
+
+    /**
+     * Re-format every tagged element under a root (default: document).
+     *
+     * @param {Element|Document} [root]
+     */
+    function refresh(root) {
+        var scope = root || document;
+        var els = scope.querySelectorAll('[data-rel-time]');
+        for (var i = 0; i < els.length; i++) render(els[i]);
+        if (scope !== document && scope.hasAttribute && scope.hasAttribute('data-rel-time')) {
+            render(scope);
+        }
+    }
+
+    /**
+     * Tag an element with a timestamp and render it immediately.
+     * Used by SSE handlers when a card_refresh carries new timestamps.
+     *
+     * @param {Element} el - Target element
+     * @param {string} kind - 'last-seen' | 'uptime' | 'elapsed'
+     * @param {string} iso - Start timestamp
+     * @param {Object} [opts]
+     * @param {string} [opts.end] - End timestamp (elapsed only)
+     * @param {string} [opts.prefix] - Text before the elapsed value
+     */
+    function bind(el, kind, iso, opts) {
+        if (!el) return;
+        opts = opts || {};
+        el.setAttribute('data-rel-time', kind);
+        if (iso) {
+            el.setAttribute('data-ts', iso);
+        } else {
+            el.removeAttribute('data-ts');
+        }
+        if (opts.end) {
+            el.setAttribute('data-ts-end', opts.end);
+        } else {
+            el.removeAttribute('data-ts-end');
+        }
+        if (opts.prefix != null) {
+            el.setAttribute('data-rel-prefix', opts.prefix);
+        } else {
+            el.removeAttribute('data-rel-prefix');
+        }
+        if (iso) {
+            render(el);
+        } else if (kind === 'elapsed' && opts.prefix != null) {
+            el.textContent = opts.prefix;
+        }
+    }
+
+    function _start() {
+        if (_timer) return;
+        _timer = setInterval(function() { refresh(); }, TICK_INTERVAL_MS);
+    }
+
+    function _stop() {
+        if (!_timer) return;
+        clearInterval(_timer);
+        _timer = null;
+    }
+
+    // Pause while the tab is hidden; catch up immediately when it returns.
+    document.addEventListener('visibilitychange', function() {
+        if (document.hidden) {
+            _stop();
+        } else {
+            refresh();
+            _start();
+        }
+    });
+
+    if (document.readyState === 'loading') {
+        document.addEventListener('DOMContentLoaded', function() { refresh(); });
+    } else {
+        refresh();
+    }
+    _start();
+
+    window.CHTime = {
+        formatLastSeen: formatLastSeen,
+        formatUptime: formatUptime,
+        formatElapsed: formatElapsed,
+        render: render,
+        refresh: refresh,
+        bind: bind
+    };
+})();
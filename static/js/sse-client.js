@@ -234,6 +234,7 @@
         "state_transition",
         "turn_detected",
         "turn_created",
+        "turns_reconciled",
         "session_started",
         "session_created",
         "session_ended",
@@ -246,6 +247,8 @@
         "error",
         "instruction_summary",
         "priority_update",
+        "priority_ranking",
+        "status_counts",
         "priority_toggle",
         "commander_availability",
         "agent_state_changed",
@@ -370,6 +370,43 @@
         return API_BASE + path;
     }
 
+    // ── Content-addressed blobs ──
+
+    // Blob bodies never change for a given hash, so a resolved fetch can be
+    // reused for the life of the page. Bounded to keep long sessions lean.
+    var BLOB_CACHE_MAX = 50;
+    var _blobCache = new Map();
+
+    /**
+     * Fetch a content-addressed blob (large card field) by hash.
+     * Cards carry e.g. plan_content_hash / question_options_hash instead of
+     * the full value; this resolves them once per hash.
+     *
+     * @param {string} hash - SHA-256 content hash
+     * @returns {Promise<Object|string>} Parsed JSON or text body
+     */
+    function fetchBlob(hash) {
+        var cached = _blobCache.get(hash);
+        if (cached) return cached;
+
+        var promise = fetch(apiUrl('/api/blobs/' + encodeURIComponent(hash)))
+            .then(function(response) {
+                if (!response.ok) throw new Error('Blob fetch failed: ' + response.status);
+                var contentType = response.headers.get('Content-Type') || '';
+                return contentType.indexOf('application/json') === 0 ? response.json() : response.text();
+            })
+            .catch(function(err) {
+                _blobCache.delete(hash);  // Allow a retry on the next refresh
+                throw err;
+            });
+
+        _blobCache.set(hash, promise);
+        if (_blobCache.size > BLOB_CACHE_MAX) {
+            _blobCache.delete(_blobCache.keys().next().value);
+        }
+        return promise;
+    }
+
     // ── Response validation (L8) ──
 
     /**
@@ -417,6 +454,7 @@
         copyCodeBlock: copyCodeBlock,
         apiFetch: apiFetch,
         apiUrl: apiUrl,
+        fetchBlob: fetchBlob,
         validateResponse: validateResponse,
         heroHTML: heroHTML,
         fillHourlyGaps: fillHourlyGaps,
@@ -243,6 +243,19 @@ window.VoiceAPI = (function () {
       } catch (err) { /* ignore */ }
     });
 
+    // Batched reconciliation: one event per agent carrying every correction
+    // and recovered turn, replayed through the per-turn handlers.
+    _sse.addEventListener('turns_reconciled', function (e) {
+      try {
+        var data = JSON.parse(e.data);
+        var withAgent = function (item) {
+          return Object.assign({ agent_id: data.agent_id, project_id: data.project_id }, item);
+        };
+        if (_onTurnUpdated) (data.updated || []).forEach(function (item) { _onTurnUpdated(withAgent(item)); });
+        if (_onTurnCreated) (data.created || []).forEach(function (item) { _onTurnCreated(withAgent(item)); });
+      } catch (err) { /* ignore */ }
+    });
+
     _sse.addEventListener('session_ended', function (e) {
       try {
         var data = JSON.parse(e.data);
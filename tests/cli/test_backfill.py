@@ -0,0 +1,228 @@
+"""Tests for the historical transcript backfill."""
+
+import csv
+import io
+import json
+import uuid
+
+import pytest
+
+from src.claude_headspace.cli.backfill import (
+    CHECKPOINT_EXISTING,
+    BackfillCheckpoint,
+    BackfillLoader,
+    discover_transcripts,
+    parse_transcript,
+    run_backfill,
+    session_uuid_for,
+)
+from src.claude_headspace.cli.launcher import create_parser
+
+SESSION_ID = "0b7c9f5e-1d2a-4e3b-8c4d-5e6f7a8b9c0d"
+
+
+def line(role, text, ts, **extra):
+    data = {
+        "type": role,
+        "message": {"role": role, "content": [{"type": "text", "text": text}]},
+        "timestamp": ts,
+        **extra,
+    }
+    return json.dumps(data) + "\n"
+
+
+@pytest.fixture
+def projects(tmp_path):
+    folder = tmp_path / "-work-my-app"
+    folder.mkdir()
+    (folder / f"{SESSION_ID}.jsonl").write_text(
+        line("user", "fix the bug", "2026-01-29T10:00:00Z", cwd="/work/my-app")
+        + json.dumps({"type": "progress", "data": {}}) + "\n"
+        + line("assistant", "looking", "2026-01-29T10:00:05Z")
+        + line("assistant", "fixed", "2026-01-29T10:01:00Z")
+        + line("user", "now test it", "2026-01-29T10:02:00Z")
+        + line("user", "caveat", "2026-01-29T10:02:01Z", isMeta=True)
+    )
+    # Subagent transcripts live in nested directories and are ignored
+    (folder / "subagents").mkdir()
+    (folder / "subagents" / "agent-1.jsonl").write_text(line("user", "x", "2026-01-29T10:00:00Z"))
+    (tmp_path / "stray.jsonl").write_text("")
+    return tmp_path
+
+
+class FakeCursor:
+
+    def __init__(self, conn):
+        self.conn = conn
+        self._rows = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def execute(self, sql, params=None):
+        self.conn.executed.append(sql)
+        if sql.startswith("SELECT path"):
+            self._rows = [("/existing", 1, "my-app")]
+        elif sql.startswith("SELECT claude_session_id"):
+            self._rows = [("known-session", uuid.uuid4())]
+        elif sql.startswith("INSERT INTO projects"):
+            self.conn.project_slugs.append(params[1])
+            self._rows = [(42,)]
+        elif "nextval" in sql:
+            start = self.conn.next_id
+            self.conn.next_id += params[1]
+            self._rows = [(i,) for i in range(start, start + params[1])]
+
+    def fetchall(self):
+        return self._rows
+
+    def fetchone(self):
+        return self._rows[0]
+
+    def copy_expert(self, sql, buf):
+        table = sql.split()[1]
+        self.conn.copied[table] = list(csv.reader(io.StringIO(buf.read())))
+
+
+class FakeConnection:
+
+    def __init__(self):
+        self.executed = []
+        self.copied = {}
+        self.project_slugs = []
+        self.next_id = 100
+        self.commits = 0
+
+    def cursor(self):
+        return FakeCursor(self)
+
+    def commit(self):
+        self.commits += 1
+
+    def rollback(self):
+        pass
+
+
+class TestDiscoverTranscripts:
+
+    def test_finds_top_level_session_files(self, projects):
+        files = discover_transcripts(str(projects))
+        assert [(f.folder, f.session_id) for f in files] == [("-work-my-app", SESSION_ID)]
+
+    def test_missing_directory(self, tmp_path):
+        assert discover_transcripts(str(tmp_path / "missing")) == []
+
+
+class TestParseTranscript:
+
+    def test_groups_turns_into_tasks(self, projects):
+        session = parse_transcript(discover_transcripts(str(projects))[0])
+
+        assert session.project_path == "/work/my-app"
+        assert [t.full_command for t in session.tasks] == ["fix the bug", "now test it"]
+        first = session.tasks[0]
+        assert [(t.actor, t.intent, t.text) for t in first.turns] == [
+            ("USER", "COMMAND", "fix the bug"),
+            ("AGENT", "PROGRESS", "looking"),
+            ("AGENT", "COMPLETION", "fixed"),
+        ]
+        assert first.full_output == "fixed"
+        assert first.completed_at.isoformat() == "2026-01-29T10:01:00+00:00"
+        assert session.ended_at.isoformat() == "2026-01-29T10:02:01+00:00"
+
+    def test_decoded_folder_used_without_cwd(self, tmp_path):
+        folder = tmp_path / "-work-app"
+        folder.mkdir()
+        (folder / "s.jsonl").write_text(line("user", "hi", "2026-01-29T10:00:00Z"))
+        session = parse_transcript(discover_transcripts(str(tmp_path))[0])
+        assert session.project_path == "/work/app"
+
+
+class TestCheckpoint:
+
+    def test_round_trip_and_change_detection(self, projects, tmp_path):
+        file = discover_transcripts(str(projects))[0]
+        checkpoint = BackfillCheckpoint(tmp_path / "state" / "checkpoint.json")
+        checkpoint.mark(file, CHECKPOINT_EXISTING)
+        checkpoint.save()
+
+        reloaded = BackfillCheckpoint(checkpoint.path)
+        assert reloaded.is_done(file)
+        with open(file.path, "a") as f:
+            f.write(line("assistant", "more", "2026-01-29T10:03:00Z"))
+        assert not reloaded.is_done(discover_transcripts(str(projects))[0])
+
+    def test_restart_ignores_saved_progress(self, projects, tmp_path):
+        file = discover_transcripts(str(projects))[0]
+        checkpoint = BackfillCheckpoint(tmp_path / "checkpoint.json")
+        checkpoint.mark(file, CHECKPOINT_EXISTING)
+        checkpoint.save()
+        assert len(BackfillCheckpoint(checkpoint.path, resume=False)) == 0
+
+
+class TestBackfillLoader:
+
+    def test_copies_rows_with_reserved_ids(self, projects):
+        conn = FakeConnection()
+        loader = BackfillLoader(conn)
+        session = parse_transcript(discover_transcripts(str(projects))[0])
+
+        counts = loader.load([session])
+
+        assert counts == {"projects": 1, "agents": 1, "tasks": 2, "turns": 4}
+        assert conn.project_slugs == ["my-app-2"]
+        agent = conn.copied["agents"][0]
+        assert agent[:4] == ["100", str(uuid.UUID(SESSION_ID)), SESSION_ID, "42"]
+        assert [row[2] for row in conn.copied["tasks"]] == ["COMPLETE", "COMPLETE"]
+        assert conn.copied["tasks"][1][6] == ""  # No agent output: NULL
+        assert [row[1] for row in conn.copied["turns"]] == ["101", "101", "101", "102"]
+        assert loader.is_known(session)
+        assert loader.load([session])["agents"] == 0
+
+    def test_known_session_skipped(self, tmp_path):
+        folder = tmp_path / "-work-app"
+        folder.mkdir()
+        (folder / "known-session.jsonl").write_text(line("user", "hi", "2026-01-29T10:00:00Z"))
+        session = parse_transcript(discover_transcripts(str(tmp_path))[0])
+
+        conn = FakeConnection()
+        assert BackfillLoader(conn).load([session])["agents"] == 0
+        assert "agents" not in conn.copied
+
+    def test_non_uuid_session_id_gets_stable_uuid(self):
+        assert session_uuid_for("known-session") == session_uuid_for("known-session")
+        assert session_uuid_for(SESSION_ID) == uuid.UUID(SESSION_ID)
+
+
+class TestRunBackfill:
+
+    def test_imports_and_checkpoints(self, projects, tmp_path):
+        conn = FakeConnection()
+        checkpoint = BackfillCheckpoint(tmp_path / "checkpoint.json")
+        files = discover_transcripts(str(projects))
+
+        report = run_backfill(files, checkpoint, BackfillLoader(conn), workers=1)
+
+        assert (report.files_parsed, report.agents, report.turns) == (1, 1, 4)
+        assert conn.commits == 1
+        assert "MB/s" in report.format()
+
+        resumed = run_backfill(files, BackfillCheckpoint(checkpoint.path), BackfillLoader(conn), workers=1)
+        assert (resumed.files_checkpointed, resumed.files_parsed) == (1, 0)
+
+    def test_dry_run_writes_nothing(self, projects, tmp_path):
+        checkpoint = BackfillCheckpoint(tmp_path / "checkpoint.json")
+        report = run_backfill(discover_transcripts(str(projects)), checkpoint, None, workers=1)
+        assert (report.agents, report.tasks, report.turns) == (1, 2, 4)
+        assert not checkpoint.path.exists()
+
+
+class TestBackfillParser:
+
+    def test_backfill_arguments(self):
+        parsed = create_parser().parse_args(["backfill", "--workers", "2", "--dry-run"])
+        assert (parsed.command, parsed.workers, parsed.dry_run) == ("backfill", 2, True)
+        assert parsed.batch_files == 50
@@ -0,0 +1,34 @@
+"""Tests for the cold-storage command."""
+
+from argparse import Namespace
+from datetime import datetime, timezone
+from unittest.mock import patch
+
+from src.claude_headspace.cli.cold_storage import EXIT_ERROR, EXIT_SUCCESS, cmd_cold_storage
+from src.claude_headspace.services.cold_storage import TieringReport
+
+
+def _args(tmp_path, **overrides):
+    return Namespace(config=str(tmp_path / "config.yaml"), after_days=7, dry_run=True, **overrides)
+
+
+class TestColdStorageCommand:
+
+    def test_prints_report(self, tmp_path, capsys):
+        report = TieringReport(cutoff=datetime(2026, 1, 1, tzinfo=timezone.utc), dry_run=True)
+        with patch("src.claude_headspace.cli.cold_storage.ColdStorageService") as service_cls, \
+                patch("sqlalchemy.create_engine"), patch("sqlalchemy.orm.Session"):
+            service_cls.return_value.run_once.return_value = report
+            assert cmd_cold_storage(_args(tmp_path)) == EXIT_SUCCESS
+
+        config = service_cls.call_args.kwargs["config"]
+        assert config["cold_storage"]["after_days"] == 7
+        assert service_cls.return_value.run_once.call_args.kwargs["dry_run"] is True
+        assert capsys.readouterr().out.strip() == report.format()
+
+    def test_failed_pass(self, tmp_path, capsys):
+        with patch("src.claude_headspace.cli.cold_storage.ColdStorageService") as service_cls, \
+                patch("sqlalchemy.create_engine"), patch("sqlalchemy.orm.Session"):
+            service_cls.return_value.run_once.side_effect = RuntimeError("no database")
+            assert cmd_cold_storage(_args(tmp_path)) == EXIT_ERROR
+        assert "no database" in capsys.readouterr().out
@@ -0,0 +1,50 @@
+"""Tests for the intent corpus and classifier commands."""
+
+from argparse import Namespace
+
+from src.claude_headspace.cli.intent import EXIT_ERROR, EXIT_SUCCESS, cmd_intent_eval, cmd_intent_train
+from src.claude_headspace.services.intent_classifier import IntentClassifier
+from src.claude_headspace.services.intent_evaluation import CorpusEntry, write_corpus
+
+
+def _corpus(n):
+    entries = []
+    for i in range(n):
+        text, label = ("Not sure which config you meant, dev or prod", "question") if i % 2 \
+            else ("Now reading the migrations folder", "progress")
+        entries.append(CorpusEntry(i, "agent", label, f"{text} ({i})", label_source="inference"))
+    return entries
+
+
+class TestCommand:
+
+    def test_eval_exit_codes(self, tmp_path, capsys):
+        path = tmp_path / "corpus.jsonl"
+        write_corpus([CorpusEntry(1, "agent", "completion", "Reading the file now")], path)
+        args = Namespace(corpus=str(path), profile=False, top=5, backtracking=False, min_accuracy=None)
+        assert cmd_intent_eval(args) == EXIT_SUCCESS
+        args.min_accuracy = 0.5
+        assert cmd_intent_eval(args) == EXIT_ERROR
+        assert "0/1 correct" in capsys.readouterr().out
+
+    def test_eval_missing_corpus(self, tmp_path):
+        args = Namespace(corpus=str(tmp_path / "missing.jsonl"), profile=False, top=5,
+                         backtracking=False, min_accuracy=None)
+        assert cmd_intent_eval(args) == EXIT_ERROR
+
+    def test_train_from_corpus(self, tmp_path, capsys):
+        corpus = tmp_path / "corpus.jsonl"
+        write_corpus(_corpus(60), corpus)
+        output = tmp_path / "intent.json"
+        args = Namespace(config=str(tmp_path / "config.yaml"), corpus=str(corpus),
+                         output=str(output), epochs=2, holdout=0.2)
+        assert cmd_intent_train(args) == EXIT_SUCCESS
+        assert IntentClassifier.load(output).labels == ["progress", "question"]
+        assert "Holdout:" in capsys.readouterr().out
+
+    def test_train_empty_corpus(self, tmp_path):
+        corpus = tmp_path / "corpus.jsonl"
+        corpus.write_text("")
+        args = Namespace(config=str(tmp_path / "config.yaml"), corpus=str(corpus),
+                         output=str(tmp_path / "intent.json"), epochs=1, holdout=0.2)
+        assert cmd_intent_train(args) == EXIT_ERROR
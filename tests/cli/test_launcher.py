@@ -668,6 +668,14 @@ class TestCreateParser:
         assert args.bridge is True
         assert args.no_bridge is True
 
+    def test_cold_storage_command(self):
+        """Test cold-storage command parsing."""
+        parser = create_parser()
+        args = parser.parse_args(["cold-storage", "--after-days", "7", "--dry-run"])
+        assert args.command == "cold-storage"
+        assert args.after_days == 7
+        assert args.dry_run is True
+
 
 class TestMain:
     """Tests for main function."""
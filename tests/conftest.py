@@ -56,6 +56,18 @@ def _force_test_database():
         os.environ.pop("DATABASE_URL", None)
 
 
+@pytest.fixture(autouse=True)
+def _clear_intent_cache():
+    """Isolate tests from intent results cached by earlier tests."""
+    from claude_headspace.services.intent_detector import intent_cache, set_local_classifier
+
+    intent_cache.clear()
+    set_local_classifier(None)
+    yield
+    intent_cache.clear()
+    set_local_classifier(None)
+
+
 @pytest.fixture
 def app():
     """Create a Flask application for testing."""
@@ -73,6 +85,7 @@ def app():
 
     yield app
 
+    app.extensions["session_index"].stop()
     os.chdir(original_cwd)
 
 
@@ -0,0 +1,85 @@
+"""Integration tests for full-text search over turns and tasks."""
+
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from claude_headspace.models.agent import Agent
+from claude_headspace.models.project import Project
+from claude_headspace.models.task import Task, TaskState
+from claude_headspace.models.turn import Turn, TurnActor, TurnIntent
+from claude_headspace.services.search import search
+
+NOW = datetime(2026, 1, 29, 10, 0, tzinfo=timezone.utc)
+
+
+@pytest.fixture
+def searchable(db_session):
+    project = Project(name="billing", slug="billing", path="/work/billing")
+    db_session.add(project)
+    db_session.flush()
+    agent = Agent(
+        session_uuid="aaaaaaaa-bbbb-cccc-dddd-000000000039",
+        project_id=project.id,
+        started_at=NOW,
+        last_seen_at=NOW,
+    )
+    db_session.add(agent)
+    db_session.flush()
+    task = Task(
+        agent_id=agent.id,
+        state=TaskState.COMPLETE,
+        started_at=NOW,
+        instruction="Write the payments migration",
+    )
+    db_session.add(task)
+    db_session.flush()
+    turns = [
+        Turn(
+            task_id=task.id, actor=TurnActor.AGENT, intent=TurnIntent.PROGRESS,
+            text=f"Step {i}: editing the <payments> migration", timestamp=NOW + timedelta(minutes=i),
+        )
+        for i in range(3)
+    ]
+    db_session.add_all(turns)
+    db_session.flush()
+    return project, agent, task, turns
+
+
+class TestSearch:
+
+    def test_trigger_indexes_and_ranks_results(self, db_session, searchable):
+        project, _, task, _ = searchable
+        page = search("payments migration", session=db_session)
+
+        kinds = [(r["kind"], r["id"]) for r in page.results]
+        assert ("task", task.id) in kinds
+        assert len(page.results) == 4
+        assert page.results[0]["project_name"] == "billing"
+        assert "&lt;<mark>payments</mark>&gt;" in " ".join(r["snippet"] or "" for r in page.results)
+
+    def test_summary_update_is_searchable(self, db_session, searchable):
+        *_, turns = searchable
+        turns[0].summary = "Refactored the ledger"
+        db_session.flush()
+        page = search("ledger", kinds=("turn",), session=db_session)
+        assert [r["id"] for r in page.results] == [turns[0].id]
+
+    def test_keyset_pagination_covers_all_results_once(self, db_session, searchable):
+        seen, cursor = [], None
+        while True:
+            page = search("payments", sort="recent", limit=1, cursor=cursor, session=db_session)
+            seen.extend((r["kind"], r["id"]) for r in page.results)
+            cursor = page.next_cursor
+            if cursor is None:
+                break
+        assert len(seen) == len(set(seen)) == 4
+
+    def test_filters(self, db_session, searchable):
+        project, agent, _, turns = searchable
+        assert search("payments", project_id=project.id + 1, session=db_session).results == []
+        page = search(
+            "payments", agent_id=agent.id, since=NOW + timedelta(minutes=1),
+            kinds=("turn",), session=db_session,
+        )
+        assert sorted(r["id"] for r in page.results) == sorted(t.id for t in turns[1:])
@@ -0,0 +1,62 @@
+"""Route tests for the content-addressed blob API."""
+
+import pytest
+from flask import Flask
+
+from src.claude_headspace.routes.blobs import blobs_bp
+from src.claude_headspace.services.blob_store import BlobStore
+
+
+@pytest.fixture
+def store():
+    return BlobStore()
+
+
+@pytest.fixture
+def app(store):
+    app = Flask(__name__)
+    app.register_blueprint(blobs_bp)
+    app.config["TESTING"] = True
+    app.extensions["blob_store"] = store
+    return app
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+
+class TestGetBlob:
+
+    def test_serves_text_blob_with_immutable_caching(self, client, store):
+        blob_hash = store.put(*BlobStore.encode("# Plan\n\n1. Do it"))
+        resp = client.get(f"/api/blobs/{blob_hash}")
+        assert resp.status_code == 200
+        assert resp.get_data(as_text=True) == "# Plan\n\n1. Do it"
+        assert resp.content_type.startswith("text/plain")
+        assert "immutable" in resp.headers["Cache-Control"]
+        assert resp.headers["ETag"] == f'"{blob_hash}"'
+
+    def test_serves_json_blob(self, client, store):
+        blob_hash = store.put(*BlobStore.encode({"questions": []}))
+        resp = client.get(f"/api/blobs/{blob_hash}")
+        assert resp.status_code == 200
+        assert resp.get_json() == {"questions": []}
+
+    def test_not_modified_for_matching_etag(self, client, store):
+        blob_hash = store.put(*BlobStore.encode("plan"))
+        resp = client.get(f"/api/blobs/{blob_hash}", headers={"If-None-Match": f'"{blob_hash}"'})
+        assert resp.status_code == 304
+
+    def test_unknown_hash_returns_404(self, client):
+        resp = client.get("/api/blobs/" + "a" * 64)
+        assert resp.status_code == 404
+
+    def test_malformed_hash_returns_400(self, client):
+        resp = client.get("/api/blobs/not-a-hash")
+        assert resp.status_code == 400
+
+    def test_unavailable_without_store(self, app, client):
+        app.extensions.pop("blob_store")
+        resp = client.get("/api/blobs/" + "a" * 64)
+        assert resp.status_code == 503
@@ -540,3 +540,34 @@ class TestRankings:
         assert len(data["agents"]) == 3
         scores = [a["score"] for a in data["agents"]]
         assert scores == [90, 70, 50]
+
+    def test_rankings_unscored_last_regardless_of_state(self, app, client, mock_priority):
+        """The API keeps score-desc/nulls-last order, unlike the By Priority view."""
+        from datetime import datetime, timezone
+
+        from src.claude_headspace.models import TaskState
+        from src.claude_headspace.services.priority_ranking import PriorityRanking
+
+        app.extensions["priority_scoring_service"] = mock_priority
+        app.extensions["priority_ranking"] = PriorityRanking()
+
+        agents = []
+        for i, (score, state) in enumerate([(None, TaskState.AWAITING_INPUT), (40, TaskState.IDLE)]):
+            agent = MagicMock()
+            agent.id = i + 1
+            agent.project.name = f"project-{i}"
+            agent.state = state
+            agent.tasks = []
+            agent.ended_at = None
+            agent.last_seen_at = datetime.now(timezone.utc)
+            agent.priority_score = score
+            agent.priority_reason = None
+            agent.priority_updated_at = None
+            agents.append(agent)
+
+        with patch("src.claude_headspace.database.db") as mock_db:
+            mock_db.session.query.return_value.filter.return_value.order_by.return_value.all.return_value = agents
+            response = client.get("/api/priority/rankings")
+
+        assert response.status_code == 200
+        assert [a["score"] for a in response.get_json()["agents"]] == [40, None]
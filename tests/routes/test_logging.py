@@ -838,6 +838,21 @@ class TestGetInferenceCallsAPI:
             assert response.status_code == 200
             mock_query.filter.assert_called()
 
+    def test_search_reports_archived_prompts_not_searched(self, client):
+        """Test that search skips compressed prompts and reports how many."""
+        with patch("claude_headspace.routes.logging.db") as mock_db:
+            mock_query = MagicMock()
+            mock_query.filter.return_value = mock_query
+            mock_query.count.side_effect = [3, 0]
+            mock_query.order_by.return_value.offset.return_value.limit.return_value.all.return_value = []
+            mock_db.session.query.return_value = mock_query
+
+            response = client.get("/api/inference/calls?search=waiting")
+            data = json.loads(response.data)
+            assert data["archived_unsearched"] == 3
+            search_filter = str(mock_query.filter.call_args_list[-1].args[0])
+            assert "input_text_compressed IS NULL" in search_filter
+
     def test_get_inference_calls_with_search_and_other_filters(self, client):
         """Test GET with search combined with other filters."""
         with patch("claude_headspace.routes.logging.db") as mock_db:
@@ -0,0 +1,59 @@
+"""Route tests for the full-text search API."""
+
+from unittest.mock import patch
+
+import pytest
+from flask import Flask
+
+from src.claude_headspace.routes.search import search_bp
+from src.claude_headspace.services.search import SearchError, SearchPage
+
+
+@pytest.fixture
+def client():
+    app = Flask(__name__)
+    app.register_blueprint(search_bp)
+    app.config["TESTING"] = True
+    return app.test_client()
+
+
+class TestApiSearch:
+
+    @patch("src.claude_headspace.routes.search.search")
+    def test_returns_results_and_cursor(self, mock_search, client):
+        mock_search.return_value = SearchPage(results=[{"kind": "turn", "id": 1}], next_cursor="abc")
+
+        resp = client.get(
+            "/api/search?q=payments+migration&project_id=2&type=turn"
+            "&since=2026-01-01T00:00:00Z&sort=recent&limit=5&cursor=xyz"
+        )
+
+        assert resp.status_code == 200
+        assert resp.get_json() == {
+            "query": "payments migration",
+            "results": [{"kind": "turn", "id": 1}],
+            "next_cursor": "abc",
+        }
+        kwargs = mock_search.call_args.kwargs
+        assert kwargs["project_id"] == 2
+        assert kwargs["kinds"] == ("turn",)
+        assert kwargs["since"].isoformat() == "2026-01-01T00:00:00+00:00"
+        assert (kwargs["sort"], kwargs["limit"], kwargs["cursor"]) == ("recent", 5, "xyz")
+
+    def test_query_required(self, client):
+        assert client.get("/api/search?q=%20").status_code == 400
+
+    def test_invalid_date(self, client):
+        assert client.get("/api/search?q=x&since=yesterday").status_code == 400
+
+    @patch("src.claude_headspace.routes.search.search")
+    def test_invalid_parameters(self, mock_search, client):
+        mock_search.side_effect = SearchError("Invalid cursor")
+        resp = client.get("/api/search?q=x&cursor=bad")
+        assert resp.status_code == 400
+        assert resp.get_json()["error"] == "Invalid cursor"
+
+    @patch("src.claude_headspace.routes.search.search")
+    def test_failure(self, mock_search, client):
+        mock_search.side_effect = RuntimeError("db down")
+        assert client.get("/api/search?q=x").status_code == 500
@@ -0,0 +1,72 @@
+"""Unit tests for the content-addressed blob store."""
+
+import hashlib
+
+import pytest
+
+from src.claude_headspace.services.blob_store import BlobStore
+
+
+@pytest.fixture
+def store():
+    return BlobStore({"blob_store": {"inline_threshold_bytes": 16, "max_bytes": 100}})
+
+
+class TestPutGet:
+
+    def test_hash_is_sha256_of_body(self, store):
+        body = b"hello world"
+        assert store.put(body, "text/plain") == hashlib.sha256(body).hexdigest()
+
+    def test_get_returns_body_and_mimetype(self, store):
+        blob_hash = store.put(b"plan text", "text/plain; charset=utf-8")
+        blob = store.get(blob_hash)
+        assert blob.body == b"plan text"
+        assert blob.mimetype == "text/plain; charset=utf-8"
+
+    def test_get_unknown_hash_returns_none(self, store):
+        assert store.get("0" * 64) is None
+        assert store.stats["misses"] == 1
+
+    def test_duplicate_put_stored_once(self, store):
+        store.put(b"same", "text/plain")
+        store.put(b"same", "text/plain")
+        assert store.stats["count"] == 1
+        assert store.stats["total_bytes"] == 4
+
+
+class TestEncode:
+
+    def test_text_encoded_as_utf8(self):
+        body, mimetype = BlobStore.encode("plan ✓")
+        assert body == "plan ✓".encode("utf-8")
+        assert mimetype.startswith("text/plain")
+
+    def test_json_is_canonical(self):
+        a, mimetype = BlobStore.encode({"b": 1, "a": [1, 2]})
+        b, _ = BlobStore.encode({"a": [1, 2], "b": 1})
+        assert a == b
+        assert mimetype == "application/json"
+
+
+class TestThresholdAndEviction:
+
+    def test_should_externalise_at_threshold(self, store):
+        assert store.should_externalise(15) is False
+        assert store.should_externalise(16) is True
+
+    def test_lru_eviction_by_total_bytes(self, store):
+        first = store.put(b"a" * 40, "text/plain")
+        second = store.put(b"b" * 40, "text/plain")
+        store.get(first)  # Touch first so second becomes least recently used
+        store.put(b"c" * 40, "text/plain")
+
+        assert store.get(second) is None
+        assert store.get(first) is not None
+        assert store.stats["total_bytes"] == 80
+        assert store.stats["evictions"] == 1
+
+    def test_oversized_blob_is_kept(self, store):
+        blob_hash = store.put(b"x" * 500, "text/plain")
+        assert store.get(blob_hash) is not None
+        assert store.stats["count"] == 1
@@ -61,10 +61,11 @@ class TestBuildCardState:
 
         expected_keys = {
             "id", "session_uuid", "hero_chars", "hero_trail",
-            "is_active", "uptime", "last_seen",
+            "is_active", "started_at", "last_seen_at",
             "state", "state_info", "task_summary", "task_instruction",
             "task_completion_summary", "priority", "priority_reason",
-            "turn_count", "elapsed", "current_task_id", "is_bridge_connected",
+            "turn_count", "task_started_at", "task_completed_at",
+            "current_task_id", "is_bridge_connected",
             "project_name", "project_slug", "project_id",
             "has_plan", "tmux_session", "context",
         }
@@ -175,23 +176,46 @@ class TestBuildCardState:
 
         assert result["state"] == "COMPLETE"
         assert result["turn_count"] == 3
-        assert "1h" in result["elapsed"]
-        assert "turn_count" in result
-        assert "elapsed" in result
+        assert result["task_started_at"] == mock_task.started_at.isoformat()
+        assert result["task_completed_at"] == mock_task.completed_at.isoformat()
 
     @patch("claude_headspace.services.card_state._get_dashboard_config")
-    def test_idle_state_includes_turn_count_and_elapsed(self, mock_config):
-        """All states include turn_count and elapsed (0/None for IDLE with no task)."""
+    def test_idle_state_includes_turn_count_and_task_timestamps(self, mock_config):
+        """All states include turn_count and task timestamps (0/None for IDLE with no task)."""
         mock_config.return_value = {"stale_processing_seconds": 600, "active_timeout_minutes": 5}
 
         agent = _make_agent(state=TaskState.IDLE)
 
         result = build_card_state(agent)
 
-        assert "turn_count" in result
-        assert "elapsed" in result
         assert result["turn_count"] == 0
-        assert result["elapsed"] is None
+        assert result["task_started_at"] is None
+        assert result["task_completed_at"] is None
+
+    @patch("claude_headspace.services.card_state._get_dashboard_config")
+    def test_relative_times_sent_as_iso_timestamps(self, mock_config):
+        """Relative time strings are formatted client-side, not baked into the card."""
+        mock_config.return_value = {"stale_processing_seconds": 600, "active_timeout_minutes": 5}
+
+        mock_task = MagicMock()
+        mock_task.state = TaskState.PROCESSING
+        mock_task.started_at = datetime.now(timezone.utc) - timedelta(minutes=7)
+        mock_task.completed_at = None
+        mock_task.turns = []
+        mock_task.plan_content = None
+        mock_task.plan_file_path = None
+
+        agent = _make_agent(state=TaskState.PROCESSING)
+        agent.get_current_task.return_value = mock_task
+
+        result = build_card_state(agent)
+
+        assert result["started_at"] == agent.started_at.isoformat()
+        assert result["last_seen_at"] == agent.last_seen_at.isoformat()
+        assert result["task_started_at"] == mock_task.started_at.isoformat()
+        assert result["task_completed_at"] is None
+        for stale_key in ("uptime", "last_seen", "elapsed"):
+            assert stale_key not in result
 
     @patch("claude_headspace.services.card_state._get_dashboard_config")
     def test_state_serialised_as_string(self, mock_config):
@@ -357,6 +381,47 @@ class TestGetQuestionOptions:
         result = build_card_state(agent)
         assert result["question_options"] == tool_input
 
+    @patch("claude_headspace.services.card_state._get_extension")
+    @patch("claude_headspace.services.card_state._get_dashboard_config")
+    def test_build_card_state_sends_large_fields_as_hashes(self, mock_config, mock_store):
+        from claude_headspace.models.turn import TurnActor, TurnIntent
+        from claude_headspace.services.blob_store import BlobStore
+
+        mock_config.return_value = {"stale_processing_seconds": 600, "active_timeout_minutes": 5}
+        store = BlobStore({"blob_store": {"inline_threshold_bytes": 64}})
+        mock_store.return_value = store
+
+        tool_input = {
+            "questions": [{
+                "question": "Which?",
+                "options": [{"label": f"Option {i}", "description": "x" * 20} for i in range(5)],
+            }]
+        }
+        mock_turn = MagicMock()
+        mock_turn.actor = TurnActor.AGENT
+        mock_turn.intent = TurnIntent.QUESTION
+        mock_turn.tool_input = tool_input
+        mock_turn.summary = None
+        mock_turn.text = "Which?"
+
+        mock_task = MagicMock()
+        mock_task.state = TaskState.AWAITING_INPUT
+        mock_task.turns = [mock_turn]
+        mock_task.started_at = None
+        mock_task.plan_content = "# Plan\n" + "step\n" * 50
+        mock_task.plan_approved_at = None
+
+        agent = _make_agent(state=TaskState.AWAITING_INPUT)
+        agent.get_current_task.return_value = mock_task
+
+        result = build_card_state(agent)
+
+        assert "plan_content" not in result
+        assert "question_options" not in result
+        assert store.get(result["plan_content_hash"]).body.decode() == mock_task.plan_content
+        options_body = store.get(result["question_options_hash"]).body
+        assert options_body == BlobStore.encode(tool_input)[0]
+
     @patch("claude_headspace.services.card_state._get_dashboard_config")
     def test_build_card_state_omits_question_options_when_none(self, mock_config):
         mock_config.return_value = {"stale_processing_seconds": 600, "active_timeout_minutes": 5}
@@ -0,0 +1,210 @@
+"""Tests for compressed cold storage of large text columns."""
+
+import zlib
+from datetime import datetime, timezone
+from unittest.mock import patch
+
+import pytest
+from sqlalchemy import LargeBinary, String, Text, create_engine, update
+from sqlalchemy.orm import DeclarativeBase, Mapped, Session, mapped_column
+
+from claude_headspace.models import cold_storage
+from claude_headspace.models.cold_storage import (
+    ColdStorageError,
+    cold_value,
+    compress_text,
+    decompress_text,
+    install_cold_storage,
+)
+from claude_headspace.models.search_vector import search_trigger_ddl
+from claude_headspace.services.cold_storage import (
+    ColdStorageService,
+    ColumnReport,
+    TieringReport,
+)
+
+
+class _Base(DeclarativeBase):
+    pass
+
+
+class _Note(_Base):
+    __tablename__ = "notes"
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    title: Mapped[str] = mapped_column(String(50))
+    body: Mapped[str] = mapped_column(Text, nullable=False)
+    body_compressed: Mapped[bytes | None] = mapped_column(LargeBinary, nullable=True)
+
+
+install_cold_storage(_Note, (("body", ""),))
+
+
+@pytest.fixture
+def session():
+    engine = create_engine("sqlite://")
+    _Base.metadata.create_all(engine)
+    with Session(engine) as s:
+        yield s
+
+
+def _archive(session, note_id, body):
+    session.execute(
+        update(_Note)
+        .where(_Note.id == note_id)
+        .values(body="", body_compressed=compress_text(body))
+    )
+    session.commit()
+    session.expunge_all()
+
+
+class TestCodec:
+
+    def test_round_trip(self):
+        text = "héllo wörld " * 1000
+        blob = compress_text(text)
+        assert len(blob) < len(text)
+        assert decompress_text(blob) == text
+
+    def test_reads_zlib_blobs(self):
+        blob = b"D" + zlib.compress("legacy".encode())
+        assert decompress_text(memoryview(blob)) == "legacy"
+
+    def test_zlib_fallback_without_zstandard(self):
+        with patch.object(cold_storage, "zstandard", None):
+            blob = compress_text("fallback")
+        assert blob[:1] == b"D"
+        assert decompress_text(blob) == "fallback"
+
+    def test_unknown_codec(self):
+        with pytest.raises(ColdStorageError):
+            decompress_text(b"Xabc")
+
+    def test_corrupt_blob(self):
+        with pytest.raises(ColdStorageError):
+            decompress_text(b"Dnot zlib")
+
+    def test_cold_value(self):
+        assert cold_value("raw", None) == "raw"
+        assert cold_value("", compress_text("archived")) == "archived"
+
+
+class TestTransparentReads:
+
+    def test_load_decompresses_without_dirtying(self, session):
+        session.add(_Note(id=1, title="a", body="long body " * 100))
+        session.commit()
+        _archive(session, 1, "long body " * 100)
+
+        note = session.get(_Note, 1)
+        assert note.body == "long body " * 100
+        assert note not in session.dirty
+        assert not session.is_modified(note)
+
+    def test_refresh_decompresses(self, session):
+        session.add(_Note(id=1, title="a", body="original"))
+        session.commit()
+        note = session.get(_Note, 1)
+        session.execute(
+            update(_Note).where(_Note.id == 1).values(body="", body_compressed=compress_text("original"))
+        )
+        session.refresh(note)
+        assert note.body == "original"
+
+    def test_writing_raw_value_clears_compressed(self, session):
+        session.add(_Note(id=1, title="a", body="original"))
+        session.commit()
+        _archive(session, 1, "original")
+
+        note = session.get(_Note, 1)
+        note.body = "rewritten"
+        session.commit()
+        session.expunge_all()
+
+        row = session.execute(_Note.__table__.select()).one()
+        assert row.body == "rewritten"
+        assert row.body_compressed is None
+
+    def test_hot_rows_untouched(self, session):
+        session.add(_Note(id=1, title="a", body="hot"))
+        session.commit()
+        session.expunge_all()
+        assert session.get(_Note, 1).body == "hot"
+
+
+class TestSearchTrigger:
+
+    def test_keep_when_guards_updates(self):
+        ddl = search_trigger_ddl("turns", (("text", "A"),), keep_when="NEW.text_compressed IS NOT NULL")
+        assert "IF TG_OP = 'UPDATE' AND (NEW.text_compressed IS NOT NULL) THEN" in ddl[0]
+        assert "ts_filter(OLD.search_vector, '{a}')" in ddl[0]
+
+    def test_kept_columns_reindex_the_rest(self):
+        ddl = search_trigger_ddl(
+            "turns", (("text", "A"), ("summary", "B")),
+            keep_when="NEW.text_compressed IS NOT NULL", kept_columns=("text",),
+        )
+        guard = ddl[0].split("END IF;")[0]
+        assert "ts_filter(OLD.search_vector, '{a}')" in guard
+        assert "NEW.summary" in guard
+        assert "NEW.text," not in guard
+
+    def test_no_guard_by_default(self):
+        assert "TG_OP" not in search_trigger_ddl("turns", (("text", "A"),))[0]
+
+
+class TestTieringReport:
+
+    def test_totals_and_format(self):
+        report = TieringReport(
+            cutoff=datetime(2026, 1, 1, tzinfo=timezone.utc),
+            columns={
+                "turns.text": ColumnReport(rows=3, raw_bytes=3_000_000, compressed_bytes=1_000_000),
+                "tasks.full_output": ColumnReport(rows=1, raw_bytes=1_000_000, compressed_bytes=200_000),
+                "tasks.full_command": ColumnReport(),
+            },
+            table_bytes_before={"turns": 10_485_760},
+            table_bytes_after={"turns": 8_388_608},
+        )
+        assert report.rows == 4
+        assert report.reclaimed_bytes == 2_800_000
+
+        data = report.to_dict()
+        assert data["reclaimed_bytes"] == 2_800_000
+        assert data["columns"]["turns.text"]["rows"] == 3
+
+        text = report.format()
+        assert "4 values" in text
+        assert "turns.text" in text
+        assert "tasks.full_command" not in text
+        assert "turns on disk: 10.0MB -> 8.0MB" in text
+
+
+class TestColdStorageService:
+
+    def test_config(self):
+        service = ColdStorageService(app=None, config={"cold_storage": {"after_days": 7, "enabled": False}})
+        assert service.after_days == 7
+        assert service.enabled is False
+        assert service.min_bytes == 1024
+
+    def test_disabled_does_not_start(self):
+        service = ColdStorageService(app=None, config={"cold_storage": {"enabled": False}})
+        service.start()
+        assert service._thread is None
+
+    def test_stats_track_passes(self):
+        service = ColdStorageService(app=None, config={})
+        report = TieringReport(
+            cutoff=datetime(2026, 1, 1, tzinfo=timezone.utc),
+            columns={"turns.text": ColumnReport(rows=2, raw_bytes=5000, compressed_bytes=1000)},
+        )
+        with patch.object(service, "_run", side_effect=lambda s, r: r.columns.update(report.columns)):
+            service.run_once(session=object())
+            service.run_once(dry_run=True, session=object())
+
+        stats = service.stats
+        assert stats["passes"] == 1
+        assert stats["rows_moved"] == 2
+        assert stats["reclaimed_bytes"] == 4000
+        assert stats["last_report"]["dry_run"] is True
@@ -244,3 +244,85 @@ class TestFileWatcherDebouncing:
 
         # Should have all 5 messages, but processed in fewer batches
         assert len(events) == 5
+
+
+class TestFileWatcherDirectoryWatches:
+    """Test per-directory watches and the fallback scan."""
+
+    @pytest.fixture
+    def temp_projects_dir(self):
+        """Create a temporary Claude projects directory."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            yield tmpdir
+
+    def _make_jsonl(self, projects_dir, project_path, name):
+        folder = os.path.join(projects_dir, encode_project_path(project_path))
+        os.makedirs(folder, exist_ok=True)
+        path = os.path.join(folder, name)
+        with open(path, "w") as f:
+            f.write("")
+        return path
+
+    def test_one_watch_per_project_directory(self, temp_projects_dir):
+        """Sessions in the same project share one directory watch."""
+        watcher = FileWatcher(projects_path=temp_projects_dir)
+        watcher.start()
+        try:
+            self._make_jsonl(temp_projects_dir, "/test/project", "session.jsonl")
+            uuid1, uuid2 = uuid4(), uuid4()
+            watcher.register_session(uuid1, "/test/project", "/test/project")
+            watcher.register_session(uuid2, "/test/project", "/test/project")
+            assert len(watcher._dir_watches) == 1
+
+            watcher.unregister_session(uuid1)
+            assert len(watcher._dir_watches) == 1
+            watcher.unregister_session(uuid2)
+            assert watcher._dir_watches == {}
+        finally:
+            watcher.stop()
+
+    def test_directories_watched_when_observer_starts(self, temp_projects_dir):
+        """Sessions registered before start() are watched once it runs."""
+        watcher = FileWatcher(projects_path=temp_projects_dir)
+        self._make_jsonl(temp_projects_dir, "/test/project", "session.jsonl")
+        watcher.register_session(uuid4(), "/test/project", "/test/project")
+        assert watcher._dir_watches == {}
+
+        watcher.start()
+        try:
+            assert len(watcher._dir_watches) == 1
+        finally:
+            watcher.stop()
+
+    def test_fallback_scan_queues_only_changed_files(self, temp_projects_dir):
+        """The scan compares size/mtime and never reads unchanged files."""
+        watcher = FileWatcher(projects_path=temp_projects_dir)
+        path = self._make_jsonl(temp_projects_dir, "/test/project", "session.jsonl")
+        watcher.register_session(uuid4(), "/test/project", "/test/project")
+
+        watcher._scan_watched_files()
+        assert watcher._pending_files == {}
+
+        with open(path, "a") as f:
+            f.write('{"type": "user", "message": {"content": "Hi"}}\n')
+        watcher._scan_watched_files()
+        assert list(watcher._pending_files) == [path]
+
+    def test_fallback_scan_emits_missed_turns(self, temp_projects_dir):
+        """Changes found by the scan are processed like Watchdog events."""
+        events = []
+        watcher = FileWatcher(projects_path=temp_projects_dir, debounce_interval=0)
+        watcher.set_on_turn_detected(events.append)
+        path = self._make_jsonl(temp_projects_dir, "/test/project", "session.jsonl")
+        watcher.register_session(uuid4(), "/test/project", "/test/project")
+
+        with open(path, "a") as f:
+            f.write(json.dumps({
+                "type": "user",
+                "message": {"content": "Missed"},
+                "timestamp": "2026-01-29T10:00:00Z",
+            }) + "\n")
+        watcher._scan_watched_files()
+        watcher._process_debounced_changes()
+
+        assert [e["text"] for e in events] == ["Missed"]
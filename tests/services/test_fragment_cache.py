@@ -0,0 +1,134 @@
+"""Tests for the rendered agent card fragment cache."""
+
+import pytest
+from jinja2 import DictLoader, Environment, pass_context
+
+from src.claude_headspace.services.fragment_cache import (
+    AGENT_CARD_TEMPLATE,
+    FragmentCache,
+    card_version,
+    render_agent_card,
+)
+
+
+CARD_SOURCE = (
+    '<article data-agent-id="{{ agent.id }}">{{ agent.name }}'
+    '{% if context_thresholds is defined %} ctx={{ context_thresholds.high }}{% endif %}</article>'
+)
+
+
+@pytest.fixture
+def cache():
+    return FragmentCache()
+
+
+@pytest.fixture
+def env(cache):
+    templates = {
+        AGENT_CARD_TEMPLATE: CARD_SOURCE,
+        "page.html": "{% for agent in agents %}{{ card(agent) }}{% endfor %}",
+    }
+    env = Environment(loader=DictLoader(templates), autoescape=True)
+
+    @pass_context
+    def card(ctx, agent):
+        return render_agent_card(ctx, agent, cache=cache)
+
+    env.globals["card"] = card
+    return env
+
+
+class TestCardVersion:
+
+    def test_changes_with_agent_data(self):
+        assert card_version({"id": 1, "state": "IDLE"}) != card_version({"id": 1, "state": "PROCESSING"})
+
+    def test_independent_of_key_order(self):
+        assert card_version({"id": 1, "a": 2}) == card_version({"a": 2, "id": 1})
+
+    def test_ignores_ticker_strings_when_timestamp_present(self):
+        base = {"id": 1, "last_seen_at": "2026-02-01T12:00:00+00:00", "started_at": "2026-02-01T10:00:00+00:00"}
+        assert card_version({**base, "last_seen": "<1m ago", "uptime": "up 2h"}) == card_version(
+            {**base, "last_seen": "1m ago", "uptime": "up 3h"}
+        )
+
+    def test_keeps_ticker_strings_without_timestamp(self):
+        assert card_version({"id": 1, "elapsed": "5m"}) != card_version({"id": 1, "elapsed": "6m"})
+
+    def test_includes_extra_context(self):
+        agent = {"id": 1}
+        assert card_version(agent, {"t": 65}) != card_version(agent, {"t": 75})
+
+
+class TestFragmentCache:
+
+    def test_render_miss_then_hit(self, env, cache):
+        page = env.get_template("page.html")
+        agents = [{"id": 1, "name": "a"}, {"id": 2, "name": "b"}]
+
+        first = page.render(agents=agents)
+        second = page.render(agents=agents)
+
+        assert first == second
+        assert 'data-agent-id="1">a</article>' in first
+        stats = cache.stats
+        assert stats["misses"] == 2
+        assert stats["hits"] == 2
+        assert stats["hit_rate"] == 0.5
+        assert stats["render_ms_saved"] >= 0
+
+    def test_changed_agent_rerenders_and_drops_old_version(self, env, cache):
+        page = env.get_template("page.html")
+        page.render(agents=[{"id": 1, "name": "before"}])
+        html = page.render(agents=[{"id": 1, "name": "after"}])
+
+        assert "after" in html
+        assert cache.stats["entries"] == 1
+
+    def test_context_thresholds_part_of_key(self, env, cache):
+        page = env.get_template("page.html")
+        agents = [{"id": 1, "name": "a"}]
+        assert "ctx=75" in page.render(agents=agents, context_thresholds={"high": 75})
+        assert "ctx=90" in page.render(agents=agents, context_thresholds={"high": 90})
+
+    def test_output_is_not_double_escaped(self, env):
+        html = env.get_template("page.html").render(agents=[{"id": 1, "name": "<b>"}])
+        assert "&lt;b&gt;" in html
+        assert "&amp;lt;" not in html
+
+    def test_lru_eviction_by_bytes(self):
+        cache = FragmentCache({"fragment_cache": {"max_bytes": 10}})
+        cache.put((1, "v", "t"), "x" * 6, 0.001)
+        cache.put((2, "v", "t"), "y" * 6, 0.001)
+
+        assert cache.get((1, "v", "t")) is None
+        assert cache.get((2, "v", "t")) == "y" * 6
+        assert cache.stats["evictions"] == 1
+        assert cache.stats["total_bytes"] == 6
+
+    def test_oversized_fragment_not_cached(self):
+        cache = FragmentCache({"fragment_cache": {"max_bytes": 4}})
+        cache.put((1, "v", "t"), "too long", 0.001)
+        assert cache.stats["entries"] == 0
+
+    def test_template_change_invalidates(self, cache):
+        loader = DictLoader({AGENT_CARD_TEMPLATE: "v1"})
+        env = Environment(loader=loader, auto_reload=True)
+        first = cache.template_hash(env, AGENT_CARD_TEMPLATE)
+        loader.mapping[AGENT_CARD_TEMPLATE] = "v2"
+        assert cache.template_hash(env, AGENT_CARD_TEMPLATE) != first
+
+    def test_disabled_bypasses_cache(self, env):
+        cache = FragmentCache({"fragment_cache": {"enabled": False}})
+        html = cache.render(env, AGENT_CARD_TEMPLATE, 1, "v", {"agent": {"id": 1, "name": "a"}})
+        assert "a</article>" in html
+        assert cache.stats["misses"] == 0
+
+    def test_render_without_cache(self, env):
+        @pass_context
+        def card(ctx, agent):
+            return render_agent_card(ctx, agent)
+
+        env.globals["card"] = card
+        html = env.get_template("page.html").render(agents=[{"id": 3, "name": "c"}])
+        assert 'data-agent-id="3"' in html
@@ -0,0 +1,174 @@
+"""Tests for multi-item batching of summarisation inference calls."""
+
+import json
+import re
+import threading
+from unittest.mock import MagicMock
+
+import pytest
+
+from claude_headspace.services.inference_batcher import InferenceBatcher, parse_batch_response
+from claude_headspace.services.openrouter_client import InferenceResult
+
+
+def _result(text, input_tokens=90, output_tokens=30):
+    return InferenceResult(
+        text=text, input_tokens=input_tokens, output_tokens=output_tokens,
+        model="m", latency_ms=100,
+    )
+
+
+@pytest.fixture
+def inference():
+    service = MagicMock()
+    service.is_available = True
+    service.get_model_for_level.return_value = "m"
+    service.cached_result.return_value = None
+    service.rate_limiter.priority_for.side_effect = lambda purpose: (
+        "interactive" if purpose == "summarise_permission" else "normal"
+    )
+    return service
+
+
+def _echo_batch(skip=()):
+    """Fake model answering every batched item with "answer-<prompt>"."""
+    def infer(**kwargs):
+        if kwargs["purpose"] != "summarise_batch":
+            return _result("individual")
+        items = re.findall(r'<item id="(\d+)">\n(.*?)\n</item>', kwargs["input_text"])
+        return _result(json.dumps({n: f"answer-{p}" for n, p in items if p not in skip}))
+    return infer
+
+
+def _batcher(inference, **batching):
+    return InferenceBatcher(inference, {"openrouter": {"batching": {"window_ms": 2000, **batching}}})
+
+
+def _concurrently(batcher, prompts, purpose="summarise_turn"):
+    results, errors = {}, []
+
+    def call(prompt):
+        try:
+            results[prompt] = batcher.infer(level="turn", purpose=purpose, input_text=prompt, turn_id=1)
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=call, args=(p,)) for p in prompts]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join(timeout=10)
+    return results, errors
+
+
+class TestParseBatchResponse:
+
+    def test_plain_and_fenced_json(self):
+        assert parse_batch_response('{"1": "Fix bug", "2": "Add tests"}', 2) == {1: "Fix bug", 2: "Add tests"}
+        assert parse_batch_response('```json\n{"1": "Fix bug"}\n```', 1) == {1: "Fix bug"}
+
+    def test_surrounding_prose_and_bad_keys(self):
+        text = 'Here you go:\n{"1": "Fix bug", "7": "out of range", "x": "junk", "2": ""}\nDone.'
+        assert parse_batch_response(text, 2) == {1: "Fix bug"}
+
+    def test_nested_json_answer_reserialised(self):
+        answers = parse_batch_response('{"1": {"summary": "Fix", "frustration_score": 2}}', 1)
+        assert json.loads(answers[1]) == {"summary": "Fix", "frustration_score": 2}
+
+    def test_unparseable(self):
+        assert parse_batch_response("Sorry, I can't do that", 2) == {}
+        assert parse_batch_response('["a", "b"]', 2) == {}
+
+
+class TestInferenceBatcher:
+
+    def test_concurrent_calls_share_one_request(self, inference):
+        batcher = _batcher(inference, max_items=3)
+        inference.infer.side_effect = _echo_batch()
+
+        results, errors = _concurrently(batcher, ["p1", "p2", "p3"])
+
+        assert not errors
+        inference.infer.assert_called_once()
+        call = inference.infer.call_args.kwargs
+        assert call["purpose"] == "summarise_batch"
+        assert call["record"] is False
+        assert {p: r.text for p, r in results.items()} == {p: f"answer-{p}" for p in ["p1", "p2", "p3"]}
+        assert results["p1"].input_tokens == 30
+        assert inference.cache.put.call_count == 3
+        assert batcher.stats["batches"] == 1
+        assert batcher.stats["batched_items"] == 3
+
+    def test_each_item_logged_as_its_own_call(self, inference):
+        batcher = _batcher(inference, max_items=2)
+        inference.infer.side_effect = _echo_batch()
+
+        results, errors = _concurrently(batcher, ["p1", "p2"])
+
+        assert not errors
+        logged = [c.kwargs for c in inference.log_call.call_args_list]
+        assert sorted(c["input_text"] for c in logged) == ["p1", "p2"]
+        for call in logged:
+            assert (call["purpose"], call["turn_id"], call["model"]) == ("summarise_turn", 1, "m")
+            assert call["result"].text == f"answer-{call['input_text']}"
+            assert call["result"].input_tokens == 45
+
+    def test_batch_takes_highest_item_priority(self, inference):
+        batcher = _batcher(inference, max_items=2)
+        inference.infer.side_effect = _echo_batch()
+        results = {}
+
+        def call(purpose, prompt):
+            results[prompt] = batcher.infer(level="turn", purpose=purpose, input_text=prompt)
+
+        threads = [
+            threading.Thread(target=call, args=("summarise_turn", "p1")),
+            threading.Thread(target=call, args=("summarise_permission", "p2")),
+        ]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join(timeout=10)
+
+        assert len(results) == 2
+        assert inference.infer.call_args.kwargs["priority"] == "interactive"
+
+    def test_missing_item_falls_back_to_individual_call(self, inference):
+        batcher = _batcher(inference, max_items=2)
+        inference.infer.side_effect = _echo_batch(skip={"p2"})
+
+        results, errors = _concurrently(batcher, ["p1", "p2"])
+
+        assert not errors
+        assert results["p1"].text == "answer-p1"
+        assert results["p2"].text == "individual"
+        fallback = inference.infer.call_args_list[-1].kwargs
+        assert (fallback["purpose"], fallback["input_text"]) == ("summarise_turn", "p2")
+        assert batcher.stats["fallbacks"] == 1
+
+    def test_single_call_sent_as_is_after_window(self, inference):
+        batcher = _batcher(inference, window_ms=10)
+        inference.infer.return_value = _result("solo")
+        assert batcher.infer(level="turn", purpose="summarise_turn", input_text="p1").text == "solo"
+        assert inference.infer.call_args.kwargs["purpose"] == "summarise_turn"
+        assert inference.infer.call_args.kwargs["cache_checked"] is True
+        inference.cached_result.assert_called_once()
+        assert batcher.stats["fallbacks"] == 0
+
+    def test_batch_error_raised_to_every_caller(self, inference):
+        batcher = _batcher(inference, max_items=2)
+        inference.infer.side_effect = RuntimeError("rate limited")
+        results, errors = _concurrently(batcher, ["p1", "p2"])
+        assert not results
+        assert len(errors) == 2
+        logged = [c.kwargs for c in inference.log_call.call_args_list]
+        assert [c["error_message"] for c in logged] == ["rate limited", "rate limited"]
+
+    def test_bypasses_for_other_purposes_and_cache_hits(self, inference):
+        batcher = _batcher(inference)
+        inference.infer.return_value = _result("direct")
+        batcher.infer(level="objective", purpose="priority_scoring", input_text="p")
+        inference.cached_result.return_value = _result("cached")
+        assert batcher.infer(level="turn", purpose="summarise_turn", input_text="p").text == "cached"
+        assert inference.infer.call_count == 1
+        assert batcher.stats["batches"] == 0
@@ -1,6 +1,8 @@
 """Unit tests for inference cache service."""
 
 import time
+from datetime import datetime, timedelta, timezone
+from unittest.mock import MagicMock
 
 import pytest
 
@@ -128,3 +130,96 @@ class TestCacheClear:
         cache.clear()
         assert cache.stats["size"] == 0
         assert cache.get("hash1") is None
+
+
+class TestCacheLRU:
+
+    def test_evicts_least_recently_used(self, cache_config):
+        cache = InferenceCache(cache_config, max_size=2)
+        cache.put("hash1", "a", 10, 5, "m")
+        cache.put("hash2", "b", 10, 5, "m")
+        cache.get("hash1")  # hash2 is now least recently used
+        cache.put("hash3", "c", 10, 5, "m")
+        assert cache.get("hash2") is None
+        assert cache.get("hash1") is not None
+        assert cache.get("hash3") is not None
+
+    def test_max_entries_from_config(self, cache_config):
+        cache_config["openrouter"]["cache"]["max_entries"] = 3
+        cache = InferenceCache(cache_config)
+        for i in range(10):
+            cache.put(f"hash{i}", "r", 10, 5, "m")
+        assert cache.stats["size"] == 3
+
+
+class TestPersistentTier:
+
+    @pytest.fixture
+    def session(self):
+        return MagicMock()
+
+    @pytest.fixture
+    def persistent_cache(self, session):
+        config = {
+            "openrouter": {
+                "cache": {
+                    "enabled": True,
+                    "ttl_seconds": 300,
+                    "persistent": True,
+                    "persistent_ttl_seconds": 3600,
+                    "purpose_ttl_seconds": {"priority_scoring": 0},
+                },
+            },
+        }
+        return InferenceCache(config, session_factory=lambda: session)
+
+    def _row(self, age_seconds=60):
+        row = MagicMock()
+        row.result_text = "stored summary"
+        row.input_tokens = 100
+        row.output_tokens = 20
+        row.timestamp = datetime.now(timezone.utc) - timedelta(seconds=age_seconds)
+        return row
+
+    def _first(self, session):
+        return session.query.return_value.filter.return_value.order_by.return_value.first
+
+    def test_miss_falls_back_to_logged_call_and_promotes(self, persistent_cache, session):
+        self._first(session).return_value = self._row()
+        entry = persistent_cache.get("hash1", purpose="summarise_turn", model="m")
+        assert entry.result_text == "stored summary"
+        assert entry.model == "m"
+        session.close.assert_called_once()
+
+        assert persistent_cache.get("hash1", purpose="summarise_turn", model="m") is entry
+        assert session.query.call_count == 1  # Second lookup served from memory
+        assert persistent_cache.stats["persistent_hits"] == 1
+
+    def test_promoted_entry_expires_with_database_ttl(self, persistent_cache, session):
+        self._first(session).return_value = self._row(age_seconds=3500)
+        entry = persistent_cache.get("hash1", purpose="summarise_turn", model="m")
+        assert entry.ttl_seconds <= 100
+
+    def test_no_row_is_a_miss(self, persistent_cache, session):
+        self._first(session).return_value = None
+        assert persistent_cache.get("hash1", purpose="summarise_turn", model="m") is None
+        assert persistent_cache.stats["misses"] == 1
+
+    def test_zero_purpose_ttl_skips_database(self, persistent_cache, session):
+        assert persistent_cache.ttl_for("priority_scoring") == 0
+        assert persistent_cache.ttl_for("summarise_turn") == 3600
+        assert persistent_cache.get("hash1", purpose="priority_scoring", model="m") is None
+        session.query.assert_not_called()
+
+    def test_lookup_without_purpose_skips_database(self, persistent_cache, session):
+        assert persistent_cache.get("hash1") is None
+        session.query.assert_not_called()
+
+    def test_database_error_is_a_miss(self, persistent_cache, session):
+        session.query.side_effect = Exception("connection lost")
+        assert persistent_cache.get("hash1", purpose="summarise_turn", model="m") is None
+        session.close.assert_called_once()
+
+    def test_requires_session_factory(self, cache_config):
+        cache_config["openrouter"]["cache"]["persistent"] = True
+        assert InferenceCache(cache_config).stats["persistent"] is False
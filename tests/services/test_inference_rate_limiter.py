@@ -1,6 +1,7 @@
 """Unit tests for inference rate limiter."""
 
 import threading
+import time
 
 import pytest
 
@@ -141,3 +142,92 @@ class TestThreadSafety:
         t2.join()
 
         assert len(errors) == 0
+
+
+@pytest.fixture
+def fast_limiter():
+    """10 calls/s refill, so waits in tests stay short."""
+    return InferenceRateLimiter({
+        "openrouter": {
+            "rate_limits": {
+                "calls_per_minute": 600,
+                "tokens_per_minute": 1_000_000,
+                "interactive_reserve": 0.1,
+            },
+        },
+    })
+
+
+def _exhaust(limiter):
+    limiter._calls.level = 0
+
+
+class TestAcquire:
+
+    def test_acquire_reserves_a_call(self, limiter):
+        assert limiter.acquire().allowed is True
+        limiter.record(100, reserved=True)
+        usage = limiter.current_usage
+        assert usage["calls_per_minute"]["current"] == 1
+        assert usage["tokens_per_minute"]["current"] == 100
+        assert usage["granted"]["normal"] == 1
+
+    def test_no_wait_by_default(self, limiter):
+        for _ in range(5):
+            limiter.record(10)
+        result = limiter.acquire()
+        assert result.allowed is False
+        assert "Calls per minute" in result.reason
+        assert limiter.current_usage["timed_out"]["normal"] == 1
+
+    def test_waits_for_refill(self, fast_limiter):
+        _exhaust(fast_limiter)
+        result = fast_limiter.acquire(timeout=2)
+        assert result.allowed is True
+        assert 0.05 < result.waited_seconds < 1
+
+    def test_deadline_expires(self, fast_limiter):
+        _exhaust(fast_limiter)
+        fast_limiter._calls.level = -100  # ~10s of debt
+        result = fast_limiter.acquire(timeout=0.05)
+        assert result.allowed is False
+        assert result.retry_after_seconds > 5
+
+    def test_background_leaves_interactive_reserve(self, fast_limiter):
+        fast_limiter._calls.level = 30  # Below 1 + 10% of 600
+        assert fast_limiter.acquire(priority="background", timeout=0).allowed is False
+        assert fast_limiter.acquire(priority="interactive", timeout=0).allowed is True
+
+    def test_priority_and_project_order(self, fast_limiter):
+        _exhaust(fast_limiter)
+        fast_limiter.interactive_reserve = 0
+        fast_limiter._calls.level = -2  # All waiters queue before the first grant
+        fast_limiter._last_grant[1] = next(fast_limiter._grants)  # Project 1 served recently
+        order, lock = [], threading.Lock()
+
+        def call(name, priority, project_id):
+            if fast_limiter.acquire(priority=priority, project_id=project_id, timeout=5).allowed:
+                with lock:
+                    order.append(name)
+
+        waiters = [
+            ("background", "background", 2),
+            ("normal-p1", "normal", 1),
+            ("normal-p2", "normal", 2),
+            ("interactive", "interactive", 1),
+        ]
+        threads = []
+        for args in waiters:
+            threads.append(threading.Thread(target=call, args=args))
+            threads[-1].start()
+            while len(fast_limiter._waiting) < len(threads):
+                time.sleep(0.001)
+        for t in threads:
+            t.join(timeout=10)
+
+        assert order == ["interactive", "normal-p2", "normal-p1", "background"]
+
+    def test_purpose_priority(self, limiter):
+        assert limiter.priority_for("summarise_permission") == "interactive"
+        assert limiter.priority_for("priority_scoring") == "background"
+        assert limiter.priority_for("summarise_turn") == "normal"
@@ -1,5 +1,7 @@
 """Unit tests for inference service."""
 
+import threading
+import time
 from unittest.mock import MagicMock, patch
 
 import pytest
@@ -141,6 +143,45 @@ class TestInference:
         assert result.text == "Fresh result"
         assert result.latency_ms == 0
 
+    def test_unrecorded_call_is_not_cached_or_logged(self, service):
+        mock_result = InferenceResult(
+            text="Batch result",
+            input_tokens=100,
+            output_tokens=50,
+            model="anthropic/claude-3-haiku",
+            latency_ms=250,
+        )
+
+        with patch.object(service.client, "chat_completion", return_value=mock_result), \
+                patch.object(service, "log_call") as mock_log, \
+                patch.object(service.rate_limiter, "acquire", wraps=service.rate_limiter.acquire) as mock_acquire:
+            result = service.infer(
+                level="turn", purpose="summarise_batch", input_text="batch input",
+                priority="interactive", record=False,
+            )
+
+        assert result.text == "Batch result"
+        mock_log.assert_not_called()
+        assert mock_acquire.call_args.kwargs["priority"] == "interactive"
+        assert service.cache.stats["size"] == 0
+
+    def test_cache_checked_skips_lookup(self, service):
+        mock_result = InferenceResult(
+            text="Fresh result",
+            input_tokens=100,
+            output_tokens=50,
+            model="anthropic/claude-3-haiku",
+            latency_ms=250,
+        )
+
+        assert service.cached_result(level="turn", purpose="summarise", input_text="new input") is None
+        with patch.object(service.client, "chat_completion", return_value=mock_result), \
+                patch.object(service.cache, "get", wraps=service.cache.get) as mock_get:
+            service.infer(level="turn", purpose="summarise", input_text="new input", cache_checked=True)
+
+        mock_get.assert_not_called()
+        assert service.cache.stats["misses"] == 1
+
     def test_rate_limit_raises(self, service):
         # Exhaust rate limits
         for _ in range(30):
@@ -158,6 +199,93 @@ class TestInference:
                 service.infer(level="turn", purpose="test", input_text="error input")
 
 
+class TestStreaming:
+
+    def test_on_token_passed_to_client(self, service):
+        mock_result = InferenceResult(
+            text="Streamed", input_tokens=10, output_tokens=2,
+            model="anthropic/claude-3-haiku", latency_ms=90, ttft_ms=40,
+        )
+        tokens = []
+        with patch.object(service.client, "chat_completion", return_value=mock_result) as mock_call:
+            service.infer(level="turn", purpose="summarise", input_text="stream me", on_token=tokens.append)
+        assert mock_call.call_args.kwargs["on_token"] == tokens.append
+
+        with patch.object(service.client, "chat_completion") as mock_call:
+            result = service.infer(level="turn", purpose="summarise", input_text="stream me", on_token=tokens.append)
+            mock_call.assert_not_called()
+        assert result.cached is True
+        assert tokens == ["Streamed"]  # Cache hit delivered in one piece
+
+    def test_status_includes_client_stats(self, service):
+        with patch.object(service.client, "check_connectivity", return_value=True):
+            status = service.get_status()
+        assert status["client"]["pool_size"] == 10
+        assert "connection_reuse_rate" in status["client"]
+
+
+class TestSingleFlight:
+
+    def _run_concurrently(self, service, chat_completion, count=3):
+        """Start one leader, then ``count - 1`` identical calls while it is in flight."""
+        results, errors = [], []
+
+        def call():
+            try:
+                results.append(service.infer(level="turn", purpose="summarise", input_text="same input"))
+            except Exception as e:
+                errors.append(e)
+
+        with patch.object(service.client, "chat_completion", side_effect=chat_completion) as mock_call:
+            threads = [threading.Thread(target=call) for _ in range(count)]
+            threads[0].start()
+            self.started.wait(timeout=5)
+            for t in threads[1:]:
+                t.start()
+            while service.coalescing_stats["coalesced"] < count - 1:
+                time.sleep(0.001)
+            self.release.set()
+            for t in threads:
+                t.join(timeout=5)
+        return mock_call, results, errors
+
+    @pytest.fixture(autouse=True)
+    def events(self):
+        self.started, self.release = threading.Event(), threading.Event()
+
+    def _blocking(self, outcome):
+        def chat_completion(**kwargs):
+            self.started.set()
+            self.release.wait(timeout=5)
+            if isinstance(outcome, Exception):
+                raise outcome
+            return outcome
+        return chat_completion
+
+    def test_concurrent_identical_calls_share_one_request(self, service):
+        mock_result = InferenceResult(
+            text="Shared", input_tokens=100, output_tokens=50,
+            model="anthropic/claude-3-haiku", latency_ms=250,
+        )
+        mock_call, results, errors = self._run_concurrently(service, self._blocking(mock_result))
+
+        assert not errors
+        assert mock_call.call_count == 1
+        assert [r.text for r in results] == ["Shared"] * 3
+        assert sorted(r.cached for r in results) == [False, True, True]
+        assert service.rate_limiter.current_usage["calls_per_minute"]["current"] == 1
+        assert service.get_status()["coalescing"] == {"in_flight": 0, "coalesced": 2}
+
+    def test_leader_error_propagates_to_waiters(self, service):
+        error = OpenRouterClientError("API failed", status_code=500, retryable=True)
+        mock_call, results, errors = self._run_concurrently(service, self._blocking(error))
+
+        assert mock_call.call_count == 1
+        assert not results
+        assert errors == [error] * 3
+        assert service.coalescing_stats["in_flight"] == 0
+
+
 class TestCostCalculation:
 
     def test_haiku_cost(self, service):
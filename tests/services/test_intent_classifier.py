@@ -0,0 +1,225 @@
+"""Tests for the local intent classifier."""
+
+import json
+from unittest.mock import MagicMock
+
+import pytest
+
+from claude_headspace.models.turn import TurnIntent
+from claude_headspace.services import intent_detector
+from claude_headspace.services.intent_classifier import (
+    MODEL_FORMAT_VERSION,
+    IntentClassifier,
+    compare,
+    configure_intent_classifier,
+    features,
+    has_trusted_label,
+    split_holdout,
+    train_classifier,
+)
+from claude_headspace.services.intent_detector import detect_agent_intent
+from claude_headspace.services.intent_evaluation import CorpusEntry, label_source, write_corpus
+from claude_headspace.services.openrouter_client import OpenRouterClient
+from claude_headspace.services.prompt_registry import build_prompt
+
+# None of these match an intent pattern
+QUESTIONS = [
+    "Two routes here: rewrite the parser or patch the tokenizer, your call",
+    "Not sure which config you meant, the dev one or the prod one",
+    "I can take either route, the tradeoff is speed versus clarity",
+]
+PROGRESS = [
+    "Now reading the migrations folder",
+    "Checking how the handler wires up the queue",
+    "Looking at the failing fixture next",
+]
+
+
+def _corpus(n=300):
+    entries = []
+    for i in range(n):
+        texts, label = (QUESTIONS, "question") if i % 2 else (PROGRESS, "progress")
+        entries.append(CorpusEntry(i, "agent", label, f"{texts[i % 3]} ({i})", label_source="inference"))
+    return entries
+
+
+@pytest.fixture(scope="module")
+def trained():
+    classifier, report = train_classifier(_corpus(), holdout=0.2, epochs=5)
+    return classifier, report
+
+
+class TestFeatures:
+
+    def test_normalised_and_stable(self):
+        a = features("Should we keep going?")
+        assert a == features("Should we keep going?")
+        assert sum(v * v for v in a.values()) == pytest.approx(1.0)
+
+    def test_question_mark_feature(self):
+        assert len(features("keep going?")) > len(features("keep going"))
+
+    def test_empty_text(self):
+        assert features("") == {}
+
+
+class TestIntentClassifier:
+
+    def test_learns_separable_intents(self, trained):
+        classifier, report = trained
+        assert classifier.labels == ["progress", "question"]
+        result = classifier.classify("Not sure which config you meant, the dev one")
+        assert result.intent == TurnIntent.QUESTION
+        assert result.confidence > 0.8
+        assert result.matched_pattern == f"classifier:{classifier.version}"
+        assert report.total == classifier.metadata["holdout_examples"]
+        assert report.misses == report.total
+        assert report.miss_confident_correct == report.miss_confident > 0
+
+    def test_save_load_round_trip(self, trained, tmp_path):
+        classifier, _ = trained
+        path = tmp_path / "models" / "intent.json"
+        classifier.save(path)
+        loaded = IntentClassifier.load(path)
+        assert loaded.version == classifier.version
+        assert loaded.metadata["train_examples"] == classifier.metadata["train_examples"]
+        text = "Checking how the handler wires up the queue"
+        assert loaded.classify(text).intent == classifier.classify(text).intent
+
+    def test_rejects_other_format_version(self, tmp_path):
+        path = tmp_path / "intent.json"
+        path.write_text(json.dumps({"format_version": MODEL_FORMAT_VERSION + 1}))
+        with pytest.raises(ValueError):
+            IntentClassifier.load(path)
+
+    def test_rejects_single_label_model(self, tmp_path):
+        path = tmp_path / "intent.json"
+        path.write_text(json.dumps({
+            "format_version": MODEL_FORMAT_VERSION, "labels": ["completion"],
+            "buckets": 16, "bias": [0.0], "weights": {},
+        }))
+        with pytest.raises(ValueError):
+            IntentClassifier.load(path)
+        with pytest.raises(ValueError):
+            IntentClassifier(labels=["completion"]).save(tmp_path / "out.json")
+        assert not (tmp_path / "out.json").exists()
+
+    def test_rejects_unknown_labels(self, tmp_path):
+        path = tmp_path / "intent.json"
+        path.write_text(json.dumps({
+            "format_version": MODEL_FORMAT_VERSION, "labels": ["maybe"],
+            "buckets": 16, "bias": [0.0], "weights": {},
+        }))
+        with pytest.raises(ValueError):
+            IntentClassifier.load(path)
+
+
+class TestSplitAndCompare:
+
+    def test_split_is_deterministic(self):
+        entries = _corpus(100)
+        assert split_holdout(entries, 0.3) == split_holdout(entries, 0.3)
+        train, holdout = split_holdout(entries, 0.3)
+        assert len(train) + len(holdout) == 100
+        assert 10 < len(holdout) < 50
+
+    def test_regex_matches_are_not_counted_as_misses(self, trained):
+        classifier, _ = trained
+        entries = [
+            CorpusEntry(1, "agent", "completion", "All 12 tests pass."),
+            CorpusEntry(2, "agent", "question", QUESTIONS[0]),
+        ]
+        report = compare(classifier, entries, min_confidence=0.8)
+        assert (report.total, report.regex_matched, report.regex_correct, report.misses) == (2, 1, 1, 1)
+        assert "LLM calls avoided" in report.format()
+
+
+class TestTrustedLabels:
+
+    def test_label_source(self):
+        logged = {OpenRouterClient.compute_input_hash(
+            build_prompt("completion_classification", tail=QUESTIONS[0]))}
+        assert label_source("All 12 tests pass.", logged) == "pattern"
+        assert label_source(QUESTIONS[0], logged) == "inference"
+        assert label_source(PROGRESS[0], logged) == "unverified"
+
+    def test_legacy_entries_drop_only_unmatched_progress(self):
+        assert not has_trusted_label(CorpusEntry(1, "agent", "progress", PROGRESS[0]))
+        assert has_trusted_label(CorpusEntry(2, "agent", "question", QUESTIONS[0]))
+        assert has_trusted_label(CorpusEntry(3, "agent", "completion", "All 12 tests pass."))
+
+    def test_training_needs_two_sufficient_classes(self):
+        one_label = [e for e in _corpus(100) if e.intent == "question"]
+        with pytest.raises(ValueError):
+            train_classifier(one_label, holdout=0.2, epochs=1)
+
+    def test_sparse_class_left_out(self):
+        sparse = [CorpusEntry(2000 + i, "agent", "end_of_task", f"Wrapped up {i}", label_source="inference")
+                  for i in range(3)]
+        classifier, _ = train_classifier(_corpus(100) + sparse, holdout=0.2, epochs=1)
+        assert classifier.labels == ["progress", "question"]
+
+    def test_training_excludes_unverified_labels(self):
+        unverified = [
+            CorpusEntry(1000 + i, "agent", "progress", f"{QUESTIONS[i % 3]} [{i}]", label_source="unverified")
+            for i in range(100)
+        ]
+        classifier, report = train_classifier(_corpus(100) + unverified, holdout=0.2, epochs=2)
+        assert classifier.metadata["untrusted_excluded"] == 100
+        assert classifier.metadata["train_examples"] + report.total == 100
+
+
+class TestDetectorIntegration:
+
+    def _service(self):
+        service = MagicMock()
+        service.is_available = True
+        service.infer.return_value = MagicMock(text="B")
+        return service
+
+    def test_confident_prediction_skips_llm(self, trained):
+        classifier, _ = trained
+        intent_detector.set_local_classifier(classifier, 0.8)
+        service = self._service()
+        result = detect_agent_intent(QUESTIONS[1], inference_service=service)
+        assert result.intent == TurnIntent.QUESTION
+        assert result.matched_pattern.startswith("classifier:")
+        service.infer.assert_not_called()
+
+    def test_low_confidence_escalates_to_llm(self, trained):
+        classifier, _ = trained
+        intent_detector.set_local_classifier(classifier, 1.01)
+        service = self._service()
+        result = detect_agent_intent(QUESTIONS[1], inference_service=service)
+        assert result.intent == TurnIntent.PROGRESS
+        service.infer.assert_called_once()
+
+    def test_patterns_still_take_precedence(self, trained):
+        classifier, _ = trained
+        intent_detector.set_local_classifier(classifier, 0.0)
+        assert detect_agent_intent("All 12 tests pass.").matched_pattern.startswith("(?i)")
+
+
+class TestConfigure:
+
+    def test_missing_model_leaves_no_classifier(self, tmp_path):
+        config = {"intent_classifier": {"model_path": str(tmp_path / "none.json")}}
+        assert configure_intent_classifier(config) is None
+        assert intent_detector._local_classifier is None
+
+    def test_loads_model(self, trained, tmp_path):
+        classifier, _ = trained
+        path = tmp_path / "intent.json"
+        classifier.save(path)
+        config = {"intent_classifier": {"model_path": str(path), "min_confidence": 0.9}}
+        loaded = configure_intent_classifier(config)
+        assert loaded.version == classifier.version
+        assert intent_detector._local_min_confidence == 0.9
+
+    def test_disabled(self, trained, tmp_path):
+        classifier, _ = trained
+        path = tmp_path / "intent.json"
+        classifier.save(path)
+        config = {"intent_classifier": {"model_path": str(path), "enabled": False}}
+        assert configure_intent_classifier(config) is None
+
@@ -4,7 +4,7 @@ import pytest
 
 from claude_headspace.models.task import TaskState
 from claude_headspace.models.turn import TurnActor, TurnIntent
-from unittest.mock import MagicMock
+from unittest.mock import MagicMock, patch
 
 from claude_headspace.services.intent_detector import (
     BARE_AFFIRMATIVES,
@@ -17,17 +17,22 @@ from claude_headspace.services.intent_detector import (
     END_OF_TASK_SUMMARY_PATTERNS,
     PLAN_APPROVAL_PATTERN,
     QUESTION_PATTERNS,
+    DETECTOR_VERSION,
+    IntentCache,
     IntentResult,
+    PatternSet,
     _detect_completion_opener,
     _detect_end_of_task,
     _detect_trailing_question,
     _extract_tail,
     _infer_completion_classification,
     _is_confirmation,
+    _match_patterns,
     _strip_code_blocks,
     detect_agent_intent,
     detect_intent,
     detect_user_intent,
+    intent_cache,
 )
 
 
@@ -1984,3 +1989,141 @@ class TestTaskCompleteMarkerInFullResponse:
             f"Expected COMPLETION but got {result.intent.value} "
             f"(pattern={result.matched_pattern})"
         )
+
+
+class TestPatternSet:
+    """PatternSet must pick the same pattern as trying each with re.search."""
+
+    ALL_PATTERN_LISTS = [
+        QUESTION_PATTERNS,
+        BLOCKED_PATTERNS,
+        COMPLETION_PATTERNS,
+        COMPLETION_OPENER_PATTERNS,
+        END_OF_TASK_SUMMARY_PATTERNS,
+        END_OF_TASK_SOFT_CLOSE_PATTERNS,
+        END_OF_TASK_HANDOFF_PATTERNS,
+        CONTINUATION_PATTERNS,
+    ]
+
+    SAMPLES = [
+        "",
+        "Reading the file now.",
+        "Would you like me to also update the docs?",
+        "All 12 tests pass.\nShould I continue?",
+        "Error: database is locked",
+        "TASK COMPLETE \u2014 done",
+        "Here's a summary of what was done:\n- fixed it\nLet me know if there's anything else.",
+        "Next I'll wire up the route. TODO: tests",
+        "\u273b Cooked for 1m 33s",
+        "Done. The fix is deployed.",
+        "PRD created at docs/prd.md",
+        "WOULD YOU LIKE ME TO PROCEED?",
+        # Non-ASCII characters IGNORECASE matches as ASCII letters
+        "\u017fhould I proceed",
+        "Ta\u017fk complete",
+        "I w\u0131ll do it. Now \u0130 need to check",
+        "\u212aeep working on it",
+    ]
+
+    @staticmethod
+    def _naive(text, patterns):
+        import re
+
+        for pattern in patterns:
+            if re.search(pattern, text):
+                return pattern
+        return None
+
+    @pytest.mark.parametrize("text", SAMPLES)
+    def test_matches_sequential_search(self, text):
+        for patterns in self.ALL_PATTERN_LISTS:
+            assert PatternSet(patterns).search(text) == self._naive(text, patterns)
+
+    def test_first_pattern_in_list_order_wins(self):
+        # The later pattern matches earlier in the text
+        patterns = [r"(?i)world", r"hello"]
+        assert PatternSet(patterns).search("hello world") == r"(?i)world"
+
+    def test_pattern_without_literals_always_runs(self):
+        ps = PatternSet([r"\d+"])
+        assert ps._literals == (None,)
+        assert ps.search("abc 42") == r"\d+"
+
+    def test_literals_prefilter(self):
+        ps = PatternSet([r"(?i)\bplease (?:respond|reply)\b"])
+        (literals,) = ps._literals
+        assert all(lit.startswith("please ") for lit in literals)
+        assert ps.search("no match here") is None
+
+    def test_match_patterns_uses_cached_sets(self):
+        assert _match_patterns("All 3 tests pass", COMPLETION_PATTERNS) is not None
+        assert _match_patterns("nothing", COMPLETION_PATTERNS) is None
+
+
+class TestIntentCache:
+    """Agent intent results are shared across callers for the same text."""
+
+    AMBIGUOUS = "The error occurs because the database connection times out after 30 seconds."
+
+    def _service(self, letter="A"):
+        service = MagicMock()
+        service.is_available = True
+        service.infer.return_value = MagicMock(text=letter)
+        return service
+
+    def test_pattern_result_cached(self):
+        from claude_headspace.services import intent_detector
+
+        hits = intent_cache.stats["hits"]
+        with patch.object(
+            intent_detector, "_detect_by_patterns", wraps=intent_detector._detect_by_patterns
+        ) as detect:
+            first = detect_agent_intent("All 3 tests pass.")
+            second = detect_agent_intent("All 3 tests pass.")
+        assert detect.call_count == 1
+        assert first == second
+        assert intent_cache.stats["hits"] == hits + 1
+
+    def test_key_ignores_code_blocks(self):
+        assert IntentCache.key("Done.")[0] == DETECTOR_VERSION
+        detect_agent_intent("Done.\n```py\nx = 1\n```")
+        hits = intent_cache.stats["hits"]
+        detect_agent_intent("Done.\n```sh\nls\n```")
+        assert intent_cache.stats["hits"] == hits + 1
+
+    def test_cached_results_are_copies(self):
+        result = detect_agent_intent("All 3 tests pass.")
+        result.confidence = 0.0
+        assert detect_agent_intent("All 3 tests pass.").confidence == 1.0
+
+    def test_inference_result_cached(self):
+        service = self._service()
+        assert detect_agent_intent(self.AMBIGUOUS, inference_service=service).intent == TurnIntent.END_OF_TASK
+        assert detect_agent_intent(self.AMBIGUOUS, inference_service=service).intent == TurnIntent.END_OF_TASK
+        assert service.infer.call_count == 1
+
+    def test_regex_miss_without_service_still_allows_fallback_later(self):
+        assert detect_agent_intent(self.AMBIGUOUS).intent == TurnIntent.PROGRESS
+        service = self._service()
+        assert detect_agent_intent(self.AMBIGUOUS, inference_service=service).intent == TurnIntent.END_OF_TASK
+        service.infer.assert_called_once()
+
+    def test_inference_result_expires(self):
+        cache = IntentCache(inference_ttl_seconds=0)
+        key = IntentCache.key("x")
+        cache.put_inferred(key, IntentResult(TurnIntent.QUESTION, 0.85))
+        assert cache.get_inferred(key) is None
+
+    def test_lru_bound(self):
+        cache = IntentCache(max_entries=2)
+        for text in ("a", "b", "c"):
+            cache.put(IntentCache.key(text), None)
+        assert cache.get(IntentCache.key("a")) is not None  # Evicted: sentinel returned
+        assert cache.get(IntentCache.key("c")) is None  # Cached "no pattern matched"
+        assert cache.stats["size"] == 2
+
+    def test_disabled(self):
+        cache = IntentCache()
+        cache.configure({"intent_cache": {"enabled": False}})
+        cache.put(IntentCache.key("a"), IntentResult(TurnIntent.QUESTION, 1.0))
+        assert cache.stats["size"] == 0
@@ -0,0 +1,154 @@
+"""Tests for the intent corpus and evaluation harness."""
+
+import json
+from unittest.mock import MagicMock
+
+from claude_headspace.models.task import TaskState
+from claude_headspace.models.turn import TurnActor, TurnIntent
+from claude_headspace.services.intent_evaluation import (
+    CorpusEntry,
+    EvaluationReport,
+    adversarial_inputs,
+    evaluate,
+    export_corpus,
+    find_pathological,
+    profile_patterns,
+    read_corpus,
+    state_before,
+    write_corpus,
+)
+
+
+def _turn(id, task_id, actor, intent, text):
+    turn = MagicMock()
+    turn.id, turn.task_id, turn.actor, turn.intent, turn.text = id, task_id, actor, intent, text
+    return turn
+
+
+class TestStateBefore:
+
+    def test_first_turn_of_task(self):
+        assert state_before(None) == TaskState.IDLE
+
+    def test_after_agent_question(self):
+        assert state_before((TurnActor.AGENT, TurnIntent.QUESTION)) == TaskState.AWAITING_INPUT
+
+    def test_after_completion(self):
+        assert state_before((TurnActor.AGENT, TurnIntent.END_OF_TASK)) == TaskState.COMPLETE
+
+    def test_after_progress(self):
+        assert state_before((TurnActor.AGENT, TurnIntent.PROGRESS)) == TaskState.PROCESSING
+
+
+class TestCorpus:
+
+    def _session(self, turns):
+        session = MagicMock()
+        session.query.return_value.order_by.return_value.yield_per.return_value = turns
+        return session
+
+    def test_export_reconstructs_state_per_task(self):
+        turns = [
+            _turn(1, 10, TurnActor.USER, TurnIntent.COMMAND, "fix it"),
+            _turn(2, 10, TurnActor.AGENT, TurnIntent.QUESTION, "Which file?"),
+            _turn(3, 10, TurnActor.USER, TurnIntent.ANSWER, "app.py"),
+            _turn(4, 11, TurnActor.USER, TurnIntent.COMMAND, "next"),
+        ]
+        entries = list(export_corpus(self._session(turns)))
+        assert [e.state for e in entries] == ["idle", "processing", "awaiting_input", "idle"]
+        assert entries[2].intent == "answer"
+
+    def test_export_actor_filter_and_limit(self):
+        turns = [
+            _turn(1, 10, TurnActor.USER, TurnIntent.COMMAND, "fix it"),
+            _turn(2, 10, TurnActor.AGENT, TurnIntent.QUESTION, "Which file?"),
+            _turn(3, 10, TurnActor.USER, TurnIntent.ANSWER, "app.py"),
+            _turn(4, 10, TurnActor.AGENT, TurnIntent.COMPLETION, ""),
+        ]
+        entries = list(export_corpus(self._session(turns), actor=TurnActor.USER, limit=1))
+        assert [e.turn_id for e in entries] == [1]
+        agents = list(export_corpus(self._session(turns), actor=TurnActor.AGENT))
+        assert [e.turn_id for e in agents] == [2]  # Empty text skipped
+
+    def test_round_trip(self, tmp_path):
+        path = tmp_path / "corpus.jsonl"
+        entries = [CorpusEntry(1, "agent", "question", "Should I — proceed?", "processing")]
+        assert write_corpus(entries, path) == 1
+        with open(path, "a") as f:
+            f.write("\nnot json\n" + json.dumps({"actor": "agent"}) + "\n")
+        assert read_corpus(path) == entries
+
+
+class TestEvaluate:
+
+    def test_accuracy_confusion_and_pattern_hits(self):
+        entries = [
+            CorpusEntry(1, "agent", "question", "Would you like me to continue?"),
+            CorpusEntry(2, "agent", "completion", "Would you like me to continue?"),
+            CorpusEntry(3, "agent", "progress", "Reading the file now"),
+            CorpusEntry(4, "user", "answer", "yes", "awaiting_input"),
+            CorpusEntry(5, "user", "command", "do it", "processing"),
+        ]
+        reports = evaluate(entries)
+        agent, user = reports["agent"], reports["user"]
+
+        assert agent.total == 2
+        assert agent.correct == 1
+        assert agent.excluded == 1  # Unmatched PROGRESS is the detector's default
+        assert agent.confusion["completion"]["question"] == 1
+        (stats,) = agent.pattern_hits.values()
+        assert (stats.hits, stats.correct) == (2, 1)
+
+        assert user.total == 2
+        assert user.confusion["command"]["answer"] == 1  # Confirmation while PROCESSING
+
+    def test_scores_by_label_source(self):
+        entries = [
+            CorpusEntry(1, "agent", "question", "Would you like me to continue?", label_source="pattern"),
+            CorpusEntry(2, "agent", "question", "Two routes, your call", label_source="inference"),
+            CorpusEntry(3, "agent", "progress", "Reading the file now", label_source="unverified"),
+        ]
+        agent = evaluate(entries)["agent"]
+
+        assert (agent.total, agent.excluded) == (2, 1)
+        assert agent.by_source == {"pattern": [1, 1], "inference": [1, 0]}
+        text = agent.format()
+        assert "1 unverified labels not scored" in text
+        assert "pattern 1/1 (100.0%, by construction)" in text
+
+    def test_format_and_dict(self):
+        report = EvaluationReport("detect_agent_intent")
+        report.add("question", "question", "p1")
+        report.add("progress", "question", "p1")
+        text = report.format()
+        assert "1/2 correct (50.0%)" in text
+        assert "p1" in text
+        assert report.to_dict()["confusion"] == {"question": {"question": 1}, "progress": {"question": 1}}
+
+    def test_empty_report(self):
+        assert "no entries" in EvaluationReport("x").format()
+
+
+class TestPatternCost:
+
+    def test_profile_covers_every_pattern(self):
+        timings = profile_patterns(["Would you like me to proceed?", "All 3 tests pass"])
+        assert len(timings) > 50
+        assert timings == sorted(timings, key=lambda t: -t.seconds)
+        assert any(t.matches for t in timings)
+
+    def test_adversarial_inputs_repeat_required_literals(self):
+        builders = adversarial_inputs(r"(?i)please (?:respond|reply)")
+        literal_builders = [name for name in builders if name.startswith("repeat")]
+        assert literal_builders
+        text = builders[literal_builders[0]](100)
+        assert len(text) == 100
+
+    def test_flags_quadratic_pattern(self):
+        lists = {
+            "QUADRATIC": [r"(?i)would you like[\s\S]*\?\s*$"],
+            "LINEAR": [r"(?i)would you like"],
+        }
+        findings = find_pathological(small=2_000, large=8_000, min_seconds=0, pattern_lists=lists)
+        assert [f.list_name for f in findings] == ["QUADRATIC"]
+        assert findings[0].growth > 8
@@ -0,0 +1,119 @@
+"""Tests for selective transcript line decoding."""
+
+import json
+
+from claude_headspace.services import jsonl_decode
+from claude_headspace.services.jsonl_decode import (
+    is_user_content_list,
+    may_have_text,
+    peek_type,
+)
+from claude_headspace.services.transcript_tailer import (
+    SKIPPED,
+    LazyTranscriptEntry,
+    parse_transcript_line,
+)
+
+
+def compact(data: dict) -> bytes:
+    return json.dumps(data, separators=(",", ":")).encode()
+
+
+def tool_result_line(size: int = 10000) -> bytes:
+    return compact({
+        "parentUuid": "p",
+        "cwd": "/work",
+        "type": "user",
+        "message": {"role": "user", "content": [
+            {"tool_use_id": "t1", "type": "tool_result", "content": "x" * size},
+        ]},
+        "timestamp": "2026-01-29T10:00:00Z",
+    })
+
+
+def tool_use_line(size: int = 10000) -> bytes:
+    return compact({
+        "parentUuid": "p",
+        "message": {"id": "m", "type": "message", "role": "assistant", "content": [
+            {"type": "tool_use", "name": "Bash", "input": {"command": "y" * size}},
+        ]},
+        "type": "assistant",
+        "timestamp": "2026-01-29T10:00:00Z",
+    })
+
+
+class TestPeekType:
+
+    def test_leading_type(self):
+        assert peek_type(tool_result_line()) == "user"
+
+    def test_trailing_type_after_message(self):
+        assert peek_type(tool_use_line()) == "assistant"
+
+    def test_spaced_json(self):
+        assert peek_type(json.dumps({"type": "progress", "data": {}}).encode()) == "progress"
+
+    def test_nested_only_is_unknown(self):
+        raw = compact({"message": {"type": "message"}, "x": [1], "uuid": "u"})
+        assert peek_type(raw) is None
+
+    def test_brace_in_leading_string_is_unknown(self):
+        raw = compact({"cwd": "/a{b", "message": {"type": "message"}, "x": [1]})
+        assert peek_type(raw) is None
+
+
+class TestTextProbes:
+
+    def test_may_have_text(self):
+        assert may_have_text(compact({"content": [{"type": "text", "text": "hi"}]}))
+        assert not may_have_text(tool_result_line())
+
+    def test_escaped_text_is_not_a_block(self):
+        raw = compact({"content": 'a "text" b'})
+        assert not may_have_text(raw)
+
+    def test_is_user_content_list(self):
+        assert is_user_content_list(tool_result_line())
+        assert not is_user_content_list(
+            compact({"type": "user", "message": {"role": "user", "content": "typed"}})
+        )
+
+
+class TestParseTranscriptLine:
+
+    def test_non_message_record_skipped(self):
+        assert parse_transcript_line(compact({"type": "progress", "data": "z" * 10})) is SKIPPED
+
+    def test_large_tool_result_is_lazy(self):
+        raw = tool_result_line()
+        entry = parse_transcript_line(raw)
+        assert isinstance(entry, LazyTranscriptEntry)
+        assert (entry.type, entry.role, entry.content) == ("user", "user", None)
+        assert entry.timestamp.year == 2026
+        assert entry.raw_data == jsonl_decode.loads(raw)
+
+    def test_large_tool_use_is_lazy(self):
+        entry = parse_transcript_line(tool_use_line())
+        assert isinstance(entry, LazyTranscriptEntry)
+        assert entry.role == "assistant"
+        assert entry.content is None
+
+    def test_large_line_with_text_is_decoded(self):
+        raw = compact({
+            "type": "assistant",
+            "message": {"role": "assistant", "content": [
+                {"type": "tool_use", "input": {"q": "y" * 10000}},
+                {"type": "text", "text": "done"},
+            ]},
+        })
+        entry = parse_transcript_line(raw)
+        assert not isinstance(entry, LazyTranscriptEntry)
+        assert entry.content == "done"
+
+    def test_small_lines_decoded_eagerly(self):
+        entry = parse_transcript_line(tool_result_line(size=10))
+        assert not isinstance(entry, LazyTranscriptEntry)
+        assert entry.role == "user"
+
+    def test_partial_line_never_skipped(self):
+        assert parse_transcript_line(b'{"type":"progress"', complete=False) is None
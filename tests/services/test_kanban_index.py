@@ -0,0 +1,146 @@
+"""Tests for the incrementally maintained Kanban index."""
+
+from datetime import datetime, timedelta, timezone
+from unittest.mock import MagicMock
+
+import pytest
+
+from src.claude_headspace.models import TaskState
+from src.claude_headspace.services.kanban_index import (
+    KanbanIndex,
+    flags_from_counts,
+    kanban_column,
+    status_bucket,
+)
+
+
+def make_agent(agent_id, project_id=1, state=TaskState.IDLE, has_task=False,
+               minutes_ago=0, ended=False):
+    agent = MagicMock()
+    agent.id = agent_id
+    agent.project_id = project_id
+    agent.state = state
+    agent.tasks = []
+    agent.last_seen_at = datetime.now(timezone.utc) - timedelta(minutes=minutes_ago)
+    agent.ended_at = datetime.now(timezone.utc) if ended else None
+    agent.get_current_task.return_value = MagicMock() if has_task else None
+    return agent
+
+
+@pytest.fixture
+def index():
+    return KanbanIndex()
+
+
+class TestMappings:
+
+    def test_status_bucket(self):
+        assert status_bucket("TIMED_OUT") == "timed_out"
+        assert status_bucket(TaskState.AWAITING_INPUT) == "input_needed"
+        assert status_bucket(TaskState.COMMANDED) == "working"
+        assert status_bucket(TaskState.PROCESSING) == "working"
+        assert status_bucket(TaskState.COMPLETE) == "idle"
+
+    def test_kanban_column(self):
+        assert kanban_column("PROCESSING", has_current_task=False) == "IDLE"
+        assert kanban_column("COMPLETE", has_current_task=True) == "IDLE"
+        assert kanban_column("COMMANDED", has_current_task=True) == "PROCESSING"
+        assert kanban_column("TIMED_OUT", has_current_task=True) == "PROCESSING"
+        assert kanban_column("AWAITING_INPUT", has_current_task=True) == "AWAITING_INPUT"
+
+    def test_flags_from_counts(self):
+        flags = flags_from_counts({"timed_out": 0, "input_needed": 2, "working": 0, "idle": 1})
+        assert flags == {
+            "has_timed_out": False,
+            "has_input_needed": True,
+            "has_working": False,
+            "has_idle": True,
+        }
+
+
+class TestKanbanIndex:
+
+    def test_reconcile_counts_and_columns(self, index):
+        index.reconcile([
+            make_agent(1, 1, TaskState.PROCESSING, has_task=True),
+            make_agent(2, 1, TaskState.AWAITING_INPUT, has_task=True),
+            make_agent(3, 2, TaskState.IDLE),
+        ])
+
+        assert index.status_counts() == {
+            "timed_out": 0, "input_needed": 1, "working": 1, "idle": 1,
+        }
+        assert index.project_flags(1)["has_working"] is True
+        assert index.project_flags(2) == {
+            "has_timed_out": False, "has_input_needed": False,
+            "has_working": False, "has_idle": True,
+        }
+        assert index.project_columns(1)["PROCESSING"] == [1]
+        assert index.column_of(2) == "AWAITING_INPUT"
+        assert index.is_warm
+
+    def test_sync_only_touches_changed_project(self, index):
+        index.reconcile([
+            make_agent(1, 1, TaskState.PROCESSING, has_task=True),
+            make_agent(2, 2, TaskState.IDLE),
+        ])
+
+        assert index.sync_agent(make_agent(1, 1, TaskState.AWAITING_INPUT, has_task=True)) == (1,)
+        assert index.column_of(1) == "AWAITING_INPUT"
+        assert index.project_counts(1)["input_needed"] == 1
+        assert index.project_counts(1)["working"] == 0
+        assert index.project_counts(2)["idle"] == 1
+
+    def test_sync_unchanged_returns_nothing(self, index):
+        index.reconcile([make_agent(1)])
+        assert index.sync_agent(make_agent(1)) == ()
+
+    def test_sync_ended_agent_removes(self, index):
+        index.reconcile([make_agent(1, 5)])
+        assert index.sync_agent(make_agent(1, 5, ended=True)) == (5,)
+        assert index.status_counts()["idle"] == 0
+        assert index.stats["projects"] == 0
+
+    def test_sync_project_move_reports_both_projects(self, index):
+        index.reconcile([make_agent(1, 1), make_agent(2, 1)])
+        assert index.sync_agent(make_agent(1, 2)) == (1, 2)
+        assert index.project_columns(1)["IDLE"] == [2]
+        assert index.project_columns(2)["IDLE"] == [1]
+
+    def test_refresh_replaces_only_drifted_agents(self, index):
+        agents = [make_agent(1, 1, TaskState.PROCESSING, has_task=True), make_agent(2, 1)]
+        assert index.refresh(agents, {1: "PROCESSING", 2: "IDLE"}) == 2  # Cold
+        updates = index.stats["updates"]
+
+        assert index.refresh(agents, {1: "PROCESSING", 2: "IDLE"}) == 0
+        assert index.stats["updates"] == updates
+
+        agents[0].last_seen_at = datetime.now(timezone.utc) - timedelta(hours=2)
+        assert index.refresh(agents, {1: "TIMED_OUT", 2: "IDLE"}) == 1
+        assert index.status_counts()["timed_out"] == 1
+
+    def test_refresh_membership_change_reconciles(self, index):
+        index.reconcile([make_agent(1), make_agent(2)])
+        assert index.refresh([make_agent(2), make_agent(3)], {2: "IDLE", 3: "IDLE"}) == 2
+        assert index.stats["agents"] == 2
+        assert index.column_of(1) is None
+
+    def test_stale_processing_counts_as_timed_out(self, index):
+        index.reconcile([make_agent(1, 1, TaskState.PROCESSING, has_task=True, minutes_ago=30)])
+        assert index.status_counts()["timed_out"] == 1
+        assert index.column_of(1) == "PROCESSING"
+
+    def test_reconcile_drops_missing(self, index):
+        index.reconcile([make_agent(1), make_agent(2)])
+        index.reconcile([make_agent(2)])
+        assert index.stats["agents"] == 1
+        assert index.status_counts()["idle"] == 1
+
+    def test_snapshot(self, index):
+        index.reconcile([make_agent(1, 3, TaskState.COMMANDED, has_task=True)])
+        snapshot = index.snapshot(3)
+        assert snapshot["project_id"] == 3
+        assert snapshot["project_counts"]["working"] == 1
+        assert snapshot["project_flags"]["has_working"] is True
+        assert snapshot["project_columns"]["PROCESSING"] == [1]
+        assert snapshot["status_counts"]["working"] == 1
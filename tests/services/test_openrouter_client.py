@@ -1,5 +1,8 @@
 """Unit tests for OpenRouter API client."""
 
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 from unittest.mock import MagicMock, patch
 
 import pytest
@@ -81,7 +84,7 @@ class TestChatCompletion:
             "model": "anthropic/claude-3-haiku",
         }
 
-        with patch("requests.post", return_value=mock_response):
+        with patch.object(client_with_key._session, "post", return_value=mock_response):
             result = client_with_key.chat_completion(
                 model="anthropic/claude-3-haiku",
                 messages=[{"role": "user", "content": "Hi"}],
@@ -105,7 +108,7 @@ class TestChatCompletion:
         mock_response.status_code = 401
         mock_response.text = "Unauthorized"
 
-        with patch("requests.post", return_value=mock_response):
+        with patch.object(client_with_key._session, "post", return_value=mock_response):
             with pytest.raises(OpenRouterClientError) as exc_info:
                 client_with_key.chat_completion(
                     model="test-model",
@@ -119,7 +122,7 @@ class TestChatCompletion:
         mock_response.status_code = 400
         mock_response.text = "Bad request"
 
-        with patch("requests.post", return_value=mock_response) as mock_post:
+        with patch.object(client_with_key._session, "post", return_value=mock_response) as mock_post:
             with pytest.raises(OpenRouterClientError) as exc_info:
                 client_with_key.chat_completion(
                     model="test-model",
@@ -134,7 +137,7 @@ class TestChatCompletion:
         mock_response.status_code = 500
         mock_response.text = "Internal server error"
 
-        with patch("requests.post", return_value=mock_response) as mock_post:
+        with patch.object(client_with_key._session, "post", return_value=mock_response) as mock_post:
             with pytest.raises(OpenRouterClientError) as exc_info:
                 client_with_key.chat_completion(
                     model="test-model",
@@ -148,7 +151,7 @@ class TestChatCompletion:
         mock_response.status_code = 429
         mock_response.text = "Rate limited"
 
-        with patch("requests.post", return_value=mock_response) as mock_post:
+        with patch.object(client_with_key._session, "post", return_value=mock_response) as mock_post:
             with pytest.raises(OpenRouterClientError) as exc_info:
                 client_with_key.chat_completion(
                     model="test-model",
@@ -158,7 +161,7 @@ class TestChatCompletion:
             assert mock_post.call_count == 2
 
     def test_timeout_is_retryable(self, client_with_key):
-        with patch("requests.post", side_effect=requests.exceptions.Timeout) as mock_post:
+        with patch.object(client_with_key._session, "post", side_effect=requests.exceptions.Timeout) as mock_post:
             with pytest.raises(OpenRouterClientError) as exc_info:
                 client_with_key.chat_completion(
                     model="test-model",
@@ -168,7 +171,7 @@ class TestChatCompletion:
             assert mock_post.call_count == 2
 
     def test_connection_error_is_retryable(self, client_with_key):
-        with patch("requests.post", side_effect=requests.exceptions.ConnectionError) as mock_post:
+        with patch.object(client_with_key._session, "post", side_effect=requests.exceptions.ConnectionError) as mock_post:
             with pytest.raises(OpenRouterClientError) as exc_info:
                 client_with_key.chat_completion(
                     model="test-model",
@@ -190,7 +193,7 @@ class TestChatCompletion:
             "model": "test-model",
         }
 
-        with patch("requests.post", side_effect=[fail_response, success_response]):
+        with patch.object(client_with_key._session, "post", side_effect=[fail_response, success_response]):
             result = client_with_key.chat_completion(
                 model="test-model",
                 messages=[{"role": "user", "content": "Hi"}],
@@ -203,17 +206,135 @@ class TestChatCompletion:
         assert headers["Content-Type"] == "application/json"
 
 
+def _sse(*chunks):
+    lines = [": OPENROUTER PROCESSING", ""]
+    for chunk in chunks:
+        lines += [f"data: {json.dumps(chunk)}", ""]
+    return lines + ["data: [DONE]", ""]
+
+
+def _stream_response(lines):
+    response = MagicMock()
+    response.status_code = 200
+    response.iter_lines.return_value = iter(lines)
+    return response
+
+
+class TestStreaming:
+
+    def test_stream_forwards_tokens(self, client_with_key):
+        lines = _sse(
+            {"model": "test-model", "choices": [{"delta": {"content": "Fixed "}}]},
+            {"choices": [{"delta": {"content": "the bug"}}]},
+            {"choices": [{"delta": {}}], "usage": {"prompt_tokens": 12, "completion_tokens": 3}},
+        )
+        tokens = []
+        with patch.object(client_with_key._session, "post", return_value=_stream_response(lines)) as mock_post:
+            result = client_with_key.chat_completion(
+                model="test-model",
+                messages=[{"role": "user", "content": "Hi"}],
+                on_token=tokens.append,
+            )
+
+        assert tokens == ["Fixed ", "the bug"]
+        assert result.text == "Fixed the bug"
+        assert (result.input_tokens, result.output_tokens) == (12, 3)
+        assert result.ttft_ms is not None
+        assert mock_post.call_args.kwargs["stream"] is True
+        assert mock_post.call_args.kwargs["json"]["stream"] is True
+        assert client_with_key.stats["streamed"] == 1
+        assert client_with_key.stats["ttft_ms_avg"] is not None
+
+    def test_interrupted_stream_not_retried(self, client_with_key):
+        def lines():
+            yield f"data: {json.dumps({'choices': [{'delta': {'content': 'partial'}}]})}"
+            raise requests.exceptions.ChunkedEncodingError("connection reset")
+
+        response = MagicMock()
+        response.status_code = 200
+        response.iter_lines.return_value = lines()
+        with patch.object(client_with_key._session, "post", return_value=response) as mock_post:
+            with pytest.raises(OpenRouterClientError, match="interrupted") as exc_info:
+                client_with_key.chat_completion(
+                    model="test-model",
+                    messages=[{"role": "user", "content": "Hi"}],
+                    on_token=lambda t: None,
+                )
+        assert exc_info.value.retryable is False
+        assert mock_post.call_count == 1
+
+    def test_stream_error_before_first_token_retried(self, client_with_key):
+        failed = _stream_response(_sse({"error": {"message": "overloaded"}}))
+        ok = _stream_response(_sse({"choices": [{"delta": {"content": "Done"}}]}))
+        with patch.object(client_with_key._session, "post", side_effect=[failed, ok]) as mock_post:
+            result = client_with_key.chat_completion(
+                model="test-model",
+                messages=[{"role": "user", "content": "Hi"}],
+                on_token=lambda t: None,
+            )
+        assert result.text == "Done"
+        assert mock_post.call_count == 2
+
+
+class _CompletionHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # Keep-alive
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers["Content-Length"]))
+        body = json.dumps({
+            "choices": [{"message": {"content": "ok"}}],
+            "usage": {"prompt_tokens": 1, "completion_tokens": 1},
+        }).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class TestConnectionPool:
+
+    def test_pool_size_from_config(self, config):
+        config["openrouter"]["pool_size"] = 4
+        client = OpenRouterClient(config)
+        assert client._session.get_adapter("https://openrouter.ai")._pool_maxsize == 4
+        assert client.stats["pool_size"] == 4
+
+    def test_connection_reused_across_calls(self, config):
+        server = ThreadingHTTPServer(("127.0.0.1", 0), _CompletionHandler)
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        try:
+            config["openrouter"]["base_url"] = f"http://127.0.0.1:{server.server_port}"
+            with patch.dict("os.environ", {"OPENROUTER_API_KEY": "test-key-123"}):
+                client = OpenRouterClient(config)
+            for _ in range(3):
+                assert client.chat_completion(model="m", messages=[]).text == "ok"
+            stats = client.stats
+            client.close()
+        finally:
+            server.shutdown()
+            server.server_close()
+
+        assert stats["requests"] == 3
+        assert stats["connections_opened"] == 1
+        assert stats["connection_reuse_rate"] == pytest.approx(2 / 3)
+
+
 class TestConnectivity:
 
     def test_check_connectivity_success(self, client_with_key):
         mock_response = MagicMock()
         mock_response.status_code = 200
 
-        with patch("requests.get", return_value=mock_response):
+        with patch.object(client_with_key._session, "get", return_value=mock_response):
             assert client_with_key.check_connectivity() is True
 
     def test_check_connectivity_failure(self, client_with_key):
-        with patch("requests.get", side_effect=Exception("Connection failed")):
+        with patch.object(client_with_key._session, "get", side_effect=Exception("Connection failed")):
             assert client_with_key.check_connectivity() is False
 
     def test_check_connectivity_no_key(self, client_no_key):
@@ -0,0 +1,206 @@
+"""Tests for the incrementally maintained priority ranking."""
+
+from datetime import datetime, timedelta, timezone
+from unittest.mock import MagicMock
+
+import pytest
+
+from src.claude_headspace.models import TaskState
+from src.claude_headspace.services.priority_ranking import (
+    PriorityRanking,
+    RankingEntry,
+    entry_from_agent,
+    recommendation_rationale,
+)
+
+
+NOW = datetime(2026, 2, 1, 12, 0, tzinfo=timezone.utc)
+
+
+def make_entry(
+    agent_id: int,
+    state: str = "IDLE",
+    score: int | None = None,
+    reason: str | None = None,
+    minutes_ago: int = 0,
+) -> RankingEntry:
+    return RankingEntry(
+        agent_id=agent_id,
+        project_id=1,
+        project_name="proj",
+        project_slug="proj",
+        session_uuid=f"abcd{agent_id:04d}",
+        state=state,
+        model_state=state.lower(),
+        score=score,
+        reason=reason,
+        scored_at=NOW if score is not None else None,
+        last_seen_at=NOW - timedelta(minutes=minutes_ago),
+    )
+
+
+def make_agent(agent_id: int, state=TaskState.IDLE, score=None, minutes_ago=0, ended=False):
+    agent = MagicMock()
+    agent.id = agent_id
+    agent.project_id = 1
+    agent.project.name = "proj"
+    agent.project.slug = "proj"
+    agent.session_uuid = f"abcd{agent_id:04d}-0000"
+    agent.state = state
+    agent.tasks = []
+    agent.priority_score = score
+    agent.priority_reason = "reason" if score is not None else None
+    agent.priority_updated_at = NOW if score is not None else None
+    agent.last_seen_at = datetime.now(timezone.utc) - timedelta(minutes=minutes_ago)
+    agent.ended_at = NOW if ended else None
+    return agent
+
+
+@pytest.fixture
+def ranking():
+    return PriorityRanking(top_n=2)
+
+
+class TestOrdering:
+
+    def test_score_then_group_then_recency(self, ranking):
+        ranking.reconcile([
+            make_entry(1, "IDLE", score=80, minutes_ago=1),
+            make_entry(2, "AWAITING_INPUT", score=80, minutes_ago=5),
+            make_entry(3, "PROCESSING", score=80, minutes_ago=2),
+            make_entry(4, "IDLE", score=90, minutes_ago=30),
+            make_entry(5, "IDLE", score=80, minutes_ago=0),
+        ])
+
+        assert [e.agent_id for e in ranking.ranked()] == [4, 2, 3, 5, 1]
+        assert [e.agent_id for e in ranking.ranked(2)] == [4, 2]
+
+    def test_unscored_ranks_as_fifty(self, ranking):
+        ranking.reconcile([make_entry(1, score=40), make_entry(2, score=None)])
+        assert [e.agent_id for e in ranking.ranked()] == [2, 1]
+
+    def test_ranked_by_score_puts_unscored_last(self, ranking):
+        ranking.reconcile([
+            make_entry(1, "IDLE", score=40),
+            make_entry(2, "AWAITING_INPUT", score=None),
+            make_entry(3, "IDLE", score=70, minutes_ago=5),
+            make_entry(4, "PROCESSING", score=70, minutes_ago=1),
+        ])
+        assert [e.agent_id for e in ranking.ranked_by_score()] == [4, 3, 1, 2]
+        assert [e.agent_id for e in ranking.ranked_by_score(1)] == [4]
+
+    def test_update_repositions_agent(self, ranking):
+        ranking.reconcile([make_entry(1, score=90), make_entry(2, score=10)])
+        ranking.update(make_entry(2, score=95))
+        assert [e.agent_id for e in ranking.ranked()] == [2, 1]
+        assert len(ranking) == 2
+
+    def test_remove(self, ranking):
+        ranking.reconcile([make_entry(1, "AWAITING_INPUT"), make_entry(2)])
+        ranking.remove(1)
+        assert [e.agent_id for e in ranking.ranked()] == [2]
+        assert ranking.stats["needs_attention"] == 0
+
+    def test_reconcile_drops_missing_agents(self, ranking):
+        ranking.reconcile([make_entry(1), make_entry(2)])
+        ranking.reconcile([make_entry(2)])
+        assert [e.agent_id for e in ranking.ranked()] == [2]
+        assert ranking.is_warm
+
+    def test_unchanged_update_is_noop(self, ranking):
+        ranking.reconcile([make_entry(1)])
+        updates = ranking.stats["updates"]
+        ranking.update(make_entry(1))
+        assert ranking.stats["updates"] == updates
+
+
+class TestRecommended:
+
+    def test_oldest_awaiting_input_first(self, ranking):
+        ranking.reconcile([
+            make_entry(1, "AWAITING_INPUT", minutes_ago=2),
+            make_entry(2, "TIMED_OUT", minutes_ago=10),
+            make_entry(3, "IDLE", score=100),
+        ])
+        assert ranking.recommended().agent_id == 2
+
+    def test_highest_score_among_active(self, ranking):
+        ranking.reconcile([
+            make_entry(1, score=90, minutes_ago=30),
+            make_entry(2, score=70, minutes_ago=1),
+            make_entry(3, score=None, minutes_ago=0),
+        ])
+        active_since = NOW - timedelta(minutes=5)
+        assert ranking.recommended(active_since).agent_id == 2
+
+    def test_none_when_all_inactive(self, ranking):
+        ranking.reconcile([make_entry(1, minutes_ago=30)])
+        assert ranking.recommended(NOW - timedelta(minutes=5)) is None
+
+    def test_rationale(self):
+        assert recommendation_rationale(
+            make_entry(1, "AWAITING_INPUT", minutes_ago=75), now=NOW
+        ) == "Awaiting input for 1h 15m"
+        assert recommendation_rationale(
+            make_entry(1, "TIMED_OUT", minutes_ago=3), now=NOW
+        ) == "Timed out for 3m"
+        assert recommendation_rationale(make_entry(1, score=80, reason="Urgent")) == "Priority: 80 — Urgent"
+        assert recommendation_rationale(make_entry(1)) == "Most recently active"
+
+
+class TestSyncAgent:
+
+    def test_reports_head_change_only(self, ranking):
+        ranking.reconcile([
+            entry_from_agent(make_agent(1, score=90)),
+            entry_from_agent(make_agent(2, score=80)),
+            entry_from_agent(make_agent(3, score=10)),
+        ])
+
+        # Re-scoring an agent outside the top 2 doesn't move the head
+        assert ranking.sync_agent(make_agent(3, score=20)) is False
+        # An agent starting to wait for input becomes the recommendation
+        assert ranking.sync_agent(make_agent(3, TaskState.AWAITING_INPUT, score=20)) is True
+        assert ranking.recommended().agent_id == 3
+        assert ranking.stats["head_changes"] == 1
+
+    def test_ended_agent_is_removed(self, ranking):
+        ranking.reconcile([entry_from_agent(make_agent(1, score=90))])
+        assert ranking.sync_agent(make_agent(1, score=90, ended=True)) is True
+        assert len(ranking) == 0
+
+    def test_snapshot(self, ranking):
+        ranking.reconcile([entry_from_agent(make_agent(1, TaskState.AWAITING_INPUT, score=60))])
+        snapshot = ranking.snapshot()
+        assert snapshot["recommended"]["agent_id"] == 1
+        assert snapshot["recommended"]["rationale"] == "Awaiting input"
+        assert snapshot["recommended"]["session_uuid"] == "abcd0001"
+        assert [e["agent_id"] for e in snapshot["top"]] == [1]
+
+
+class TestRefresh:
+
+    def test_cold_ranking_is_reconciled(self, ranking):
+        agents = [make_agent(1, score=10), make_agent(2, score=90)]
+        assert ranking.refresh(agents, {1: "IDLE", 2: "IDLE"}) == 2
+        assert ranking.is_warm
+        assert [e.agent_id for e in ranking.ranked()] == [2, 1]
+
+    def test_only_drifted_entries_are_rebuilt(self, ranking):
+        agents = [make_agent(1, TaskState.PROCESSING, score=10), make_agent(2, score=90)]
+        ranking.reconcile(entry_from_agent(a) for a in agents)
+        updates = ranking.stats["updates"]
+
+        assert ranking.refresh(agents, {1: "PROCESSING", 2: "IDLE"}) == 0
+        assert ranking.stats["updates"] == updates
+
+        # Agent 1 has gone stale since it was last synced
+        agents[0].last_seen_at = datetime.now(timezone.utc) - timedelta(hours=2)
+        assert ranking.refresh(agents, {1: "TIMED_OUT", 2: "IDLE"}) == 1
+        assert ranking.recommended().agent_id == 1
+
+    def test_membership_change_reconciles(self, ranking):
+        ranking.reconcile([entry_from_agent(make_agent(1)), entry_from_agent(make_agent(2))])
+        agents = [make_agent(2), make_agent(3)]
+        assert ranking.refresh(agents, {2: "IDLE", 3: "IDLE"}) == 2
+        assert sorted(e.agent_id for e in ranking.ranked()) == [2, 3]
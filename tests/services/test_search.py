@@ -0,0 +1,135 @@
+"""Tests for the full-text search service."""
+
+from datetime import datetime, timezone
+from decimal import Decimal
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+import pytest
+from sqlalchemy import func
+from sqlalchemy.dialects import postgresql
+
+from claude_headspace.models.cold_storage import compress_text
+from claude_headspace.models.turn import TurnActor, TurnIntent
+from claude_headspace.services.search import (
+    SearchError,
+    build_hits_query,
+    decode_cursor,
+    encode_cursor,
+    render_snippet,
+    search,
+)
+
+TS = datetime(2026, 1, 29, 10, 0, tzinfo=timezone.utc)
+
+
+def hit(kind, id, rank="0.5"):
+    return SimpleNamespace(kind=kind, id=id, ts=TS, rank=Decimal(rank))
+
+
+def compiled(stmt) -> str:
+    return str(stmt.compile(dialect=postgresql.dialect()))
+
+
+class TestCursor:
+
+    def test_relevance_round_trip(self):
+        cursor = encode_cursor("relevance", hit("turn", 7, "0.123456"))
+        assert decode_cursor("relevance", cursor) == (Decimal("0.123456"), TS, 7, "turn")
+
+    def test_recent_round_trip(self):
+        cursor = encode_cursor("recent", hit("task", 3))
+        assert decode_cursor("recent", cursor) == (TS, 3, "task")
+
+    def test_invalid_cursor(self):
+        with pytest.raises(SearchError):
+            decode_cursor("relevance", "not-a-cursor")
+        with pytest.raises(SearchError):
+            decode_cursor("relevance", encode_cursor("recent", hit("turn", 1)))
+
+
+class TestRenderSnippet:
+
+    def test_escapes_html_and_marks_matches(self):
+        assert render_snippet("<b>\x02payments\x03</b> migration") == (
+            "&lt;b&gt;<mark>payments</mark>&lt;/b&gt; migration"
+        )
+
+    def test_empty(self):
+        assert render_snippet(None) is None
+
+
+class TestHitsQuery:
+
+    def test_searches_both_kinds_via_index(self):
+        sql = compiled(build_hits_query(func.websearch_to_tsquery("english", "x")))
+        assert sql.count("@@") == 2
+        assert "UNION ALL" in sql
+        assert "ts_rank_cd" in sql
+
+    def test_filters_join_only_when_needed(self):
+        tsquery = func.websearch_to_tsquery("english", "x")
+        assert "JOIN" not in compiled(build_hits_query(tsquery, kinds=("turn",)))
+
+        sql = compiled(build_hits_query(tsquery, project_id=1, since=TS, kinds=("turn",)))
+        assert "JOIN tasks" in sql and "JOIN agents" in sql
+        assert "turns.timestamp >=" in sql
+
+
+class TestSearch:
+
+    def _session(self, hits, turn_details=(), task_details=(), cold_headlines=None):
+        session = MagicMock()
+        session.execute.side_effect = [
+            MagicMock(all=MagicMock(return_value=hits)),
+            *([MagicMock(all=MagicMock(return_value=list(turn_details)))] if turn_details else []),
+            *([MagicMock(one=MagicMock(return_value=cold_headlines))] if cold_headlines else []),
+            *([iter(task_details)] if task_details else []),
+        ]
+        return session
+
+    def test_paginates_with_next_cursor(self):
+        detail = SimpleNamespace(
+            id=1, actor=TurnActor.AGENT, intent=TurnIntent.PROGRESS, task_id=9,
+            agent_id=4, project_id=2, project_name="app", text_compressed=None,
+            snippet="the \x02payments\x03 migration", summary_snippet=None,
+        )
+        session = self._session([hit("turn", 1), hit("turn", 0)], turn_details=[detail])
+
+        page = search("payments", limit=1, session=session)
+
+        assert page.next_cursor == encode_cursor("relevance", hit("turn", 1))
+        assert page.results == [{
+            "kind": "turn", "id": 1, "rank": 0.5, "timestamp": TS.isoformat(),
+            "task_id": 9, "agent_id": 4, "project_id": 2, "project_name": "app",
+            "actor": "agent", "intent": "progress",
+            "snippet": "the <mark>payments</mark> migration", "summary_snippet": None,
+        }]
+
+    def test_archived_turn_snippet_from_decompressed_text(self):
+        detail = SimpleNamespace(
+            id=1, actor=TurnActor.AGENT, intent=TurnIntent.PROGRESS, task_id=9,
+            agent_id=4, project_id=2, project_name="app",
+            text_compressed=compress_text("the payments migration"),
+            snippet=None, summary_snippet=None,
+        )
+        session = self._session(
+            [hit("turn", 1)], turn_details=[detail],
+            cold_headlines=("the \x02payments\x03 migration",),
+        )
+
+        page = search("payments", session=session)
+
+        assert page.results[0]["snippet"] == "the <mark>payments</mark> migration"
+        cold_stmt = session.execute.call_args_list[2].args[0]
+        assert "ts_headline" in compiled(cold_stmt)
+
+    def test_last_page_has_no_cursor(self):
+        page = search("payments", session=self._session([]))
+        assert page == type(page)(results=[], next_cursor=None)
+
+    def test_invalid_parameters(self):
+        with pytest.raises(SearchError):
+            search("x", sort="oldest", session=MagicMock())
+        with pytest.raises(SearchError):
+            search("x", kinds=("event",), session=MagicMock())
@@ -0,0 +1,147 @@
+"""Tests for the session-to-JSONL location index."""
+
+import os
+import time
+from uuid import uuid4
+
+import pytest
+
+from claude_headspace.services.file_watcher import FileWatcher
+from claude_headspace.services.project_decoder import encode_project_path
+from claude_headspace.services.session_index import SessionIndex
+
+
+def write_session(projects, project_path, session_id, content="{}\n"):
+    folder = projects / encode_project_path(project_path)
+    folder.mkdir(exist_ok=True)
+    path = folder / f"{session_id}.jsonl"
+    path.write_text(content)
+    return path
+
+
+@pytest.fixture
+def projects(tmp_path):
+    root = tmp_path / "projects"
+    root.mkdir()
+    return root
+
+
+@pytest.fixture
+def index(projects):
+    return SessionIndex(str(projects))
+
+
+class TestBuild:
+
+    def test_indexes_top_level_sessions(self, index, projects):
+        path = write_session(projects, "/work/app", "abc")
+        (path.parent / "subagents").mkdir()
+        (path.parent / "subagents" / "agent-1.jsonl").write_text("{}\n")
+        write_session(projects, "/work/other", "def")
+
+        assert not index.ready
+        assert index.build() == 2
+        assert index.ready
+
+        location = index.lookup("abc")
+        assert location.path == str(path)
+        assert location.folder == "-work-app"
+        assert location.size == path.stat().st_size
+        assert index.lookup("agent-1") is None
+
+    def test_missing_projects_directory(self, tmp_path):
+        index = SessionIndex(str(tmp_path / "missing"))
+        assert index.build() == 0
+        assert index.ready
+
+    def test_rebuild_drops_deleted_sessions(self, index, projects):
+        path = write_session(projects, "/work/app", "abc")
+        index.build()
+        path.unlink()
+        index.build()
+        assert index.lookup("abc") is None
+
+
+class TestLatestForDirectory:
+
+    def test_most_recently_modified_session(self, index, projects):
+        old = write_session(projects, "/work/app", "old")
+        new = write_session(projects, "/work/app", "new")
+        os.utime(old, (time.time() - 100, time.time() - 100))
+        index.build()
+
+        assert index.latest_for_directory("/work/app") == str(new)
+        assert index.latest_for_directory("/work/none") is None
+
+
+class TestUpdates:
+
+    def test_update_and_remove_path(self, index, projects):
+        index.build()
+        path = write_session(projects, "/work/app", "abc")
+        index.update_path(str(path))
+        assert index.lookup("abc").path == str(path)
+
+        path.unlink()
+        index.remove_path(str(path))
+        assert index.lookup("abc") is None
+        assert index.latest_for_directory("/work/app") is None
+
+    def test_update_of_deleted_file_removes_it(self, index, projects):
+        path = write_session(projects, "/work/app", "abc")
+        index.build()
+        path.unlink()
+        index.update_path(str(path))
+        assert index.lookup("abc") is None
+
+    def test_paths_outside_top_level_are_ignored(self, index, projects, tmp_path):
+        nested = projects / "-work-app" / "subagents"
+        nested.mkdir(parents=True)
+        (nested / "agent-1.jsonl").write_text("{}\n")
+        index.update_path(str(nested / "agent-1.jsonl"))
+        (tmp_path / "stray.jsonl").write_text("{}\n")
+        index.update_path(str(tmp_path / "stray.jsonl"))
+        assert index.stats["sessions"] == 0
+
+    def test_watchdog_events_keep_index_current(self, index, projects):
+        index.start()
+        try:
+            index._thread.join(timeout=5)
+            path = write_session(projects, "/work/app", "abc")
+            deadline = time.time() + 5
+            while index.lookup("abc") is None and time.time() < deadline:
+                time.sleep(0.05)
+            assert index.lookup("abc").path == str(path)
+        finally:
+            index.stop()
+
+
+class TestFileWatcherIntegration:
+
+    def test_register_session_uses_index(self, index, projects):
+        path = write_session(projects, "/work/app", "abc")
+        index.build()
+        watcher = FileWatcher(projects_path=str(projects), session_index=index)
+
+        lookups = index.stats["lookups"]
+        watcher.register_session(uuid4(), "/work/app", "/work/app")
+        assert index.stats["lookups"] == lookups + 1
+        assert watcher.get_registered_sessions()[0].jsonl_file_path == str(path)
+
+    def test_projects_directory_created_after_start(self, tmp_path):
+        projects = tmp_path / "projects"
+        index = SessionIndex(str(projects))
+        index.start()
+        try:
+            index._thread.join(timeout=5)
+            assert index.ready and not index.watching
+
+            projects.mkdir()
+            path = write_session(projects, "/work/app", "abc")
+            watcher = FileWatcher(projects_path=str(projects), session_index=index)
+
+            assert watcher._locate_jsonl_file("/work/app") == str(path)
+            assert index.watching
+            assert index.lookup("abc").path == str(path)
+        finally:
+            index.stop()
@@ -0,0 +1,128 @@
+"""Tests for the prioritised summarisation queue."""
+
+import time
+from unittest.mock import MagicMock, PropertyMock, patch
+
+import pytest
+
+from claude_headspace.services.summarisation_queue import SummarisationQueue
+from claude_headspace.services.task_lifecycle import SummarisationRequest
+
+
+def _turn(id, task_id, intent="progress"):
+    turn = MagicMock()
+    turn.id, turn.task_id = id, task_id
+    turn.intent.value = intent
+    return turn
+
+
+def _task(id):
+    task = MagicMock()
+    task.id = id
+    return task
+
+
+@pytest.fixture
+def queue():
+    return SummarisationQueue(app=MagicMock(), service=MagicMock(), config={})
+
+
+@pytest.fixture
+def accepting(queue):
+    """Let submit() queue jobs without starting worker threads."""
+    with patch.object(SummarisationQueue, "running", new_callable=PropertyMock, return_value=True):
+        yield queue
+
+
+def _drain(queue):
+    jobs = []
+    while not queue._queue.empty():
+        job = queue._queue.get_nowait()
+        if not job.cancelled:
+            jobs.append(job)
+    return jobs
+
+
+class TestSubmit:
+
+    def test_not_running_returns_everything_for_inline_execution(self, queue):
+        requests = [SummarisationRequest(type="turn", turn=_turn(1, 10))]
+        assert queue.submit(requests) == requests
+
+    def test_jobs_ordered_by_priority(self, accepting):
+        accepting.submit([
+            SummarisationRequest(type="task_completion", task=_task(10)),
+            SummarisationRequest(type="turn", turn=_turn(1, 10)),
+            SummarisationRequest(type="permission_summary", turn=_turn(2, 11)),
+        ])
+        accepting.submit([SummarisationRequest(type="instruction", task=_task(12), command_text="fix")])
+        types = [job.key[0] for job in _drain(accepting)]
+        assert types == ["permission_summary", "instruction", "turn", "task_completion"]
+
+    def test_command_turn_grouped_with_instruction(self, accepting):
+        command = SummarisationRequest(type="turn", turn=_turn(1, 10, intent="command"))
+        instruction = SummarisationRequest(type="instruction", task=_task(10), command_text="fix it")
+        accepting.submit([command, instruction])
+        (job,) = _drain(accepting)
+        assert job.key == ("instruction", 10)
+        assert [r.type for r in job.requests] == ["turn", "instruction"]
+        assert job.requests[0].turn_id == 1
+
+    def test_duplicate_request_deduplicated(self, accepting):
+        accepting.submit([SummarisationRequest(type="task_completion", task=_task(10))])
+        assert accepting.submit([SummarisationRequest(type="task_completion", task=_task(10))]) == []
+        assert len(_drain(accepting)) == 1
+        assert accepting.stats["deduplicated"] == 1
+
+    def test_newer_turn_cancels_stale_permission_summary(self, accepting):
+        accepting.submit([SummarisationRequest(type="permission_summary", turn=_turn(1, 10))])
+        accepting.submit([SummarisationRequest(type="permission_summary", turn=_turn(5, 11))])
+        accepting.submit([SummarisationRequest(type="turn", turn=_turn(2, 10))])
+        assert [job.key for job in _drain(accepting)] == [("permission_summary", 5), ("turn", 2)]
+        assert accepting.stats["cancelled"] == 1
+
+    def test_full_queue_overflows_to_caller(self, accepting):
+        accepting.max_queued = 1
+        first = SummarisationRequest(type="turn", turn=_turn(1, 10))
+        second = SummarisationRequest(type="turn", turn=_turn(2, 10))
+        assert accepting.submit([first, second]) == [second]
+        assert accepting.stats["overflow"] == 1
+
+
+class TestWorkers:
+
+    def test_workers_run_queued_jobs(self, queue):
+        ran = []
+        with patch.object(queue, "_run", side_effect=lambda job: ran.append(job.key)):
+            queue.start()
+            try:
+                assert queue.submit([SummarisationRequest(type="turn", turn=_turn(1, 10))]) == []
+                deadline = time.monotonic() + 5
+                while queue.stats["completed"] < 1 and time.monotonic() < deadline:
+                    time.sleep(0.01)
+            finally:
+                queue.stop()
+        assert ran == [("turn", 1)]
+        assert queue.stats["queued"] == 0
+        assert queue.stats["running"] is False
+
+    def test_run_reloads_entities_and_executes(self, queue):
+        from claude_headspace.services.summarisation_queue import QueuedRequest, _Job
+
+        job = _Job(1, 0, ("instruction", 10), [
+            QueuedRequest("turn", turn_id=1, task_id=10),
+            QueuedRequest("instruction", task_id=10, command_text="fix it"),
+        ])
+        with patch("claude_headspace.database.db") as db:
+            queue._run(job)
+        (requests, session), _ = queue._service.execute_pending.call_args
+        assert session is db.session
+        assert [r.type for r in requests] == ["turn", "instruction"]
+        assert requests[1].command_text == "fix it"
+        assert requests[1].task is db.session.get.return_value
+
+    def test_disabled_queue_does_not_start(self):
+        queue = SummarisationQueue(app=MagicMock(), service=MagicMock(),
+                                   config={"summarisation_queue": {"enabled": False}})
+        queue.start()
+        assert queue.running is False
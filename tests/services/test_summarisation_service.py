@@ -313,6 +313,31 @@ class TestInstructionSummarisation:
         assert "stating the goal" in call_kwargs["input_text"]
 
 
+class TestSubmitPending:
+    """Tests for submit_pending() — hand-off to the background queue."""
+
+    def test_without_queue_executes_inline(self, service):
+        requests = [MagicMock()]
+        with patch.object(service, "execute_pending") as mock_execute:
+            service.submit_pending(requests, "session")
+        mock_execute.assert_called_once_with(requests, "session")
+
+    def test_queue_overflow_executes_inline(self, service):
+        queued, overflow = MagicMock(), MagicMock()
+        service.queue = MagicMock()
+        service.queue.submit.return_value = [overflow]
+        with patch.object(service, "execute_pending") as mock_execute:
+            service.submit_pending([queued, overflow], "session")
+        mock_execute.assert_called_once_with([overflow], "session")
+
+    def test_fully_queued_skips_inline(self, service):
+        service.queue = MagicMock()
+        service.queue.submit.return_value = []
+        with patch.object(service, "execute_pending") as mock_execute:
+            service.submit_pending([MagicMock()], "session")
+        mock_execute.assert_not_called()
+
+
 class TestExecutePending:
     """Tests for execute_pending() — synchronous post-commit summarisation."""
 
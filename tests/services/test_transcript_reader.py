@@ -8,6 +8,10 @@ import pytest
 from claude_headspace.services.transcript_reader import (
     MAX_CONTENT_LENGTH,
     TranscriptReadResult,
+    configure_transcript_reader,
+    get_transcript_index,
+    iter_lines_reverse,
+    read_last_user_message,
     read_transcript_file,
 )
 
@@ -179,3 +183,144 @@ class TestReadTranscriptFile:
         assert "Second response part 1" in result.text
         assert "Second response part 2" in result.text
         assert "First response" not in result.text
+
+
+class TestTranscriptIndex:
+    """Tests for the incremental per-transcript index."""
+
+    def test_incremental_append_only_parses_new_lines(self, tmp_path):
+        f = tmp_path / "incremental.jsonl"
+        f.write_text(_user_line("Prompt") + "\n" + _assistant_line("Part 1") + "\n")
+        assert read_transcript_file(str(f)).text == "Part 1"
+
+        index = get_transcript_index(str(f))
+        indexed = index.lines_indexed
+
+        with open(f, "a") as fh:
+            fh.write(_assistant_line("Part 2") + "\n")
+        assert read_transcript_file(str(f)).text == "Part 1\n\nPart 2"
+        assert index.lines_indexed == indexed + 1
+
+        with open(f, "a") as fh:
+            fh.write(_user_line("Next prompt") + "\n" + _assistant_line("Reply") + "\n")
+        assert read_transcript_file(str(f)).text == "Reply"
+        assert len(index.boundaries) == 2
+
+    def test_rewritten_file_is_reindexed(self, tmp_path):
+        f = tmp_path / "rewritten.jsonl"
+        f.write_text(_user_line("Prompt") + "\n" + _assistant_line("Original") + "\n")
+        assert read_transcript_file(str(f)).text == "Original"
+
+        f.write_text(_user_line("Prompt") + "\n" + _assistant_line("Replaced text!!") + "\n")
+        assert read_transcript_file(str(f)).text == "Replaced text!!"
+
+    def test_incomplete_trailing_line_waits_for_writer(self, tmp_path):
+        f = tmp_path / "partial.jsonl"
+        full = _assistant_line("Late")
+        f.write_text(_user_line("Prompt") + "\n" + full[:20])
+        assert read_transcript_file(str(f)).text == ""
+
+        with open(f, "a") as fh:
+            fh.write(full[20:])
+        assert read_transcript_file(str(f)).text == "Late"
+
+    def test_large_file_bootstraps_from_tail(self, tmp_path):
+        f = tmp_path / "large.jsonl"
+        filler = [_assistant_line("x" * 1000) for _ in range(100)]
+        f.write_text("\n".join(filler + [_user_line("Prompt"), _assistant_line("Done")]) + "\n")
+
+        assert read_transcript_file(str(f)).text == "Done"
+        index = get_transcript_index(str(f))
+        assert index.start > 0
+        assert index.lines_indexed < 100
+
+
+class TestReverseBoundaryScan:
+    """Tests for the adaptive reverse scan that finds the current turn."""
+
+    @pytest.fixture(autouse=True)
+    def small_scan_window(self):
+        configure_transcript_reader({"transcript": {
+            "reverse_scan_initial_bytes": 1024,
+            "reverse_scan_max_bytes": 64 * 1024,
+        }})
+        yield
+        configure_transcript_reader({"transcript": {
+            "reverse_scan_initial_bytes": 64 * 1024,
+            "reverse_scan_max_bytes": 16 * 1024 * 1024,
+        }})
+
+    def test_iter_lines_reverse(self):
+        buf = b"one\ntwo\n\nthree"
+        lines = [buf[lo:hi] for lo, hi in iter_lines_reverse(buf, initial_window=2)]
+        assert lines == [b"three", b"two", b"one"]
+
+    def test_iter_lines_reverse_stops_at_ceiling(self):
+        buf = b"a" * 100 + b"\n" + b"b" * 10
+        lines = [buf[lo:hi] for lo, hi in iter_lines_reverse(buf, initial_window=4, max_window=16)]
+        assert lines == [b"b" * 10]
+
+    def test_boundary_beyond_initial_window_is_found(self, tmp_path):
+        f = tmp_path / "long_turn.jsonl"
+        tool_output = json.dumps({
+            "type": "user",
+            "message": {"role": "user", "content": [{"type": "tool_result", "content": "x" * 8000}]},
+        })
+        lines = [
+            _user_line("Old prompt"), _assistant_line("Old reply"),
+            _user_line("Prompt"), _assistant_line("Start"),
+            *[tool_output] * 4,
+            _assistant_line("Done"),
+        ]
+        f.write_text("\n".join(lines) + "\n")
+
+        assert read_transcript_file(str(f)).text == "Done"
+        assert read_last_user_message(str(f)).text == "Prompt"
+        index = get_transcript_index(str(f))
+        assert index.start == f.read_bytes().rindex(tool_output.encode())
+
+    def test_scan_gives_up_at_ceiling(self, tmp_path):
+        f = tmp_path / "huge_turn.jsonl"
+        filler = [_assistant_line("y" * 2000) for _ in range(40)]
+        f.write_text("\n".join([_user_line("Prompt")] + filler) + "\n")
+
+        index_text = read_transcript_file(str(f)).text
+        index = get_transcript_index(str(f))
+        assert index.start > 0
+        assert index.boundaries == []
+        assert "y" in index_text
+
+
+class TestReadLastUserMessage:
+    """Tests for read_last_user_message()."""
+
+    def test_returns_latest_user_text(self, tmp_path):
+        f = tmp_path / "user.jsonl"
+        lines = [
+            _user_line("First"),
+            _assistant_line("Reply"),
+            _user_line("Second"),
+            _assistant_line("Reply 2"),
+        ]
+        f.write_text("\n".join(lines) + "\n")
+        assert read_last_user_message(str(f)).text == "Second"
+
+    def test_skips_tool_results(self, tmp_path):
+        f = tmp_path / "tool_result.jsonl"
+        tool_result = json.dumps({
+            "type": "user",
+            "message": {"role": "user", "content": [{"type": "tool_result", "content": "ok"}]},
+        })
+        string_prompt = json.dumps({"type": "user", "message": {"role": "user", "content": "Do it"}})
+        f.write_text("\n".join([string_prompt, _assistant_line("On it"), tool_result]) + "\n")
+
+        assert read_last_user_message(str(f)).text == "Do it"
+        # The tool_result is still a turn boundary for assistant text
+        assert read_transcript_file(str(f)).text == ""
+
+    def test_no_user_message(self, tmp_path):
+        f = tmp_path / "none.jsonl"
+        f.write_text(_assistant_line("Hi") + "\n")
+        result = read_last_user_message(str(f))
+        assert result.success
+        assert result.text == ""
@@ -456,6 +456,103 @@ class TestReconcileMultipleEntries:
         assert len(result["created"]) == 0
 
 
+class TestReconcileBatch:
+    """Test batch mode: one flush for new turns, one UPDATE for corrections."""
+
+    def test_batch_matches_per_turn_results(self, app_ctx, agent, task):
+        now = datetime.now(timezone.utc)
+        server_ts = now - timedelta(seconds=10)
+        jsonl_ts = now - timedelta(seconds=8)
+
+        corrected = Turn(
+            task_id=task.id, actor=TurnActor.USER, intent=TurnIntent.COMMAND,
+            text="Existing command", timestamp=server_ts, timestamp_source="server",
+        )
+        hashed = Turn(
+            task_id=task.id, actor=TurnActor.AGENT, intent=TurnIntent.PROGRESS,
+            text="Untimed reply", timestamp=server_ts, timestamp_source="server",
+        )
+        db.session.add_all([corrected, hashed])
+        db.session.flush()
+
+        entries = [
+            _make_entry(role="user", content="Existing command", timestamp=jsonl_ts),
+            _make_entry(role="assistant", content="Untimed reply", timestamp=None),
+            _make_entry(role="assistant", content="New agent response", timestamp=now),
+            _make_entry(role="user", content="Another new command", timestamp=now),
+        ]
+        result = reconcile_transcript_entries(agent, task, entries, batch=True)
+
+        assert result["updated"] == [(corrected.id, server_ts, jsonl_ts)]
+        assert len(result["created"]) == 2
+        assert corrected.timestamp == jsonl_ts
+        assert corrected.timestamp_source == "jsonl"
+        assert corrected.jsonl_entry_hash == _content_hash("user", "Existing command")
+        assert hashed.jsonl_entry_hash == _content_hash("agent", "Untimed reply")
+        assert hashed.timestamp_source == "server"
+        created = [db.session.get(Turn, turn_id) for turn_id in result["created"]]
+        assert [t.text for t in created] == ["New agent response", "Another new command"]
+
+    def test_batch_flushes_once(self, app_ctx, agent, task):
+        now = datetime.now(timezone.utc)
+        entries = [_make_entry(content=f"Command {i}", timestamp=now) for i in range(20)]
+
+        with patch.object(db.session, "flush", wraps=db.session.flush) as mock_flush:
+            result = reconcile_transcript_entries(agent, task, entries, batch=True)
+
+        assert len(result["created"]) == 20
+        assert mock_flush.call_count == 1
+
+    @patch("claude_headspace.services.transcript_reader.read_new_entries_from_position")
+    def test_batch_agent_session(self, mock_read, app_ctx, agent, task):
+        agent.transcript_path = "/tmp/test-transcript.jsonl"
+        now = datetime.now(timezone.utc)
+        mock_read.return_value = (
+            [_make_entry(content=f"Command {i}", timestamp=now) for i in range(5)],
+            1000,
+        )
+
+        result = reconcile_agent_session(agent, batch=True)
+
+        assert len(result["created"]) == 5
+        assert all(db.session.get(Turn, turn_id) for turn_id in result["created"])
+
+    @patch("claude_headspace.services.transcript_reader.read_new_entries_from_position")
+    def test_batch_agent_session_corrects_server_timestamps(self, mock_read, app_ctx, agent, task):
+        agent.transcript_path = "/tmp/test-transcript.jsonl"
+        now = datetime.now(timezone.utc)
+        server_ts = now - timedelta(seconds=10)
+        jsonl_ts = now - timedelta(seconds=12)
+
+        hook_turn = Turn(
+            task_id=task.id, actor=TurnActor.USER, intent=TurnIntent.COMMAND,
+            text="Run the tests", timestamp=server_ts, timestamp_source="server",
+        )
+        user_turn = Turn(
+            task_id=task.id, actor=TurnActor.AGENT, intent=TurnIntent.PROGRESS,
+            text="Edited by user", timestamp=server_ts, timestamp_source="user",
+        )
+        db.session.add_all([hook_turn, user_turn])
+        db.session.flush()
+
+        mock_read.return_value = (
+            [
+                _make_entry(role="user", content="Run the tests", timestamp=jsonl_ts),
+                _make_entry(role="assistant", content="Edited by user", timestamp=jsonl_ts),
+                _make_entry(role="assistant", content="Done", timestamp=now),
+            ],
+            1000,
+        )
+
+        result = reconcile_agent_session(agent, batch=True)
+
+        assert result["updated"] == [(hook_turn.id, server_ts, jsonl_ts)]
+        assert len(result["created"]) == 1
+        assert hook_turn.timestamp == jsonl_ts
+        assert hook_turn.timestamp_source == "jsonl"
+        assert user_turn.timestamp == server_ts
+
+
 class TestReconcileOldTurnsNotMatched:
     """Test that turns outside the match window are not considered."""
 
@@ -721,6 +818,59 @@ class TestBroadcastReconciliationMixed:
         assert second_call[0][0] == "turn_created"
 
 
+class TestBroadcastReconciliationAggregate:
+    """Test broadcast_reconciliation(aggregate=True)."""
+
+    @patch("claude_headspace.services.transcript_reconciler.Turn")
+    @patch("claude_headspace.services.broadcaster.get_broadcaster")
+    def test_single_turns_reconciled_event(self, mock_get_broadcaster, mock_turn_model):
+        mock_broadcaster = MagicMock()
+        mock_get_broadcaster.return_value = mock_broadcaster
+
+        ts_old = datetime(2026, 2, 15, 10, 0, 0, tzinfo=timezone.utc)
+        ts_new = datetime(2026, 2, 15, 10, 0, 1, tzinfo=timezone.utc)
+        created = []
+        for turn_id in (98, 99):
+            turn = MagicMock()
+            turn.id = turn_id
+            turn.text = f"Turn {turn_id}"
+            turn.actor.value = "agent"
+            turn.intent.value = "progress"
+            turn.task_id = 5
+            turn.timestamp = ts_new
+            created.append(turn)
+        mock_turn_model.query.filter.return_value.order_by.return_value.all.return_value = created
+
+        agent = MagicMock()
+        agent.id = 1
+        agent.project_id = 10
+
+        broadcast_reconciliation(
+            agent,
+            {"updated": [(42, ts_old, ts_new), (43, ts_old, ts_new)], "created": [98, 99]},
+            aggregate=True,
+        )
+
+        mock_broadcaster.broadcast.assert_called_once()
+        event_type, payload = mock_broadcaster.broadcast.call_args[0]
+        assert event_type == "turns_reconciled"
+        assert payload["agent_id"] == 1
+        assert payload["project_id"] == 10
+        assert [u["turn_id"] for u in payload["updated"]] == [42, 43]
+        assert payload["updated"][0]["timestamp"] == ts_new.isoformat()
+        assert [c["turn_id"] for c in payload["created"]] == [98, 99]
+        assert payload["created"][0]["text"] == "Turn 98"
+
+    @patch("claude_headspace.services.broadcaster.get_broadcaster")
+    def test_aggregate_broadcast_exception_does_not_propagate(self, mock_get_broadcaster):
+        mock_broadcaster = MagicMock()
+        mock_broadcaster.broadcast.side_effect = RuntimeError("boom")
+        mock_get_broadcaster.return_value = mock_broadcaster
+
+        ts = datetime(2026, 2, 15, 10, 0, 0, tzinfo=timezone.utc)
+        broadcast_reconciliation(MagicMock(), {"updated": [(1, ts, ts)], "created": []}, aggregate=True)
+
+
 # ---------------------------------------------------------------------------
 # Tests for reconcile_agent_session
 # ---------------------------------------------------------------------------
@@ -0,0 +1,147 @@
+"""Tests for the shared transcript tailer."""
+
+import json
+
+import pytest
+
+from claude_headspace.services.transcript_tailer import TranscriptTailer
+
+
+def line(role, text):
+    data = {
+        "type": role,
+        "message": {"role": role, "content": [{"type": "text", "text": text}]},
+    }
+    return json.dumps(data) + "\n"
+
+
+@pytest.fixture
+def tailer():
+    return TranscriptTailer()
+
+
+@pytest.fixture
+def transcript(tmp_path):
+    path = tmp_path / "session.jsonl"
+    path.write_text(line("user", "one") + line("assistant", "two"))
+    return path
+
+
+class TestReadFrom:
+
+    def test_reads_all_entries_from_start(self, tailer, transcript):
+        entries, position = tailer.read_from(str(transcript), 0)
+        assert [e.content for e in entries] == ["one", "two"]
+        assert position == transcript.stat().st_size
+
+    def test_each_line_parsed_once_across_consumers(self, tailer, transcript):
+        tailer.read_from(str(transcript), 0)
+        tailer.read_from(str(transcript), 0)
+        _, position = tailer.read_from(str(transcript), 0)
+
+        with open(transcript, "a") as f:
+            f.write(line("assistant", "three"))
+        entries_a, _ = tailer.read_from(str(transcript), position)
+        entries_b, _ = tailer.read_from(str(transcript), position)
+
+        assert [e.content for e in entries_a] == ["three"]
+        assert entries_a[0] is entries_b[0]
+        assert tailer.stats["lines_parsed"] == 3
+
+    def test_partial_trailing_line_waits_for_newline(self, tailer, transcript):
+        _, position = tailer.read_from(str(transcript), 0)
+        partial = line("assistant", "three")
+        with open(transcript, "a") as f:
+            f.write(partial[:10])
+
+        entries, new_position = tailer.read_from(str(transcript), position)
+        assert entries == []
+        assert new_position == position
+
+        with open(transcript, "a") as f:
+            f.write(partial[10:])
+        entries, _ = tailer.read_from(str(transcript), position)
+        assert [e.content for e in entries] == ["three"]
+
+    def test_malformed_line_skipped(self, tailer, tmp_path):
+        path = tmp_path / "bad.jsonl"
+        path.write_text("not json\n" + line("user", "ok"))
+        entries, _ = tailer.read_from(str(path), 0)
+        assert [e.content for e in entries] == ["ok"]
+
+    def test_consumer_behind_retained_window(self, tailer, transcript):
+        size = transcript.stat().st_size
+        tailer.read_from(str(transcript), size)
+        entries, _ = tailer.read_from(str(transcript), 0)
+        assert [e.content for e in entries] == ["one", "two"]
+
+    def test_rewritten_file_is_reparsed(self, tailer, transcript):
+        tailer.read_from(str(transcript), 0)
+        transcript.write_text(line("user", "uno") + line("assistant", "dos"))
+        entries, _ = tailer.read_from(str(transcript), 0)
+        assert [e.content for e in entries] == ["uno", "dos"]
+
+    def test_missing_file(self, tailer):
+        assert tailer.read_from("/nonexistent/file.jsonl", 7) == ([], 7)
+
+    def test_retention_budget_trims_oldest(self, transcript):
+        tailer = TranscriptTailer(max_retained_entries=1)
+        entries, position = tailer.read_from(str(transcript), 0)
+        assert len(entries) == 2
+        assert tailer.stats["retained_entries"] == 1
+        # Older lines are still served by parsing the gap on demand
+        entries, _ = tailer.read_from(str(transcript), 0)
+        assert [e.content for e in entries] == ["one", "two"]
+
+
+    def test_non_message_records_only_on_request(self, tailer, tmp_path):
+        path = tmp_path / "progress.jsonl"
+        progress = json.dumps({"type": "progress", "data": {"step": 1}}) + "\n"
+        path.write_text(line("user", "one") + progress + '{"type":"system",\n' + line("assistant", "two"))
+
+        entries, position = tailer.read_from(str(path), 0)
+        assert [e.type for e in entries] == ["user", "assistant"]
+
+        entries, _ = tailer.read_from(str(path), 0, messages_only=False)
+        assert [e.type for e in entries] == ["user", "progress", "assistant"]
+        assert entries[1].raw_data["data"] == {"step": 1}
+        assert entries[1].content is None
+        assert tailer.stats["lines_skipped"] == 2
+
+    def test_read_new_entries_from_position_keeps_all_records(self, tmp_path):
+        from claude_headspace.services.transcript_reader import read_new_entries_from_position
+
+        path = tmp_path / "summary.jsonl"
+        path.write_text(json.dumps({"type": "summary", "summary": "s"}) + "\n" + line("user", "one"))
+        entries, _ = read_new_entries_from_position(str(path), 0)
+        assert [e.type for e in entries] == ["summary", "user"]
+
+
+class TestSubscriptions:
+
+    def test_subscribe_defaults_to_end_of_file(self, tailer, transcript):
+        tailer.subscribe("watcher", str(transcript))
+        assert tailer.poll("watcher") == []
+
+        with open(transcript, "a") as f:
+            f.write(line("assistant", "three"))
+        assert [e.content for e in tailer.poll("watcher")] == ["three"]
+        assert tailer.poll("watcher") == []
+
+    def test_independent_cursors(self, tailer, transcript):
+        tailer.subscribe("a", str(transcript), 0)
+        tailer.subscribe("b", str(transcript))
+
+        assert len(tailer.poll("a")) == 2
+        assert tailer.poll("b") == []
+        assert tailer.cursor("a") == tailer.cursor("b")
+
+    def test_poll_auto_subscribes_from_start(self, tailer, transcript):
+        assert len(tailer.poll("new", str(transcript))) == 2
+        assert tailer.cursor("new") == transcript.stat().st_size
+
+    def test_unsubscribe(self, tailer, transcript):
+        tailer.subscribe("a", str(transcript))
+        tailer.unsubscribe("a")
+        assert tailer.cursor("a") is None
+        assert tailer.poll("a") == []
@@ -30,6 +30,13 @@ class TestAppFactory:
         """Test that app version is configured."""
         assert app.config.get('APP_VERSION') == __version__
 
+    def test_session_index_not_started_for_test_apps(self, app, client):
+        """Test that requests to a TESTING app do not start the session index watch."""
+        client.get('/health')
+        index = app.extensions["session_index"]
+        assert index._observer is None
+        assert index._thread is None
+
 
 class TestHealthEndpoint:
     """Test health check endpoint."""